@@ -20,10 +20,11 @@
 from audiotools import (AudioFile, InvalidFile, PCMReader,
                         __capped_stream_reader__, PCMReaderError,
                         transfer_data, DecodingError, EncodingError,
-                        ID3v22Comment, BUFFER_SIZE, ChannelMask,
+                        BUFFER_SIZE, ChannelMask,
                         ReorderedPCMReader, pcm,
                         cStringIO, os, AiffContainer, to_pcm_progress,
                         LimitedFileReader)
+from __id3__ import ID3v22Comment
 import struct
 import gettext
 
@@ -290,6 +291,7 @@ class AiffAudio(AiffContainer):
 
     SUFFIX = "aiff"
     NAME = SUFFIX
+    MAGIC = (((0, 'FORM'), (8, 'AIFF')),)
 
     PRINTABLE_ASCII = frozenset([chr(i) for i in xrange(0x20, 0x7E + 1)])
 
@@ -743,14 +745,17 @@ class AiffAudio(AiffContainer):
         the resulting object
         may raise EncodingError if some problem occurs during encoding"""
 
-        if (hasattr(target_class, "from_aiff")):
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (hasattr(target_class, "from_aiff")):
             return target_class.from_aiff(target_path,
                                           self.filename,
                                           compression=compression,
                                           progress=progress)
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
     def pcm_split(self):
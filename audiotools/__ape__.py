@@ -815,6 +815,7 @@ class ApeAudio(ApeTaggedAudio, AudioFile):
 
     SUFFIX = "ape"
     NAME = SUFFIX
+    MAGIC = (((0, 'MAC '),),)
     DEFAULT_COMPRESSION = "5000"
     COMPRESSION_MODES = tuple([str(x * 1000) for x in range(1, 6)])
     BINARIES = ("mac",)
@@ -83,6 +83,7 @@ class AuAudio(AudioFile):
 
     SUFFIX = "au"
     NAME = SUFFIX
+    MAGIC = (((0, '.snd'),),)
 
     def __init__(self, filename):
         AudioFile.__init__(self, filename)
@@ -1226,6 +1226,7 @@ class FlacAudio(WaveContainer, AiffContainer):
 
     SUFFIX = "flac"
     NAME = SUFFIX
+    MAGIC = (((0, 'fLaC'),),)
     DEFAULT_COMPRESSION = "8"
     COMPRESSION_MODES = tuple(map(str, range(0, 9)))
     COMPRESSION_DESCRIPTIONS = {"0": _(u"least amount of compresson, " +
@@ -1608,11 +1609,13 @@ class FlacAudio(WaveContainer, AiffContainer):
         """returns a PCMReader object containing the track's PCM data"""
 
         from . import decoders
+        from . import DECODING_THREADS
 
         try:
             return decoders.FlacDecoder(self.filename,
                                         self.channel_mask(),
-                                        self.__stream_offset__)
+                                        self.__stream_offset__,
+                                        DECODING_THREADS)
         except (IOError, ValueError), msg:
             #The only time this is likely to occur is
             #if the FLAC is modified between when FlacAudio
@@ -1634,6 +1637,7 @@ class FlacAudio(WaveContainer, AiffContainer):
         and returns a new FlacAudio object"""
 
         from . import encoders
+        from . import ENCODING_THREADS
 
         if ((compression is None) or
             (compression not in cls.COMPRESSION_MODES)):
@@ -1720,6 +1724,7 @@ class FlacAudio(WaveContainer, AiffContainer):
             offsets = encoders.encode_flac(
                 filename,
                 pcmreader=BufferedPCMReader(pcmreader),
+                threads=ENCODING_THREADS,
                 **encoding_options)
             flac = FlacAudio(filename)
             metadata = flac.get_metadata()
@@ -1821,12 +1826,12 @@ class FlacAudio(WaveContainer, AiffContainer):
             elif (chunk_id == 'data'):
                 if (progress is not None):
                     yield FLAC_Data_Chunk(
-                        self.__total_frames__,
+                        self.total_frames(),
                         PCMReaderProgress(self.to_pcm(),
-                                          self.__total_frames__,
+                                          self.total_frames(),
                                           progress))
                 else:
-                    yield FLAC_Data_Chunk(self.__total_frames__, self.to_pcm())
+                    yield FLAC_Data_Chunk(self.total_frames(), self.to_pcm())
             else:
                 chunk_size = unpack("<I", chunk_size)[0]
                 yield RIFF_Chunk(chunk_id, chunk_size, chunk_data[0:chunk_size])
@@ -1982,12 +1987,12 @@ class FlacAudio(WaveContainer, AiffContainer):
             elif (chunk_id == 'SSND'):
                 if (progress is not None):
                     yield FLAC_SSND_Chunk(
-                        self.__total_frames__,
+                        self.total_frames(),
                         PCMReaderProgress(self.to_pcm(),
-                                          self.__total_frames__,
+                                          self.total_frames(),
                                           progress))
                 else:
-                    yield FLAC_SSND_Chunk(self.__total_frames__, self.to_pcm())
+                    yield FLAC_SSND_Chunk(self.total_frames(), self.to_pcm())
             else:
                 chunk_size = unpack(">I", chunk_size)[0]
                 yield AIFF_Chunk(chunk_id, chunk_size, chunk_data[0:chunk_size])
@@ -2007,12 +2012,20 @@ class FlacAudio(WaveContainer, AiffContainer):
 
         import tempfile
 
-        if (target_class == WaveAudio):
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (target_class == WaveAudio):
             self.to_wave(target_path, progress=progress)
             return WaveAudio(target_path)
         elif (target_class == AiffAudio):
             self.to_aiff(target_path, progress=progress)
             return AiffAudio(target_path)
+        elif ((target_class == OggFlacAudio) and
+              (self.audio_class() == FlacAudio)):
+            #FLAC frames are identical in both containers
+            #so they're repackaged rather than re-encoded
+            #and the compression level is ignored
+            return self.__to_oggflac__(target_path, progress)
         elif (self.has_foreign_riff_chunks() and
               hasattr(target_class, "from_wave")):
             temp_wave = tempfile.NamedTemporaryFile(suffix=".wav")
@@ -2039,9 +2052,135 @@ class FlacAudio(WaveContainer, AiffContainer):
                 temp_aiff.close()
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
+    def __to_oggflac__(self, target_path, progress=None):
+        """copies this track's FLAC frames and metadata blocks
+        to a new Ogg FLAC file at target_path without decoding them
+
+        returns the new OggFlacAudio object
+        may raise EncodingError if some problem occurs during copying"""
+
+        from . import decoders
+        from . import OggStreamWriter
+        from .bitstream import BitstreamWriter
+        from random import randint
+
+        try:
+            #the byte offset and PCM frame count of each FLAC frame
+            decoder = decoders.FlacDecoder(self.filename,
+                                           self.channel_mask(),
+                                           self.__stream_offset__)
+            offsets = decoder.offsets()
+            decoder.close()
+        except (IOError, ValueError), err:
+            raise EncodingError(str(err))
+
+        if (len(offsets) == 0):
+            #an Ogg stream with no audio packets has no page
+            #to place its end-of-stream marker on,
+            #so encode it the usual way instead
+            return OggFlacAudio.from_pcm(target_path,
+                                         to_pcm_progress(self, progress))
+
+        #Ogg FLAC's seek points are page granule positions
+        #rather than byte offsets, so its SEEKTABLE is dropped
+        #and its VORBIS_COMMENT block must follow STREAMINFO
+        metadata = OggFlacMetaData.converted(self.get_metadata())
+        metadata.block_list = (
+            [b for b in metadata.block_list
+             if (b.BLOCK_ID == Flac_STREAMINFO.BLOCK_ID)] +
+            [b for b in metadata.block_list
+             if (b.BLOCK_ID == Flac_VORBISCOMMENT.BLOCK_ID)] +
+            [b for b in metadata.block_list
+             if (b.BLOCK_ID not in (Flac_STREAMINFO.BLOCK_ID,
+                                    Flac_VORBISCOMMENT.BLOCK_ID,
+                                    Flac_SEEKTABLE.BLOCK_ID))])
+
+        input_file = open(self.filename, "rb")
+        try:
+            #the final frame ends where the stream does,
+            #not counting any trailing ID3v1 tag
+            input_file.seek(-128, 2)
+            if (input_file.read(3) == 'TAG'):
+                stream_end = input_file.tell() - 3
+            else:
+                input_file.seek(0, 2)
+                stream_end = input_file.tell()
+
+            try:
+                output_file = open(target_path, "wb")
+            except IOError, err:
+                raise EncodingError(str(err))
+            try:
+                writer = BitstreamWriter(output_file, 1)
+                ogg = OggStreamWriter(writer, randint(0, 2 ** 32 - 1))
+                metadata.build(ogg)
+
+                #each FLAC frame becomes one Ogg packet
+                #and each page's granule position is the PCM frame count
+                #at the end of the last packet completed on that page
+                page_segments = []
+                page_size = 0
+                granule_position = -1
+                continuation = 0
+                pcm_frames = 0
+                input_file.seek(offsets[0][0], 0)
+                for (i, (offset, frame_count)) in enumerate(offsets):
+                    if ((i + 1) < len(offsets)):
+                        frame_end = offsets[i + 1][0]
+                    else:
+                        frame_end = stream_end
+                    frame = input_file.read(frame_end - offset)
+                    if (len(frame) != (frame_end - offset)):
+                        raise EncodingError(_(u"I/O error reading FLAC frame"))
+
+                    for (j, segment) in enumerate(
+                        ogg.packet_to_segments(frame)):
+                        if (len(page_segments) == 255):
+                            ogg.write_page(granule_position, page_segments,
+                                           continuation, 0, 0)
+                            page_segments = []
+                            page_size = 0
+                            granule_position = -1
+                            continuation = 1 if (j > 0) else 0
+                        page_segments.append(segment)
+                        page_size += len(segment)
+
+                    pcm_frames += frame_count
+                    granule_position = pcm_frames
+
+                    if (page_size >= 4096):
+                        ogg.write_page(granule_position, page_segments,
+                                       continuation, 0,
+                                       1 if ((i + 1) == len(offsets)) else 0)
+                        page_segments = []
+                        page_size = 0
+                        granule_position = -1
+                        continuation = 0
+
+                    if (progress is not None):
+                        progress(pcm_frames, self.total_frames())
+
+                if (len(page_segments) > 0):
+                    ogg.write_page(granule_position, page_segments,
+                                   continuation, 0, 1)
+                writer.flush()
+            finally:
+                output_file.close()
+        except EncodingError, err:
+            self.__unlink__(target_path)
+            raise err
+        except (IOError, ValueError), err:
+            self.__unlink__(target_path)
+            raise EncodingError(str(err))
+        finally:
+            input_file.close()
+
+        return OggFlacAudio(target_path)
+
     def bits_per_sample(self):
         """returns an integer number of bits-per-sample this track contains"""
 
@@ -2112,24 +2251,10 @@ class FlacAudio(WaveContainer, AiffContainer):
                  track_peak,
                  album_gain,
                  album_peak) in calculate_replay_gain(tracks, progress):
-                metadata = track.get_metadata()
-                try:
-                    comment = metadata.get_block(
-                        Flac_VORBISCOMMENT.BLOCK_ID)
-                except IndexError:
-                    comment = Flac_VORBISCOMMENT(
-                        [], u"Python Audio Tools %s" % (VERSION))
-                    metadata.add_block(comment)
-
-                comment["REPLAYGAIN_TRACK_GAIN"] = [
-                    "%1.2f dB" % (track_gain)]
-                comment["REPLAYGAIN_TRACK_PEAK"] = [
-                    "%1.8f" % (track_peak)]
-                comment["REPLAYGAIN_ALBUM_GAIN"] = [
-                    "%1.2f dB" % (album_gain)]
-                comment["REPLAYGAIN_ALBUM_PEAK"] = ["%1.8f" % (album_peak)]
-                comment["REPLAYGAIN_REFERENCE_LOUDNESS"] = [u"89.0 dB"]
-                track.update_metadata(metadata)
+                track.set_replay_gain(ReplayGain(track_gain,
+                                                 track_peak,
+                                                 album_gain,
+                                                 album_peak))
 
     @classmethod
     def can_add_replay_gain(cls):
@@ -2143,6 +2268,36 @@ class FlacAudio(WaveContainer, AiffContainer):
 
         return True
 
+    @classmethod
+    def can_set_replay_gain(cls):
+        """returns True"""
+
+        return True
+
+    def set_replay_gain(self, replaygain):
+        """sets our ReplayGain values from a ReplayGain object
+        without recalculating them"""
+
+        metadata = self.get_metadata()
+        try:
+            comment = metadata.get_block(
+                Flac_VORBISCOMMENT.BLOCK_ID)
+        except IndexError:
+            comment = Flac_VORBISCOMMENT(
+                [], u"Python Audio Tools %s" % (VERSION))
+            metadata.add_block(comment)
+
+        comment["REPLAYGAIN_TRACK_GAIN"] = [
+            "%1.2f dB" % (replaygain.track_gain)]
+        comment["REPLAYGAIN_TRACK_PEAK"] = [
+            "%1.8f" % (replaygain.track_peak)]
+        comment["REPLAYGAIN_ALBUM_GAIN"] = [
+            "%1.2f dB" % (replaygain.album_gain)]
+        comment["REPLAYGAIN_ALBUM_PEAK"] = [
+            "%1.8f" % (replaygain.album_peak)]
+        comment["REPLAYGAIN_REFERENCE_LOUDNESS"] = [u"89.0 dB"]
+        self.update_metadata(metadata)
+
     def replay_gain(self):
         """returns a ReplayGain object of our ReplayGain values
 
@@ -2302,7 +2457,7 @@ class FlacAudio(WaveContainer, AiffContainer):
                 finally:
                     output_f.close()
 
-                output_track = self.__class__(output_filename)
+                output_track = self.audio_class()(output_filename)
 
                 metadata = self.get_metadata()
 
@@ -2610,11 +2765,39 @@ class __Counter__:
         return self.value
 
 
+def __frame_block_size__(frame):
+    """given a binary string of FLAC frame data
+    returns the number of PCM frames in its header's block size"""
+
+    block_size = ord(frame[2]) >> 4
+    if (block_size == 1):
+        return 192
+    elif (block_size <= 5):
+        return 576 << (block_size - 2)
+    elif (block_size >= 8):
+        return 256 << (block_size - 8)
+    else:
+        #an 8 or 16 bit block size follows the UTF-8 coded frame number
+        #whose byte length is given by its first byte's leading 1 bits
+        if (ord(frame[4]) & 0x80):
+            utf8_bytes = 2
+            while (ord(frame[4]) & (0x80 >> utf8_bytes)):
+                utf8_bytes += 1
+        else:
+            utf8_bytes = 1
+        if (block_size == 6):
+            return ord(frame[4 + utf8_bytes]) + 1
+        else:
+            return ((ord(frame[4 + utf8_bytes]) << 8) |
+                    ord(frame[5 + utf8_bytes])) + 1
+
+
 class OggFlacAudio(FlacAudio):
     """a Free Lossless Audio Codec file inside an Ogg container"""
 
     SUFFIX = "oga"
     NAME = SUFFIX
+    MAGIC = (((0, 'OggS'), (0x1C, '\x7FFLAC')),)
     DEFAULT_COMPRESSION = "8"
     COMPRESSION_MODES = tuple(map(str, range(0, 9)))
     COMPRESSION_DESCRIPTIONS = {"0": _(u"least amount of compresson, " +
@@ -2663,6 +2846,22 @@ class OggFlacAudio(FlacAudio):
     def total_frames(self):
         """returns the total PCM frames of the track as an integer"""
 
+        if (self.__total_frames__ is None):
+            #STREAMINFO left the total unknown
+            #so the final page's granule position has it
+            from . import read_ogg_final_granule_position
+
+            f = open(self.filename, "rb")
+            try:
+                total_frames = read_ogg_final_granule_position(
+                    f, self.__serial_number__)
+            finally:
+                f.close()
+            if (total_frames is not None):
+                self.__total_frames__ = total_frames
+            else:
+                self.__total_frames__ = 0
+
         return self.__total_frames__
 
     def sample_rate(self):
@@ -2833,6 +3032,11 @@ class OggFlacAudio(FlacAudio):
 
             self.__channels__ += 1
             self.__bitspersample__ += 1
+
+            #a total of 0 means unknown,
+            #to be filled in by total_frames() on first use
+            if (self.__total_frames__ == 0):
+                self.__total_frames__ = None
         finally:
             f.close()
 
@@ -2960,6 +3164,117 @@ class OggFlacAudio(FlacAudio):
         else:
             raise EncodingError(u"error encoding file with flac")
 
+    def convert(self, target_path, target_class, compression=None,
+                progress=None):
+        """encodes a new AudioFile from existing AudioFile
+
+        take a filename string, target class and optional compression string
+        encodes a new AudioFile in the target class and returns
+        the resulting object
+        may raise EncodingError if some problem occurs during encoding"""
+
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (target_class == FlacAudio):
+            #FLAC frames are identical in both containers
+            #so they're unwrapped rather than re-encoded
+            #and the compression level is ignored
+            return self.__to_flac__(target_path, progress)
+        else:
+            return FlacAudio.convert(self, target_path, target_class,
+                                     compression, progress)
+
+    def __to_flac__(self, target_path, progress=None):
+        """copies this track's FLAC frames and metadata blocks
+        to a new FLAC file at target_path without decoding them
+
+        returns the new FlacAudio object
+        may raise EncodingError if some problem occurs during copying"""
+
+        from . import OggStreamReader
+        from .bitstream import BitstreamReader
+        from .bitstream import BitstreamWriter
+
+        total_frames = self.total_frames()
+        seekpoint_interval = self.sample_rate() * 10
+
+        metadata = FlacMetaData.converted(self.get_metadata())
+        metadata.get_block(Flac_STREAMINFO.BLOCK_ID).total_samples = \
+            total_frames
+
+        #reserve a SEEKTABLE of the proper size
+        #to be populated once the frames' byte offsets are known
+        if (total_frames > 0):
+            seektable = Flac_SEEKTABLE(
+                [(0, 0, 0)] * len(xrange(0, total_frames, seekpoint_interval)))
+            if (metadata.has_block(Flac_SEEKTABLE.BLOCK_ID)):
+                metadata.replace_blocks(Flac_SEEKTABLE.BLOCK_ID, [seektable])
+            else:
+                metadata.add_block(seektable)
+        else:
+            metadata.replace_blocks(Flac_SEEKTABLE.BLOCK_ID, [])
+
+        input_file = open(self.filename, "rb")
+        try:
+            try:
+                output_file = open(target_path, "w+b")
+            except IOError, err:
+                raise EncodingError(str(err))
+            try:
+                #skip the Ogg FLAC header packets
+                reader = BitstreamReader(input_file, 1)
+                OggFlacMetaData.parse(reader)
+
+                output_file.write("fLaC")
+                writer = BitstreamWriter(output_file, 0)
+                metadata.build(writer)
+                writer.flush()
+                frames_start = output_file.tell()
+
+                #each Ogg packet is one FLAC frame
+                offsets = []
+                packet = []
+                for (granule_position,
+                     segments,
+                     continuation,
+                     first_page,
+                     last_page) in OggStreamReader(reader).pages():
+                    for segment in segments:
+                        packet.append(segment)
+                        if (len(segment) < 255):
+                            frame = "".join(packet)
+                            packet = []
+                            if (len(frame) > 0):
+                                offsets.append(
+                                    (output_file.tell() - frames_start,
+                                     __frame_block_size__(frame)))
+                                output_file.write(frame)
+
+                    if ((progress is not None) and (granule_position >= 0)):
+                        progress(granule_position, total_frames)
+
+                #then fill in the reserved SEEKTABLE
+                if (total_frames > 0):
+                    metadata.replace_blocks(
+                        Flac_SEEKTABLE.BLOCK_ID,
+                        [self.seektable(offsets, seekpoint_interval)])
+                    output_file.seek(4, 0)
+                    writer = BitstreamWriter(output_file, 0)
+                    metadata.build(writer)
+                    writer.flush()
+            finally:
+                output_file.close()
+        except EncodingError, err:
+            self.__unlink__(target_path)
+            raise err
+        except (IOError, ValueError, IndexError), err:
+            self.__unlink__(target_path)
+            raise EncodingError(str(err))
+        finally:
+            input_file.close()
+
+        return FlacAudio(target_path)
+
     def sub_pcm_tracks(self):
         """yields a PCMReader object per cuesheet track
 
@@ -1069,20 +1069,26 @@ class ID3v22Comment(MetaData):
 
         return cls(frames)
 
-    def build(self, writer):
+    def build(self, writer, padding=0):
         """writes the complete ID3v22Comment data
-        to the given BitstreamWriter"""
+        to the given BitstreamWriter
+
+        padding is the number of NULL bytes to reserve after the frames
+        and should be either 0 or at least as large as a frame header"""
 
         from operator import add
 
         writer.build("3b 8u 8u 8u", ("ID3", 0x02, 0x00, 0x00))
         encode_syncsafe32(writer,
-                          reduce(add, [6 + frame.size() for frame in self], 0))
+                          reduce(add, [6 + frame.size() for frame in self],
+                                 padding))
 
         for frame in self:
             writer.build("3b 24u", (frame.id, frame.size()))
             frame.build(writer)
 
+        writer.write_bytes(chr(0) * padding)
+
     def size(self):
         """returns the total size of the ID3v22Comment, including its header"""
 
@@ -1620,21 +1626,27 @@ class ID3v23Comment(ID3v22Comment):
 
         return cls(frames)
 
-    def build(self, writer):
+    def build(self, writer, padding=0):
         """writes the complete ID3v23Comment data
-        to the given BitstreamWriter"""
+        to the given BitstreamWriter
+
+        padding is the number of NULL bytes to reserve after the frames
+        and should be either 0 or at least as large as a frame header"""
 
         from operator import add
 
         writer.build("3b 8u 8u 8u", ("ID3", 0x03, 0x00, 0x00))
         encode_syncsafe32(writer,
                           reduce(add,
-                                 [10 + frame.size() for frame in self], 0))
+                                 [10 + frame.size() for frame in self],
+                                 padding))
 
         for frame in self:
             writer.build("4b 32u 16u", (frame.id, frame.size(), 0))
             frame.build(writer)
 
+        writer.write_bytes(chr(0) * padding)
+
     def size(self):
         """returns the total size of the ID3v23Comment, including its header"""
 
@@ -2022,16 +2034,19 @@ class ID3v24Comment(ID3v23Comment):
 
         return cls(frames)
 
-    def build(self, writer):
+    def build(self, writer, padding=0):
         """writes the complete ID3v24Comment data
-        to the given BitstreamWriter"""
+        to the given BitstreamWriter
+
+        padding is the number of NULL bytes to reserve after the frames
+        and should be either 0 or at least as large as a frame header"""
 
         from operator import add
 
         writer.build("3b 8u 8u 8u", ("ID3", 0x04, 0x00, 0x00))
         encode_syncsafe32(writer,
                           reduce(add, [10 + frame.size() for frame in self],
-                                 0))
+                                 padding))
 
         for frame in self:
             writer.write_bytes(frame.id)
@@ -2039,6 +2054,8 @@ class ID3v24Comment(ID3v23Comment):
             writer.write(16, 0)
             frame.build(writer)
 
+        writer.write_bytes(chr(0) * padding)
+
     def size(self):
         """returns the total size of the ID3v24Comment, including its header"""
 
@@ -35,7 +35,8 @@ import os.path
 import ConfigParser
 import optparse
 import struct
-from itertools import izip
+import types
+from itertools import izip, groupby
 import gettext
 import unicodedata
 import cPickle
@@ -106,6 +107,9 @@ class __system_binaries__:
     def __init__(self, config):
         self.config = config
 
+        #each command's availability, once checked
+        self.__executable__ = {}
+
     def __getitem__(self, command):
         try:
             return self.config.get("Binaries", command)
@@ -115,6 +119,13 @@ class __system_binaries__:
             return command
 
     def can_execute(self, command):
+        #searching $PATH is only done once per command,
+        #since has_binaries() asks about the same few repeatedly
+        if (command not in self.__executable__):
+            self.__executable__[command] = self.__search__(command)
+        return self.__executable__[command]
+
+    def __search__(self, command):
         if (os.sep in command):
             return os.access(command, os.X_OK)
         else:
@@ -160,10 +171,9 @@ DEFAULT_VERBOSITY = config.get_default("Defaults", "verbosity", "normal")
 if (DEFAULT_VERBOSITY not in VERBOSITY_LEVELS):
     DEFAULT_VERBOSITY = "normal"
 
-DEFAULT_TYPE = config.get_default("System", "default_type", "wav")
-
 
 def __default_quality__(audio_type):
+    __load_types__()
     quality = DEFAULT_QUALITY.get(audio_type, "")
     try:
         if (quality not in TYPE_MAP[audio_type].COMPRESSION_MODES):
@@ -183,6 +193,17 @@ else:
     except (ImportError,AttributeError):
         MAX_JOBS = 1
 
+ENCODING_THREADS = config.getint_default("System", "encoding_threads", 1)
+DECODING_THREADS = config.getint_default("System", "decoding_threads", 1)
+
+#the location of a catalog database of tracks' stream information
+#and metadata for utilities to open files from, if not empty
+CATALOG = config.get_default("System", "catalog", "")
+
+#the number of threads open_files() and open_directory()
+#may use to open files at once
+OPENING_THREADS = config.getint_default("System", "opening_threads", 1)
+
 
 def get_umask():
     """returns the current file creation umask as an integer
@@ -1048,7 +1069,7 @@ class UnsupportedChannelMask(EncodingError):
             _(u"Unable to write \"%(target_filename)s\"" +
               u" with channel assignment \"%(assignment)s\"") %
             {"target_filename": VerboseMessenger(None).filename(filename),
-             "assignment": audiotools.ChannelMask(mask)})
+             "assignment": ChannelMask(mask)})
 
 
 class UnsupportedChannelCount(EncodingError):
@@ -1086,6 +1107,59 @@ class DecodingError(IOError):
         self.error_message = error_message
 
 
+#the number of bytes open() reads from the start of a file
+#to match against each AudioFile class's MAGIC signatures
+MAGIC_READ_SIZE = 4096
+
+__MAGIC_TABLES__ = {}
+
+
+def __magic_table__(audio_types):
+    """given a tuple of AudioFile classes, returns a (table, unmarked) tuple
+
+    table is a list of ((offset, length), strings) tuples
+    where strings is a dict of the first string of each signature
+    found at that offset and length to [(class, remaining pairs), ...]
+    unmarked is a list of classes which have no MAGIC signatures"""
+
+    if (audio_types not in __MAGIC_TABLES__):
+        table = {}
+        unmarked = []
+        for audio_type in audio_types:
+            if (len(audio_type.MAGIC) == 0):
+                unmarked.append(audio_type)
+            for signature in audio_type.MAGIC:
+                (offset, string) = signature[0]
+                table.setdefault((offset, len(string)), {}).setdefault(
+                    string, []).append((audio_type, signature[1:]))
+        __MAGIC_TABLES__[audio_types] = (table.items(), unmarked)
+
+    return __MAGIC_TABLES__[audio_types]
+
+
+def __magic_candidates__(header, audio_types):
+    """given a string of a file's opening bytes
+    and a tuple of AudioFile classes,
+    returns a (matched, unmarked) tuple of class lists
+
+    matched are the classes with a MAGIC signature found in header
+    and unmarked are the classes without any MAGIC signatures,
+    both in audio_types order"""
+
+    (table, unmarked) = __magic_table__(audio_types)
+    matched = set([])
+    for ((offset, length), strings) in table:
+        for (audio_type, remaining) in strings.get(
+            header[offset:offset + length], []):
+            for (offset2, string2) in remaining:
+                if (header[offset2:offset2 + len(string2)] != string2):
+                    break
+            else:
+                matched.add(audio_type)
+
+    return ([t for t in audio_types if t in matched], unmarked)
+
+
 def open(filename):
     """returns an AudioFile located at the given filename path
 
@@ -1097,11 +1171,56 @@ def open(filename):
     raises IOError if some problem occurs attempting to open the file
     """
 
-    available_types = frozenset(TYPE_MAP.values())
+    if ("TYPE_MAP" not in globals()):
+        #until every format module is needed,
+        #only those of formats with the file's suffix are tried
+        track = __open_by_suffix__(filename)
+        if (track is not None):
+            return track
+
+    __load_types__()
+    audio_types = tuple(TYPE_MAP.values())
 
     f = file(filename, "rb")
     try:
-        for audioclass in TYPE_MAP.values():
+        header = f.read(MAGIC_READ_SIZE)
+        if (header.startswith("ID3") and (len(header) >= 10)):
+            #an ID3v2 tag may prefix some formats,
+            #so match signatures against whatever follows it
+            #and let is_type() confirm any of them
+            f.seek(10 + ((ord(header[6]) & 0x7F) << 21) +
+                   ((ord(header[7]) & 0x7F) << 14) +
+                   ((ord(header[8]) & 0x7F) << 7) +
+                   (ord(header[9]) & 0x7F), 0)
+            (candidates,
+             unmarked) = __magic_candidates__(
+                f.read(MAGIC_READ_SIZE).lstrip(chr(0)), audio_types)
+            candidates.extend([t for t in audio_types
+                               if ((t not in candidates) and
+                                   (t not in unmarked))])
+        else:
+            #signatures are matched against every known class,
+            #since one shared with an unavailable class
+            #still needs is_type() to tell them apart
+            (matched,
+             unmarked) = __magic_candidates__(header, AVAILABLE_TYPES)
+            candidates = [t for t in matched if t in audio_types]
+            unmarked = [t for t in unmarked if t in audio_types]
+            if ((len(matched) == 1) and (len(candidates) == 1)):
+                #a single match needs no is_type() call
+                #unless the file turns out not to parse
+                try:
+                    return candidates[0](filename)
+                except InvalidFile, err:
+                    f.seek(0, 0)
+                    if (candidates[0].is_type(f)):
+                        raise err
+                    else:
+                        candidates = []
+
+        #otherwise, is_type() breaks any tie between several matches
+        #and checks any classes without signatures
+        for audioclass in candidates + unmarked:
             f.seek(0, 0)
             if (audioclass.is_type(f)):
                 return audioclass(filename)
@@ -1112,35 +1231,173 @@ def open(filename):
         f.close()
 
 
+def __open_by_suffix__(filename):
+    """returns an AudioFile located at the given filename path
+    if an available format with the file's suffix identifies it,
+    importing only those formats' modules, or None if not
+
+    raises InvalidFile if that format can't parse it
+    raises IOError if some problem occurs attempting to open the file"""
+
+    suffix = os.path.splitext(filename)[1][1:].lower()
+    for (name, format_suffix, module_name, class_name) in __FORMATS__:
+        if (format_suffix == suffix):
+            audio_class = __format_class__(name)
+            if (not audio_class.has_binaries(BIN)):
+                continue
+            f = file(filename, "rb")
+            try:
+                if (audio_class.is_type(f)):
+                    return audio_class(filename)
+            finally:
+                f.close()
+    else:
+        return None
+
+
+def __probe_files__(filenames, open_file, threads):
+    """given an iterable of filename strings,
+    a function which takes a filename and returns an AudioFile
+    and the number of threads to call that function from,
+    yields a (filename, AudioFile, exception) tuple per filename
+    in the same order as filenames,
+    where exception is an UnsupportedFile, IOError or InvalidFile
+    if the file couldn't be opened, and AudioFile is None
+
+    with more than 1 thread, filenames are read on a thread of their own
+    while the others open them, so that a slow iterable
+    such as a directory traversal overlaps with opening files
+    and any other exception is raised once its file is reached"""
+
+    if (threads <= 1):
+        for filename in filenames:
+            try:
+                yield (filename, open_file(filename), None)
+            except (UnsupportedFile, IOError, InvalidFile), err:
+                yield (filename, None, err)
+        return
+
+    import threading
+    import Queue
+
+    #only a few filenames per thread are queued at once
+    #while results are queued until they can be yielded in order
+    jobs = Queue.Queue(threads * 2)
+    results = Queue.Queue()
+
+    def feed():
+        #results ends with a (None, total, None, exception) tuple
+        #where exception is any error from filenames itself
+        total = 0
+        error = None
+        try:
+            try:
+                for filename in filenames:
+                    jobs.put((total, filename))
+                    total += 1
+            except Exception, err:
+                error = err
+        finally:
+            for i in xrange(threads):
+                jobs.put(None)
+            results.put((None, total, None, error))
+
+    def probe():
+        job = jobs.get()
+        while (job is not None):
+            (index, filename) = job
+            try:
+                results.put((index, filename, open_file(filename), None))
+            except Exception, err:
+                results.put((index, filename, None, err))
+            job = jobs.get()
+
+    workers = ([threading.Thread(target=feed)] +
+               [threading.Thread(target=probe) for i in xrange(threads)])
+    for thread in workers:
+        thread.setDaemon(True)
+        thread.start()
+
+    pending = {}
+    next_index = 0
+    total = None
+    while ((total is None) or (next_index < total)):
+        (index, filename, track, error) = results.get()
+        if (index is None):
+            (total, feed_error) = (filename, error)
+        else:
+            pending[index] = (filename, track, error)
+        while (next_index in pending):
+            (filename, track, error) = pending.pop(next_index)
+            next_index += 1
+            if ((error is None) or
+                isinstance(error, (UnsupportedFile, IOError, InvalidFile))):
+                yield (filename, track, error)
+            else:
+                raise error
+
+    #every job is finished, so the threads are exiting
+    for thread in workers:
+        thread.join()
+
+    if (feed_error is not None):
+        raise feed_error
+
+
+def __opened_files__(results, sorted, messenger):
+    """given an iterable of (filename, AudioFile, exception) tuples
+    from __probe_files__, returns a list of the AudioFile objects,
+    sorted by album number then track number if sorted is True,
+    and sends any errors to messenger"""
+
+    toreturn = []
+    for (filename, track, error) in results:
+        if (error is None):
+            toreturn.append(track)
+        elif (isinstance(error, UnsupportedFile)):
+            pass
+        elif (isinstance(error, IOError)):
+            messenger.warning(
+                _(u"Unable to open \"%s\"" % (messenger.filename(filename))))
+        else:
+            messenger.error(unicode(error))
+
+    if (sorted):
+        toreturn.sort(key=lambda x: (x.album_number(), x.track_number()))
+    return toreturn
+
+
 #takes a list of filenames
 #returns a list of AudioFile objects, sorted by track_number()
 #any unsupported files are filtered out
-def open_files(filename_list, sorted=True, messenger=None):
+def open_files(filename_list, sorted=True, messenger=None, catalog=None,
+               threads=None):
     """returns a list of AudioFile objects from a list of filenames
 
     files are sorted by album number then track number, by default
     unsupported files are filtered out
     error messages are sent to messenger, if given
+    files are opened from catalog, if given, which is then committed
+    threads is the number of files to open at once,
+    which is OPENING_THREADS by default
     """
 
-    toreturn = []
     if (messenger is None):
         messenger = Messenger("audiotools", None)
+    if (catalog is not None):
+        open_file = catalog.open
+    else:
+        open_file = open
+    if (threads is None):
+        threads = OPENING_THREADS
 
-    for filename in filename_list:
-        try:
-            toreturn.append(open(filename))
-        except UnsupportedFile:
-            pass
-        except IOError, err:
-            messenger.warning(
-                _(u"Unable to open \"%s\"" % (messenger.filename(filename))))
-        except InvalidFile, err:
-            messenger.error(unicode(err))
+    toreturn = __opened_files__(
+        __probe_files__(filename_list, open_file, threads),
+        sorted, messenger)
+
+    if (catalog is not None):
+        catalog.commit()
 
-    if (sorted):
-        toreturn.sort(lambda x, y: cmp((x.album_number(), x.track_number()),
-                                       (y.album_number(), y.track_number())))
     return toreturn
 
 
@@ -1148,24 +1405,46 @@ def open_files(filename_list, sorted=True, messenger=None):
 #iterates recursively over any and all audio files in it
 #optionally sorted by directory name and track_number()
 #any unsupported files are filtered out
-def open_directory(directory, sorted=True, messenger=None):
+def open_directory(directory, sorted=True, messenger=None, catalog=None,
+                   threads=None):
     """yields an AudioFile via a recursive search of directory
 
     files are sorted by album number/track number by default,
     on a per-directory basis
     any unsupported files are filtered out
     error messages are sent to messenger, if given
+    files are opened from catalog, if given
+    threads is the number of files to open at once,
+    which is OPENING_THREADS by default
     """
 
-    for (basedir, subdirs, filenames) in os.walk(directory):
-        if (sorted):
-            subdirs.sort()
-        for audiofile in open_files([os.path.join(basedir, filename)
-                                     for filename in filenames],
-                                    sorted=sorted,
-                                    messenger=messenger):
+    if (messenger is None):
+        messenger = Messenger("audiotools", None)
+    if (catalog is not None):
+        open_file = catalog.open
+    else:
+        open_file = open
+    if (threads is None):
+        threads = OPENING_THREADS
+
+    def walk():
+        for (basedir, subdirs, filenames) in os.walk(directory):
+            if (sorted):
+                subdirs.sort()
+            for filename in filenames:
+                yield os.path.join(basedir, filename)
+
+    #files arrive in the order they're walked,
+    #so each directory's files are grouped together
+    for (basedir, results) in groupby(
+        __probe_files__(walk(), open_file, threads),
+        lambda result: os.path.dirname(result[0])):
+        for audiofile in __opened_files__(results, sorted, messenger):
             yield audiofile
 
+        if (catalog is not None):
+            catalog.commit()
+
 
 def group_tracks(tracks):
     """takes an iterable collection of tracks
@@ -1221,6 +1500,8 @@ def filename_to_type(path):
     raise AmbiguousAudioType exception if the type is ambiguous
     """
 
+    __load_types__()
+
     (path, ext) = os.path.splitext(path)
     if (len(ext) > 0):
         ext = ext[1:]   # remove the "."
@@ -1515,15 +1796,60 @@ class PCMReaderError(PCMReader):
         raise DecodingError(self.error_message)
 
 
-def to_pcm_progress(audiofile, progress):
+def to_pcm_progress(audiofile, progress, threaded=False):
+    """returns a PCMReader of the AudioFile's data
+    which calls the progress function as it's read
+    or the file's own PCMReader if progress is None
+
+    if threaded is True, the file is decoded on a thread of its own
+    a few FrameLists ahead of whatever reads the PCMReader"""
+
+    if (threaded):
+        pcmreader = ThreadedPCMReader(audiofile.to_pcm())
+    else:
+        pcmreader = audiofile.to_pcm()
+
     if (progress is None):
-        return audiofile.to_pcm()
+        return pcmreader
     else:
-        return PCMReaderProgress(audiofile.to_pcm(),
+        return PCMReaderProgress(pcmreader,
                                  audiofile.total_frames(),
                                  progress)
 
 
+def to_pcm_offset(audiofile, pcm_frames, verify=True):
+    """given an AudioFile and a starting PCM frame offset,
+    returns a PCMReader of that file's data from the given offset onward
+
+    if the file's PCMReader has a seek() method, it is used to reach
+    the offset directly rather than decoding and discarding
+    all the PCM frames before it
+
+    if verify is False and the PCMReader has a skip_md5() method,
+    it is called so that the decoder doesn't calculate
+    a stream checksum no one will check, such as during playback"""
+
+    pcmreader = audiofile.to_pcm()
+    if ((not verify) and hasattr(pcmreader, "skip_md5")):
+        pcmreader.skip_md5()
+    if (pcm_frames <= 0):
+        return pcmreader
+    elif (hasattr(pcmreader, "seek")):
+        try:
+            pcmreader.seek(pcm_frames)
+            return pcmreader
+        except (IOError, ValueError), msg:
+            return PCMReaderError(error_message=str(msg),
+                                  sample_rate=pcmreader.sample_rate,
+                                  channels=pcmreader.channels,
+                                  channel_mask=pcmreader.channel_mask,
+                                  bits_per_sample=pcmreader.bits_per_sample)
+    else:
+        return PCMReaderWindow(pcmreader,
+                               pcm_frames,
+                               max(audiofile.total_frames() - pcm_frames, 0))
+
+
 class PCMReaderProgress:
     def __init__(self, pcmreader, total_frames, progress):
         self.__read__ = pcmreader.read
@@ -1644,6 +1970,221 @@ def threaded_transfer_framelist_data(pcmreader, to_function,
         s = data_queue.get()
 
 
+class PCMReaderTee:
+    """a class which splits one PCMReader into several
+    PCMReader-compatible objects, each of which returns
+    the same FrameLists as the original
+
+    the readers are typically consumed by encoders on their own threads
+    while run() reads the original and distributes its data
+    each reader buffers only a few FrameLists at a time
+    so a fast encoder waits for a slow one rather than
+    letting the decoded stream pile up in memory"""
+
+    def __init__(self, pcmreader, count, buffer_size=4):
+        """pcmreader is a PCMReader object to be read from once
+
+        count is the number of readers to create
+        and buffer_size is the maximum number of FrameLists
+        each reader holds before run() waits for it to catch up"""
+
+        self.pcmreader = pcmreader
+        self.readers = [__tee_reader__(pcmreader, buffer_size)
+                        for i in xrange(count)]
+
+    def run(self):
+        """reads the original PCMReader until its end
+        or until every reader has been closed
+        and sends each FrameList to every reader which is still open
+
+        errors from the original are passed along to the readers
+        rather than raised here"""
+
+        #any error is passed along, since a reader left waiting
+        #on a run() which has stopped would never return
+        try:
+            framelist = self.pcmreader.read(BUFFER_SIZE)
+            while (len(framelist) > 0):
+                for reader in self.readers:
+                    reader.__put__(framelist)
+                if (False not in [reader.closed for reader in self.readers]):
+                    #no one is left to read the rest of the stream
+                    break
+                framelist = self.pcmreader.read(BUFFER_SIZE)
+        except Exception, err:
+            for reader in self.readers:
+                reader.__put__(err)
+
+        try:
+            self.pcmreader.close()
+        except Exception, err:
+            for reader in self.readers:
+                reader.close_error = err
+
+        for reader in self.readers:
+            reader.__put__(pcm.from_list([],
+                                         self.pcmreader.channels,
+                                         self.pcmreader.bits_per_sample,
+                                         True))
+
+
+class __tee_reader__:
+    def __init__(self, pcmreader, buffer_size):
+        import Queue
+
+        self.sample_rate = pcmreader.sample_rate
+        self.channels = pcmreader.channels
+        self.channel_mask = pcmreader.channel_mask
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.queue = Queue.Queue(buffer_size)
+        self.finished = None
+        self.closed = False
+        self.close_error = None
+
+    def __put__(self, item):
+        if (not self.closed):
+            self.queue.put(item)
+
+    def read(self, bytes):
+        #once the end of the stream or an error is reached,
+        #it's returned for every subsequent read
+        if (self.finished is None):
+            item = self.queue.get()
+            if (isinstance(item, Exception) or (len(item) == 0)):
+                self.finished = item
+            else:
+                return item
+
+        if (isinstance(self.finished, Exception)):
+            raise self.finished
+        else:
+            return self.finished
+
+    def close(self):
+        import Queue
+
+        #stop accepting data, then discard whatever's buffered
+        #so that PCMReaderTee.run() is never left waiting on this reader
+        self.closed = True
+        try:
+            while (True):
+                self.queue.get_nowait()
+        except Queue.Empty:
+            pass
+
+        if (self.close_error is not None):
+            raise self.close_error
+
+
+class ThreadedPCMReader:
+    """a PCMReader which reads another PCMReader on a thread of its own
+
+    decoders release the GIL while they work,
+    so this allows a file to be decoded on one core
+    while its data is encoded on another
+    the thread reads only a few FrameLists ahead of us
+    before waiting for us to catch up"""
+
+    def __init__(self, pcmreader, buffer_size=4):
+        """pcmreader is a PCMReader object
+
+        buffer_size is the maximum number of FrameLists
+        read ahead of us at any one time"""
+
+        import threading
+
+        tee = PCMReaderTee(pcmreader, 1, buffer_size)
+        self.reader = tee.readers[0]
+        self.sample_rate = pcmreader.sample_rate
+        self.channels = pcmreader.channels
+        self.channel_mask = pcmreader.channel_mask
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.thread = threading.Thread(target=tee.run)
+        self.thread.setDaemon(True)
+        self.thread.start()
+
+    def read(self, bytes):
+        """returns the next FrameList read by the thread
+
+        may raise any error raised by the original PCMReader"""
+
+        return self.reader.read(bytes)
+
+    def close(self):
+        """closes the stream and waits for the thread to finish
+
+        may raise DecodingError if the original PCMReader does"""
+
+        try:
+            self.reader.close()
+        finally:
+            self.thread.join()
+
+    def __del__(self):
+        #an encoder which stops without closing us
+        #mustn't leave the thread waiting on a full queue forever
+        try:
+            self.reader.close()
+        except Exception:
+            pass
+
+
+def from_pcm_many(pcmreader, targets):
+    """encodes one PCMReader's data to several new files at once
+
+    targets is a list of (filename, AudioFile class, compression) tuples
+    where compression may be None for the class's default
+
+    the PCMReader is read only once and its FrameLists are passed
+    to each class's from_pcm() method running on a thread of its own
+    in-process encoders are fed directly
+    while those which use an external program pipe the data to it
+
+    returns a list of new AudioFile objects, one per target
+    may raise EncodingError if some problem occurs during any encoding"""
+
+    import threading
+
+    tee = PCMReaderTee(pcmreader, len(targets))
+    results = [None] * len(targets)
+    errors = [None] * len(targets)
+
+    def encode(index, reader, filename, audio_class, compression):
+        try:
+            results[index] = audio_class.from_pcm(filename,
+                                                  reader,
+                                                  compression)
+        except Exception, err:
+            errors[index] = err
+
+        #an encoder which fails early may not close its reader,
+        #so ensure it's closed to keep the tee from blocking on it
+        try:
+            reader.close()
+        except DecodingError:
+            pass
+
+    threads = [threading.Thread(target=encode,
+                                args=(i, reader, filename,
+                                      audio_class, compression))
+               for (i, (reader, (filename, audio_class, compression)))
+               in enumerate(zip(tee.readers, targets))]
+    for thread in threads:
+        thread.setDaemon(True)
+        thread.start()
+
+    tee.run()
+
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        if (error is not None):
+            raise error
+    else:
+        return results
+
+
 class __capped_stream_reader__:
     #allows a maximum number of bytes "length" to
     #be read from file-like object "stream"
@@ -1807,37 +2348,6 @@ class PCMCat(PCMReader):
         pass
 
 
-class __buffer__:
-    def __init__(self, channels, bits_per_sample, framelists=None):
-        if (framelists is None):
-            self.buffer = []
-        else:
-            self.buffer = framelists
-        self.end_frame = pcm.from_list([], channels, bits_per_sample, True)
-        self.bytes_per_sample = bits_per_sample / 8
-
-    #returns the length of the entire buffer in bytes
-    def __len__(self):
-        if (len(self.buffer) > 0):
-            return sum(map(len, self.buffer)) * self.bytes_per_sample
-        else:
-            return 0
-
-    def framelist(self):
-        import operator
-
-        return reduce(operator.concat, self.buffer, self.end_frame)
-
-    def push(self, s):
-        self.buffer.append(s)
-
-    def pop(self):
-        return self.buffer.pop(0)
-
-    def unpop(self, s):
-        self.buffer.insert(0, s)
-
-
 class BufferedPCMReader:
     """a PCMReader which reads exact counts of bytes"""
 
@@ -1849,7 +2359,8 @@ class BufferedPCMReader:
         self.channels = pcmreader.channels
         self.channel_mask = pcmreader.channel_mask
         self.bits_per_sample = pcmreader.bits_per_sample
-        self.buffer = __buffer__(self.channels, self.bits_per_sample)
+        self.bytes_per_frame = self.channels * (self.bits_per_sample / 8)
+        self.buffer = pcm.FrameBuffer(self.channels, self.bits_per_sample)
         self.reader_finished = False
 
     def close(self):
@@ -1865,17 +2376,20 @@ class BufferedPCMReader:
         number of bytes on each call
         """
 
-        #fill our buffer to at least 'bytes', possibly more
-        self.__fill__(bytes)
-        output_framelist = self.buffer.framelist()
-        (output, remainder) = output_framelist.split(
-            output_framelist.frame_count(bytes))
-        self.buffer.buffer = [remainder]
-        return output
-
-    #try to fill our internal buffer to at least 'bytes'
-    def __fill__(self, bytes):
-        while ((len(self.buffer) < bytes) and
+        return self.read_frames(max(bytes // self.bytes_per_frame, 1))
+
+    def read_frames(self, pcm_frames):
+        """reads exactly 'pcm_frames' PCM frames as a FrameList
+
+        fewer frames are returned only if the stream is exhausted"""
+
+        #fill our buffer to at least 'pcm_frames', possibly more
+        self.__fill__(pcm_frames)
+        return self.buffer.pop(pcm_frames)
+
+    #try to fill our internal buffer to at least 'pcm_frames'
+    def __fill__(self, pcm_frames):
+        while ((self.buffer.frames < pcm_frames) and
                (not self.reader_finished)):
             s = self.pcmreader.read(BUFFER_SIZE)
             if (len(s) > 0):
@@ -1911,7 +2425,10 @@ class LimitedPCMReader:
         """buffered_pcmreader should be a BufferedPCMReader
 
         which ensures we won't pull more frames off the reader
-        than necessary upon calls to read()"""
+        than necessary upon calls to read()
+
+        other PCMReaders, which lack read_frames(), are read from
+        with read() and any frames beyond the limit are discarded"""
 
         self.pcmreader = buffered_pcmreader
         self.total_pcm_frames = total_pcm_frames
@@ -1923,9 +2440,15 @@ class LimitedPCMReader:
 
     def read(self, bytes):
         if (self.total_pcm_frames > 0):
-            frame = self.pcmreader.read(
-                min(bytes,
-                    self.total_pcm_frames * self.bytes_per_frame))
+            if (hasattr(self.pcmreader, "read_frames")):
+                frame = self.pcmreader.read_frames(
+                    min(max(bytes // self.bytes_per_frame, 1),
+                        self.total_pcm_frames))
+            else:
+                frame = self.pcmreader.read(
+                    min(bytes, self.total_pcm_frames * self.bytes_per_frame))
+                if (frame.frames > self.total_pcm_frames):
+                    frame = frame.split(self.total_pcm_frames)[0]
             self.total_pcm_frames -= frame.frames
             return frame
         else:
@@ -1936,6 +2459,24 @@ class LimitedPCMReader:
         self.total_pcm_frames = 0
 
 
+class __framebuffer_reader__:
+    """a PCMReader which returns the contents of a pcm.FrameBuffer"""
+
+    def __init__(self, buffer, sample_rate, channel_mask):
+        self.buffer = buffer
+        self.sample_rate = sample_rate
+        self.channels = buffer.channels
+        self.channel_mask = channel_mask
+        self.bits_per_sample = buffer.bits_per_sample
+        self.bytes_per_frame = self.channels * (self.bits_per_sample / 8)
+
+    def read(self, bytes):
+        return self.buffer.pop(max(bytes // self.bytes_per_frame, 1))
+
+    def close(self):
+        self.buffer.pop(self.buffer.frames)
+
+
 def pcm_split(reader, pcm_lengths):
     """yields a PCMReader object from reader for each pcm_length (in frames)
 
@@ -1946,265 +2487,158 @@ def pcm_split(reader, pcm_lengths):
 
     import tempfile
 
-    def chunk_sizes(total_size, chunk_size):
-        while (total_size > chunk_size):
-            total_size -= chunk_size
-            yield chunk_size
-        yield total_size
-
     full_data = BufferedPCMReader(reader)
+    chunk_frames = BUFFER_SIZE // full_data.bytes_per_frame
 
-    for byte_length in [i * reader.channels * reader.bits_per_sample / 8
-                        for i in pcm_lengths]:
-        if (byte_length > (BUFFER_SIZE * 10)):
+    for pcm_length in pcm_lengths:
+        if (pcm_length > (chunk_frames * 10)):
             #if the sub-file length is somewhat large, use a temporary file
             sub_file = tempfile.TemporaryFile()
-            for size in chunk_sizes(byte_length, BUFFER_SIZE):
-                sub_file.write(full_data.read(size).to_bytes(False, True))
+            while (pcm_length > 0):
+                framelist = full_data.read_frames(min(pcm_length,
+                                                      chunk_frames))
+                if (framelist.frames == 0):
+                    break
+                sub_file.write(framelist.to_bytes(False, True))
+                pcm_length -= framelist.frames
             sub_file.seek(0, 0)
+
+            yield PCMReader(sub_file,
+                            reader.sample_rate,
+                            reader.channels,
+                            reader.channel_mask,
+                            reader.bits_per_sample)
         else:
-            #if the sub-file length is very small, use StringIO
-            sub_file = cStringIO.StringIO(
-                full_data.read(byte_length).to_bytes(False, True))
+            #if the sub-file length is very small,
+            #keep its frames in memory as-is
+            sub_buffer = pcm.FrameBuffer(reader.channels,
+                                         reader.bits_per_sample)
+            sub_buffer.push(full_data.read_frames(pcm_length))
 
-        yield PCMReader(sub_file,
-                        reader.sample_rate,
-                        reader.channels,
-                        reader.channel_mask,
-                        reader.bits_per_sample)
+            yield __framebuffer_reader__(sub_buffer,
+                                         reader.sample_rate,
+                                         reader.channel_mask)
 
     full_data.close()
 
 
-#going from many channels to less channels
-class __channel_remover__:
-    def __init__(self, old_channel_mask, new_channel_mask):
+def __downmix_matrix__(old_channel_mask, old_channel_count):
+    """returns a pair of [front_left, front_right] gain rows
+    for mixing the given channels down to 2"""
+
+    REAR_GAIN = 0.6 * 0.7
+    CENTER_GAIN = 0.7
+
+    #take the front_left, front_right, front_center,
+    #back_left and back_right channels, if possible
+    #missing channels contribute nothing
+    #excess channels are dropped entirely
+    #side_left and side_right may be substituted for back_left/right
+    #but back channels take precedence
+    if (int(old_channel_mask) == 0):
+        #if the old_channel_mask is undefined
+        #invent a channel mask based on the channel count
+        old_channel_mask = {1: ChannelMask.from_fields(front_center=True),
+                            2: ChannelMask.from_fields(front_left=True,
+                                                       front_right=True),
+                            3: ChannelMask.from_fields(front_left=True,
+                                                       front_right=True,
+                                                       front_center=True),
+                            4: ChannelMask.from_fields(front_left=True,
+                                                       front_right=True,
+                                                       back_left=True,
+                                                       back_right=True),
+                            5: ChannelMask.from_fields(front_left=True,
+                                                       front_right=True,
+                                                       front_center=True,
+                                                       back_left=True,
+                                                       back_right=True)}[
+            min(old_channel_count, 5)]
+    else:
+        old_channel_mask = ChannelMask(old_channel_mask)
+
+    left = [0.0] * old_channel_count
+    right = [0.0] * old_channel_count
+
+    def mix(channel, left_gain, right_gain):
+        index = old_channel_mask.index(channel)
+        left[index] += left_gain
+        right[index] += right_gain
+
+    if (old_channel_mask.front_left):
+        mix("front_left", 1.0, 0.0)
+    if (old_channel_mask.front_right):
+        mix("front_right", 0.0, 1.0)
+    if (old_channel_mask.front_center):
+        mix("front_center", CENTER_GAIN, CENTER_GAIN)
+
+    #both rear channels are mixed to mono
+    #and placed in and out of phase in the front channels
+    for (back, side) in [("back_left", "side_left"),
+                         ("back_right", "side_right")]:
+        if (getattr(old_channel_mask, back)):
+            mix(back, REAR_GAIN, -REAR_GAIN)
+        elif (getattr(old_channel_mask, side)):
+            mix(side, REAR_GAIN, -REAR_GAIN)
+
+    return [left, right]
+
+
+def __conversion_matrix__(old_channel_mask, old_channel_count,
+                          new_channel_mask, new_channel_count):
+    """returns a list of gain rows, one per new channel,
+    each with a gain per old channel"""
+
+    if (new_channel_count == old_channel_count):
+        return [[1.0 if (i == o) else 0.0 for i in xrange(old_channel_count)]
+                for o in xrange(old_channel_count)]
+    elif (new_channel_count == 1):
+        #going from many channels to 1
+        #by averaging the 2 channel downmix
+        (left, right) = __downmix_matrix__(old_channel_mask,
+                                           old_channel_count)
+        return [[(l + r) / 2 for (l, r) in zip(left, right)]]
+    elif (new_channel_count == 2):
+        #going from many channels to 2
+        return __downmix_matrix__(old_channel_mask, old_channel_count)
+    elif (new_channel_count < old_channel_count):
+        #going from many channels to less channels
+        #where new channels missing from the old mask are left blank
+        #and an undefined old mask keeps the leading channels
+        if (int(old_channel_mask) == 0):
+            return [[1.0 if (i == o) else 0.0
+                     for i in xrange(old_channel_count)]
+                    for o in xrange(new_channel_count)]
         old_channels = ChannelMask(old_channel_mask).channels()
-        self.channels_to_keep = []
+        matrix = []
         for new_channel in ChannelMask(new_channel_mask).channels():
+            row = [0.0] * old_channel_count
             if (new_channel in old_channels):
-                self.channels_to_keep.append(old_channels.index(new_channel))
-
-    def convert(self, frame_list):
-        return pcm.from_channels(
-            [frame_list.channel(i) for i in self.channels_to_keep])
-
-
-class __channel_adder__:
-    def __init__(self, channels):
-        self.channels = channels
-
-    def convert(self, frame_list):
-        current_channels = [frame_list.channel(i)
-                            for i in xrange(frame_list.channels)]
-        while (len(current_channels) < self.channels):
-            current_channels.append(current_channels[0])
-
-        return pcm.from_channels(current_channels)
-
-
-class __stereo_to_mono__:
-    def __init__(self):
-        pass
-
-    def convert(self, frame_list):
-        return pcm.from_list(
-            [(l + r) / 2 for l, r in izip(frame_list.channel(0),
-                                          frame_list.channel(1))],
-            1, frame_list.bits_per_sample, True)
-
-
-#going from many channels to 2
-class __downmixer__:
-    def __init__(self, old_channel_mask, old_channel_count):
-        #grab the front_left, front_right, front_center,
-        #back_left and back_right channels from old frame_list, if possible
-        #missing channels are replaced with 0-sample channels
-        #excess channels are dropped entirely
-        #side_left and side_right may be substituted for back_left/right
-        #but back channels take precedence
-
-        if (int(old_channel_mask) == 0):
-            #if the old_channel_mask is undefined
-            #invent a channel mask based on the channel count
-            old_channel_mask = {1: ChannelMask.from_fields(front_center=True),
-                                2: ChannelMask.from_fields(front_left=True,
-                                                           front_right=True),
-                                3: ChannelMask.from_fields(front_left=True,
-                                                           front_right=True,
-                                                          front_center=True),
-                                4: ChannelMask.from_fields(front_left=True,
-                                                           front_right=True,
-                                                           back_left=True,
-                                                           back_right=True),
-                                5: ChannelMask.from_fields(front_left=True,
-                                                           front_right=True,
-                                                           front_center=True,
-                                                           back_left=True,
-                                                           back_right=True)}[
-                min(old_channel_count, 5)]
-        else:
-            old_channel_mask = ChannelMask(old_channel_mask)
-
-        #channels_to_keep is an array of channel offsets
-        #where the index is:
-        #0 - front_left
-        #1 - front_right
-        #2 - front_center
-        #3 - back/side_left
-        #4 - back/side_right
-        #if -1, the channel is blank
-        self.channels_to_keep = []
-        for channel in ["front_left", "front_right", "front_center"]:
-            if (getattr(old_channel_mask, channel)):
-                self.channels_to_keep.append(old_channel_mask.index(channel))
-            else:
-                self.channels_to_keep.append(-1)
-
-        if (old_channel_mask.back_left):
-            self.channels_to_keep.append(old_channel_mask.index("back_left"))
-        elif (old_channel_mask.side_left):
-            self.channels_to_keep.append(old_channel_mask.index("side_left"))
-        else:
-            self.channels_to_keep.append(-1)
-
-        if (old_channel_mask.back_right):
-            self.channels_to_keep.append(old_channel_mask.index("back_right"))
-        elif (old_channel_mask.side_right):
-            self.channels_to_keep.append(old_channel_mask.index("side_right"))
-        else:
-            self.channels_to_keep.append(-1)
-
-        self.has_empty_channels = (-1 in self.channels_to_keep)
-
-    def convert(self, frame_list):
-        REAR_GAIN = 0.6
-        CENTER_GAIN = 0.7
-
-        if (self.has_empty_channels):
-            empty_channel = pcm.from_list([0] * frame_list.frames,
-                                          1,
-                                          frame_list.bits_per_sample,
-                                          True)
-
-        if (self.channels_to_keep[0] != -1):
-            Lf = frame_list.channel(self.channels_to_keep[0])
-        else:
-            Lf = empty_channel
-
-        if (self.channels_to_keep[1] != -1):
-            Rf = frame_list.channel(self.channels_to_keep[1])
-        else:
-            Rf = empty_channel
-
-        if (self.channels_to_keep[2] != -1):
-            C = frame_list.channel(self.channels_to_keep[2])
-        else:
-            C = empty_channel
-
-        if (self.channels_to_keep[3] != -1):
-            Lr = frame_list.channel(self.channels_to_keep[3])
-        else:
-            Lr = empty_channel
-
-        if (self.channels_to_keep[4] != -1):
-            Rr = frame_list.channel(self.channels_to_keep[4])
-        else:
-            Rr = empty_channel
-
-        mono_rear = [0.7 * (Lr_i + Rr_i) for Lr_i, Rr_i in izip(Lr, Rr)]
-
-        converter = lambda x: int(round(x))
-
-        left_channel = pcm.from_list(
-            [converter(Lf_i +
-                       (REAR_GAIN * mono_rear_i) +
-                       (CENTER_GAIN * C_i))
-             for Lf_i, mono_rear_i, C_i in izip(Lf, mono_rear, C)],
-            1,
-            frame_list.bits_per_sample,
-            True)
-
-        right_channel = pcm.from_list(
-            [converter(Rf_i -
-                       (REAR_GAIN * mono_rear_i) +
-                       (CENTER_GAIN * C_i))
-             for Rf_i, mono_rear_i, C_i in izip(Rf, mono_rear, C)],
-            1,
-            frame_list.bits_per_sample,
-            True)
-
-        return pcm.from_channels([left_channel, right_channel])
-
-
-#going from many channels to 1
-class __downmix_to_mono__:
-    def __init__(self, old_channel_mask, old_channel_count):
-        self.downmix = __downmixer__(old_channel_mask, old_channel_count)
-        self.mono = __stereo_to_mono__()
-
-    def convert(self, frame_list):
-        return self.mono.convert(self.downmix.convert(frame_list))
-
-
-class __convert_sample_rate__:
-    def __init__(self, old_sample_rate, new_sample_rate,
-                 channels, bits_per_sample):
-        from . import resample
-
-        self.resampler = resample.Resampler(
-                channels,
-                float(new_sample_rate) / float(old_sample_rate),
-                0)
-        self.unresampled = pcm.FloatFrameList([], channels)
-        self.bits_per_sample = bits_per_sample
-
-    def convert(self, frame_list):
-        #FIXME - The floating-point output from resampler.process()
-        #should be normalized rather than just chopping off
-        #excessively high or low samples (above 1.0 or below -1.0)
-        #during conversion to PCM.
-        #Unfortunately, that'll require building a second pass
-        #into the conversion process which will complicate PCMConverter
-        #a lot.
-        (output, self.unresampled) = self.resampler.process(
-            self.unresampled + frame_list.to_float(),
-            (len(frame_list) == 0) and (len(self.unresampled) == 0))
-
-        return output.to_int(self.bits_per_sample)
-
-
-class __convert_sample_rate_and_bits_per_sample__(__convert_sample_rate__):
-    def convert(self, frame_list):
-        (output, self.unresampled) = self.resampler.process(
-            self.unresampled + frame_list.to_float(),
-            (len(frame_list) == 0) and (len(self.unresampled) == 0))
-
-        return __add_dither__(output.to_int(self.bits_per_sample))
+                row[old_channels.index(new_channel)] = 1.0
+            matrix.append(row)
+        while (len(matrix) < new_channel_count):
+            matrix.append([0.0] * old_channel_count)
+        return matrix[0:new_channel_count]
+    else:
+        #going from less channels to more channels
+        #by duplicating the first channel
+        matrix = [[1.0 if (i == o) else 0.0 for i in xrange(old_channel_count)]
+                  for o in xrange(old_channel_count)]
+        while (len(matrix) < new_channel_count):
+            matrix.append(matrix[0][:])
+        return matrix
 
 
-class __convert_bits_per_sample__:
-    def __init__(self, bits_per_sample):
-        self.bits_per_sample = bits_per_sample
+def __dither__(bits_per_sample):
+    """returns the pcm.DITHER_* value to apply
+    when quantizing samples to the given bits-per-sample
 
-    def convert(self, frame_list):
-        return __add_dither__(
-            frame_list.to_float().to_int(self.bits_per_sample))
+    8 bits-per-sample output is left undithered"""
 
-
-def __add_dither__(frame_list):
-    if (frame_list.bits_per_sample >= 16):
-        random_bytes = map(ord, os.urandom((len(frame_list) / 8) + 1))
-        white_noise = [(random_bytes[i / 8] & (1 << (i % 8))) >> (i % 8)
-                       for i in xrange(len(frame_list))]
+    if (bits_per_sample >= 16):
+        return pcm.DITHER_TRIANGULAR
     else:
-        white_noise = [0] * len(frame_list)
-
-    return pcm.from_list([i ^ w for (i, w) in izip(frame_list,
-                                                   white_noise)],
-                         frame_list.channels,
-                         frame_list.bits_per_sample,
-                         True)
+        return pcm.DITHER_NONE
 
 
 class PCMConverter:
@@ -2221,7 +2655,13 @@ class PCMConverter:
                  channels,
                  channel_mask,
                  bits_per_sample):
-        """takes a PCMReader input and the attributes of the new stream"""
+        """takes a PCMReader input and the attributes of the new stream
+
+        the whole conversion runs in a single pcmconverter.Converter
+        which mixes, resamples, requantizes and dithers
+        each FrameList in one pass"""
+
+        from .pcmconverter import Converter
 
         self.sample_rate = sample_rate
         self.channels = channels
@@ -2229,58 +2669,29 @@ class PCMConverter:
         self.channel_mask = channel_mask
         self.reader = pcmreader
 
-        self.conversions = []
-        if (self.reader.channels != self.channels):
-            if (self.channels == 1):
-                self.conversions.append(
-                    __downmix_to_mono__(pcmreader.channel_mask,
-                                        pcmreader.channels))
-            elif (self.channels == 2):
-                self.conversions.append(
-                    __downmixer__(pcmreader.channel_mask,
-                                  pcmreader.channels))
-            elif (self.channels < pcmreader.channels):
-                self.conversions.append(
-                    __channel_remover__(pcmreader.channel_mask,
-                                        channel_mask))
-            elif (self.channels > pcmreader.channels):
-                self.conversions.append(
-                    __channel_adder__(self.channels))
-
-        if (self.reader.sample_rate != self.sample_rate):
-            #if we're converting sample rate and bits-per-sample
-            #at the same time, short-circuit the conversion to do both at once
-            #which can be sped up somewhat
-            if (self.reader.bits_per_sample != self.bits_per_sample):
-                self.conversions.append(
-                    __convert_sample_rate_and_bits_per_sample__(
-                        self.reader.sample_rate,
-                        self.sample_rate,
-                        self.channels,
-                        self.bits_per_sample))
-            else:
-                self.conversions.append(
-                    __convert_sample_rate__(
-                        self.reader.sample_rate,
-                        self.sample_rate,
-                        self.channels,
-                        self.bits_per_sample))
-
+        #dither whenever bits are removed
+        #or when resampling to a different bits-per-sample
+        if ((bits_per_sample < pcmreader.bits_per_sample) or
+            ((sample_rate != pcmreader.sample_rate) and
+             (bits_per_sample != pcmreader.bits_per_sample))):
+            dither = __dither__(bits_per_sample)
         else:
-            if (self.reader.bits_per_sample != self.bits_per_sample):
-                self.conversions.append(
-                    __convert_bits_per_sample__(
-                        self.bits_per_sample))
+            dither = pcm.DITHER_NONE
+
+        self.converter = Converter(
+            pcmreader,
+            sample_rate,
+            bits_per_sample,
+            __conversion_matrix__(pcmreader.channel_mask,
+                                  pcmreader.channels,
+                                  channel_mask,
+                                  channels),
+            dither)
 
     def read(self, bytes):
         """try to read a pcm.FrameList of size 'bytes'"""
 
-        frame_list = self.reader.read(bytes)
-
-        for converter in self.conversions:
-            frame_list = converter.convert(frame_list)
-
-        return frame_list
+        return self.converter.read(bytes)
 
     def close(self):
         """closes the stream for reading"""
@@ -2320,25 +2731,13 @@ class ReplayGainReader:
         if ((self.multiplier * self.peak) > 1.0):
             self.multiplier = 1.0 / self.peak
 
+        self.dither = __dither__(self.bits_per_sample)
+
     def read(self, bytes):
         """try to read a pcm.FrameList of size 'bytes'"""
 
-        multiplier = self.multiplier
-        samples = self.reader.read(bytes)
-
-        if (self.bits_per_sample >= 16):
-            random_bytes = map(ord, os.urandom((len(samples) / 8) + 1))
-            white_noise = [(random_bytes[i / 8] & (1 << (i % 8))) >> (i % 8)
-                           for i in xrange(len(samples))]
-        else:
-            white_noise = [0] * len(samples)
-
-        return pcm.from_list(
-            [(int(round(s * multiplier)) ^ w) for (s, w) in
-             izip(samples, white_noise)],
-            samples.channels,
-            samples.bits_per_sample,
-            True)
+        return self.reader.read(bytes).apply_gain(self.multiplier,
+                                                  self.dither)
 
     def close(self):
         """closes the stream for reading"""
@@ -2369,38 +2768,214 @@ def applicable_replay_gain(tracks):
     return True
 
 
-def calculate_replay_gain(tracks, progress=None):
+def calculate_replay_gain(tracks, progress=None, max_processes=None):
     """yields (track, track_gain, track_peak, album_gain, album_peak)
     for each AudioFile in the list of tracks
 
-    raises ValueError if a problem occurs during calculation"""
+    tracks are analyzed in up to "max_processes" parallel jobs,
+    which defaults to MAX_JOBS, or to 1 within an ExecProgressQueue job
+    the results are identical regardless of how many jobs are used
 
-    from . import replaygain as replaygain
+    raises ValueError if a problem occurs during calculation"""
 
     sample_rate = set([track.sample_rate() for track in tracks])
     if (len(sample_rate) != 1):
         raise ValueError(("at least one track is required " +
                           "and all must have the same sample rate"))
-    total_frames = sum([track.total_frames() for track in tracks])
+
+    if (max_processes is None):
+        #a job already running in a worker process
+        #is one of several, so it doesn't fork workers of its own
+        max_processes = 1 if __POOL_WORKER__ else MAX_JOBS
+
+    if (progress is not None):
+        progress = __ReplayGainProgress__(
+            sum([track.total_frames() for track in tracks]),
+            progress)
+
+    if ((max_processes > 1) and (len(tracks) > 1)):
+        results = __parallel_replay_gain__(tracks, progress, max_processes)
+    else:
+        results = [__track_replay_gain__(track,
+                                         progress.track_progress(i)
+                                         if (progress is not None)
+                                         else None)
+                   for (i, track) in enumerate(tracks)]
+
+    for (track, gain) in zip(tracks,
+                             album_replay_gain(list(sample_rate)[0],
+                                               results)):
+        yield (track,
+               gain.track_gain, gain.track_peak,
+               gain.album_gain, gain.album_peak)
+
+
+def album_replay_gain(sample_rate, results):
+    """given a sample rate and a list of
+    (track_gain, track_peak, album_state) tuples, one per track,
+    such as those returned by ReplayGainCalculator.result()
+
+    returns a list of ReplayGain objects, one per track,
+    whose album values are calculated from all the tracks together
+
+    raises ValueError if a problem occurs during calculation"""
+
+    from . import replaygain as replaygain
+
+    #each track's histogram is merged into the album's
+    #exactly as if all tracks had been analyzed in sequence
+    rg = replaygain.ReplayGain(sample_rate)
+    for (track_gain, track_peak, (histogram, peak)) in results:
+        rg.merge_album_state(histogram, peak)
+    (album_gain, album_peak) = rg.album_gain()
+    return [ReplayGain(track_gain, track_peak, album_gain, album_peak)
+            for (track_gain, track_peak, state) in results]
+
+
+class ReplayGainCalculator:
+    """a PCMReader which calculates ReplayGain values
+    from the data passing through it
+
+    this allows a track's values to be calculated
+    while its PCM data is being encoded
+    rather than by decoding the new file a second time"""
+
+    def __init__(self, pcmreader):
+        """pcmreader is a PCMReader whose sample rate and channel count
+        are supported by ReplayGain
+
+        raises ValueError if the sample rate is not supported"""
+
+        from . import replaygain as replaygain
+
+        self.pcmreader = pcmreader
+        self.sample_rate = pcmreader.sample_rate
+        self.channels = pcmreader.channels
+        self.channel_mask = pcmreader.channel_mask
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.replaygain = replaygain.ReplayGain(pcmreader.sample_rate)
+        self.error = None
+
+    def read(self, bytes):
+        framelist = self.pcmreader.read(bytes)
+        #a calculation error is kept for result()
+        #so that the data still reaches whatever's reading it
+        if (self.error is None):
+            try:
+                self.replaygain.update(framelist)
+            except ValueError, err:
+                self.error = err
+        return framelist
+
+    def close(self):
+        self.pcmreader.close()
+
+    def result(self):
+        """returns a (track_gain, track_peak, album_state) tuple
+        of all the data read so far
+
+        album_state is a (histogram, peak) tuple
+        suitable for ReplayGain.merge_album_state()
+
+        raises ValueError if too little data has been read
+        or if the data could not be analyzed"""
+
+        if (self.error is not None):
+            raise self.error
+
+        (track_gain, track_peak) = self.replaygain.title_gain()
+        return (track_gain, track_peak, self.replaygain.album_state())
+
+
+def __track_replay_gain__(track, progress=None):
+    """returns a (track_gain, track_peak, album_state) tuple
+    for the given AudioFile
+
+    album_state is a (histogram, peak) tuple
+    suitable for ReplayGain.merge_album_state()
+
+    raises ValueError if a problem occurs during calculation"""
+
+    total_frames = track.total_frames()
     processed_frames = 0
 
-    rg = replaygain.ReplayGain(list(sample_rate)[0])
-    gains = []
-    for track in tracks:
-        pcm = track.to_pcm()
+    pcm = ReplayGainCalculator(track.to_pcm())
+    frame = pcm.read(BUFFER_SIZE)
+    while (len(frame) > 0):
+        processed_frames += frame.frames
+        if (progress is not None):
+            progress(processed_frames, total_frames)
         frame = pcm.read(BUFFER_SIZE)
-        while (len(frame) > 0):
-            rg.update(frame)
-            processed_frames += frame.frames
-            if (progress is not None):
-                progress(processed_frames, total_frames)
-            frame = pcm.read(BUFFER_SIZE)
-        pcm.close()
-        (track_gain, track_peak) = rg.title_gain()
-        gains.append((track, track_gain, track_peak))
-    (album_gain, album_peak) = rg.album_gain()
-    for (track, track_gain, track_peak) in gains:
-        yield (track, track_gain, track_peak, album_gain, album_peak)
+    pcm.close()
+
+    return pcm.result()
+
+
+def __parallel_replay_gain__(tracks, progress, max_processes):
+    """returns a list of (track_gain, track_peak, album_state) tuples
+    for the given list of AudioFiles, one per track
+
+    tracks are analyzed by a pool of up to "max_processes" workers
+
+    raises ValueError if a problem occurs during calculation"""
+
+    queue = ExecProgressQueue(__ReplayGainProgressDisplay__(progress))
+    for track in tracks:
+        queue.execute(__track_replay_gain__, None, None, track)
+    queue.run(max_processes)
+
+    results = [queue.results[i] for i in xrange(len(tracks))]
+    if (None in results):
+        #a worker died without returning a value
+        raise ValueError("ReplayGain calculation error")
+    else:
+        return results
+
+
+class __ReplayGainProgressDisplay__:
+    """stands in for an ExecProgressQueue's ProgressDisplay
+    and sends each job's progress to a __ReplayGainProgress__, if any"""
+
+    def __init__(self, progress):
+        self.progress = progress
+
+    def add_row(self, row_id, output_line):
+        pass
+
+    def update_row(self, row_id, current, total):
+        if (self.progress is not None):
+            self.progress.track_progress(row_id)(current, total)
+
+    def delete_row(self, row_id):
+        pass
+
+    def clear(self):
+        pass
+
+    def refresh(self):
+        pass
+
+
+class __ReplayGainProgress__:
+    """combines the progress of several tracks into a single progress"""
+
+    def __init__(self, total_frames, progress):
+        """total_frames is the total PCM frames of all tracks
+        progress is a function which takes current and total arguments"""
+
+        self.total_frames = total_frames
+        self.progress = progress
+        self.processed_frames = {}
+
+    def track_progress(self, track_index):
+        """returns a progress function for the given track index"""
+
+        def progress(current, total):
+            self.processed_frames[track_index] = current
+            self.progress(sum(self.processed_frames.values()),
+                          self.total_frames)
+
+        return progress
 
 
 def ignore_sigint():
@@ -3127,6 +3702,12 @@ class AudioFile:
     BINARIES = tuple()
     REPLAYGAIN_BINARIES = tuple()
 
+    #a tuple of signatures, any one of which identifies this format
+    #where each signature is a tuple of (offset, string) pairs
+    #that must all be found at those offsets from the start of the file
+    #open() matches these against a file's header before calling is_type()
+    MAGIC = tuple()
+
     def __init__(self, filename):
         """filename is a plain string
 
@@ -3167,6 +3748,15 @@ class AudioFile:
 
         raise NotImplementedError()
 
+    def audio_class(self):
+        """returns the AudioFile class this track's file is read as
+
+        this is normally the track's own class,
+        but objects standing in for a track of some class,
+        such as those from a Catalog, return that class instead"""
+
+        return self.__class__
+
     def update_metadata(self, metadata):
         """takes this track's current MetaData object
         as returned by get_metadata() and sets this track's metadata
@@ -3287,9 +3877,64 @@ class AudioFile:
         the resulting object
         may raise EncodingError if some problem occurs during encoding"""
 
-        return target_class.from_pcm(target_path,
-                                     to_pcm_progress(self, progress),
-                                     compression)
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        else:
+            return target_class.from_pcm(target_path,
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
+                                         compression)
+
+    def __can_copy__(self, target_class, compression):
+        """returns True if conversion to the given class and compression
+        can copy this track's file instead of re-encoding it
+
+        this is the case for lossless tracks converted to their own format
+        with no compression given, since the decoded audio would be identical
+        specifying any compression forces a full re-encode,
+        even one matching the track's own"""
+
+        return ((target_class == self.audio_class()) and
+                (compression is None) and
+                self.lossless())
+
+    def __copy_file__(self, target_path, progress=None):
+        """copies this track's file to the given path
+        and returns a new AudioFile of the same class
+
+        may raise EncodingError if some problem occurs during copying"""
+
+        try:
+            total_bytes = os.path.getsize(self.filename)
+            input_file = file(self.filename, "rb")
+        except (IOError, OSError), err:
+            raise EncodingError(str(err))
+        try:
+            try:
+                output_file = file(target_path, "wb")
+            except IOError, err:
+                raise EncodingError(str(err))
+            try:
+                copied_bytes = 0
+                if (progress is not None):
+                    progress(copied_bytes, total_bytes)
+                s = input_file.read(BUFFER_SIZE)
+                while (len(s) > 0):
+                    output_file.write(s)
+                    copied_bytes += len(s)
+                    if (progress is not None):
+                        progress(copied_bytes, total_bytes)
+                    s = input_file.read(BUFFER_SIZE)
+            except IOError, err:
+                output_file.close()
+                self.__unlink__(target_path)
+                raise EncodingError(str(err))
+            else:
+                output_file.close()
+        finally:
+            input_file.close()
+
+        return self.audio_class()(target_path)
 
     @classmethod
     def __unlink__(cls, filename):
@@ -3449,6 +4094,25 @@ class AudioFile:
 
         return None
 
+    @classmethod
+    def can_set_replay_gain(cls):
+        """returns True if set_replay_gain() stores ReplayGain values
+        calculated elsewhere, such as from the PCM data
+        sent to from_pcm() while encoding
+
+        this is only the case for lossless formats
+        whose ReplayGain is added as metadata"""
+
+        return False
+
+    def set_replay_gain(self, replaygain):
+        """sets our ReplayGain values from a ReplayGain object
+        without recalculating them
+
+        formats which cannot store ReplayGain values do nothing"""
+
+        pass
+
     def set_cuesheet(self, cuesheet):
         """imports cuesheet data from a Cuesheet-compatible object
 
@@ -3568,6 +4232,8 @@ class WaveContainer(AudioFile):
 
         raises EncodingError if some error occurs during decoding"""
 
+        from .__wav__ import WaveAudio
+
         pcmreader = to_pcm_progress(self, progress)
         WaveAudio.from_pcm(wave_filename, pcmreader)
         pcmreader.close()
@@ -3590,6 +4256,8 @@ class WaveContainer(AudioFile):
         >>> flac = FlacAudio.from_wave("file.flac","file.wav","5")
         """
 
+        from .__wav__ import WaveAudio
+
         return cls.from_pcm(filename,
                             to_pcm_progress(WaveAudio(wave_filename),
                                             progress),
@@ -3615,8 +4283,11 @@ class WaveContainer(AudioFile):
         may raise EncodingError if some problem occurs during encoding"""
 
         import tempfile
+        from .__wav__ import WaveAudio
 
-        if (target_class == WaveAudio):
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (target_class == WaveAudio):
             self.to_wave(target_path, progress=progress)
             return WaveAudio(target_path)
         elif (self.has_foreign_riff_chunks() and
@@ -3634,7 +4305,8 @@ class WaveContainer(AudioFile):
                 temp_wave.close()
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
 
@@ -3651,6 +4323,8 @@ class AiffContainer(AudioFile):
 
         raises EncodingError if some error occurs during decoding"""
 
+        from .__aiff__ import AiffAudio
+
         pcmreader = to_pcm_progress(self, progress)
         AiffAudio.from_pcm(aiff_filename, pcmreader)
         pcmreader.close()
@@ -3673,6 +4347,8 @@ class AiffContainer(AudioFile):
         >>> flac = FlacAudio.from_wave("file.flac","file.aiff","5")
         """
 
+        from .__aiff__ import AiffAudio
+
         return cls.from_pcm(filename,
                             to_pcm_progress(AiffAudio(wave_filename)),
                             compression)
@@ -3696,7 +4372,11 @@ class AiffContainer(AudioFile):
         the resulting object
         may raise EncodingError if some problem occurs during encoding"""
 
-        if (target_class == AiffAudio):
+        from .__aiff__ import AiffAudio
+
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (target_class == AiffAudio):
             self.to_aiff(target_path)
             return AiffAudio(target_path)
         elif (self.has_foreign_aiff_chunks() and
@@ -3711,7 +4391,8 @@ class AiffContainer(AudioFile):
                 temp_aiff.close()
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
 
@@ -3911,23 +4592,162 @@ def iter_last(iterator):
 
 from __image__ import *
 
-from __wav__ import *
 
-from __au__ import *
-from __ogg__ import *
-from __vorbiscomment__ import *
-from __id3__ import *
-from __aiff__ import *
-from __flac__ import *
+#######################
+#Format Modules
+#######################
 
-from __ape__ import *
-from __mp3__ import *
-from __vorbis__ import *
-from __m4a__ import *
-from __wavpack__ import *
-from __shn__ import *
+#format modules aren't imported along with audiotools itself,
+#but the first time one of their names is used,
+#at which point they're added to this module's namespace
+#just as "from module import *" would have
 
-from __dvda__ import *
+#each format's NAME, SUFFIX, module and AudioFile class name
+#in AVAILABLE_TYPES order
+#
+#***ApeAudio temporarily removed***
+#Without a legal alternative to mac-port, I shall have to re-implement
+#Monkey's Audio with my own code in order to make it available again.
+#Yet another reason to avoid that unpleasant file format...
+__FORMATS__ = (("flac", "flac", "__flac__", "FlacAudio"),
+               ("oga", "oga", "__flac__", "OggFlacAudio"),
+               ("mp3", "mp3", "__mp3__", "MP3Audio"),
+               ("mp2", "mp2", "__mp3__", "MP2Audio"),
+               ("wav", "wav", "__wav__", "WaveAudio"),
+               ("ogg", "ogg", "__vorbis__", "VorbisAudio"),
+               ("aiff", "aiff", "__aiff__", "AiffAudio"),
+               ("au", "au", "__au__", "AuAudio"),
+               ("m4a", "m4a", "__m4a__", "M4AAudio"),
+               ("alac", "m4a", "__m4a__", "ALACAudio"),
+               ("wv", "wv", "__wavpack__", "WavPackAudio"),
+               ("shn", "shn", "__shn__", "ShortenAudio"))
+
+#every module whose names join this one's once it's imported,
+#in the order a name is searched for among them
+__LAZY_MODULES__ = ("__wav__",
+                    "__au__",
+                    "__ogg__",
+                    "__vorbiscomment__",
+                    "__id3__",
+                    "__aiff__",
+                    "__flac__",
+                    "__ape__",
+                    "__mp3__",
+                    "__vorbis__",
+                    "__m4a__",
+                    "__wavpack__",
+                    "__shn__",
+                    "__dvda__",
+                    "__freedb__",
+                    "__musicbrainz__",
+                    "__accuraterip__")
+
+
+def __import_lazy_module__(module_name):
+    """imports the given module from __LAZY_MODULES__, if necessary,
+    adds its public names to this module's namespace
+    and returns the module itself"""
+
+    __import__(module_name, globals(), {}, [], 1)
+    module = sys.modules["%s.%s" % (__name__, module_name)]
+    namespace = globals()
+    for (name, value) in module.__dict__.items():
+        if ((not name.startswith("_")) and (name not in namespace)):
+            namespace[name] = value
+    return module
+
+
+def __format_class__(name):
+    """given a format's NAME string, returns its AudioFile class
+    regardless of whether its binaries are available
+
+    raises KeyError if no format has that name"""
+
+    for (format_name, suffix, module_name, class_name) in __FORMATS__:
+        if (format_name == name):
+            return getattr(__import_lazy_module__(module_name), class_name)
+    else:
+        raise KeyError(name)
+
+
+def __load_types__():
+    """imports every format module, if not already imported,
+    and sets AVAILABLE_TYPES, TYPE_MAP, DEFAULT_QUALITY and DEFAULT_TYPE"""
+
+    global AVAILABLE_TYPES
+    global TYPE_MAP
+    global DEFAULT_QUALITY
+    global DEFAULT_TYPE
+
+    if ("TYPE_MAP" in globals()):
+        return
+
+    available_types = tuple([__format_class__(entry[0])
+                             for entry in __FORMATS__])
+
+    default_type = config.get_default("System", "default_type", "wav")
+
+    type_map = dict([(track_type.NAME, track_type)
+                     for track_type in available_types
+                     if track_type.has_binaries(BIN)])
+
+    if (default_type not in type_map.keys()):
+        default_type = "wav"
+
+    AVAILABLE_TYPES = available_types
+    DEFAULT_QUALITY = dict([(track_type.NAME,
+                             config.get_default(
+                                 "Quality",
+                                 track_type.NAME,
+                                 track_type.DEFAULT_COMPRESSION))
+                            for track_type in available_types
+                            if (len(track_type.COMPRESSION_MODES) > 1)])
+    DEFAULT_TYPE = default_type
+    #TYPE_MAP is set last, since it marks the others as done
+    TYPE_MAP = type_map
+
+
+def __lazy_attribute__(name):
+    """returns the value of the given name in this module's namespace,
+    importing format modules as needed to find it
+
+    raises AttributeError if none of them define it"""
+
+    namespace = globals()
+    if (name in namespace):
+        return namespace[name]
+    elif (name in ("AVAILABLE_TYPES", "TYPE_MAP",
+                   "DEFAULT_QUALITY", "DEFAULT_TYPE")):
+        __load_types__()
+    elif (name in [entry[3] for entry in __FORMATS__]):
+        for (format_name, suffix, module_name, class_name) in __FORMATS__:
+            if (class_name == name):
+                __import_lazy_module__(module_name)
+    elif ((not name.startswith("__")) and (not __is_submodule__(name))):
+        for module_name in __LAZY_MODULES__:
+            __import_lazy_module__(module_name)
+            if (name in namespace):
+                break
+
+    try:
+        return namespace[name]
+    except KeyError:
+        raise AttributeError(name)
+
+
+def __is_submodule__(name):
+    """returns True if name is a module in this package,
+    which the import machinery looks for as an attribute first"""
+
+    import imp
+
+    try:
+        (f, path, description) = imp.find_module(name, __path__)
+    except ImportError:
+        return False
+    if (f is not None):
+        f.close()
+    return True
 
 
 #######################
@@ -4318,6 +5138,8 @@ class CDTrackReaderAccurateRipCRC:
     def __init__(self, cdtrackreader,
                  track_number, track_total,
                  total_sectors):
+        from .__accuraterip__ import AccurateRipTrackCRC
+
         self.cdtrackreader = cdtrackreader
         self.accuraterip_crc = AccurateRipTrackCRC()
         if (track_number == 1):
@@ -4405,10 +5227,6 @@ def most_numerous(item_list, empty_list="", all_differ=""):
 
 __most_numerous__ = most_numerous
 
-from __freedb__ import *
-from __musicbrainz__ import *
-from __accuraterip__ import *
-
 
 def read_metadata_file(filename):
     """returns an AlbumMetaDataFile-compatible file from a filename string
@@ -4417,6 +5235,9 @@ def read_metadata_file(filename):
     during reading
     """
 
+    from .__freedb__ import XMCD, XMCDException
+    from .__musicbrainz__ import MusicBrainzReleaseXML, MBXMLException
+
     try:
         data = file(filename, 'rb').read()
     except IOError, msg:
@@ -4676,6 +5497,10 @@ class ExecQueue2:
             yield result
 
 
+#True within a process forked by ExecProgressQueue to run its jobs
+__POOL_WORKER__ = False
+
+
 class ProgressJobQueueComplete(Exception):
     pass
 
@@ -4715,8 +5540,8 @@ class ExecProgressQueue:
                                  kwargs))
         self.max_job_id += 1
 
-    def execute_next_job(self):
-        """executes the next queued job"""
+    def execute_next_job(self, worker):
+        """sends the next queued job to the given idle worker"""
 
         #pull job off queue
         (job_id,
@@ -4731,19 +5556,17 @@ class ExecProgressQueue:
             self.progress_display.add_row(job_id, progress_text)
             self.progress_display.update_row(job_id, 0, 1)
 
-        #spawn subprocess and add it to pool
-        self.running_job_pool[job_id] = \
-            __ProgressQueueJob__.spawn(function,
-                                       args,
-                                       kwargs,
-                                       completion_output)
+        #hand job to worker and add it to pool
+        worker.start_job(job_id, completion_output)
+        self.running_job_pool[job_id] = worker
 
-    def remove_job(self, job_id, job):
+    def remove_job(self, job_id, result, completion_output):
         """job_id is taken from the job_pool dict
-        job is a __ProgressQueueJob__ object"""
+        result is a (success, value) tuple from the job's worker
+        completion_output is the job's unicode string or function"""
 
         #add job's results to results dict
-        (success, value) = job.result
+        (success, value) = result
         if (success):
             self.results[job_id] = value
 
@@ -4754,7 +5577,6 @@ class ExecProgressQueue:
             self.progress_display.delete_row(job_id)
 
             #display job's output message
-            completion_output = job.completion_output
             if (completion_output is not None):
                 if (callable(completion_output)):
                     output = completion_output(value)
@@ -4783,168 +5605,308 @@ class ExecProgressQueue:
         if (len(self.queued_jobs) == 0):
             return
 
-        import time
+        import select
+        import mmap
+
+        #workers are forked after all jobs are queued
+        #so each one inherits the whole job table
+        #and only job IDs need to be sent to them
+        jobs = dict([(job_id, (function, args, kwargs))
+                     for (job_id,
+                          progress_text,
+                          completion_output,
+                          function,
+                          args,
+                          kwargs) in self.queued_jobs])
 
-        #populate job pool with up to "max_processes" number of jobs
-        for i in xrange(min(max_processes, len(self.queued_jobs))):
-            self.execute_next_job()
+        max_processes = max(min(max_processes, len(self.queued_jobs)), 1)
 
-        #while the pool still contains running jobs
-        while (len(self.running_job_pool) > 0):
-            #clear out old display
-            self.progress_display.clear()
+        #2, 64-bit fields of progress data per worker
+        progress_table = mmap.mmap(-1, 16 * max_processes)
+
+        workers = []
+        try:
+            #populate pool with up to "max_processes" number of workers
+            for slot in xrange(max_processes):
+                workers.append(__ProgressQueueWorker__.spawn(jobs,
+                                                             progress_table,
+                                                             slot,
+                                                             workers))
+                self.execute_next_job(workers[-1])
+
+            #while the pool still contains running jobs
+            while (len(self.running_job_pool) > 0):
+                #wait for any busy worker to report a finished job
+                #or for the display refresh interval to elapse
+                (finished, writeable, exceptional) = select.select(
+                    [worker for worker in workers if worker.is_busy()],
+                    [], [], 0.25)
+
+                #clear out old display
+                self.progress_display.clear()
+
+                for worker in finished:
+                    (job_id, result, completion_output) = worker.result()
 
-            #poll job pool for completed jobs
-            for (job_id, job) in self.running_job_pool.items():
-                if (job.is_completed()):
                     #display any output message
-                    self.remove_job(job_id, job)
+                    self.remove_job(job_id, result, completion_output)
 
                     #and add new jobs from the queue as necessary
                     if (len(self.queued_jobs) > 0):
-                        self.execute_next_job()
-                else:
-                    #update job's progress row with current progress
-                    (current, total) = job.progress()
+                        if (not worker.is_alive()):
+                            #replace a worker that died mid-job
+                            worker.close()
+                            workers[worker.slot] = worker = \
+                                __ProgressQueueWorker__.spawn(jobs,
+                                                              progress_table,
+                                                              worker.slot,
+                                                              workers)
+                        self.execute_next_job(worker)
+
+                #update running jobs' progress rows with current progress
+                for (job_id, worker) in self.running_job_pool.items():
+                    (current, total) = worker.progress()
                     self.progress_display.update_row(job_id, current, total)
 
-            #display new set of progress rows
-            self.progress_display.refresh()
-
-            #wait some amount of time before polling job pool again
-            time.sleep(0.25)
+                #display new set of progress rows
+                self.progress_display.refresh()
+        finally:
+            for worker in workers:
+                worker.close()
+            progress_table.close()
 
         if (self.exception is not None):
             raise self.exception
 
-class __ProgressQueueJob__:
-    def __init__(self, pid, progress, result, completion_output):
-        """pid is the child process's PID
-        progress is anonymous memory-mapped data of the child's progress
-        result is a file object pipe for receiving the child's final result
-        completion_output is a unicode string or function
-        to execute upon the job's completion"""
 
-        self.__pid__ = pid
-        self.__progress__ = progress
-        self.__result__ = result
+class __ProgressQueueWorker__:
+    def __init__(self, pid, jobs, results, progress_table, slot):
+        """pid is the worker process's PID
+        jobs is a file descriptor for sending job IDs to the worker
+        results is a file descriptor for receiving the worker's results
+        progress_table is anonymous memory-mapped data of all workers' progress
+        slot is this worker's index in progress_table"""
 
-        self.completion_output = completion_output
+        self.__pid__ = pid
+        self.__jobs__ = jobs
+        self.__results__ = results
+        self.__progress_table__ = progress_table
+        self.slot = slot
 
-        # (True, value) indicates function succeeded and returned "value"
-        # (False, exc) indicates function raised exception "exc"
-        # None indicates the function hasn't yet completed
-        self.result = None
+        #the job ID and completion output of the running job, if any
+        self.job_id = None
+        self.__completion_output__ = None
 
     @classmethod
-    def spawn(cls, function, args, kwargs, completion_output):
-        """given an callable function args tuple and kwargs dict
-        forks a child process with several pipes for polling progress
-        and returns a __ProgressQueueJob__ object
-        which can be polled for progress, waited for, or
-        have return values extracted from"""
-
-        import mmap
-        import struct
-
-        progress = mmap.mmap(-1, 16)  # 2, 64-bit fields of progress data
-        (r3, w3) = os.pipe()  # for sending final result from child->parent
+    def spawn(cls, jobs, progress_table, slot, siblings):
+        """given a dict of job_id -> (function, args, kwargs) values,
+        a shared progress table, an int slot in that table
+        and a list of previously spawned __ProgressQueueWorker__ objects,
+        forks a worker process which runs jobs as their IDs arrive
+        and returns a __ProgressQueueWorker__ object
+        which can be sent jobs, polled for progress
+        or have results extracted from"""
+
+        (job_read, job_write) = os.pipe()  # job IDs from parent->worker
+        (result_read, result_write) = os.pipe()  # results from worker->parent
         pid = os.fork()
         if (pid > 0):
             #parent
-            os.close(w3)
-            child_result = os.fdopen(r3, "rb")
+            os.close(job_read)
+            os.close(result_write)
 
-            return cls(pid, progress, child_result, completion_output)
+            return cls(pid, job_write, result_read, progress_table, slot)
         else:
-            #child
-            os.close(r3)
-
+            #worker
+            #which never returns to the caller's stack
+            global __POOL_WORKER__
+            __POOL_WORKER__ = True
             try:
-                result = (True, function(*args,
-                                         progress=
-                                         __PollingProgress__(progress).progress,
-                                         **kwargs))
-            except Exception, exception:
-                result = (False, exception)
-
-            result_pipe = os.fdopen(w3, "wb")
-            cPickle.dump(result, result_pipe)
-            result_pipe.flush()
-            result_pipe.close()
-            progress.close()
-            sys.exit(0)
+                #drop our copies of sibling workers' pipes
+                #so they see EOF when the parent closes them
+                os.close(job_write)
+                os.close(result_read)
+                for sibling in siblings:
+                    sibling.__close_pipes__()
+
+                progress = __PollingProgress__(progress_table, slot).progress
+
+                while (True):
+                    job_id = __read_exactly__(job_read, 4)
+                    if (len(job_id) < 4):
+                        #parent has no more jobs for us
+                        break
+
+                    (function, args, kwargs) = jobs[struct.unpack(">I",
+                                                                  job_id)[0]]
+                    try:
+                        result = (True, function(*args,
+                                                 progress=progress,
+                                                 **kwargs))
+                    except Exception, exception:
+                        result = (False, exception)
+
+                    try:
+                        result = cPickle.dumps(result,
+                                               cPickle.HIGHEST_PROTOCOL)
+                    except Exception, exception:
+                        #result can't be sent back to parent,
+                        #so send the reason why instead
+                        result = cPickle.dumps((False, exception),
+                                               cPickle.HIGHEST_PROTOCOL)
+
+                    __write_all__(result_write,
+                                  struct.pack(">I", len(result)) + result)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(0)
 
-    def is_completed(self):
-        """returns True if the job is completed
-        in that instance, self.result will be populated
-        with the function's return value
-        and the child process will be disposed of"""
+    def fileno(self):
+        """returns the worker's result pipe for use with select()"""
 
-        if (os.waitpid(self.__pid__, os.WNOHANG) != (0, 0)):
-            try:
-                self.result = cPickle.load(self.__result__)
-            except EOFError:
-                #child died without returning a value
-                #or raising any exception
-                #which is unusual
-                self.result = (True, None)
-            self.__progress__.close()
-            return True
+        return self.__results__
+
+    def is_busy(self):
+        """returns True if the worker has a job running"""
+
+        return self.job_id is not None
+
+    def is_alive(self):
+        """returns True if the worker is able to accept more jobs"""
+
+        return self.__pid__ is not None
+
+    def start_job(self, job_id, completion_output):
+        """sends the given job ID to an idle worker to be run
+
+        completion_output is held until the job's result is returned"""
+
+        self.__progress_table__[self.slot * 16:(self.slot + 1) * 16] = \
+            struct.pack(">QQ", 0, 0)
+        self.job_id = job_id
+        self.__completion_output__ = completion_output
+        __write_all__(self.__jobs__, struct.pack(">I", job_id))
+
+    def result(self):
+        """returns a (job_id, result, completion_output) tuple
+        for the worker's finished job
+
+        result is a (True, value) tuple if the function returned "value"
+        or a (False, exc) tuple if the function raised exception "exc"
+
+        this blocks until the worker's job is finished"""
+
+        size = __read_exactly__(self.__results__, 4)
+        if (len(size) == 4):
+            result = cPickle.loads(
+                __read_exactly__(self.__results__,
+                                 struct.unpack(">I", size)[0]))
         else:
-            return False
+            #worker died without returning a value
+            #or raising any exception
+            #which is unusual
+            result = (True, None)
+            os.waitpid(self.__pid__, 0)
+            self.__pid__ = None
+
+        job = (self.job_id, result, self.__completion_output__)
+        self.job_id = None
+        self.__completion_output__ = None
+        return job
 
     def progress(self):
-        """polls child process for job's current progress
+        """polls worker's shared progress slot for job's current progress
         and returns a (progress, total) pair of integers"""
 
-        import struct
+        return struct.unpack(
+            ">QQ",
+            self.__progress_table__[self.slot * 16:(self.slot + 1) * 16])
+
+    def __close_pipes__(self):
+        if (self.__jobs__ is not None):
+            os.close(self.__jobs__)
+            self.__jobs__ = None
+        if (self.__results__ is not None):
+            os.close(self.__results__)
+            self.__results__ = None
 
-        self.__progress__.seek(0, 0)
-        (current, total) = struct.unpack(">QQ", self.__progress__.read(16))
+    def close(self):
+        """signals the worker that no more jobs are coming
+        and waits for it to exit"""
 
-        return (current, total)
+        self.__close_pipes__()
+        if (self.__pid__ is not None):
+            os.waitpid(self.__pid__, 0)
+            self.__pid__ = None
 
 
 class __PollingProgress__:
-    def __init__(self, memory):
-        self.memory = memory
+    def __init__(self, progress_table, slot):
+        self.progress_table = progress_table
+        self.slot = slot
 
     def progress(self, current, total):
-        import struct
+        self.progress_table[self.slot * 16:(self.slot + 1) * 16] = \
+            struct.pack(">QQ", current, total)
 
-        self.memory.seek(0, 0)
-        self.memory.write(struct.pack(">QQ", current, total))
 
+def __read_exactly__(fd, bytes):
+    """reads the given number of bytes from a file descriptor
 
-#***ApeAudio temporarily removed***
-#Without a legal alternative to mac-port, I shall have to re-implement
-#Monkey's Audio with my own code in order to make it available again.
-#Yet another reason to avoid that unpleasant file format...
+    returns fewer bytes only if EOF is reached first"""
+
+    data = []
+    while (bytes > 0):
+        chunk = os.read(fd, bytes)
+        if (len(chunk) == 0):
+            break
+        data.append(chunk)
+        bytes -= len(chunk)
+    return "".join(data)
+
+
+def __write_all__(fd, data):
+    """writes all the given data to a file descriptor"""
+
+    while (len(data) > 0):
+        data = data[os.write(fd, data):]
+
+
+class __LazyModule__(types.ModuleType):
+    """stands in for this module in sys.modules
+    so that format module names can be imported on first use,
+    since a module of its own can't provide __getattr__"""
+
+    def __init__(self, module):
+        types.ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__["__real_module__"] = module
+
+    def __getattr__(self, name):
+        try:
+            return self.__real_module__.__dict__[name]
+        except KeyError:
+            if (name == "__all__"):
+                #"from audiotools import *" would otherwise
+                #only see this object's own few names
+                for module_name in __LAZY_MODULES__:
+                    __import_lazy_module__(module_name)
+                __load_types__()
+                return [key for key in self.__real_module__.__dict__.keys()
+                        if (not key.startswith("_"))]
+            else:
+                return self.__real_module__.__lazy_attribute__(name)
+
+    def __setattr__(self, name, value):
+        setattr(self.__real_module__, name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__real_module__, name)
+
+    def __dir__(self):
+        return sorted(set(dir(self.__real_module__) +
+                          [entry[3] for entry in __FORMATS__] +
+                          ["AVAILABLE_TYPES", "TYPE_MAP",
+                           "DEFAULT_QUALITY", "DEFAULT_TYPE"]))
 
-AVAILABLE_TYPES = (FlacAudio,
-                   OggFlacAudio,
-                   MP3Audio,
-                   MP2Audio,
-                   WaveAudio,
-                   VorbisAudio,
-                   AiffAudio,
-                   AuAudio,
-                   M4AAudio,
-                   ALACAudio,
-                   WavPackAudio,
-                   ShortenAudio)
-
-TYPE_MAP = dict([(track_type.NAME, track_type)
-                 for track_type in AVAILABLE_TYPES
-                 if track_type.has_binaries(BIN)])
-
-DEFAULT_QUALITY = dict([(track_type.NAME,
-                         config.get_default("Quality",
-                                            track_type.NAME,
-                                            track_type.DEFAULT_COMPRESSION))
-                        for track_type in AVAILABLE_TYPES
-                        if (len(track_type.COMPRESSION_MODES) > 1)])
-
-if (DEFAULT_TYPE not in TYPE_MAP.keys()):
-    DEFAULT_TYPE = "wav"
+sys.modules[__name__] = __LazyModule__(sys.modules[__name__])
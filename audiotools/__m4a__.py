@@ -281,6 +281,8 @@ class M4AAudio_faac(M4ATaggedAudio, AudioFile):
 
     SUFFIX = "m4a"
     NAME = SUFFIX
+    MAGIC = tuple(((4, 'ftyp'), (8, brand))
+                  for brand in ('mp41', 'mp42', 'M4A ', 'M4B '))
     DEFAULT_COMPRESSION = "100"
     COMPRESSION_MODES = tuple(["10"] + map(str, range(50, 500, 25)) + ["500"])
     BINARIES = ("faac", "faad")
@@ -775,6 +777,8 @@ class ALACAudio(M4ATaggedAudio, AudioFile):
 
     SUFFIX = "m4a"
     NAME = "alac"
+    MAGIC = tuple(((4, 'ftyp'), (8, brand))
+                  for brand in ('mp41', 'mp42', 'M4A ', 'M4B '))
     DEFAULT_COMPRESSION = ""
     COMPRESSION_MODES = ("",)
     BINARIES = tuple()
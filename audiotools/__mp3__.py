@@ -20,10 +20,11 @@
 
 from audiotools import (AudioFile, InvalidFile, PCMReader, PCMConverter,
                         transfer_data, transfer_framelist_data,
-                        subprocess, BIN, ApeTag, ReplayGain,
+                        subprocess, BIN, ReplayGain,
                         ignore_sigint, open_files, EncodingError,
                         DecodingError, PCMReaderError, ChannelMask,
-                        __default_quality__, config, sys)
+                        LimitedFileReader, __default_quality__, config, sys)
+from __ape__ import ApeTag
 from __id3__ import *
 import gettext
 
@@ -46,6 +47,12 @@ class MP3Audio(AudioFile):
 
     SUFFIX = "mp3"
     NAME = SUFFIX
+    #an MPEG frame sync, a non-reserved MPEG ID and layer III or I
+    MAGIC = tuple(((0, chr(0xFF) + chr(0xE0 | (mpeg_id << 3) |
+                                       (layer << 1) | protection)),)
+                  for mpeg_id in (0, 2, 3)
+                  for layer in (1, 3)
+                  for protection in (0, 1))
     DEFAULT_COMPRESSION = "2"
     #0 is better quality/lower compression
     #9 is worse quality/higher compression
@@ -66,6 +73,12 @@ class MP3Audio(AudioFile):
     BINARIES = ("lame", "mpg123")
     REPLAYGAIN_BINARIES = ("mp3gain", )
 
+    #the bytes of padding reserved after newly written ID3v2 tags
+    #so that later updates can be written in place
+    ID3V2_PADDING = 1024
+    #the smallest padding which parses as an empty frame header
+    ID3V2_MIN_PADDING = 10
+
     SAMPLE_RATE = ((11025, 12000, 8000, None),   # MPEG-2.5
                    (None, None, None, None),     # reserved
                    (22050, 24000, 16000, None),  # MPEG-2
@@ -414,31 +427,12 @@ class MP3Audio(AudioFile):
                    isinstance(metadata, ID3v1Comment))):
             raise ValueError(_(u"metadata not from audio file"))
 
-        #get the original MP3 data
-        f = file(self.filename, "rb")
-        MP3Audio.__find_mp3_start__(f)
-        data_start = f.tell()
-        MP3Audio.__find_last_mp3_frame__(f)
-        data_end = f.tell()
-        f.seek(data_start, 0)
-        mp3_data = f.read(data_end - data_start)
-        f.close()
-
-        from .bitstream import BitstreamWriter
-
-        #write id3v2 + data + id3v1 to file
-        f = file(self.filename, "wb")
         if (isinstance(metadata, ID3CommentPair)):
-            metadata.id3v2.build(BitstreamWriter(f, 0))
-            f.write(mp3_data)
-            metadata.id3v1.build(f)
+            self.__write_tags__(metadata.id3v2, metadata.id3v1)
         elif (isinstance(metadata, ID3v2Comment)):
-            metadata.build(BitstreamWriter(f, 0))
-            f.write(mp3_data)
-        elif (isinstance(metadata, ID3v1Comment)):
-            f.write(mp3_data)
-            metadata.build(f)
-        f.close()
+            self.__write_tags__(metadata, None)
+        else:
+            self.__write_tags__(None, metadata)
 
     def set_metadata(self, metadata):
         """takes a MetaData object and sets this track's metadata
@@ -486,20 +480,77 @@ class MP3Audio(AudioFile):
         this removes or unsets tags as necessary in order to remove all data
         raises IOError if unable to write the file"""
 
-        #get the original MP3 data
+        self.__write_tags__(None, None)
+
+    def __write_tags__(self, id3v2, id3v1):
+        """writes the given ID3v2 and ID3v1 tags around the MP3 data
+
+        either tag may be None, in which case it is omitted
+        raises IOError if unable to write the file"""
+
+        from .bitstream import BitstreamWriter
+
+        #find the original MP3 data
         f = file(self.filename, "rb")
-        MP3Audio.__find_mp3_start__(f)
-        data_start = f.tell()
-        MP3Audio.__find_last_mp3_frame__(f)
-        data_end = f.tell()
-        f.seek(data_start, 0)
-        mp3_data = f.read(data_end - data_start)
-        f.close()
-
-        #write data to file
-        f = file(self.filename, "wb")
-        f.write(mp3_data)
-        f.close()
+        try:
+            MP3Audio.__find_mp3_start__(f)
+            data_start = f.tell()
+            MP3Audio.__find_last_mp3_frame__(f)
+            data_end = f.tell()
+        finally:
+            f.close()
+
+        if (id3v2 is not None):
+            id3v2_size = id3v2.size()
+        else:
+            id3v2_size = 0
+
+        if ((id3v2_size == data_start) or
+            ((id3v2 is not None) and
+             ((id3v2_size + self.ID3V2_MIN_PADDING) <= data_start))):
+            #if the new ID3v2 tag fits in the space of the old tag
+            #and its padding, overwrite the beginning of the file
+            #and leave the MP3 data where it is
+            f = file(self.filename, "r+b")
+            if (id3v2 is not None):
+                writer = BitstreamWriter(f, 0)
+                id3v2.build(writer, data_start - id3v2_size)
+                writer.flush()
+            f.seek(data_end, 0)
+            f.truncate()
+            if (id3v1 is not None):
+                id3v1.build(f)
+            f.close()
+        else:
+            #otherwise, copy the MP3 data to a temporary file
+            #and rebuild the file around it with a freshly padded tag
+            import tempfile
+
+            f = file(self.filename, "rb")
+            f.seek(data_start, 0)
+            mp3_data = tempfile.TemporaryFile()
+            transfer_data(LimitedFileReader(f, data_end - data_start).read,
+                          mp3_data.write)
+            f.close()
+            mp3_data.seek(0, 0)
+
+            padding = config.getint_default("ID3", "padding",
+                                            self.ID3V2_PADDING)
+            if (padding > 0):
+                padding = max(padding, self.ID3V2_MIN_PADDING)
+            else:
+                padding = 0
+
+            f = file(self.filename, "wb")
+            if (id3v2 is not None):
+                writer = BitstreamWriter(f, 0)
+                id3v2.build(writer, padding)
+                writer.flush()
+            transfer_data(mp3_data.read, f.write)
+            mp3_data.close()
+            if (id3v1 is not None):
+                id3v1.build(f)
+            f.close()
 
     #places mp3file at the position of the next MP3 frame's start
     @classmethod
@@ -697,6 +748,11 @@ class MP2Audio(MP3Audio):
 
     SUFFIX = "mp2"
     NAME = SUFFIX
+    #an MPEG frame sync, a non-reserved MPEG ID and layer II
+    MAGIC = tuple(((0, chr(0xFF) + chr(0xE0 | (mpeg_id << 3) |
+                                       (2 << 1) | protection)),)
+                  for mpeg_id in (0, 2, 3)
+                  for protection in (0, 1))
     DEFAULT_COMPRESSION = str(192)
     COMPRESSION_MODES = tuple(map(str, (64,  96,  112, 128, 160, 192,
                                         224, 256, 320, 384)))
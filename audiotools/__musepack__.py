@@ -97,6 +97,7 @@ class MusepackAudio(ApeTaggedAudio, AudioFile):
 
     SUFFIX = "mpc"
     NAME = SUFFIX
+    MAGIC = (((0, 'MP+\x07'),), ((0, 'MPCK'),))
     DEFAULT_COMPRESSION = "standard"
     COMPRESSION_MODES = ("thumb", "radio", "standard", "extreme", "insane")
 
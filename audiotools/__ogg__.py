@@ -68,6 +68,98 @@ def read_ogg_packets_data(reader):
                 packet = []
 
 
+#the largest possible Ogg page is a 27 byte header,
+#255 segment lengths and 255 segments of 255 bytes each
+MAX_OGG_PAGE_SIZE = 27 + 255 + (255 * 255)
+
+
+def read_ogg_final_granule_position(file, serial_number=None):
+    """given a seekable file object containing an Ogg stream,
+    returns the granule position of the last page which has one
+
+    this works by scanning backward from the end of the file
+    for "OggS" capture patterns whose pages end exactly where
+    the following page begins and whose checksums match,
+    so only the final pages are read
+
+    only pages with the given serial number are considered,
+    which defaults to that of the stream's first page
+
+    returns None if no such page can be found,
+    such as when the end of the stream is truncated or invalid"""
+
+    from struct import unpack
+
+    if (serial_number is None):
+        file.seek(0, 0)
+        header = file.read(27)
+        if ((len(header) != 27) or (not header.startswith("OggS"))):
+            return None
+        (serial_number,) = unpack("<I", header[14:18])
+
+    file.seek(0, 2)
+    page_end = file.tell()
+
+    while (page_end > 0):
+        #the page ending at "page_end" must begin within this window
+        window_start = max(page_end - MAX_OGG_PAGE_SIZE, 0)
+        file.seek(window_start, 0)
+        window = file.read(page_end - window_start)
+        if (len(window) != (page_end - window_start)):
+            return None
+
+        page_start = len(window)
+        while (True):
+            page_start = window.rfind("OggS", 0, page_start)
+            if (page_start == -1):
+                #no valid page ends at "page_end"
+                return None
+            elif ((page_start + 27) > len(window)):
+                continue
+
+            (version,
+             header_type,
+             granule_position,
+             page_serial_number,
+             page_sequence_number,
+             checksum,
+             segment_count) = unpack("<BBqIIIB",
+                                     window[page_start + 4:page_start + 27])
+            if ((version != 0) or
+                (header_type & ~0x7) or
+                ((page_start + 27 + segment_count) > len(window))):
+                continue
+
+            page_size = 27 + segment_count + sum(
+                map(ord, window[page_start + 27:
+                                page_start + 27 + segment_count]))
+            if (((page_start + page_size) == len(window)) and
+                (__page_checksum__(window[page_start:]) == checksum)):
+                break
+
+        if ((page_serial_number == serial_number) and
+            (granule_position >= 0)):
+            return granule_position
+        else:
+            #page is from another logical stream
+            #or has no completed packets, so try the one before it
+            page_end = window_start + page_start
+
+    return None
+
+
+def __page_checksum__(page):
+    """given a complete Ogg page string,
+    returns its calculated checksum as an integer
+
+    the page's own checksum field is treated as 0"""
+
+    checksum = OggChecksum()
+    for byte in map(ord, page[0:22] + "\x00\x00\x00\x00" + page[26:]):
+        checksum.update(byte)
+    return int(checksum)
+
+
 class OggChecksum:
     """calculates the checksum of Ogg pages
     the final checksum may be determined by int(ogg_checksum_instance)"""
@@ -37,6 +37,7 @@ class ShortenAudio(WaveContainer, AiffContainer):
 
     SUFFIX = "shn"
     NAME = SUFFIX
+    MAGIC = (((0, 'ajkg'), (4, '\x02')),)
 
     def __init__(self, filename):
         """filename is a plain string"""
@@ -422,7 +423,9 @@ class ShortenAudio(WaveContainer, AiffContainer):
 
         import tempfile
 
-        if (target_class == WaveAudio):
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (target_class == WaveAudio):
             self.to_wave(target_path, progress=progress)
             return WaveAudio(target_path)
         elif (target_class == AiffAudio):
@@ -454,7 +457,8 @@ class ShortenAudio(WaveContainer, AiffContainer):
                 temp_aiff.close()
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
     def has_foreign_riff_chunks(self):
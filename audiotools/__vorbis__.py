@@ -56,13 +56,14 @@ class VorbisAudio(AudioFile):
 
     SUFFIX = "ogg"
     NAME = SUFFIX
+    MAGIC = (((0, 'OggS'), (0x1C, '\x01vorbis')),)
     DEFAULT_COMPRESSION = "3"
     COMPRESSION_MODES = tuple([str(i) for i in range(0, 11)])
     COMPRESSION_DESCRIPTIONS = {"0": _(u"very low quality, " +
                                        u"corresponds to oggenc -q 0"),
                                 "10": _(u"very high quality, " +
                                         u"corresponds to oggenc -q 10")}
-    BINARIES = ("oggenc", "oggdec")
+    BINARIES = ("oggenc",)
     REPLAYGAIN_BINARIES = ("vorbisgain", )
 
     def __init__(self, filename):
@@ -71,6 +72,7 @@ class VorbisAudio(AudioFile):
         AudioFile.__init__(self, filename)
         self.__sample_rate__ = 0
         self.__channels__ = 0
+        self.__total_frames__ = None
         try:
             self.__read_identification__()
         except IOError, msg:
@@ -194,19 +196,34 @@ class VorbisAudio(AudioFile):
     def total_frames(self):
         """returns the total PCM frames of the track as an integer"""
 
+        if (self.__total_frames__ is None):
+            self.__total_frames__ = self.__read_total_frames__()
+        return self.__total_frames__
+
+    def __read_total_frames__(self):
         from .bitstream import BitstreamReader
-        from . import OggStreamReader
+        from . import OggStreamReader, read_ogg_final_granule_position
 
-        pcm_samples = 0
-        for (granule_position,
-             segments,
-             continuation,
-             first_page,
-             last_page) in OggStreamReader(
-            BitstreamReader(file(self.filename, "rb"), 1)).pages():
-            if (granule_position >= 0):
-                pcm_samples = granule_position
-        return pcm_samples
+        f = open(self.filename, "rb")
+        try:
+            pcm_samples = read_ogg_final_granule_position(f)
+            if (pcm_samples is not None):
+                return pcm_samples
+
+            #fall back to walking every page of the stream
+            f.seek(0, 0)
+            pcm_samples = 0
+            for (granule_position,
+                 segments,
+                 continuation,
+                 first_page,
+                 last_page) in OggStreamReader(
+                BitstreamReader(f, 1)).pages():
+                if (granule_position >= 0):
+                    pcm_samples = granule_position
+            return pcm_samples
+        finally:
+            f.close()
 
     def sample_rate(self):
         """returns the rate of the track's audio as an integer number of Hz"""
@@ -216,35 +233,18 @@ class VorbisAudio(AudioFile):
     def to_pcm(self):
         """returns a PCMReader object containing the track's PCM data"""
 
-        sub = subprocess.Popen([BIN['oggdec'], '-Q',
-                                '-b', str(16),
-                                '-e', str(0),
-                                '-s', str(1),
-                                '-R',
-                                '-o', '-',
-                                self.filename],
-                               stdout=subprocess.PIPE,
-                               stderr=file(os.devnull, "a"))
-
-        pcmreader = PCMReader(sub.stdout,
-                              sample_rate=self.sample_rate(),
-                              channels=self.channels(),
-                              channel_mask=int(self.channel_mask()),
-                              bits_per_sample=self.bits_per_sample(),
-                              process=sub)
-
-        if (self.channels() <= 2):
-            return pcmreader
-        elif (self.channels() <= 8):
-            #these mappings transform Vorbis order into ChannelMask order
-            standard_channel_mask = self.channel_mask()
-            vorbis_channel_mask = VorbisChannelMask(self.channel_mask())
-            return ReorderedPCMReader(
-                pcmreader,
-                [vorbis_channel_mask.channels().index(channel) for channel in
-                 standard_channel_mask.channels()])
-        else:
-            return pcmreader
+        from . import decoders
+        from . import PCMReaderError
+
+        #the native decoder returns PCM frames in ChannelMask order
+        try:
+            return decoders.VorbisDecoder(self.filename)
+        except (IOError, ValueError), msg:
+            return PCMReaderError(error_message=str(msg),
+                                  sample_rate=self.sample_rate(),
+                                  channels=self.channels(),
+                                  channel_mask=int(self.channel_mask()),
+                                  bits_per_sample=self.bits_per_sample())
 
     @classmethod
     def from_pcm(cls, filename, pcmreader, compression=None):
@@ -329,6 +329,7 @@ class WaveAudio(WaveContainer):
 
     SUFFIX = "wav"
     NAME = SUFFIX
+    MAGIC = (((0, 'RIFF'), (8, 'WAVE')),)
 
     PRINTABLE_ASCII = frozenset([chr(i) for i in xrange(0x20, 0x7E + 1)])
 
@@ -614,14 +615,17 @@ class WaveAudio(WaveContainer):
         the resulting object
         may raise EncodingError if some problem occurs during encoding"""
 
-        if (hasattr(target_class, "from_wave")):
+        if (self.__can_copy__(target_class, compression)):
+            return self.__copy_file__(target_path, progress)
+        elif (hasattr(target_class, "from_wave")):
             return target_class.from_wave(target_path,
                                           self.filename,
                                           compression=compression,
                                           progress=progress)
         else:
             return target_class.from_pcm(target_path,
-                                         to_pcm_progress(self, progress),
+                                         to_pcm_progress(self, progress,
+                                                         threaded=True),
                                          compression)
 
     def total_frames(self):
@@ -77,6 +77,7 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
 
     SUFFIX = "wv"
     NAME = SUFFIX
+    MAGIC = (((0, 'wvpk'),),)
     DEFAULT_COMPRESSION = "standard"
     COMPRESSION_MODES = ("veryfast", "fast", "standard", "high", "veryhigh")
     COMPRESSION_DESCRIPTIONS = {"veryfast": _(u"fastest encode/decode, " +
@@ -592,24 +593,10 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
                  track_peak,
                  album_gain,
                  album_peak) in calculate_replay_gain(tracks, progress):
-                metadata = track.get_metadata()
-                if (metadata is None):
-                    metadata = ApeTag([])
-
-                metadata["replaygain_track_gain"] = ApeTagItem.string(
-                    "replaygain_track_gain",
-                    u"%+1.2f dB" % (track_gain))
-                metadata["replaygain_track_peak"] = ApeTagItem.string(
-                    "replaygain_track_peak",
-                    u"%1.6f" % (track_peak))
-                metadata["replaygain_album_gain"] = ApeTagItem.string(
-                    "replaygain_album_gain",
-                    u"%+1.2f dB" % (album_gain))
-                metadata["replaygain_album_peak"] = ApeTagItem.string(
-                    "replaygain_album_peak",
-                    u"%1.6f" % (album_peak))
-
-                track.update_metadata(metadata)
+                track.set_replay_gain(ReplayGain(track_gain,
+                                                 track_peak,
+                                                 album_gain,
+                                                 album_peak))
 
     @classmethod
     def can_add_replay_gain(cls):
@@ -623,6 +610,35 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
 
         return True
 
+    @classmethod
+    def can_set_replay_gain(cls):
+        """returns True"""
+
+        return True
+
+    def set_replay_gain(self, replaygain):
+        """sets our ReplayGain values from a ReplayGain object
+        without recalculating them"""
+
+        metadata = self.get_metadata()
+        if (metadata is None):
+            metadata = ApeTag([])
+
+        metadata["replaygain_track_gain"] = ApeTagItem.string(
+            "replaygain_track_gain",
+            u"%+1.2f dB" % (replaygain.track_gain))
+        metadata["replaygain_track_peak"] = ApeTagItem.string(
+            "replaygain_track_peak",
+            u"%1.6f" % (replaygain.track_peak))
+        metadata["replaygain_album_gain"] = ApeTagItem.string(
+            "replaygain_album_gain",
+            u"%+1.2f dB" % (replaygain.album_gain))
+        metadata["replaygain_album_peak"] = ApeTagItem.string(
+            "replaygain_album_peak",
+            u"%1.6f" % (replaygain.album_peak))
+
+        self.update_metadata(metadata)
+
     def replay_gain(self):
         """returns a ReplayGain object of our ReplayGain values
 
@@ -0,0 +1,390 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+import os
+import os.path
+import sqlite3
+import threading
+import cPickle
+from audiotools import (open as open_audiofile,
+                        VERSION,
+                        CATALOG,
+                        ChannelMask,
+                        UnsupportedFile,
+                        InvalidFile)
+
+
+class Catalog:
+    """a persistent catalog of AudioFile stream information and metadata
+
+    entries are keyed by each file's absolute path
+    and are only used while the file's inode, size
+    and modification time are unchanged"""
+
+    def __init__(self, filename):
+        """filename is the location on disk for this catalog database"""
+
+        from audiotools import TYPE_MAP
+
+        #open_files() may call open() from several threads,
+        #which take turns using the database
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.cursor = self.db.cursor()
+        self.lock = threading.Lock()
+
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS catalog_info (
+  name TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+)""")
+
+        #a NULL type marks a file which isn't a supported AudioFile
+        #and a NULL metadata marks one whose metadata couldn't be read
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS audio_file (
+  path BLOB PRIMARY KEY,
+  inode INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  mtime REAL NOT NULL,
+  type TEXT,
+  sample_rate INTEGER,
+  channels INTEGER,
+  channel_mask INTEGER,
+  bits_per_sample INTEGER,
+  total_frames INTEGER,
+  metadata BLOB
+)""")
+
+        #pickled metadata may not load in a different version
+        #and unsupported files may be supported by newly available types,
+        #so either change invalidates the whole catalog
+        types = u"%s %s" % (VERSION.decode('ascii'),
+                            u",".join(sorted([name.decode('ascii')
+                                              for name in TYPE_MAP.keys()])))
+        self.cursor.execute("""SELECT value FROM catalog_info
+WHERE (name = 'types')""")
+        row = self.cursor.fetchone()
+        if ((row is None) or (row[0] != types)):
+            self.cursor.execute("DELETE FROM audio_file")
+            self.cursor.execute("""INSERT OR REPLACE INTO catalog_info
+(name, value) VALUES ('types', ?)""", (types,))
+            self.db.commit()
+
+    def close(self):
+        """commits any new entries and closes any open database handles"""
+
+        self.lock.acquire()
+        try:
+            self.db.commit()
+            self.cursor.close()
+            self.db.close()
+        finally:
+            self.lock.release()
+
+    def commit(self):
+        """commits any new entries to disk"""
+
+        self.lock.acquire()
+        try:
+            self.db.commit()
+        finally:
+            self.lock.release()
+
+    def open(self, filename):
+        """returns an AudioFile located at the given filename path
+
+        this works like audiotools.open(), except that files
+        unchanged since they were last cataloged aren't parsed at all
+        and are returned as CachedAudioFile objects instead
+
+        raises UnsupportedFile if it's not a file we support
+        raises InvalidFile if the file appears to be something we support,
+        but has errors of some sort
+        raises IOError if some problem occurs attempting to open the file"""
+
+        from audiotools import TYPE_MAP
+
+        path = os.path.abspath(filename)
+        try:
+            stat = os.stat(filename)
+        except OSError, err:
+            raise IOError(err.errno, err.strerror, filename)
+        key = (stat.st_ino, stat.st_size, stat.st_mtime)
+
+        self.lock.acquire()
+        try:
+            self.cursor.execute("""SELECT inode, size, mtime, type,
+sample_rate, channels, channel_mask, bits_per_sample, total_frames,
+metadata FROM audio_file WHERE (path = ?)""", (sqlite3.Binary(path),))
+            row = self.cursor.fetchone()
+        finally:
+            self.lock.release()
+        if ((row is not None) and (tuple(row[0:3]) == key)):
+            if (row[3] is None):
+                raise UnsupportedFile(filename)
+            elif (row[3].encode('ascii') in TYPE_MAP):
+                return cached_type(TYPE_MAP[row[3].encode('ascii')])(
+                    filename,
+                    tuple(row[4:9]),
+                    str(row[9]) if (row[9] is not None) else None)
+
+        #otherwise, the file is new or changed since it was cataloged
+        try:
+            track = open_audiofile(filename)
+        except UnsupportedFile:
+            self.__add_entry__(path, key, None, None, None)
+            raise
+
+        try:
+            metadata = cPickle.dumps(track.get_metadata(),
+                                     cPickle.HIGHEST_PROTOCOL)
+        except (IOError, InvalidFile, cPickle.PicklingError):
+            metadata = None
+
+        self.__add_entry__(path, key, track.NAME,
+                           stream_info(track.__class__, track), metadata)
+        return track
+
+    def __add_entry__(self, path, key, type_name, stream, metadata):
+        if (stream is None):
+            stream = (None,) * 5
+        self.lock.acquire()
+        try:
+            self.cursor.execute("""INSERT OR REPLACE INTO audio_file
+(path, inode, size, mtime, type,
+ sample_rate, channels, channel_mask, bits_per_sample, total_frames,
+ metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                                (sqlite3.Binary(path),) + key +
+                                (type_name.decode('ascii')
+                                 if (type_name is not None) else None,) +
+                                stream +
+                                (sqlite3.Binary(metadata)
+                                 if (metadata is not None) else None,))
+        finally:
+            self.lock.release()
+
+    def prune(self):
+        """removes the entries of any files which no longer exist
+
+        returns the number of entries removed"""
+
+        self.lock.acquire()
+        try:
+            self.cursor.execute("SELECT path FROM audio_file")
+            missing = [(path,) for (path,) in self.cursor.fetchall()
+                       if (not os.path.isfile(str(path)))]
+            self.cursor.executemany(
+                "DELETE FROM audio_file WHERE (path = ?)", missing)
+            self.db.commit()
+        finally:
+            self.lock.release()
+        return len(missing)
+
+
+def open_catalog():
+    """returns the Catalog at the [System] catalog config option's path
+
+    returns None if no catalog is configured"""
+
+    if (len(CATALOG) > 0):
+        return Catalog(CATALOG)
+    else:
+        return None
+
+
+def stream_info(audio_class, track):
+    """given an AudioFile class and an AudioFile object of that class,
+    returns a (sample_rate, channels, channel_mask,
+               bits_per_sample, total_frames) tuple of integers
+    as reported by that class's methods"""
+
+    return (audio_class.sample_rate(track),
+            audio_class.channels(track),
+            int(audio_class.channel_mask(track)),
+            audio_class.bits_per_sample(track),
+            audio_class.total_frames(track))
+
+
+class CachedAudioFile(object):
+    """a mixin for AudioFile classes whose stream information and metadata
+    are taken from a Catalog instead of the file itself
+
+    the AudioFile class's own __init__ method only parses the file
+    once some attribute it would have set is needed,
+    such as by to_pcm() or verify()"""
+
+    def __init__(self, filename, stream=None, metadata=None):
+        """filename is a plain string
+        stream is a tuple of integers as returned by stream_info()
+        and metadata is a string of pickled MetaData
+
+        if stream is None, the file is parsed immediately
+        and if metadata is None, it is read from the file when needed"""
+
+        self.filename = filename
+        self.__catalog_parsed__ = False
+        self.__catalog_metadata__ = metadata
+        if (stream is not None):
+            self.__catalog_stream__ = stream
+        else:
+            #the AudioFile class's methods may call our own,
+            #so the stream information comes from a plain object
+            self.__catalog_stream__ = stream_info(
+                self.__audio_class__, self.__audio_class__(filename))
+
+    def __catalog_parse__(self):
+        self.__catalog_parsed__ = True
+        self.__audio_class__.__init__(self, self.filename)
+
+    def __getattr__(self, attr):
+        #only called for attributes not yet set,
+        #which the AudioFile class's __init__ method may provide
+        if (self.__dict__.get("__catalog_parsed__", True)):
+            raise AttributeError(attr)
+        else:
+            self.__catalog_parse__()
+            return getattr(self, attr)
+
+    def sample_rate(self):
+        """returns the rate of the track's audio as an integer number of Hz"""
+
+        return self.__catalog_stream__[0]
+
+    def channels(self):
+        """returns an integer number of channels this track contains"""
+
+        return self.__catalog_stream__[1]
+
+    def channel_mask(self):
+        """returns a ChannelMask object of this track's channel layout"""
+
+        return ChannelMask(self.__catalog_stream__[2])
+
+    def bits_per_sample(self):
+        """returns an integer number of bits-per-sample this track contains"""
+
+        return self.__catalog_stream__[3]
+
+    def total_frames(self):
+        """returns the total PCM frames of the track as an integer"""
+
+        return self.__catalog_stream__[4]
+
+    def cd_frames(self):
+        """returns the total length of the track in CD frames
+
+        each CD frame is 1/75th of a second"""
+
+        try:
+            return (self.total_frames() * 75) / self.sample_rate()
+        except ZeroDivisionError:
+            return 0
+
+    def seconds_length(self):
+        """returns the length of the track as a Decimal number of seconds"""
+
+        import decimal
+
+        try:
+            return (decimal.Decimal(self.total_frames()) /
+                    decimal.Decimal(self.sample_rate()))
+        except decimal.DivisionByZero:
+            return decimal.Decimal(0)
+
+    def get_metadata(self):
+        """returns a MetaData object, or None
+
+        raises IOError if unable to read the file"""
+
+        if (self.__catalog_metadata__ is not None):
+            return cPickle.loads(self.__catalog_metadata__)
+        else:
+            return self.__audio_class__.get_metadata(self)
+
+    #any methods which modify the file's metadata
+    #also discard the cataloged copy,
+    #so that it's read back from the file afterward
+
+    def update_metadata(self, metadata):
+        """takes this track's current MetaData object
+        as returned by get_metadata() and sets this track's metadata
+        with any fields updated in that object
+
+        raises IOError if unable to write the file
+        """
+
+        self.__catalog_metadata__ = None
+        self.__audio_class__.update_metadata(self, metadata)
+
+    def set_metadata(self, metadata):
+        """takes a MetaData object and sets this track's metadata
+
+        this metadata includes track name, album name, and so on
+        raises IOError if unable to write the file"""
+
+        self.__catalog_metadata__ = None
+        self.__audio_class__.set_metadata(self, metadata)
+
+    def delete_metadata(self):
+        """deletes the track's MetaData
+
+        this removes or unsets tags as necessary in order to remove all data
+        raises IOError if unable to write the file"""
+
+        self.__catalog_metadata__ = None
+        self.__audio_class__.delete_metadata(self)
+
+    def set_replay_gain(self, replaygain):
+        """given a ReplayGain object, sets the track's gain to those values
+
+        may raise IOError if unable to modify the file"""
+
+        self.__catalog_metadata__ = None
+        self.__audio_class__.set_replay_gain(self, replaygain)
+
+    def set_cuesheet(self, cuesheet):
+        """imports cuesheet data from a Cuesheet-compatible object
+
+        this are objects with catalog(), ISRCs(), indexes(), and pcm_lengths()
+        methods.  Raises IOError if an error occurs setting the cuesheet"""
+
+        self.__catalog_metadata__ = None
+        self.__audio_class__.set_cuesheet(self, cuesheet)
+
+    def audio_class(self):
+        """returns the AudioFile class this track's file is read as
+
+        this is the class this object's type was built from,
+        rather than the type itself"""
+
+        return self.__audio_class__
+
+
+__CACHED_TYPES__ = {}
+
+
+def cached_type(audio_class):
+    """given an AudioFile class, returns a subclass of it
+    and CachedAudioFile whose objects take their stream information
+    and metadata from a Catalog"""
+
+    if (audio_class not in __CACHED_TYPES__):
+        __CACHED_TYPES__[audio_class] = type(
+            "Cached" + audio_class.__name__,
+            (CachedAudioFile, audio_class),
+            {"__audio_class__": audio_class})
+    return __CACHED_TYPES__[audio_class]
@@ -20,6 +20,7 @@
 import sys
 from itertools import izip
 import bz2
+import zlib
 import sqlite3
 from hashlib import sha1
 import base64
@@ -27,33 +28,47 @@ import anydbm
 import subprocess
 import tempfile
 import whichdb
-from audiotools import BIN, transfer_data
+from audiotools import BIN, BUFFER_SIZE, transfer_data
 import cStringIO
 
 
 class UndoDB:
     """a class for performing undo operations on files
 
-    this stores an undo/redo patch for transforming a file
+    this stores an undo/redo delta for transforming a file
     back to its original value, or forward again to its modified form"""
 
+    #the size of the blocks compared between files, in bytes
+    CHUNK_SIZE = 4096
+
     def __init__(self, filename):
         """filename is the location on disk for this undo database"""
 
         self.db = sqlite3.connect(filename)
         self.cursor = self.db.cursor()
 
-        self.cursor.execute("""CREATE TABLE IF NOT EXISTS patch (
-  patch_id INTEGER PRIMARY KEY AUTOINCREMENT,
-  patch_data BLOB NOT NULL
-)""")
+        #databases from older versions store XORed patches
+        #in the "patch" and "source_file" tables,
+        #which are still consulted when undoing
+        self.cursor.execute("""SELECT name FROM sqlite_master
+WHERE ((type = 'table') AND (name = 'source_file'))""")
+        self.has_patches = self.cursor.fetchone() is not None
 
-        self.cursor.execute("""CREATE TABLE IF NOT EXISTS source_file (
-  source_checksum CHAR(40) PRIMARY KEY,
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS delta (
+  delta_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  source_checksum CHAR(40) UNIQUE NOT NULL,
   source_size INTEGER NOT NULL,
-  target_size INTEGER NOT NULL,
-  patch_id INTEGER,
-  FOREIGN KEY (patch_id) REFERENCES patch (patch_id) ON DELETE CASCADE
+  target_size INTEGER NOT NULL
+)""")
+
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS delta_range (
+  delta_id INTEGER NOT NULL,
+  range_number INTEGER NOT NULL,
+  source_offset INTEGER,
+  range_length INTEGER NOT NULL,
+  range_data BLOB,
+  PRIMARY KEY (delta_id, range_number),
+  FOREIGN KEY (delta_id) REFERENCES delta (delta_id) ON DELETE CASCADE
 )""")
 
     def close(self):
@@ -63,27 +78,116 @@ class UndoDB:
         self.db.close()
 
     @classmethod
-    def build_patch(cls, s1, s2):
-        """given two strings, returns a transformation patch
+    def checksum(cls, f):
+        """given a file object, returns its size and SHA1 checksum"""
 
-        this function presumes the two strings will be largely
-        equal and similar in length.  It operates by performing an
-        xOR operation across both and BZ2 compressing the result"""
+        f.seek(0, 0)
+        c = sha1("")
+        transfer_data(f.read, c.update)
+        return (f.tell(), c.hexdigest())
 
-        if (len(s1) < len(s2)):
-            s1 += (chr(0) * (len(s2) - len(s1)))
-        elif (len(s2) < len(s1)):
-            s2 += (chr(0) * (len(s1) - len(s2)))
+    @classmethod
+    def build_delta(cls, source, target, source_size, target_size):
+        """given source and target file objects and their sizes,
+        yields (source_offset, length, data) tuples
+        which rebuild target from source when applied in order
+
+        if source_offset is None, data is a string of new bytes
+        otherwise, data is None and length bytes are copied from source
+
+        this presumes the two files will be largely equal,
+        with any changes being edited in place or
+        growing or shrinking the file from one end.
+        It operates by comparing blocks of the target
+        against the source at the same offset from both
+        the start and the end of the file"""
+
+        shift = target_size - source_size
+        if (shift == 0):
+            alignments = [0]
+        else:
+            alignments = [0, shift]
+
+        (range_offset, range_length, range_data) = (None, 0, [])
+        target.seek(0, 0)
+        offset = 0
+        while (offset < target_size):
+            chunk = target.read(cls.CHUNK_SIZE)
+            if (len(chunk) == 0):
+                break
+
+            #find a source block identical to this target block, if any
+            source_offset = None
+            for alignment in alignments:
+                if (((offset - alignment) >= 0) and
+                    ((offset - alignment + len(chunk)) <= source_size)):
+                    source.seek(offset - alignment, 0)
+                    if (source.read(len(chunk)) == chunk):
+                        source_offset = offset - alignment
+                        #try the alignment that matched first next time
+                        alignments.remove(alignment)
+                        alignments.insert(0, alignment)
+                        break
+
+            if (source_offset is not None):
+                if ((range_offset is not None) and
+                    ((range_offset + range_length) == source_offset)):
+                    #extend the current copied range
+                    range_length += len(chunk)
+                else:
+                    if (range_length > 0):
+                        yield (range_offset,
+                               range_length,
+                               "".join(range_data) if
+                               (range_offset is None) else None)
+                    (range_offset, range_length, range_data) = \
+                        (source_offset, len(chunk), [])
+            else:
+                if ((range_offset is None) and
+                    ((range_length + len(chunk)) <= BUFFER_SIZE)):
+                    #extend the current range of new bytes
+                    range_length += len(chunk)
+                    range_data.append(chunk)
+                else:
+                    if (range_length > 0):
+                        yield (range_offset,
+                               range_length,
+                               "".join(range_data) if
+                               (range_offset is None) else None)
+                    (range_offset, range_length, range_data) = \
+                        (None, len(chunk), [chunk])
+
+            offset += len(chunk)
 
-        patch = bz2.compress("".join([chr(ord(x) ^ ord(y)) for (x, y) in
-                                      izip(s1, s2)]))
-        return patch
+        if (range_length > 0):
+            yield (range_offset,
+                   range_length,
+                   "".join(range_data) if (range_offset is None) else None)
+
+    @classmethod
+    def apply_delta(cls, source, ranges, output):
+        """given a source file object, an iterator of
+        (source_offset, length, data) tuples from build_delta()
+        and an output file object, writes the rebuilt file to output"""
+
+        for (source_offset, length, data) in ranges:
+            if (source_offset is None):
+                output.write(data)
+            else:
+                source.seek(source_offset, 0)
+                while (length > 0):
+                    s = source.read(min(length, BUFFER_SIZE))
+                    if (len(s) == 0):
+                        raise IOError("source file too short for delta")
+                    output.write(s)
+                    length -= len(s)
 
     @classmethod
     def apply_patch(cls, s, patch, new_length):
         """given a string, patch and new length, restores string
 
-        patch is the same BZ2 compressed output from build_patch()
+        patch is the BZ2 compressed XOR of both strings
+        stored by older versions of UndoDB
         new_length is the size of the string originally,
         which must be stored externally from the patch itself"""
 
@@ -95,50 +199,65 @@ class UndoDB:
         return "".join([chr(ord(x) ^ ord(y)) for (x, y) in
                         izip(s, bz2.decompress(patch))])
 
-    def __add__(self, file_data1, file_data2):
-        #file_data1's target is file_data2 and
-        #file_data2's target is file_data1
-
-        self.cursor.execute(
-            "INSERT INTO patch (patch_id, patch_data) VALUES (?, ?)",
-            [None,
-             base64.b64encode(
-                    UndoDB.build_patch(file_data1,
-                                       file_data2)).decode('ascii')])
-        patch_id = self.cursor.lastrowid
-        try:
-            self.cursor.execute("""INSERT INTO source_file (
-source_checksum, source_size, target_size, patch_id) values (?, ?, ?, ?)""",
-                                [sha1(file_data1).hexdigest().decode('ascii'),
-                                 len(file_data1),
-                                 len(file_data2),
-                                 patch_id])
-            self.cursor.execute("""INSERT INTO source_file (
-source_checksum, source_size, target_size, patch_id) values (?, ?, ?, ?)""",
-                                [sha1(file_data2).hexdigest().decode('ascii'),
-                                 len(file_data2),
-                                 len(file_data1),
-                                 patch_id])
-            self.db.commit()
-        except sqlite3.IntegrityError:
-            self.db.rollback()
-
-    def __undo__(self, file_data):
+    def __add_delta__(self, source, target, source_size, target_size,
+                      source_checksum):
+        self.cursor.execute("""INSERT INTO delta (
+delta_id, source_checksum, source_size, target_size) VALUES (?, ?, ?, ?)""",
+                            [None,
+                             source_checksum.decode('ascii'),
+                             source_size,
+                             target_size])
+        delta_id = self.cursor.lastrowid
+        #ranges of new bytes are stored zlib compressed
+        for (i, (source_offset, length, data)) in enumerate(
+            UndoDB.build_delta(source, target, source_size, target_size)):
+            self.cursor.execute("""INSERT INTO delta_range (
+delta_id, range_number, source_offset, range_length, range_data)
+VALUES (?, ?, ?, ?, ?)""",
+                                [delta_id,
+                                 i,
+                                 source_offset,
+                                 length,
+                                 sqlite3.Binary(zlib.compress(data)) if
+                                 (data is not None) else None])
+
+    def __undo_delta__(self, source, source_size, source_checksum, output):
+        self.cursor.execute("""SELECT delta_id FROM delta
+WHERE ((source_checksum = ?) AND (source_size = ?))""",
+                            [source_checksum.decode('ascii'), source_size])
+        row = self.cursor.fetchone()
+        if (row is not None):
+            self.cursor.execute("""SELECT source_offset, range_length,
+range_data FROM delta_range WHERE (delta_id = ?) ORDER BY range_number""",
+                                row)
+            UndoDB.apply_delta(
+                source,
+                ((source_offset, length,
+                  zlib.decompress(str(data)) if
+                  (data is not None) else None)
+                 for (source_offset, length, data) in self.cursor),
+                output)
+            return True
+        else:
+            return False
+
+    def __undo_patch__(self, source, source_size, source_checksum, output):
         self.cursor.execute("""SELECT target_size, patch_data FROM
 source_file, patch WHERE ((source_checksum = ?) AND
                           (source_size = ?) AND
                           (source_file.patch_id = patch.patch_id))""",
-                            [sha1(file_data).hexdigest().decode('ascii'),
-                             len(file_data)])
+                            [source_checksum.decode('ascii'), source_size])
         row = self.cursor.fetchone()
         if (row is not None):
             (target_size, patch) = row
-            return UndoDB.apply_patch(
-                file_data,
-                base64.b64decode(patch.encode('ascii')),
-                target_size)
+            source.seek(0, 0)
+            output.write(UndoDB.apply_patch(
+                    source.read(),
+                    base64.b64decode(patch.encode('ascii')),
+                    target_size))
+            return True
         else:
-            return None
+            return False
 
     def add(self, old_file, new_file):
         """adds an undo entry for transforming new_file to old_file
@@ -148,7 +267,19 @@ source_file, patch WHERE ((source_checksum = ?) AND
         old_f = open(old_file, 'rb')
         new_f = open(new_file, 'rb')
         try:
-            self.__add__(old_f.read(), new_f.read())
+            (old_size, old_checksum) = UndoDB.checksum(old_f)
+            (new_size, new_checksum) = UndoDB.checksum(new_f)
+
+            #new_file's target is old_file and
+            #old_file's target is new_file
+            try:
+                self.__add_delta__(new_f, old_f, new_size, old_size,
+                                   new_checksum)
+                self.__add_delta__(old_f, new_f, old_size, new_size,
+                                   old_checksum)
+                self.db.commit()
+            except sqlite3.IntegrityError:
+                self.db.rollback()
         finally:
             old_f.close()
             new_f.close()
@@ -159,18 +290,29 @@ source_file, patch WHERE ((source_checksum = ?) AND
 
         returns True if undo performed, False if not"""
 
-        new_f = open(new_file, 'rb')
+        old_data = tempfile.TemporaryFile()
         try:
-            old_data = self.__undo__(new_f.read())
+            new_f = open(new_file, 'rb')
+            try:
+                (new_size, new_checksum) = UndoDB.checksum(new_f)
+                found = (self.__undo_delta__(new_f, new_size, new_checksum,
+                                             old_data) or
+                         (self.has_patches and
+                          self.__undo_patch__(new_f, new_size, new_checksum,
+                                              old_data)))
+            finally:
+                new_f.close()
+
+            if (found):
+                old_data.seek(0, 0)
+                old_f = open(new_file, 'wb')
+                transfer_data(old_data.read, old_f.write)
+                old_f.close()
+                return True
+            else:
+                return False
         finally:
-            new_f.close()
-        if (old_data is not None):
-            old_f = open(new_file, 'wb')
-            old_f.write(old_data)
-            old_f.close()
-            return True
-        else:
-            return False
+            old_data.close()
 
 
 class OldUndoDB:
@@ -265,7 +407,8 @@ def open_db(filename):
     """given a filename string, returns UndoDB or OldUndoDB
 
     if the file doesn't exist, this uses UndoDB by default
-    otherwise, detect OldUndoDB if xdelta is installed"""
+    otherwise, detect OldUndoDB if xdelta is installed
+    UndoDB handles both current and older SQLite databases"""
 
     if (BIN.can_execute(BIN["xdelta"])):
         db = whichdb.whichdb(filename)
@@ -96,6 +96,16 @@ class Player:
 
         self.command_queue.put(("stop", []))
 
+    def seek(self, seconds):
+        """moves playback of the current file to the given position
+
+        seconds may be a float and is clamped to the length of the file
+        such that seeking to the end stops playback
+        if playback is stopped, the file is left paused at that position
+        such that play() will start from there"""
+
+        self.command_queue.put(("seek", [seconds]))
+
     def close(self):
         """closes the player for playback
 
@@ -142,50 +152,69 @@ class PlayerThread:
         if (self.state == PLAYER_PLAYING):
             self.state = PLAYER_PAUSED
 
+    def __start_converter__(self, pcm_frame):
+        """starts a new ThreadedPCMConverter at the given PCM frame
+
+        formats whose decoders can seek() jump there directly
+        while others decode and discard the frames before it"""
+
+        #playback has no use for the decoder verifying an MD5 sum
+        pcmreader = audiotools.to_pcm_offset(self.track, pcm_frame,
+                                             verify=False)
+
+        if (self.replay_gain == RG_TRACK_GAIN):
+            from audiotools.replaygain import ReplayGainReader
+            replay_gain = self.track.replay_gain()
+
+            if (replay_gain is not None):
+                pcmreader = ReplayGainReader(pcmreader,
+                                             replay_gain.track_gain,
+                                             replay_gain.track_peak)
+        elif (self.replay_gain == RG_ALBUM_GAIN):
+            from audiotools.replaygain import ReplayGainReader
+            replay_gain = self.track.replay_gain()
+
+            if (replay_gain is not None):
+                pcmreader = ReplayGainReader(pcmreader,
+                                             replay_gain.album_gain,
+                                             replay_gain.album_peak)
+
+        if (not self.audio_output.compatible(pcmreader)):
+            self.audio_output.init(
+                sample_rate=pcmreader.sample_rate,
+                channels=pcmreader.channels,
+                channel_mask=pcmreader.channel_mask,
+                bits_per_sample=pcmreader.bits_per_sample)
+        self.pcmconverter = ThreadedPCMConverter(
+            pcmreader,
+            self.audio_output.framelist_converter())
+        self.frames_played = pcm_frame
+
     def play(self):
         if (self.track is not None):
             if (self.state == PLAYER_STOPPED):
-                if (self.replay_gain == RG_TRACK_GAIN):
-                    from audiotools.replaygain import ReplayGainReader
-                    replay_gain = self.track.replay_gain()
-
-                    if (replay_gain is not None):
-                        pcmreader = ReplayGainReader(
-                            self.track.to_pcm(),
-                            replay_gain.track_gain,
-                            replay_gain.track_peak)
-                    else:
-                        pcmreader = self.track.to_pcm()
-                elif (self.replay_gain == RG_ALBUM_GAIN):
-                    from audiotools.replaygain import ReplayGainReader
-                    replay_gain = self.track.replay_gain()
-
-                    if (replay_gain is not None):
-                        pcmreader = ReplayGainReader(
-                            self.track.to_pcm(),
-                            replay_gain.album_gain,
-                            replay_gain.album_peak)
-                    else:
-                        pcmreader = self.track.to_pcm()
-                else:
-                    pcmreader = self.track.to_pcm()
-
-                if (not self.audio_output.compatible(pcmreader)):
-                    self.audio_output.init(
-                        sample_rate=pcmreader.sample_rate,
-                        channels=pcmreader.channels,
-                        channel_mask=pcmreader.channel_mask,
-                        bits_per_sample=pcmreader.bits_per_sample)
-                self.pcmconverter = ThreadedPCMConverter(
-                    pcmreader,
-                    self.audio_output.framelist_converter())
-                self.frames_played = 0
+                self.__start_converter__(0)
                 self.state = PLAYER_PLAYING
             elif (self.state == PLAYER_PAUSED):
                 self.state = PLAYER_PLAYING
             elif (self.state == PLAYER_PLAYING):
                 pass
 
+    def seek(self, seconds):
+        if (self.track is not None):
+            pcm_frame = max(min(int(seconds * self.track.sample_rate()),
+                                self.total_frames), 0)
+
+            #discard the old converter along with any data it has queued
+            if (self.pcmconverter is not None):
+                self.pcmconverter.close()
+                del(self.pcmconverter)
+                self.pcmconverter = None
+
+            self.__start_converter__(pcm_frame)
+            if (self.state == PLAYER_STOPPED):
+                self.state = PLAYER_PAUSED
+
     def set_replay_gain(self, replay_gain):
         self.replay_gain = replay_gain
 
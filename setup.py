@@ -39,6 +39,11 @@ resamplemodule = Extension('audiotools.resample',
 pcmmodule = Extension('audiotools.pcm',
                       sources=['src/pcm.c'])
 
+pcmconvertermodule = Extension('audiotools.pcmconverter',
+                               sources=['src/pcmconverter.c',
+                                        'src/pcmconv.c',
+                                        'src/array.c'])
+
 replaygainmodule = Extension('audiotools.replaygain',
                              sources=['src/replaygain.c'])
 
@@ -55,7 +60,7 @@ decoders_sources = ['src/array.c',
                     'src/decoders/shn.c',
                     'src/decoders/alac.c',
                     'src/decoders/wavpack.c',
-                    # 'src/decoders/vorbis.c',
+                    'src/decoders/vorbis.c',
                     'src/decoders/mlp.c',
                     'src/decoders/aobpcm.c',
                     'src/decoders/aob.c',
@@ -74,7 +79,8 @@ if (sys.platform == 'linux2'):
 
 decodersmodule = Extension('audiotools.decoders',
                            sources=decoders_sources,
-                           define_macros=decoders_defines)
+                           define_macros=decoders_defines,
+                           libraries=['pthread'])
 
 encodersmodule = Extension('audiotools.encoders',
                            sources=['src/array.c',
@@ -87,7 +93,8 @@ encodersmodule = Extension('audiotools.encoders',
                                     'src/encoders/alac.c',
                                     'src/encoders/wavpack.c',
                                     'src/encoders.c'],
-                           define_macros=[("VERSION", VERSION)])
+                           define_macros=[("VERSION", VERSION)],
+                           libraries=['pthread'])
 
 bitstreammodule = Extension('audiotools.bitstream',
                             sources=['src/mod_bitstream.c',
@@ -110,6 +117,7 @@ setup(name='Python Audio Tools',
       ext_modules=[cdiomodule,
                    resamplemodule,
                    pcmmodule,
+                   pcmconvertermodule,
                    replaygainmodule,
                    decodersmodule,
                    encodersmodule,
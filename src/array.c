@@ -401,7 +401,7 @@ ARRAY_TAIL(array_f_tail, array_f, double)
     FUNC_NAME(const ARRAY_TYPE *array, unsigned count, ARRAY_TYPE *head) \
     {                                                                   \
         unsigned to_copy;                                               \
-        count = MAX(count, array->len);                                 \
+        count = MIN(count, array->len);                                 \
         to_copy = array->len - count;                                   \
                                                                         \
         if (head != array) {                                            \
@@ -655,7 +655,7 @@ ARRAY_L_TAIL(array_lf_tail, array_lf)
     FUNC_NAME(const ARRAY_TYPE *array, unsigned count, ARRAY_TYPE *head) \
     {                                                                   \
         assert(array->_ != NULL);                                       \
-        head->len = array->len - MAX(count, array->len);                \
+        head->len = array->len - MIN(count, array->len);                \
     }
 ARRAY_L_DE_TAIL(array_li_de_tail, array_li)
 ARRAY_L_DE_TAIL(array_lf_de_tail, array_lf)
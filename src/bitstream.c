@@ -53,6 +53,34 @@ const unsigned int read_limited_unary_table_le[0x200][18] =
 #include "read_limited_unary_table_le.h"
     ;
 
+/*appends a single read byte to the span pending for the checksums, if any,
+  passing the span along to them first if it's full*/
+static inline void
+br_span_byte(BitstreamReader *bs, uint8_t byte)
+{
+    if (bs->checksums != NULL) {
+        if (bs->span_size == BR_SPAN_SIZE)
+            br_update_checksums(bs);
+        bs->span[bs->span_size++] = byte;
+    }
+}
+
+/*passes a block of read bytes directly to the checksums, if any,
+  after any bytes still pending in the span*/
+static void
+br_span_bytes(BitstreamReader *bs, const uint8_t *bytes, unsigned count)
+{
+    struct br_checksum *checksum;
+
+    if (bs->checksums != NULL) {
+        br_update_checksums(bs);
+        for (checksum = bs->checksums;
+             checksum != NULL;
+             checksum = checksum->next)
+            checksum->checksum(bytes, count, checksum->data);
+    }
+}
+
 
 BitstreamReader*
 br_open(FILE *f, bs_endianness endianness)
@@ -64,9 +92,13 @@ br_open(FILE *f, bs_endianness endianness)
     bs->callbacks = NULL;
     bs->exceptions = NULL;
     bs->marks = NULL;
+    bs->checksums = NULL;
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->checksums_used = NULL;
+    bs->span = NULL;
+    bs->span_size = 0;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -121,9 +153,13 @@ br_substream_new(bs_endianness endianness)
     bs->callbacks = NULL;
     bs->exceptions = NULL;
     bs->marks = NULL;
+    bs->checksums = NULL;
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->checksums_used = NULL;
+    bs->span = NULL;
+    bs->span_size = 0;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -178,9 +214,13 @@ br_open_buffer(struct bs_buffer* buffer, bs_endianness endianness)
     bs->callbacks = NULL;
     bs->exceptions = NULL;
     bs->marks = NULL;
+    bs->checksums = NULL;
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->checksums_used = NULL;
+    bs->span = NULL;
+    bs->span_size = 0;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -240,9 +280,13 @@ br_open_external(void* user_data,
     bs->callbacks = NULL;
     bs->exceptions = NULL;
     bs->marks = NULL;
+    bs->checksums = NULL;
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->checksums_used = NULL;
+    bs->span = NULL;
+    bs->span_size = 0;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -327,6 +371,7 @@ br_open_external(void* user_data,
                      callback != NULL;                                  \
                      callback = callback->next)                         \
                     callback->callback((uint8_t)byte, callback->data);  \
+                br_span_byte(bs, (uint8_t)byte);                        \
             }                                                           \
                                                                         \
             result = read_bits_table[context][MIN(count, 8) - 1];       \
@@ -366,6 +411,7 @@ br_open_external(void* user_data,
                      callback != NULL;                                  \
                      callback = callback->next)                         \
                     callback->callback((uint8_t)byte, callback->data);  \
+                br_span_byte(bs, (uint8_t)byte);                        \
             }                                                           \
                                                                         \
             result = read_bits_table_le[context][MIN(count, 8) - 1];    \
@@ -495,8 +541,10 @@ br_skip_bits_f_be(BitstreamReader* bs, unsigned int count)
             if (fread(dummy, sizeof(uint8_t), to_read, bs->input.file) !=
                 to_read)
                 br_abort(bs);
-            else
+            else {
+                br_span_bytes(bs, dummy, to_read);
                 count -= (to_read * 8);
+            }
         }
     } else {
         while (count > 0) {
@@ -508,6 +556,7 @@ br_skip_bits_f_be(BitstreamReader* bs, unsigned int count)
                      callback != NULL;
                      callback = callback->next)
                     callback->callback((uint8_t)byte, callback->data);
+                br_span_byte(bs, (uint8_t)byte);
             }
 
             result = read_bits_table[context][MIN(count, 8) - 1];
@@ -543,8 +592,10 @@ br_skip_bits_f_le(BitstreamReader* bs, unsigned int count)
             if (fread(dummy, sizeof(uint8_t), to_read, bs->input.file) !=
                 to_read)
                 br_abort(bs);
-            else
+            else {
+                br_span_bytes(bs, dummy, to_read);
                 count -= (to_read * 8);
+            }
         }
     } else {
         while (count > 0) {
@@ -556,6 +607,7 @@ br_skip_bits_f_le(BitstreamReader* bs, unsigned int count)
                      callback != NULL;
                      callback = callback->next)
                     callback->callback((uint8_t)byte, callback->data);
+                br_span_byte(bs, (uint8_t)byte);
             }
 
             result = read_bits_table_le[context][MIN(count, 8) - 1];
@@ -586,6 +638,10 @@ br_skip_bits_s_be(BitstreamReader* bs, unsigned int count)
     if ((context == 0) && ((count % 8) == 0) && (bs->callbacks == NULL)) {
         count /= 8;
         if (count <= BUF_REMAINING_BYTES(bs->input.substream)) {
+            br_span_bytes(bs,
+                          bs->input.substream->buffer +
+                          bs->input.substream->buffer_position,
+                          count);
             bs->input.substream->buffer_position += count;
         } else {
             br_abort(bs);
@@ -600,6 +656,7 @@ br_skip_bits_s_be(BitstreamReader* bs, unsigned int count)
                      callback != NULL;
                      callback = callback->next)
                     callback->callback((uint8_t)byte, callback->data);
+                br_span_byte(bs, (uint8_t)byte);
             }
 
             result = read_bits_table[context][MIN(count, 8) - 1];
@@ -631,6 +688,10 @@ br_skip_bits_s_le(BitstreamReader* bs, unsigned int count)
     if ((context == 0) && ((count % 8) == 0) && (bs->callbacks == NULL)) {
         count /= 8;
         if (count <= BUF_REMAINING_BYTES(bs->input.substream)) {
+            br_span_bytes(bs,
+                          bs->input.substream->buffer +
+                          bs->input.substream->buffer_position,
+                          count);
             bs->input.substream->buffer_position += count;
         } else {
             br_abort(bs);
@@ -645,6 +706,7 @@ br_skip_bits_s_le(BitstreamReader* bs, unsigned int count)
                      callback != NULL;
                      callback = callback->next)
                     callback->callback((uint8_t)byte, callback->data);
+                br_span_byte(bs, (uint8_t)byte);
             }
 
             result = read_bits_table_le[context][MIN(count, 8) - 1];
@@ -680,6 +742,7 @@ br_skip_bits_e_be(BitstreamReader* bs, unsigned int count)
                  callback != NULL;
                  callback = callback->next)
                 callback->callback((uint8_t)byte, callback->data);
+            br_span_byte(bs, (uint8_t)byte);
         }
 
         result = read_bits_table[context][MIN(count, 8) - 1];
@@ -713,6 +776,7 @@ br_skip_bits_e_le(BitstreamReader* bs, unsigned int count)
                  callback != NULL;
                  callback = callback->next)
                 callback->callback((uint8_t)byte, callback->data);
+            br_span_byte(bs, (uint8_t)byte);
         }
 
         result = read_bits_table_le[context][MIN(count, 8) - 1];
@@ -792,6 +856,7 @@ br_unread_bit_c(BitstreamReader* bs, int unread_bit)
                      callback != NULL;                                  \
                      callback = callback->next)                         \
                     callback->callback((uint8_t)byte, callback->data);  \
+                br_span_byte(bs, (uint8_t)byte);                        \
             }                                                           \
                                                                         \
             result = UNARY_TABLE[context][stop_bit];                    \
@@ -842,6 +907,7 @@ br_read_unary_c(BitstreamReader* bs, int stop_bit)
                      callback != NULL;                                  \
                      callback = callback->next)                         \
                     callback->callback((uint8_t)byte, callback->data);  \
+                br_span_byte(bs, (uint8_t)byte);                        \
             }                                                           \
                                                                         \
             result = UNARY_TABLE[context][stop_bit];                    \
@@ -894,6 +960,7 @@ br_skip_unary_c(BitstreamReader* bs, int stop_bit)
                      callback != NULL;                                  \
                      callback = callback->next)                         \
                     callback->callback((uint8_t)byte, callback->data);  \
+                br_span_byte(bs, (uint8_t)byte);                        \
             }                                                           \
                                                                         \
             result = UNARY_TABLE[context][stop_bit +                    \
@@ -964,6 +1031,7 @@ br_read_limited_unary_c(BitstreamReader* bs, int stop_bit, int maximum_bits)
                  callback != NULL;                                      \
                  callback = callback->next)                             \
                 callback->callback((uint8_t)byte, callback->data);      \
+            br_span_byte(bs, (uint8_t)byte);                            \
                                                                         \
             entry = table[READ_HUFFMAN_NEXT_NODE(entry.context_node)][context]; \
         }                                                               \
@@ -1012,6 +1080,7 @@ br_read_bytes_f(struct BitstreamReader_s* bs,
                  callback = callback->next)
                 for (i = 0; i < byte_count; i++)
                     callback->callback(bytes[i], callback->data);
+            br_span_bytes(bs, bytes, byte_count);
         } else {
             br_abort(bs);
         }
@@ -1048,6 +1117,7 @@ br_read_bytes_s(struct BitstreamReader_s* bs,
                  callback = callback->next)
                 for (i = 0; i < byte_count; i++)
                     callback->callback(bytes[i], callback->data);
+            br_span_bytes(bs, bytes, byte_count);
 
             /*and increment buffer position*/
             buffer->buffer_position += byte_count;
@@ -1096,6 +1166,7 @@ br_read_bytes_e(struct BitstreamReader_s* bs,
                 for (i = 0; i < to_read; i++)
                     callback->callback(bytes[i], callback->data);
             }
+            br_span_bytes(bs, bytes, to_read);
 
             /*and increment buffer position and output position*/
             buffer->buffer_position += to_read;
@@ -1368,6 +1439,8 @@ br_free_f(BitstreamReader* bs)
 {
     struct bs_callback *c_node;
     struct bs_callback *c_next;
+    struct br_checksum *k_node;
+    struct br_checksum *k_next;
     struct bs_exception *e_node;
     struct bs_exception *e_next;
     struct br_mark *m_node;
@@ -1385,6 +1458,17 @@ br_free_f(BitstreamReader* bs)
         free(c_node);
     }
 
+    /*deallocate checksums and any pending span*/
+    for (k_node = bs->checksums; k_node != NULL; k_node = k_next) {
+        k_next = k_node->next;
+        free(k_node);
+    }
+    for (k_node = bs->checksums_used; k_node != NULL; k_node = k_next) {
+        k_next = k_node->next;
+        free(k_node);
+    }
+    free(bs->span);
+
     /*deallocate exceptions*/
     if (bs->exceptions != NULL) {
         fprintf(stderr, "Warning: leftover etry entries on stack\n");
@@ -1616,6 +1700,7 @@ br_substream_append_f(struct BitstreamReader_s *stream,
         for (i = 0; i < bytes; i++)
             callback->callback(extended_buffer[i], callback->data);
     }
+    br_span_bytes(stream, extended_buffer, bytes);
 
     /*complete buffer extension*/
     substream->input.substream->buffer_size += bytes;
@@ -1657,6 +1742,7 @@ br_substream_append_s(struct BitstreamReader_s *stream,
         for (i = 0; i < bytes; i++)
             callback->callback(extended_buffer[i], callback->data);
     }
+    br_span_bytes(stream, extended_buffer, bytes);
 
     /*complete buffer extension*/
     substream->input.substream->buffer_size += bytes;
@@ -1695,6 +1781,7 @@ br_substream_append_e(struct BitstreamReader_s *stream,
         for (i = 0; i < bytes; i++)
             callback->callback(extended_buffer[i], callback->data);
     }
+    br_span_bytes(stream, extended_buffer, bytes);
 }
 
 void
@@ -1731,6 +1818,7 @@ br_call_callbacks(BitstreamReader *bs, uint8_t byte)
          callback != NULL;
          callback = callback->next)
         callback->callback(byte, callback->data);
+    br_span_byte(bs, byte);
 }
 
 void
@@ -1770,10 +1858,79 @@ br_push_callback(BitstreamReader *bs, struct bs_callback *callback)
     }
 }
 
+void
+br_add_checksum(BitstreamReader *bs, bs_checksum_func checksum, void *data)
+{
+    struct br_checksum checksum_node;
+
+    checksum_node.checksum = checksum;
+    checksum_node.data = data;
+    checksum_node.next = NULL;
+    br_push_checksum(bs, &checksum_node);
+}
+
+void
+br_update_checksums(BitstreamReader *bs)
+{
+    struct br_checksum *checksum;
+
+    if (bs->span_size > 0) {
+        for (checksum = bs->checksums;
+             checksum != NULL;
+             checksum = checksum->next)
+            checksum->checksum(bs->span, bs->span_size, checksum->data);
+        bs->span_size = 0;
+    }
+}
+
+void
+br_pop_checksum(BitstreamReader *bs, struct br_checksum *checksum)
+{
+    struct br_checksum *c_node = bs->checksums;
+    if (c_node != NULL) {
+        br_update_checksums(bs);
+        if (checksum != NULL) {
+            checksum->checksum = c_node->checksum;
+            checksum->data = c_node->data;
+            checksum->next = NULL;
+        }
+        bs->checksums = c_node->next;
+        c_node->next = bs->checksums_used;
+        bs->checksums_used = c_node;
+    } else {
+        fprintf(stderr, "warning: no checksums available to pop\n");
+    }
+}
+
+void
+br_push_checksum(BitstreamReader *bs, struct br_checksum *checksum)
+{
+    struct br_checksum *checksum_node;
+
+    if (checksum != NULL) {
+        br_update_checksums(bs);
+        if (bs->span == NULL)
+            bs->span = malloc(BR_SPAN_SIZE);
+        if (bs->checksums_used == NULL)
+            checksum_node = malloc(sizeof(struct br_checksum));
+        else {
+            checksum_node = bs->checksums_used;
+            bs->checksums_used = bs->checksums_used->next;
+        }
+        checksum_node->checksum = checksum->checksum;
+        checksum_node->data = checksum->data;
+        checksum_node->next = bs->checksums;
+        bs->checksums = checksum_node;
+    }
+}
+
 
 void
 br_abort(BitstreamReader *bs)
 {
+    /*bring checksums up to date while their data is still in scope*/
+    br_update_checksums(bs);
+
     if (bs->exceptions != NULL) {
         longjmp(bs->exceptions->env, 1);
     } else {
@@ -1831,6 +1988,21 @@ br_substream_reset(struct BitstreamReader_s *substream)
     buf_reset(substream->input.substream);
 }
 
+void
+br_substream_checksum(struct BitstreamReader_s *substream,
+                      bs_checksum_func checksum,
+                      void *data)
+{
+    struct bs_buffer *buffer;
+
+    assert(substream->type == BR_SUBSTREAM);
+
+    buffer = substream->input.substream;
+    checksum(buffer->buffer + buffer->buffer_position,
+             BUF_REMAINING_BYTES(buffer),
+             data);
+}
+
 
 BitstreamWriter*
 bw_open(FILE *f, bs_endianness endianness)
@@ -3438,6 +3610,9 @@ test_callbacks_reader(BitstreamReader* reader,
                       struct br_huffman_table (*table)[][0x200],
                       int huffman_code_count);
 
+void
+test_checksums_reader(BitstreamReader* reader);
+
 void
 test_edge_cases(void);
 void
@@ -3541,6 +3716,7 @@ void check_alignment_e(const align_check* check,
 void func_add_one(uint8_t byte, int* value);
 void func_add_two(uint8_t byte, int* value);
 void func_mult_three(uint8_t byte, int* value);
+void span_counter(const uint8_t* bytes, unsigned count, unsigned int* total);
 
 int main(int argc, char* argv[]) {
     int fd;
@@ -3595,6 +3771,7 @@ int main(int argc, char* argv[]) {
     test_big_endian_reader(reader, be_table);
     test_try(reader, be_table);
     test_callbacks_reader(reader, 14, 18, be_table, 14);
+    test_checksums_reader(reader);
     reader->free(reader);
 
     temp_file2 = fopen(temp_filename, "rb");
@@ -3613,6 +3790,7 @@ int main(int argc, char* argv[]) {
     test_big_endian_reader(reader, be_table);
     test_try(reader, be_table);
     test_callbacks_reader(reader, 14, 18, be_table, 14);
+    test_checksums_reader(reader);
     reader->free(reader);
 
     fseek(temp_file, 0, SEEK_SET);
@@ -3622,6 +3800,7 @@ int main(int argc, char* argv[]) {
     test_little_endian_reader(reader, le_table);
     test_try(reader, le_table);
     test_callbacks_reader(reader, 14, 18, le_table, 13);
+    test_checksums_reader(reader);
     reader->free(reader);
 
     temp_file2 = fopen(temp_filename, "rb");
@@ -3638,6 +3817,7 @@ int main(int argc, char* argv[]) {
     test_little_endian_reader(reader, le_table);
     test_try(reader, le_table);
     test_callbacks_reader(reader, 14, 18, le_table, 13);
+    test_checksums_reader(reader);
     reader->free(reader);
 
     fseek(temp_file, 0, SEEK_SET);
@@ -3665,6 +3845,7 @@ int main(int argc, char* argv[]) {
     test_big_endian_reader(subreader, be_table);
     test_try(subreader, be_table);
     test_callbacks_reader(subreader, 14, 18, be_table, 14);
+    test_checksums_reader(subreader);
     br_substream_reset(subreader);
 
     reader->rewind(reader);
@@ -3685,6 +3866,7 @@ int main(int argc, char* argv[]) {
     test_big_endian_reader(subsubreader, be_table);
     test_try(subsubreader, be_table);
     test_callbacks_reader(subsubreader, 14, 18, be_table, 14);
+    test_checksums_reader(subsubreader);
     subsubreader->close(subsubreader);
     subreader->close(subreader);
     reader->rewind(reader);
@@ -3701,6 +3883,7 @@ int main(int argc, char* argv[]) {
     test_little_endian_reader(subreader, le_table);
     test_try(subreader, le_table);
     test_callbacks_reader(subreader, 14, 18, le_table, 13);
+    test_checksums_reader(subreader);
     br_substream_reset(subreader);
 
     reader->rewind(reader);
@@ -3721,6 +3904,7 @@ int main(int argc, char* argv[]) {
     test_little_endian_reader(subsubreader, le_table);
     test_try(subsubreader, le_table);
     test_callbacks_reader(subsubreader, 14, 18, le_table, 13);
+    test_checksums_reader(subsubreader);
     subsubreader->close(subsubreader);
     subreader->close(subreader);
     reader->rewind(reader);
@@ -4451,6 +4635,69 @@ void test_callbacks_reader(BitstreamReader* reader,
     reader->unmark(reader);
 }
 
+void
+test_checksums_reader(BitstreamReader* reader) {
+    int i;
+    unsigned int byte_count;
+    uint8_t bytes[2];
+    struct br_checksum saved_checksum;
+
+    reader->mark(reader);
+    br_add_checksum(reader, (bs_checksum_func)span_counter, &byte_count);
+
+    /*bytes are only passed along once the checksums are updated*/
+    byte_count = 0;
+    for (i = 0; i < 8; i++)
+        reader->read(reader, 4);
+    assert(byte_count == 0);
+    br_update_checksums(reader);
+    assert(byte_count == 4);
+    reader->rewind(reader);
+
+    /*bulk reads and skips*/
+    byte_count = 0;
+    reader->read_bytes(reader, bytes, 2);
+    reader->skip_bytes(reader, 2);
+    br_update_checksums(reader);
+    assert(byte_count == 4);
+    reader->rewind(reader);
+
+    /*calling checksums directly*/
+    byte_count = 0;
+    for (i = 0; i < 20; i++)
+        br_call_callbacks(reader, 0);
+    br_update_checksums(reader);
+    assert(byte_count == 20);
+
+    /*temporarily suspending the checksum*/
+    byte_count = 0;
+    reader->read(reader, 8);
+    br_pop_checksum(reader, &saved_checksum);
+    assert(byte_count == 1);
+    reader->read(reader, 8);
+    reader->read(reader, 8);
+    br_push_checksum(reader, &saved_checksum);
+    reader->read(reader, 8);
+    br_update_checksums(reader);
+    assert(byte_count == 2);
+    reader->rewind(reader);
+
+    /*an aborted read updates the checksums before returning*/
+    byte_count = 0;
+    if (!setjmp(*br_try(reader))) {
+        for (i = 0; i < 5; i++)
+            reader->read(reader, 8);
+        assert(0);
+    } else {
+        br_etry(reader);
+        assert(byte_count == 4);
+    }
+    reader->rewind(reader);
+
+    br_pop_checksum(reader, NULL);
+    reader->unmark(reader);
+}
+
 void
 test_writer(bs_endianness endianness) {
     FILE* output_file;
@@ -5627,5 +5874,10 @@ void func_mult_three(uint8_t byte, int* value)
     *value *= 3;
 }
 
+void span_counter(const uint8_t* bytes, unsigned count, unsigned int* total)
+{
+    *total += count;
+}
+
 
 #endif
@@ -44,6 +44,7 @@ typedef enum {BS_INST_UNSIGNED, BS_INST_SIGNED, BS_INST_UNSIGNED64,
               BS_INST_BYTES, BS_INST_ALIGN} bs_instruction;
 
 typedef void (*bs_callback_func)(uint8_t, void*);
+typedef void (*bs_checksum_func)(const uint8_t*, unsigned, void*);
 
 /*a stackable callback function,
   used by BitstreamReader and BitstreamWriter*/
@@ -53,6 +54,21 @@ struct bs_callback {
     struct bs_callback *next;
 };
 
+/*a stackable checksum function,
+  used by BitstreamReader
+
+  unlike a callback, which is called once per byte,
+  a checksum is passed whole spans of read bytes at a time*/
+struct br_checksum {
+    void (*checksum)(const uint8_t*, unsigned, void*);
+    void *data;
+    struct br_checksum *next;
+};
+
+/*the number of read bytes a BitstreamReader collects
+  before passing them to its checksums*/
+#define BR_SPAN_SIZE 4096
+
 /*a stackable exception entry,
   used by BitstreamReader and BitstreamWriter*/
 struct bs_exception {
@@ -127,10 +143,16 @@ typedef struct BitstreamReader_s {
     struct bs_callback* callbacks;
     struct bs_exception* exceptions;
     struct br_mark* marks;
+    struct br_checksum* checksums;
 
     struct bs_callback* callbacks_used;
     struct bs_exception* exceptions_used;
     struct br_mark* marks_used;
+    struct br_checksum* checksums_used;
+
+    /*bytes read since the checksums were last updated*/
+    uint8_t* span;
+    unsigned span_size;
 
     /*returns "count" number of unsigned bits from the current stream
       in the current endian format up to "count" bits wide*/
@@ -643,7 +665,7 @@ br_substream_append_c(struct BitstreamReader_s *stream,
 void
 br_add_callback(BitstreamReader *bs, bs_callback_func callback, void *data);
 
-/*explicitly passes "byte" to the set callbacks,
+/*explicitly passes "byte" to the set callbacks and checksums,
   as if the byte were read from the input stream*/
 void
 br_call_callbacks(BitstreamReader *bs, uint8_t byte);
@@ -668,6 +690,33 @@ br_pop_callback(BitstreamReader *bs, struct bs_callback *callback);
 void
 br_push_callback(BitstreamReader *bs, struct bs_callback *callback);
 
+/*adds the given checksum to BitstreamReader's checksum stack
+
+  bytes read from the stream are collected into a span
+  and passed to each checksum function in bulk
+  whenever the span fills, a checksum is added or removed,
+  or br_update_checksums is called*/
+void
+br_add_checksum(BitstreamReader *bs, bs_checksum_func checksum, void *data);
+
+/*passes any bytes read since the last update to the set checksums
+
+  this must be called before examining a checksum's current value*/
+void
+br_update_checksums(BitstreamReader *bs);
+
+/*removes the most recently added checksum, if any,
+  after updating it with any pending bytes
+  if "checksum" is not NULL, the popped checksum's data is copied to it
+  for possible restoration via "br_push_checksum"*/
+void
+br_pop_checksum(BitstreamReader *bs, struct br_checksum *checksum);
+
+/*pushes the given checksum back onto the checksum stack
+  after updating the current checksums with any pending bytes*/
+void
+br_push_checksum(BitstreamReader *bs, struct br_checksum *checksum);
+
 
 /*Called by the read functions if one attempts to read past
   the end of the stream.
@@ -714,6 +763,17 @@ br_ftell(BitstreamReader *bs) {
 void
 br_substream_reset(struct BitstreamReader_s *substream);
 
+/*passes the substream's remaining unread bytes to "checksum"
+  as a single span, without consuming them
+
+  this allows a fully buffered block of data,
+  such as an Ogg packet, to be checksummed all at once
+  rather than as it's read*/
+void
+br_substream_checksum(struct BitstreamReader_s *substream,
+                      bs_checksum_func checksum,
+                      void *data);
+
 
 /*******************************************************************
  *                          BitstreamWriter                        *
@@ -151,9 +151,6 @@ static PyObject*
 CDDA_read_sector(cdio_CDDAObject* self)
 {
     int16_t *raw_sector;
-    int i;
-
-    int current_sector_position = 0;
 
     pcm_FrameList *sector;
     PyThreadState *thread_state = NULL;
@@ -163,23 +160,21 @@ CDDA_read_sector(cdio_CDDAObject* self)
     if (sector == NULL)
         return NULL;
 
+    if (FrameList_resize(sector, 44100 / 75, 2, 16)) {
+        Py_DECREF(sector);
+        return NULL;
+    }
+
     if (read_callback == NULL) {
         thread_state = PyEval_SaveThread();
     }
 
-    sector->frames = 44100 / 75;
-    sector->channels = 2;
-    sector->bits_per_sample = 16;
-    sector->samples_length = (sector->frames * sector->channels);
-    sector->samples = realloc(sector->samples,
-                              sector->samples_length * sizeof(int));
-
+    /*16 bits-per-sample FrameLists store native int16_t samples,
+      just like the sector itself*/
     raw_sector = cdio_paranoia_read_limited(self->paranoia,
                                             &read_sector_callback,
                                             10);
-    for (i = 0; i < (SECTOR_LENGTH / 2); i++) {
-        sector->samples[current_sector_position++] = raw_sector[i];
-    }
+    memcpy(sector->samples, raw_sector, SECTOR_LENGTH);
 
     if (read_callback == NULL) {
         PyEval_RestoreThread(thread_state);
@@ -192,9 +187,6 @@ static PyObject*
 CDDA_read_sectors(cdio_CDDAObject* self, PyObject *args)
 {
     int16_t *raw_sector;
-    int i;
-
-    int current_sectors_position = 0;
     int sectors_read;
     int sectors_to_read;
 
@@ -209,24 +201,23 @@ CDDA_read_sectors(cdio_CDDAObject* self, PyObject *args)
     if (sectors == NULL)
         return NULL;
 
+    if (FrameList_resize(sectors, sectors_to_read * (44100 / 75), 2, 16)) {
+        Py_DECREF(sectors);
+        return NULL;
+    }
+
     if (read_callback == NULL) {
         thread_state = PyEval_SaveThread();
     }
 
-    sectors->frames = sectors_to_read * (44100 / 75);
-    sectors->channels = 2;
-    sectors->bits_per_sample = 16;
-    sectors->samples_length = (sectors->frames * sectors->channels);
-    sectors->samples = realloc(sectors->samples,
-                               sectors->samples_length * sizeof(int));
-
     for (sectors_read = 0; sectors_read < sectors_to_read; sectors_read++) {
         raw_sector = cdio_paranoia_read_limited(self->paranoia,
                                                 &read_sector_callback,
                                                 10);
-        for (i = 0; i < (SECTOR_LENGTH / 2); i++) {
-            sectors->samples[current_sectors_position++] = raw_sector[i];
-        }
+        memcpy((int16_t*)sectors->samples +
+               (sectors_read * (SECTOR_LENGTH / 2)),
+               raw_sector,
+               SECTOR_LENGTH);
     }
 
     if (read_callback == NULL) {
@@ -638,8 +629,8 @@ cdio_accuraterip_crc(PyObject *dummy, PyObject *args) {
 
     /*update CRC with values from FrameList struct*/
     for (i = 0; i < framelist->frames; i++) {
-        left_v = framelist->samples[i * 2];
-        right_v = framelist->samples[i * 2 + 1];
+        left_v = FrameList_get_sample(framelist, i * 2);
+        right_v = FrameList_get_sample(framelist, i * 2 + 1);
         left = left_v >= 0 ? left_v : (1 << 16) - (-left_v);
         right = right_v >= 0 ? right_v : (1 << 16) - (-right_v);
         crc += ((left | (right << 16)) * track_index);
@@ -81,3 +81,567 @@ flac_crc16(uint8_t byte, void *checksum)
     *((int*)checksum) = (sumtable[(old_checksum >> 8) ^ byte] ^
                          (old_checksum << 8)) & 0xFFFF;
 }
+
+/*slicing-by-8 lookup tables for checksumming 8 bytes at a time
+  where slice N is the table for a byte followed by N other bytes*/
+static const uint8_t crc8_slices[8][0x100] = {
+    {0x00, 0x07, 0x0E, 0x09, 0x1C, 0x1B, 0x12, 0x15,
+     0x38, 0x3F, 0x36, 0x31, 0x24, 0x23, 0x2A, 0x2D,
+     0x70, 0x77, 0x7E, 0x79, 0x6C, 0x6B, 0x62, 0x65,
+     0x48, 0x4F, 0x46, 0x41, 0x54, 0x53, 0x5A, 0x5D,
+     0xE0, 0xE7, 0xEE, 0xE9, 0xFC, 0xFB, 0xF2, 0xF5,
+     0xD8, 0xDF, 0xD6, 0xD1, 0xC4, 0xC3, 0xCA, 0xCD,
+     0x90, 0x97, 0x9E, 0x99, 0x8C, 0x8B, 0x82, 0x85,
+     0xA8, 0xAF, 0xA6, 0xA1, 0xB4, 0xB3, 0xBA, 0xBD,
+     0xC7, 0xC0, 0xC9, 0xCE, 0xDB, 0xDC, 0xD5, 0xD2,
+     0xFF, 0xF8, 0xF1, 0xF6, 0xE3, 0xE4, 0xED, 0xEA,
+     0xB7, 0xB0, 0xB9, 0xBE, 0xAB, 0xAC, 0xA5, 0xA2,
+     0x8F, 0x88, 0x81, 0x86, 0x93, 0x94, 0x9D, 0x9A,
+     0x27, 0x20, 0x29, 0x2E, 0x3B, 0x3C, 0x35, 0x32,
+     0x1F, 0x18, 0x11, 0x16, 0x03, 0x04, 0x0D, 0x0A,
+     0x57, 0x50, 0x59, 0x5E, 0x4B, 0x4C, 0x45, 0x42,
+     0x6F, 0x68, 0x61, 0x66, 0x73, 0x74, 0x7D, 0x7A,
+     0x89, 0x8E, 0x87, 0x80, 0x95, 0x92, 0x9B, 0x9C,
+     0xB1, 0xB6, 0xBF, 0xB8, 0xAD, 0xAA, 0xA3, 0xA4,
+     0xF9, 0xFE, 0xF7, 0xF0, 0xE5, 0xE2, 0xEB, 0xEC,
+     0xC1, 0xC6, 0xCF, 0xC8, 0xDD, 0xDA, 0xD3, 0xD4,
+     0x69, 0x6E, 0x67, 0x60, 0x75, 0x72, 0x7B, 0x7C,
+     0x51, 0x56, 0x5F, 0x58, 0x4D, 0x4A, 0x43, 0x44,
+     0x19, 0x1E, 0x17, 0x10, 0x05, 0x02, 0x0B, 0x0C,
+     0x21, 0x26, 0x2F, 0x28, 0x3D, 0x3A, 0x33, 0x34,
+     0x4E, 0x49, 0x40, 0x47, 0x52, 0x55, 0x5C, 0x5B,
+     0x76, 0x71, 0x78, 0x7F, 0x6A, 0x6D, 0x64, 0x63,
+     0x3E, 0x39, 0x30, 0x37, 0x22, 0x25, 0x2C, 0x2B,
+     0x06, 0x01, 0x08, 0x0F, 0x1A, 0x1D, 0x14, 0x13,
+     0xAE, 0xA9, 0xA0, 0xA7, 0xB2, 0xB5, 0xBC, 0xBB,
+     0x96, 0x91, 0x98, 0x9F, 0x8A, 0x8D, 0x84, 0x83,
+     0xDE, 0xD9, 0xD0, 0xD7, 0xC2, 0xC5, 0xCC, 0xCB,
+     0xE6, 0xE1, 0xE8, 0xEF, 0xFA, 0xFD, 0xF4, 0xF3},
+    {0x00, 0x15, 0x2A, 0x3F, 0x54, 0x41, 0x7E, 0x6B,
+     0xA8, 0xBD, 0x82, 0x97, 0xFC, 0xE9, 0xD6, 0xC3,
+     0x57, 0x42, 0x7D, 0x68, 0x03, 0x16, 0x29, 0x3C,
+     0xFF, 0xEA, 0xD5, 0xC0, 0xAB, 0xBE, 0x81, 0x94,
+     0xAE, 0xBB, 0x84, 0x91, 0xFA, 0xEF, 0xD0, 0xC5,
+     0x06, 0x13, 0x2C, 0x39, 0x52, 0x47, 0x78, 0x6D,
+     0xF9, 0xEC, 0xD3, 0xC6, 0xAD, 0xB8, 0x87, 0x92,
+     0x51, 0x44, 0x7B, 0x6E, 0x05, 0x10, 0x2F, 0x3A,
+     0x5B, 0x4E, 0x71, 0x64, 0x0F, 0x1A, 0x25, 0x30,
+     0xF3, 0xE6, 0xD9, 0xCC, 0xA7, 0xB2, 0x8D, 0x98,
+     0x0C, 0x19, 0x26, 0x33, 0x58, 0x4D, 0x72, 0x67,
+     0xA4, 0xB1, 0x8E, 0x9B, 0xF0, 0xE5, 0xDA, 0xCF,
+     0xF5, 0xE0, 0xDF, 0xCA, 0xA1, 0xB4, 0x8B, 0x9E,
+     0x5D, 0x48, 0x77, 0x62, 0x09, 0x1C, 0x23, 0x36,
+     0xA2, 0xB7, 0x88, 0x9D, 0xF6, 0xE3, 0xDC, 0xC9,
+     0x0A, 0x1F, 0x20, 0x35, 0x5E, 0x4B, 0x74, 0x61,
+     0xB6, 0xA3, 0x9C, 0x89, 0xE2, 0xF7, 0xC8, 0xDD,
+     0x1E, 0x0B, 0x34, 0x21, 0x4A, 0x5F, 0x60, 0x75,
+     0xE1, 0xF4, 0xCB, 0xDE, 0xB5, 0xA0, 0x9F, 0x8A,
+     0x49, 0x5C, 0x63, 0x76, 0x1D, 0x08, 0x37, 0x22,
+     0x18, 0x0D, 0x32, 0x27, 0x4C, 0x59, 0x66, 0x73,
+     0xB0, 0xA5, 0x9A, 0x8F, 0xE4, 0xF1, 0xCE, 0xDB,
+     0x4F, 0x5A, 0x65, 0x70, 0x1B, 0x0E, 0x31, 0x24,
+     0xE7, 0xF2, 0xCD, 0xD8, 0xB3, 0xA6, 0x99, 0x8C,
+     0xED, 0xF8, 0xC7, 0xD2, 0xB9, 0xAC, 0x93, 0x86,
+     0x45, 0x50, 0x6F, 0x7A, 0x11, 0x04, 0x3B, 0x2E,
+     0xBA, 0xAF, 0x90, 0x85, 0xEE, 0xFB, 0xC4, 0xD1,
+     0x12, 0x07, 0x38, 0x2D, 0x46, 0x53, 0x6C, 0x79,
+     0x43, 0x56, 0x69, 0x7C, 0x17, 0x02, 0x3D, 0x28,
+     0xEB, 0xFE, 0xC1, 0xD4, 0xBF, 0xAA, 0x95, 0x80,
+     0x14, 0x01, 0x3E, 0x2B, 0x40, 0x55, 0x6A, 0x7F,
+     0xBC, 0xA9, 0x96, 0x83, 0xE8, 0xFD, 0xC2, 0xD7},
+    {0x00, 0x6B, 0xD6, 0xBD, 0xAB, 0xC0, 0x7D, 0x16,
+     0x51, 0x3A, 0x87, 0xEC, 0xFA, 0x91, 0x2C, 0x47,
+     0xA2, 0xC9, 0x74, 0x1F, 0x09, 0x62, 0xDF, 0xB4,
+     0xF3, 0x98, 0x25, 0x4E, 0x58, 0x33, 0x8E, 0xE5,
+     0x43, 0x28, 0x95, 0xFE, 0xE8, 0x83, 0x3E, 0x55,
+     0x12, 0x79, 0xC4, 0xAF, 0xB9, 0xD2, 0x6F, 0x04,
+     0xE1, 0x8A, 0x37, 0x5C, 0x4A, 0x21, 0x9C, 0xF7,
+     0xB0, 0xDB, 0x66, 0x0D, 0x1B, 0x70, 0xCD, 0xA6,
+     0x86, 0xED, 0x50, 0x3B, 0x2D, 0x46, 0xFB, 0x90,
+     0xD7, 0xBC, 0x01, 0x6A, 0x7C, 0x17, 0xAA, 0xC1,
+     0x24, 0x4F, 0xF2, 0x99, 0x8F, 0xE4, 0x59, 0x32,
+     0x75, 0x1E, 0xA3, 0xC8, 0xDE, 0xB5, 0x08, 0x63,
+     0xC5, 0xAE, 0x13, 0x78, 0x6E, 0x05, 0xB8, 0xD3,
+     0x94, 0xFF, 0x42, 0x29, 0x3F, 0x54, 0xE9, 0x82,
+     0x67, 0x0C, 0xB1, 0xDA, 0xCC, 0xA7, 0x1A, 0x71,
+     0x36, 0x5D, 0xE0, 0x8B, 0x9D, 0xF6, 0x4B, 0x20,
+     0x0B, 0x60, 0xDD, 0xB6, 0xA0, 0xCB, 0x76, 0x1D,
+     0x5A, 0x31, 0x8C, 0xE7, 0xF1, 0x9A, 0x27, 0x4C,
+     0xA9, 0xC2, 0x7F, 0x14, 0x02, 0x69, 0xD4, 0xBF,
+     0xF8, 0x93, 0x2E, 0x45, 0x53, 0x38, 0x85, 0xEE,
+     0x48, 0x23, 0x9E, 0xF5, 0xE3, 0x88, 0x35, 0x5E,
+     0x19, 0x72, 0xCF, 0xA4, 0xB2, 0xD9, 0x64, 0x0F,
+     0xEA, 0x81, 0x3C, 0x57, 0x41, 0x2A, 0x97, 0xFC,
+     0xBB, 0xD0, 0x6D, 0x06, 0x10, 0x7B, 0xC6, 0xAD,
+     0x8D, 0xE6, 0x5B, 0x30, 0x26, 0x4D, 0xF0, 0x9B,
+     0xDC, 0xB7, 0x0A, 0x61, 0x77, 0x1C, 0xA1, 0xCA,
+     0x2F, 0x44, 0xF9, 0x92, 0x84, 0xEF, 0x52, 0x39,
+     0x7E, 0x15, 0xA8, 0xC3, 0xD5, 0xBE, 0x03, 0x68,
+     0xCE, 0xA5, 0x18, 0x73, 0x65, 0x0E, 0xB3, 0xD8,
+     0x9F, 0xF4, 0x49, 0x22, 0x34, 0x5F, 0xE2, 0x89,
+     0x6C, 0x07, 0xBA, 0xD1, 0xC7, 0xAC, 0x11, 0x7A,
+     0x3D, 0x56, 0xEB, 0x80, 0x96, 0xFD, 0x40, 0x2B},
+    {0x00, 0x16, 0x2C, 0x3A, 0x58, 0x4E, 0x74, 0x62,
+     0xB0, 0xA6, 0x9C, 0x8A, 0xE8, 0xFE, 0xC4, 0xD2,
+     0x67, 0x71, 0x4B, 0x5D, 0x3F, 0x29, 0x13, 0x05,
+     0xD7, 0xC1, 0xFB, 0xED, 0x8F, 0x99, 0xA3, 0xB5,
+     0xCE, 0xD8, 0xE2, 0xF4, 0x96, 0x80, 0xBA, 0xAC,
+     0x7E, 0x68, 0x52, 0x44, 0x26, 0x30, 0x0A, 0x1C,
+     0xA9, 0xBF, 0x85, 0x93, 0xF1, 0xE7, 0xDD, 0xCB,
+     0x19, 0x0F, 0x35, 0x23, 0x41, 0x57, 0x6D, 0x7B,
+     0x9B, 0x8D, 0xB7, 0xA1, 0xC3, 0xD5, 0xEF, 0xF9,
+     0x2B, 0x3D, 0x07, 0x11, 0x73, 0x65, 0x5F, 0x49,
+     0xFC, 0xEA, 0xD0, 0xC6, 0xA4, 0xB2, 0x88, 0x9E,
+     0x4C, 0x5A, 0x60, 0x76, 0x14, 0x02, 0x38, 0x2E,
+     0x55, 0x43, 0x79, 0x6F, 0x0D, 0x1B, 0x21, 0x37,
+     0xE5, 0xF3, 0xC9, 0xDF, 0xBD, 0xAB, 0x91, 0x87,
+     0x32, 0x24, 0x1E, 0x08, 0x6A, 0x7C, 0x46, 0x50,
+     0x82, 0x94, 0xAE, 0xB8, 0xDA, 0xCC, 0xF6, 0xE0,
+     0x31, 0x27, 0x1D, 0x0B, 0x69, 0x7F, 0x45, 0x53,
+     0x81, 0x97, 0xAD, 0xBB, 0xD9, 0xCF, 0xF5, 0xE3,
+     0x56, 0x40, 0x7A, 0x6C, 0x0E, 0x18, 0x22, 0x34,
+     0xE6, 0xF0, 0xCA, 0xDC, 0xBE, 0xA8, 0x92, 0x84,
+     0xFF, 0xE9, 0xD3, 0xC5, 0xA7, 0xB1, 0x8B, 0x9D,
+     0x4F, 0x59, 0x63, 0x75, 0x17, 0x01, 0x3B, 0x2D,
+     0x98, 0x8E, 0xB4, 0xA2, 0xC0, 0xD6, 0xEC, 0xFA,
+     0x28, 0x3E, 0x04, 0x12, 0x70, 0x66, 0x5C, 0x4A,
+     0xAA, 0xBC, 0x86, 0x90, 0xF2, 0xE4, 0xDE, 0xC8,
+     0x1A, 0x0C, 0x36, 0x20, 0x42, 0x54, 0x6E, 0x78,
+     0xCD, 0xDB, 0xE1, 0xF7, 0x95, 0x83, 0xB9, 0xAF,
+     0x7D, 0x6B, 0x51, 0x47, 0x25, 0x33, 0x09, 0x1F,
+     0x64, 0x72, 0x48, 0x5E, 0x3C, 0x2A, 0x10, 0x06,
+     0xD4, 0xC2, 0xF8, 0xEE, 0x8C, 0x9A, 0xA0, 0xB6,
+     0x03, 0x15, 0x2F, 0x39, 0x5B, 0x4D, 0x77, 0x61,
+     0xB3, 0xA5, 0x9F, 0x89, 0xEB, 0xFD, 0xC7, 0xD1},
+    {0x00, 0x62, 0xC4, 0xA6, 0x8F, 0xED, 0x4B, 0x29,
+     0x19, 0x7B, 0xDD, 0xBF, 0x96, 0xF4, 0x52, 0x30,
+     0x32, 0x50, 0xF6, 0x94, 0xBD, 0xDF, 0x79, 0x1B,
+     0x2B, 0x49, 0xEF, 0x8D, 0xA4, 0xC6, 0x60, 0x02,
+     0x64, 0x06, 0xA0, 0xC2, 0xEB, 0x89, 0x2F, 0x4D,
+     0x7D, 0x1F, 0xB9, 0xDB, 0xF2, 0x90, 0x36, 0x54,
+     0x56, 0x34, 0x92, 0xF0, 0xD9, 0xBB, 0x1D, 0x7F,
+     0x4F, 0x2D, 0x8B, 0xE9, 0xC0, 0xA2, 0x04, 0x66,
+     0xC8, 0xAA, 0x0C, 0x6E, 0x47, 0x25, 0x83, 0xE1,
+     0xD1, 0xB3, 0x15, 0x77, 0x5E, 0x3C, 0x9A, 0xF8,
+     0xFA, 0x98, 0x3E, 0x5C, 0x75, 0x17, 0xB1, 0xD3,
+     0xE3, 0x81, 0x27, 0x45, 0x6C, 0x0E, 0xA8, 0xCA,
+     0xAC, 0xCE, 0x68, 0x0A, 0x23, 0x41, 0xE7, 0x85,
+     0xB5, 0xD7, 0x71, 0x13, 0x3A, 0x58, 0xFE, 0x9C,
+     0x9E, 0xFC, 0x5A, 0x38, 0x11, 0x73, 0xD5, 0xB7,
+     0x87, 0xE5, 0x43, 0x21, 0x08, 0x6A, 0xCC, 0xAE,
+     0x97, 0xF5, 0x53, 0x31, 0x18, 0x7A, 0xDC, 0xBE,
+     0x8E, 0xEC, 0x4A, 0x28, 0x01, 0x63, 0xC5, 0xA7,
+     0xA5, 0xC7, 0x61, 0x03, 0x2A, 0x48, 0xEE, 0x8C,
+     0xBC, 0xDE, 0x78, 0x1A, 0x33, 0x51, 0xF7, 0x95,
+     0xF3, 0x91, 0x37, 0x55, 0x7C, 0x1E, 0xB8, 0xDA,
+     0xEA, 0x88, 0x2E, 0x4C, 0x65, 0x07, 0xA1, 0xC3,
+     0xC1, 0xA3, 0x05, 0x67, 0x4E, 0x2C, 0x8A, 0xE8,
+     0xD8, 0xBA, 0x1C, 0x7E, 0x57, 0x35, 0x93, 0xF1,
+     0x5F, 0x3D, 0x9B, 0xF9, 0xD0, 0xB2, 0x14, 0x76,
+     0x46, 0x24, 0x82, 0xE0, 0xC9, 0xAB, 0x0D, 0x6F,
+     0x6D, 0x0F, 0xA9, 0xCB, 0xE2, 0x80, 0x26, 0x44,
+     0x74, 0x16, 0xB0, 0xD2, 0xFB, 0x99, 0x3F, 0x5D,
+     0x3B, 0x59, 0xFF, 0x9D, 0xB4, 0xD6, 0x70, 0x12,
+     0x22, 0x40, 0xE6, 0x84, 0xAD, 0xCF, 0x69, 0x0B,
+     0x09, 0x6B, 0xCD, 0xAF, 0x86, 0xE4, 0x42, 0x20,
+     0x10, 0x72, 0xD4, 0xB6, 0x9F, 0xFD, 0x5B, 0x39},
+    {0x00, 0x29, 0x52, 0x7B, 0xA4, 0x8D, 0xF6, 0xDF,
+     0x4F, 0x66, 0x1D, 0x34, 0xEB, 0xC2, 0xB9, 0x90,
+     0x9E, 0xB7, 0xCC, 0xE5, 0x3A, 0x13, 0x68, 0x41,
+     0xD1, 0xF8, 0x83, 0xAA, 0x75, 0x5C, 0x27, 0x0E,
+     0x3B, 0x12, 0x69, 0x40, 0x9F, 0xB6, 0xCD, 0xE4,
+     0x74, 0x5D, 0x26, 0x0F, 0xD0, 0xF9, 0x82, 0xAB,
+     0xA5, 0x8C, 0xF7, 0xDE, 0x01, 0x28, 0x53, 0x7A,
+     0xEA, 0xC3, 0xB8, 0x91, 0x4E, 0x67, 0x1C, 0x35,
+     0x76, 0x5F, 0x24, 0x0D, 0xD2, 0xFB, 0x80, 0xA9,
+     0x39, 0x10, 0x6B, 0x42, 0x9D, 0xB4, 0xCF, 0xE6,
+     0xE8, 0xC1, 0xBA, 0x93, 0x4C, 0x65, 0x1E, 0x37,
+     0xA7, 0x8E, 0xF5, 0xDC, 0x03, 0x2A, 0x51, 0x78,
+     0x4D, 0x64, 0x1F, 0x36, 0xE9, 0xC0, 0xBB, 0x92,
+     0x02, 0x2B, 0x50, 0x79, 0xA6, 0x8F, 0xF4, 0xDD,
+     0xD3, 0xFA, 0x81, 0xA8, 0x77, 0x5E, 0x25, 0x0C,
+     0x9C, 0xB5, 0xCE, 0xE7, 0x38, 0x11, 0x6A, 0x43,
+     0xEC, 0xC5, 0xBE, 0x97, 0x48, 0x61, 0x1A, 0x33,
+     0xA3, 0x8A, 0xF1, 0xD8, 0x07, 0x2E, 0x55, 0x7C,
+     0x72, 0x5B, 0x20, 0x09, 0xD6, 0xFF, 0x84, 0xAD,
+     0x3D, 0x14, 0x6F, 0x46, 0x99, 0xB0, 0xCB, 0xE2,
+     0xD7, 0xFE, 0x85, 0xAC, 0x73, 0x5A, 0x21, 0x08,
+     0x98, 0xB1, 0xCA, 0xE3, 0x3C, 0x15, 0x6E, 0x47,
+     0x49, 0x60, 0x1B, 0x32, 0xED, 0xC4, 0xBF, 0x96,
+     0x06, 0x2F, 0x54, 0x7D, 0xA2, 0x8B, 0xF0, 0xD9,
+     0x9A, 0xB3, 0xC8, 0xE1, 0x3E, 0x17, 0x6C, 0x45,
+     0xD5, 0xFC, 0x87, 0xAE, 0x71, 0x58, 0x23, 0x0A,
+     0x04, 0x2D, 0x56, 0x7F, 0xA0, 0x89, 0xF2, 0xDB,
+     0x4B, 0x62, 0x19, 0x30, 0xEF, 0xC6, 0xBD, 0x94,
+     0xA1, 0x88, 0xF3, 0xDA, 0x05, 0x2C, 0x57, 0x7E,
+     0xEE, 0xC7, 0xBC, 0x95, 0x4A, 0x63, 0x18, 0x31,
+     0x3F, 0x16, 0x6D, 0x44, 0x9B, 0xB2, 0xC9, 0xE0,
+     0x70, 0x59, 0x22, 0x0B, 0xD4, 0xFD, 0x86, 0xAF},
+    {0x00, 0xDF, 0xB9, 0x66, 0x75, 0xAA, 0xCC, 0x13,
+     0xEA, 0x35, 0x53, 0x8C, 0x9F, 0x40, 0x26, 0xF9,
+     0xD3, 0x0C, 0x6A, 0xB5, 0xA6, 0x79, 0x1F, 0xC0,
+     0x39, 0xE6, 0x80, 0x5F, 0x4C, 0x93, 0xF5, 0x2A,
+     0xA1, 0x7E, 0x18, 0xC7, 0xD4, 0x0B, 0x6D, 0xB2,
+     0x4B, 0x94, 0xF2, 0x2D, 0x3E, 0xE1, 0x87, 0x58,
+     0x72, 0xAD, 0xCB, 0x14, 0x07, 0xD8, 0xBE, 0x61,
+     0x98, 0x47, 0x21, 0xFE, 0xED, 0x32, 0x54, 0x8B,
+     0x45, 0x9A, 0xFC, 0x23, 0x30, 0xEF, 0x89, 0x56,
+     0xAF, 0x70, 0x16, 0xC9, 0xDA, 0x05, 0x63, 0xBC,
+     0x96, 0x49, 0x2F, 0xF0, 0xE3, 0x3C, 0x5A, 0x85,
+     0x7C, 0xA3, 0xC5, 0x1A, 0x09, 0xD6, 0xB0, 0x6F,
+     0xE4, 0x3B, 0x5D, 0x82, 0x91, 0x4E, 0x28, 0xF7,
+     0x0E, 0xD1, 0xB7, 0x68, 0x7B, 0xA4, 0xC2, 0x1D,
+     0x37, 0xE8, 0x8E, 0x51, 0x42, 0x9D, 0xFB, 0x24,
+     0xDD, 0x02, 0x64, 0xBB, 0xA8, 0x77, 0x11, 0xCE,
+     0x8A, 0x55, 0x33, 0xEC, 0xFF, 0x20, 0x46, 0x99,
+     0x60, 0xBF, 0xD9, 0x06, 0x15, 0xCA, 0xAC, 0x73,
+     0x59, 0x86, 0xE0, 0x3F, 0x2C, 0xF3, 0x95, 0x4A,
+     0xB3, 0x6C, 0x0A, 0xD5, 0xC6, 0x19, 0x7F, 0xA0,
+     0x2B, 0xF4, 0x92, 0x4D, 0x5E, 0x81, 0xE7, 0x38,
+     0xC1, 0x1E, 0x78, 0xA7, 0xB4, 0x6B, 0x0D, 0xD2,
+     0xF8, 0x27, 0x41, 0x9E, 0x8D, 0x52, 0x34, 0xEB,
+     0x12, 0xCD, 0xAB, 0x74, 0x67, 0xB8, 0xDE, 0x01,
+     0xCF, 0x10, 0x76, 0xA9, 0xBA, 0x65, 0x03, 0xDC,
+     0x25, 0xFA, 0x9C, 0x43, 0x50, 0x8F, 0xE9, 0x36,
+     0x1C, 0xC3, 0xA5, 0x7A, 0x69, 0xB6, 0xD0, 0x0F,
+     0xF6, 0x29, 0x4F, 0x90, 0x83, 0x5C, 0x3A, 0xE5,
+     0x6E, 0xB1, 0xD7, 0x08, 0x1B, 0xC4, 0xA2, 0x7D,
+     0x84, 0x5B, 0x3D, 0xE2, 0xF1, 0x2E, 0x48, 0x97,
+     0xBD, 0x62, 0x04, 0xDB, 0xC8, 0x17, 0x71, 0xAE,
+     0x57, 0x88, 0xEE, 0x31, 0x22, 0xFD, 0x9B, 0x44},
+    {0x00, 0x13, 0x26, 0x35, 0x4C, 0x5F, 0x6A, 0x79,
+     0x98, 0x8B, 0xBE, 0xAD, 0xD4, 0xC7, 0xF2, 0xE1,
+     0x37, 0x24, 0x11, 0x02, 0x7B, 0x68, 0x5D, 0x4E,
+     0xAF, 0xBC, 0x89, 0x9A, 0xE3, 0xF0, 0xC5, 0xD6,
+     0x6E, 0x7D, 0x48, 0x5B, 0x22, 0x31, 0x04, 0x17,
+     0xF6, 0xE5, 0xD0, 0xC3, 0xBA, 0xA9, 0x9C, 0x8F,
+     0x59, 0x4A, 0x7F, 0x6C, 0x15, 0x06, 0x33, 0x20,
+     0xC1, 0xD2, 0xE7, 0xF4, 0x8D, 0x9E, 0xAB, 0xB8,
+     0xDC, 0xCF, 0xFA, 0xE9, 0x90, 0x83, 0xB6, 0xA5,
+     0x44, 0x57, 0x62, 0x71, 0x08, 0x1B, 0x2E, 0x3D,
+     0xEB, 0xF8, 0xCD, 0xDE, 0xA7, 0xB4, 0x81, 0x92,
+     0x73, 0x60, 0x55, 0x46, 0x3F, 0x2C, 0x19, 0x0A,
+     0xB2, 0xA1, 0x94, 0x87, 0xFE, 0xED, 0xD8, 0xCB,
+     0x2A, 0x39, 0x0C, 0x1F, 0x66, 0x75, 0x40, 0x53,
+     0x85, 0x96, 0xA3, 0xB0, 0xC9, 0xDA, 0xEF, 0xFC,
+     0x1D, 0x0E, 0x3B, 0x28, 0x51, 0x42, 0x77, 0x64,
+     0xBF, 0xAC, 0x99, 0x8A, 0xF3, 0xE0, 0xD5, 0xC6,
+     0x27, 0x34, 0x01, 0x12, 0x6B, 0x78, 0x4D, 0x5E,
+     0x88, 0x9B, 0xAE, 0xBD, 0xC4, 0xD7, 0xE2, 0xF1,
+     0x10, 0x03, 0x36, 0x25, 0x5C, 0x4F, 0x7A, 0x69,
+     0xD1, 0xC2, 0xF7, 0xE4, 0x9D, 0x8E, 0xBB, 0xA8,
+     0x49, 0x5A, 0x6F, 0x7C, 0x05, 0x16, 0x23, 0x30,
+     0xE6, 0xF5, 0xC0, 0xD3, 0xAA, 0xB9, 0x8C, 0x9F,
+     0x7E, 0x6D, 0x58, 0x4B, 0x32, 0x21, 0x14, 0x07,
+     0x63, 0x70, 0x45, 0x56, 0x2F, 0x3C, 0x09, 0x1A,
+     0xFB, 0xE8, 0xDD, 0xCE, 0xB7, 0xA4, 0x91, 0x82,
+     0x54, 0x47, 0x72, 0x61, 0x18, 0x0B, 0x3E, 0x2D,
+     0xCC, 0xDF, 0xEA, 0xF9, 0x80, 0x93, 0xA6, 0xB5,
+     0x0D, 0x1E, 0x2B, 0x38, 0x41, 0x52, 0x67, 0x74,
+     0x95, 0x86, 0xB3, 0xA0, 0xD9, 0xCA, 0xFF, 0xEC,
+     0x3A, 0x29, 0x1C, 0x0F, 0x76, 0x65, 0x50, 0x43,
+     0xA2, 0xB1, 0x84, 0x97, 0xEE, 0xFD, 0xC8, 0xDB}};
+
+static const uint16_t crc16_slices[8][0x100] = {
+    {0x0000, 0x8005, 0x800F, 0x000A, 0x801B, 0x001E, 0x0014, 0x8011,
+     0x8033, 0x0036, 0x003C, 0x8039, 0x0028, 0x802D, 0x8027, 0x0022,
+     0x8063, 0x0066, 0x006C, 0x8069, 0x0078, 0x807D, 0x8077, 0x0072,
+     0x0050, 0x8055, 0x805F, 0x005A, 0x804B, 0x004E, 0x0044, 0x8041,
+     0x80C3, 0x00C6, 0x00CC, 0x80C9, 0x00D8, 0x80DD, 0x80D7, 0x00D2,
+     0x00F0, 0x80F5, 0x80FF, 0x00FA, 0x80EB, 0x00EE, 0x00E4, 0x80E1,
+     0x00A0, 0x80A5, 0x80AF, 0x00AA, 0x80BB, 0x00BE, 0x00B4, 0x80B1,
+     0x8093, 0x0096, 0x009C, 0x8099, 0x0088, 0x808D, 0x8087, 0x0082,
+     0x8183, 0x0186, 0x018C, 0x8189, 0x0198, 0x819D, 0x8197, 0x0192,
+     0x01B0, 0x81B5, 0x81BF, 0x01BA, 0x81AB, 0x01AE, 0x01A4, 0x81A1,
+     0x01E0, 0x81E5, 0x81EF, 0x01EA, 0x81FB, 0x01FE, 0x01F4, 0x81F1,
+     0x81D3, 0x01D6, 0x01DC, 0x81D9, 0x01C8, 0x81CD, 0x81C7, 0x01C2,
+     0x0140, 0x8145, 0x814F, 0x014A, 0x815B, 0x015E, 0x0154, 0x8151,
+     0x8173, 0x0176, 0x017C, 0x8179, 0x0168, 0x816D, 0x8167, 0x0162,
+     0x8123, 0x0126, 0x012C, 0x8129, 0x0138, 0x813D, 0x8137, 0x0132,
+     0x0110, 0x8115, 0x811F, 0x011A, 0x810B, 0x010E, 0x0104, 0x8101,
+     0x8303, 0x0306, 0x030C, 0x8309, 0x0318, 0x831D, 0x8317, 0x0312,
+     0x0330, 0x8335, 0x833F, 0x033A, 0x832B, 0x032E, 0x0324, 0x8321,
+     0x0360, 0x8365, 0x836F, 0x036A, 0x837B, 0x037E, 0x0374, 0x8371,
+     0x8353, 0x0356, 0x035C, 0x8359, 0x0348, 0x834D, 0x8347, 0x0342,
+     0x03C0, 0x83C5, 0x83CF, 0x03CA, 0x83DB, 0x03DE, 0x03D4, 0x83D1,
+     0x83F3, 0x03F6, 0x03FC, 0x83F9, 0x03E8, 0x83ED, 0x83E7, 0x03E2,
+     0x83A3, 0x03A6, 0x03AC, 0x83A9, 0x03B8, 0x83BD, 0x83B7, 0x03B2,
+     0x0390, 0x8395, 0x839F, 0x039A, 0x838B, 0x038E, 0x0384, 0x8381,
+     0x0280, 0x8285, 0x828F, 0x028A, 0x829B, 0x029E, 0x0294, 0x8291,
+     0x82B3, 0x02B6, 0x02BC, 0x82B9, 0x02A8, 0x82AD, 0x82A7, 0x02A2,
+     0x82E3, 0x02E6, 0x02EC, 0x82E9, 0x02F8, 0x82FD, 0x82F7, 0x02F2,
+     0x02D0, 0x82D5, 0x82DF, 0x02DA, 0x82CB, 0x02CE, 0x02C4, 0x82C1,
+     0x8243, 0x0246, 0x024C, 0x8249, 0x0258, 0x825D, 0x8257, 0x0252,
+     0x0270, 0x8275, 0x827F, 0x027A, 0x826B, 0x026E, 0x0264, 0x8261,
+     0x0220, 0x8225, 0x822F, 0x022A, 0x823B, 0x023E, 0x0234, 0x8231,
+     0x8213, 0x0216, 0x021C, 0x8219, 0x0208, 0x820D, 0x8207, 0x0202},
+    {0x0000, 0x8603, 0x8C03, 0x0A00, 0x9803, 0x1E00, 0x1400, 0x9203,
+     0xB003, 0x3600, 0x3C00, 0xBA03, 0x2800, 0xAE03, 0xA403, 0x2200,
+     0xE003, 0x6600, 0x6C00, 0xEA03, 0x7800, 0xFE03, 0xF403, 0x7200,
+     0x5000, 0xD603, 0xDC03, 0x5A00, 0xC803, 0x4E00, 0x4400, 0xC203,
+     0x4003, 0xC600, 0xCC00, 0x4A03, 0xD800, 0x5E03, 0x5403, 0xD200,
+     0xF000, 0x7603, 0x7C03, 0xFA00, 0x6803, 0xEE00, 0xE400, 0x6203,
+     0xA000, 0x2603, 0x2C03, 0xAA00, 0x3803, 0xBE00, 0xB400, 0x3203,
+     0x1003, 0x9600, 0x9C00, 0x1A03, 0x8800, 0x0E03, 0x0403, 0x8200,
+     0x8006, 0x0605, 0x0C05, 0x8A06, 0x1805, 0x9E06, 0x9406, 0x1205,
+     0x3005, 0xB606, 0xBC06, 0x3A05, 0xA806, 0x2E05, 0x2405, 0xA206,
+     0x6005, 0xE606, 0xEC06, 0x6A05, 0xF806, 0x7E05, 0x7405, 0xF206,
+     0xD006, 0x5605, 0x5C05, 0xDA06, 0x4805, 0xCE06, 0xC406, 0x4205,
+     0xC005, 0x4606, 0x4C06, 0xCA05, 0x5806, 0xDE05, 0xD405, 0x5206,
+     0x7006, 0xF605, 0xFC05, 0x7A06, 0xE805, 0x6E06, 0x6406, 0xE205,
+     0x2006, 0xA605, 0xAC05, 0x2A06, 0xB805, 0x3E06, 0x3406, 0xB205,
+     0x9005, 0x1606, 0x1C06, 0x9A05, 0x0806, 0x8E05, 0x8405, 0x0206,
+     0x8009, 0x060A, 0x0C0A, 0x8A09, 0x180A, 0x9E09, 0x9409, 0x120A,
+     0x300A, 0xB609, 0xBC09, 0x3A0A, 0xA809, 0x2E0A, 0x240A, 0xA209,
+     0x600A, 0xE609, 0xEC09, 0x6A0A, 0xF809, 0x7E0A, 0x740A, 0xF209,
+     0xD009, 0x560A, 0x5C0A, 0xDA09, 0x480A, 0xCE09, 0xC409, 0x420A,
+     0xC00A, 0x4609, 0x4C09, 0xCA0A, 0x5809, 0xDE0A, 0xD40A, 0x5209,
+     0x7009, 0xF60A, 0xFC0A, 0x7A09, 0xE80A, 0x6E09, 0x6409, 0xE20A,
+     0x2009, 0xA60A, 0xAC0A, 0x2A09, 0xB80A, 0x3E09, 0x3409, 0xB20A,
+     0x900A, 0x1609, 0x1C09, 0x9A0A, 0x0809, 0x8E0A, 0x840A, 0x0209,
+     0x000F, 0x860C, 0x8C0C, 0x0A0F, 0x980C, 0x1E0F, 0x140F, 0x920C,
+     0xB00C, 0x360F, 0x3C0F, 0xBA0C, 0x280F, 0xAE0C, 0xA40C, 0x220F,
+     0xE00C, 0x660F, 0x6C0F, 0xEA0C, 0x780F, 0xFE0C, 0xF40C, 0x720F,
+     0x500F, 0xD60C, 0xDC0C, 0x5A0F, 0xC80C, 0x4E0F, 0x440F, 0xC20C,
+     0x400C, 0xC60F, 0xCC0F, 0x4A0C, 0xD80F, 0x5E0C, 0x540C, 0xD20F,
+     0xF00F, 0x760C, 0x7C0C, 0xFA0F, 0x680C, 0xEE0F, 0xE40F, 0x620C,
+     0xA00F, 0x260C, 0x2C0C, 0xAA0F, 0x380C, 0xBE0F, 0xB40F, 0x320C,
+     0x100C, 0x960F, 0x9C0F, 0x1A0C, 0x880F, 0x0E0C, 0x040C, 0x820F},
+    {0x0000, 0x8017, 0x802B, 0x003C, 0x8053, 0x0044, 0x0078, 0x806F,
+     0x80A3, 0x00B4, 0x0088, 0x809F, 0x00F0, 0x80E7, 0x80DB, 0x00CC,
+     0x8143, 0x0154, 0x0168, 0x817F, 0x0110, 0x8107, 0x813B, 0x012C,
+     0x01E0, 0x81F7, 0x81CB, 0x01DC, 0x81B3, 0x01A4, 0x0198, 0x818F,
+     0x8283, 0x0294, 0x02A8, 0x82BF, 0x02D0, 0x82C7, 0x82FB, 0x02EC,
+     0x0220, 0x8237, 0x820B, 0x021C, 0x8273, 0x0264, 0x0258, 0x824F,
+     0x03C0, 0x83D7, 0x83EB, 0x03FC, 0x8393, 0x0384, 0x03B8, 0x83AF,
+     0x8363, 0x0374, 0x0348, 0x835F, 0x0330, 0x8327, 0x831B, 0x030C,
+     0x8503, 0x0514, 0x0528, 0x853F, 0x0550, 0x8547, 0x857B, 0x056C,
+     0x05A0, 0x85B7, 0x858B, 0x059C, 0x85F3, 0x05E4, 0x05D8, 0x85CF,
+     0x0440, 0x8457, 0x846B, 0x047C, 0x8413, 0x0404, 0x0438, 0x842F,
+     0x84E3, 0x04F4, 0x04C8, 0x84DF, 0x04B0, 0x84A7, 0x849B, 0x048C,
+     0x0780, 0x8797, 0x87AB, 0x07BC, 0x87D3, 0x07C4, 0x07F8, 0x87EF,
+     0x8723, 0x0734, 0x0708, 0x871F, 0x0770, 0x8767, 0x875B, 0x074C,
+     0x86C3, 0x06D4, 0x06E8, 0x86FF, 0x0690, 0x8687, 0x86BB, 0x06AC,
+     0x0660, 0x8677, 0x864B, 0x065C, 0x8633, 0x0624, 0x0618, 0x860F,
+     0x8A03, 0x0A14, 0x0A28, 0x8A3F, 0x0A50, 0x8A47, 0x8A7B, 0x0A6C,
+     0x0AA0, 0x8AB7, 0x8A8B, 0x0A9C, 0x8AF3, 0x0AE4, 0x0AD8, 0x8ACF,
+     0x0B40, 0x8B57, 0x8B6B, 0x0B7C, 0x8B13, 0x0B04, 0x0B38, 0x8B2F,
+     0x8BE3, 0x0BF4, 0x0BC8, 0x8BDF, 0x0BB0, 0x8BA7, 0x8B9B, 0x0B8C,
+     0x0880, 0x8897, 0x88AB, 0x08BC, 0x88D3, 0x08C4, 0x08F8, 0x88EF,
+     0x8823, 0x0834, 0x0808, 0x881F, 0x0870, 0x8867, 0x885B, 0x084C,
+     0x89C3, 0x09D4, 0x09E8, 0x89FF, 0x0990, 0x8987, 0x89BB, 0x09AC,
+     0x0960, 0x8977, 0x894B, 0x095C, 0x8933, 0x0924, 0x0918, 0x890F,
+     0x0F00, 0x8F17, 0x8F2B, 0x0F3C, 0x8F53, 0x0F44, 0x0F78, 0x8F6F,
+     0x8FA3, 0x0FB4, 0x0F88, 0x8F9F, 0x0FF0, 0x8FE7, 0x8FDB, 0x0FCC,
+     0x8E43, 0x0E54, 0x0E68, 0x8E7F, 0x0E10, 0x8E07, 0x8E3B, 0x0E2C,
+     0x0EE0, 0x8EF7, 0x8ECB, 0x0EDC, 0x8EB3, 0x0EA4, 0x0E98, 0x8E8F,
+     0x8D83, 0x0D94, 0x0DA8, 0x8DBF, 0x0DD0, 0x8DC7, 0x8DFB, 0x0DEC,
+     0x0D20, 0x8D37, 0x8D0B, 0x0D1C, 0x8D73, 0x0D64, 0x0D58, 0x8D4F,
+     0x0CC0, 0x8CD7, 0x8CEB, 0x0CFC, 0x8C93, 0x0C84, 0x0CB8, 0x8CAF,
+     0x8C63, 0x0C74, 0x0C48, 0x8C5F, 0x0C30, 0x8C27, 0x8C1B, 0x0C0C},
+    {0x0000, 0x9403, 0xA803, 0x3C00, 0xD003, 0x4400, 0x7800, 0xEC03,
+     0x2003, 0xB400, 0x8800, 0x1C03, 0xF000, 0x6403, 0x5803, 0xCC00,
+     0x4006, 0xD405, 0xE805, 0x7C06, 0x9005, 0x0406, 0x3806, 0xAC05,
+     0x6005, 0xF406, 0xC806, 0x5C05, 0xB006, 0x2405, 0x1805, 0x8C06,
+     0x800C, 0x140F, 0x280F, 0xBC0C, 0x500F, 0xC40C, 0xF80C, 0x6C0F,
+     0xA00F, 0x340C, 0x080C, 0x9C0F, 0x700C, 0xE40F, 0xD80F, 0x4C0C,
+     0xC00A, 0x5409, 0x6809, 0xFC0A, 0x1009, 0x840A, 0xB80A, 0x2C09,
+     0xE009, 0x740A, 0x480A, 0xDC09, 0x300A, 0xA409, 0x9809, 0x0C0A,
+     0x801D, 0x141E, 0x281E, 0xBC1D, 0x501E, 0xC41D, 0xF81D, 0x6C1E,
+     0xA01E, 0x341D, 0x081D, 0x9C1E, 0x701D, 0xE41E, 0xD81E, 0x4C1D,
+     0xC01B, 0x5418, 0x6818, 0xFC1B, 0x1018, 0x841B, 0xB81B, 0x2C18,
+     0xE018, 0x741B, 0x481B, 0xDC18, 0x301B, 0xA418, 0x9818, 0x0C1B,
+     0x0011, 0x9412, 0xA812, 0x3C11, 0xD012, 0x4411, 0x7811, 0xEC12,
+     0x2012, 0xB411, 0x8811, 0x1C12, 0xF011, 0x6412, 0x5812, 0xCC11,
+     0x4017, 0xD414, 0xE814, 0x7C17, 0x9014, 0x0417, 0x3817, 0xAC14,
+     0x6014, 0xF417, 0xC817, 0x5C14, 0xB017, 0x2414, 0x1814, 0x8C17,
+     0x803F, 0x143C, 0x283C, 0xBC3F, 0x503C, 0xC43F, 0xF83F, 0x6C3C,
+     0xA03C, 0x343F, 0x083F, 0x9C3C, 0x703F, 0xE43C, 0xD83C, 0x4C3F,
+     0xC039, 0x543A, 0x683A, 0xFC39, 0x103A, 0x8439, 0xB839, 0x2C3A,
+     0xE03A, 0x7439, 0x4839, 0xDC3A, 0x3039, 0xA43A, 0x983A, 0x0C39,
+     0x0033, 0x9430, 0xA830, 0x3C33, 0xD030, 0x4433, 0x7833, 0xEC30,
+     0x2030, 0xB433, 0x8833, 0x1C30, 0xF033, 0x6430, 0x5830, 0xCC33,
+     0x4035, 0xD436, 0xE836, 0x7C35, 0x9036, 0x0435, 0x3835, 0xAC36,
+     0x6036, 0xF435, 0xC835, 0x5C36, 0xB035, 0x2436, 0x1836, 0x8C35,
+     0x0022, 0x9421, 0xA821, 0x3C22, 0xD021, 0x4422, 0x7822, 0xEC21,
+     0x2021, 0xB422, 0x8822, 0x1C21, 0xF022, 0x6421, 0x5821, 0xCC22,
+     0x4024, 0xD427, 0xE827, 0x7C24, 0x9027, 0x0424, 0x3824, 0xAC27,
+     0x6027, 0xF424, 0xC824, 0x5C27, 0xB024, 0x2427, 0x1827, 0x8C24,
+     0x802E, 0x142D, 0x282D, 0xBC2E, 0x502D, 0xC42E, 0xF82E, 0x6C2D,
+     0xA02D, 0x342E, 0x082E, 0x9C2D, 0x702E, 0xE42D, 0xD82D, 0x4C2E,
+     0xC028, 0x542B, 0x682B, 0xFC28, 0x102B, 0x8428, 0xB828, 0x2C2B,
+     0xE02B, 0x7428, 0x4828, 0xDC2B, 0x3028, 0xA42B, 0x982B, 0x0C28},
+    {0x0000, 0x807B, 0x80F3, 0x0088, 0x81E3, 0x0198, 0x0110, 0x816B,
+     0x83C3, 0x03B8, 0x0330, 0x834B, 0x0220, 0x825B, 0x82D3, 0x02A8,
+     0x8783, 0x07F8, 0x0770, 0x870B, 0x0660, 0x861B, 0x8693, 0x06E8,
+     0x0440, 0x843B, 0x84B3, 0x04C8, 0x85A3, 0x05D8, 0x0550, 0x852B,
+     0x8F03, 0x0F78, 0x0FF0, 0x8F8B, 0x0EE0, 0x8E9B, 0x8E13, 0x0E68,
+     0x0CC0, 0x8CBB, 0x8C33, 0x0C48, 0x8D23, 0x0D58, 0x0DD0, 0x8DAB,
+     0x0880, 0x88FB, 0x8873, 0x0808, 0x8963, 0x0918, 0x0990, 0x89EB,
+     0x8B43, 0x0B38, 0x0BB0, 0x8BCB, 0x0AA0, 0x8ADB, 0x8A53, 0x0A28,
+     0x9E03, 0x1E78, 0x1EF0, 0x9E8B, 0x1FE0, 0x9F9B, 0x9F13, 0x1F68,
+     0x1DC0, 0x9DBB, 0x9D33, 0x1D48, 0x9C23, 0x1C58, 0x1CD0, 0x9CAB,
+     0x1980, 0x99FB, 0x9973, 0x1908, 0x9863, 0x1818, 0x1890, 0x98EB,
+     0x9A43, 0x1A38, 0x1AB0, 0x9ACB, 0x1BA0, 0x9BDB, 0x9B53, 0x1B28,
+     0x1100, 0x917B, 0x91F3, 0x1188, 0x90E3, 0x1098, 0x1010, 0x906B,
+     0x92C3, 0x12B8, 0x1230, 0x924B, 0x1320, 0x935B, 0x93D3, 0x13A8,
+     0x9683, 0x16F8, 0x1670, 0x960B, 0x1760, 0x971B, 0x9793, 0x17E8,
+     0x1540, 0x953B, 0x95B3, 0x15C8, 0x94A3, 0x14D8, 0x1450, 0x942B,
+     0xBC03, 0x3C78, 0x3CF0, 0xBC8B, 0x3DE0, 0xBD9B, 0xBD13, 0x3D68,
+     0x3FC0, 0xBFBB, 0xBF33, 0x3F48, 0xBE23, 0x3E58, 0x3ED0, 0xBEAB,
+     0x3B80, 0xBBFB, 0xBB73, 0x3B08, 0xBA63, 0x3A18, 0x3A90, 0xBAEB,
+     0xB843, 0x3838, 0x38B0, 0xB8CB, 0x39A0, 0xB9DB, 0xB953, 0x3928,
+     0x3300, 0xB37B, 0xB3F3, 0x3388, 0xB2E3, 0x3298, 0x3210, 0xB26B,
+     0xB0C3, 0x30B8, 0x3030, 0xB04B, 0x3120, 0xB15B, 0xB1D3, 0x31A8,
+     0xB483, 0x34F8, 0x3470, 0xB40B, 0x3560, 0xB51B, 0xB593, 0x35E8,
+     0x3740, 0xB73B, 0xB7B3, 0x37C8, 0xB6A3, 0x36D8, 0x3650, 0xB62B,
+     0x2200, 0xA27B, 0xA2F3, 0x2288, 0xA3E3, 0x2398, 0x2310, 0xA36B,
+     0xA1C3, 0x21B8, 0x2130, 0xA14B, 0x2020, 0xA05B, 0xA0D3, 0x20A8,
+     0xA583, 0x25F8, 0x2570, 0xA50B, 0x2460, 0xA41B, 0xA493, 0x24E8,
+     0x2640, 0xA63B, 0xA6B3, 0x26C8, 0xA7A3, 0x27D8, 0x2750, 0xA72B,
+     0xAD03, 0x2D78, 0x2DF0, 0xAD8B, 0x2CE0, 0xAC9B, 0xAC13, 0x2C68,
+     0x2EC0, 0xAEBB, 0xAE33, 0x2E48, 0xAF23, 0x2F58, 0x2FD0, 0xAFAB,
+     0x2A80, 0xAAFB, 0xAA73, 0x2A08, 0xAB63, 0x2B18, 0x2B90, 0xABEB,
+     0xA943, 0x2938, 0x29B0, 0xA9CB, 0x28A0, 0xA8DB, 0xA853, 0x2828},
+    {0x0000, 0xF803, 0x7003, 0x8800, 0xE006, 0x1805, 0x9005, 0x6806,
+     0x4009, 0xB80A, 0x300A, 0xC809, 0xA00F, 0x580C, 0xD00C, 0x280F,
+     0x8012, 0x7811, 0xF011, 0x0812, 0x6014, 0x9817, 0x1017, 0xE814,
+     0xC01B, 0x3818, 0xB018, 0x481B, 0x201D, 0xD81E, 0x501E, 0xA81D,
+     0x8021, 0x7822, 0xF022, 0x0821, 0x6027, 0x9824, 0x1024, 0xE827,
+     0xC028, 0x382B, 0xB02B, 0x4828, 0x202E, 0xD82D, 0x502D, 0xA82E,
+     0x0033, 0xF830, 0x7030, 0x8833, 0xE035, 0x1836, 0x9036, 0x6835,
+     0x403A, 0xB839, 0x3039, 0xC83A, 0xA03C, 0x583F, 0xD03F, 0x283C,
+     0x8047, 0x7844, 0xF044, 0x0847, 0x6041, 0x9842, 0x1042, 0xE841,
+     0xC04E, 0x384D, 0xB04D, 0x484E, 0x2048, 0xD84B, 0x504B, 0xA848,
+     0x0055, 0xF856, 0x7056, 0x8855, 0xE053, 0x1850, 0x9050, 0x6853,
+     0x405C, 0xB85F, 0x305F, 0xC85C, 0xA05A, 0x5859, 0xD059, 0x285A,
+     0x0066, 0xF865, 0x7065, 0x8866, 0xE060, 0x1863, 0x9063, 0x6860,
+     0x406F, 0xB86C, 0x306C, 0xC86F, 0xA069, 0x586A, 0xD06A, 0x2869,
+     0x8074, 0x7877, 0xF077, 0x0874, 0x6072, 0x9871, 0x1071, 0xE872,
+     0xC07D, 0x387E, 0xB07E, 0x487D, 0x207B, 0xD878, 0x5078, 0xA87B,
+     0x808B, 0x7888, 0xF088, 0x088B, 0x608D, 0x988E, 0x108E, 0xE88D,
+     0xC082, 0x3881, 0xB081, 0x4882, 0x2084, 0xD887, 0x5087, 0xA884,
+     0x0099, 0xF89A, 0x709A, 0x8899, 0xE09F, 0x189C, 0x909C, 0x689F,
+     0x4090, 0xB893, 0x3093, 0xC890, 0xA096, 0x5895, 0xD095, 0x2896,
+     0x00AA, 0xF8A9, 0x70A9, 0x88AA, 0xE0AC, 0x18AF, 0x90AF, 0x68AC,
+     0x40A3, 0xB8A0, 0x30A0, 0xC8A3, 0xA0A5, 0x58A6, 0xD0A6, 0x28A5,
+     0x80B8, 0x78BB, 0xF0BB, 0x08B8, 0x60BE, 0x98BD, 0x10BD, 0xE8BE,
+     0xC0B1, 0x38B2, 0xB0B2, 0x48B1, 0x20B7, 0xD8B4, 0x50B4, 0xA8B7,
+     0x00CC, 0xF8CF, 0x70CF, 0x88CC, 0xE0CA, 0x18C9, 0x90C9, 0x68CA,
+     0x40C5, 0xB8C6, 0x30C6, 0xC8C5, 0xA0C3, 0x58C0, 0xD0C0, 0x28C3,
+     0x80DE, 0x78DD, 0xF0DD, 0x08DE, 0x60D8, 0x98DB, 0x10DB, 0xE8D8,
+     0xC0D7, 0x38D4, 0xB0D4, 0x48D7, 0x20D1, 0xD8D2, 0x50D2, 0xA8D1,
+     0x80ED, 0x78EE, 0xF0EE, 0x08ED, 0x60EB, 0x98E8, 0x10E8, 0xE8EB,
+     0xC0E4, 0x38E7, 0xB0E7, 0x48E4, 0x20E2, 0xD8E1, 0x50E1, 0xA8E2,
+     0x00FF, 0xF8FC, 0x70FC, 0x88FF, 0xE0F9, 0x18FA, 0x90FA, 0x68F9,
+     0x40F6, 0xB8F5, 0x30F5, 0xC8F6, 0xA0F0, 0x58F3, 0xD0F3, 0x28F0},
+    {0x0000, 0x8113, 0x8223, 0x0330, 0x8443, 0x0550, 0x0660, 0x8773,
+     0x8883, 0x0990, 0x0AA0, 0x8BB3, 0x0CC0, 0x8DD3, 0x8EE3, 0x0FF0,
+     0x9103, 0x1010, 0x1320, 0x9233, 0x1540, 0x9453, 0x9763, 0x1670,
+     0x1980, 0x9893, 0x9BA3, 0x1AB0, 0x9DC3, 0x1CD0, 0x1FE0, 0x9EF3,
+     0xA203, 0x2310, 0x2020, 0xA133, 0x2640, 0xA753, 0xA463, 0x2570,
+     0x2A80, 0xAB93, 0xA8A3, 0x29B0, 0xAEC3, 0x2FD0, 0x2CE0, 0xADF3,
+     0x3300, 0xB213, 0xB123, 0x3030, 0xB743, 0x3650, 0x3560, 0xB473,
+     0xBB83, 0x3A90, 0x39A0, 0xB8B3, 0x3FC0, 0xBED3, 0xBDE3, 0x3CF0,
+     0xC403, 0x4510, 0x4620, 0xC733, 0x4040, 0xC153, 0xC263, 0x4370,
+     0x4C80, 0xCD93, 0xCEA3, 0x4FB0, 0xC8C3, 0x49D0, 0x4AE0, 0xCBF3,
+     0x5500, 0xD413, 0xD723, 0x5630, 0xD143, 0x5050, 0x5360, 0xD273,
+     0xDD83, 0x5C90, 0x5FA0, 0xDEB3, 0x59C0, 0xD8D3, 0xDBE3, 0x5AF0,
+     0x6600, 0xE713, 0xE423, 0x6530, 0xE243, 0x6350, 0x6060, 0xE173,
+     0xEE83, 0x6F90, 0x6CA0, 0xEDB3, 0x6AC0, 0xEBD3, 0xE8E3, 0x69F0,
+     0xF703, 0x7610, 0x7520, 0xF433, 0x7340, 0xF253, 0xF163, 0x7070,
+     0x7F80, 0xFE93, 0xFDA3, 0x7CB0, 0xFBC3, 0x7AD0, 0x79E0, 0xF8F3,
+     0x0803, 0x8910, 0x8A20, 0x0B33, 0x8C40, 0x0D53, 0x0E63, 0x8F70,
+     0x8080, 0x0193, 0x02A3, 0x83B0, 0x04C3, 0x85D0, 0x86E0, 0x07F3,
+     0x9900, 0x1813, 0x1B23, 0x9A30, 0x1D43, 0x9C50, 0x9F60, 0x1E73,
+     0x1183, 0x9090, 0x93A0, 0x12B3, 0x95C0, 0x14D3, 0x17E3, 0x96F0,
+     0xAA00, 0x2B13, 0x2823, 0xA930, 0x2E43, 0xAF50, 0xAC60, 0x2D73,
+     0x2283, 0xA390, 0xA0A0, 0x21B3, 0xA6C0, 0x27D3, 0x24E3, 0xA5F0,
+     0x3B03, 0xBA10, 0xB920, 0x3833, 0xBF40, 0x3E53, 0x3D63, 0xBC70,
+     0xB380, 0x3293, 0x31A3, 0xB0B0, 0x37C3, 0xB6D0, 0xB5E0, 0x34F3,
+     0xCC00, 0x4D13, 0x4E23, 0xCF30, 0x4843, 0xC950, 0xCA60, 0x4B73,
+     0x4483, 0xC590, 0xC6A0, 0x47B3, 0xC0C0, 0x41D3, 0x42E3, 0xC3F0,
+     0x5D03, 0xDC10, 0xDF20, 0x5E33, 0xD940, 0x5853, 0x5B63, 0xDA70,
+     0xD580, 0x5493, 0x57A3, 0xD6B0, 0x51C3, 0xD0D0, 0xD3E0, 0x52F3,
+     0x6E03, 0xEF10, 0xEC20, 0x6D33, 0xEA40, 0x6B53, 0x6863, 0xE970,
+     0xE680, 0x6793, 0x64A3, 0xE5B0, 0x62C3, 0xE3D0, 0xE0E0, 0x61F3,
+     0xFF00, 0x7E13, 0x7D23, 0xFC30, 0x7B43, 0xFA50, 0xF960, 0x7873,
+     0x7783, 0xF690, 0xF5A0, 0x74B3, 0xF3C0, 0x72D3, 0x71E3, 0xF0F0},
+    {0x0000, 0x1006, 0x200C, 0x300A, 0x4018, 0x501E, 0x6014, 0x7012,
+     0x8030, 0x9036, 0xA03C, 0xB03A, 0xC028, 0xD02E, 0xE024, 0xF022,
+     0x8065, 0x9063, 0xA069, 0xB06F, 0xC07D, 0xD07B, 0xE071, 0xF077,
+     0x0055, 0x1053, 0x2059, 0x305F, 0x404D, 0x504B, 0x6041, 0x7047,
+     0x80CF, 0x90C9, 0xA0C3, 0xB0C5, 0xC0D7, 0xD0D1, 0xE0DB, 0xF0DD,
+     0x00FF, 0x10F9, 0x20F3, 0x30F5, 0x40E7, 0x50E1, 0x60EB, 0x70ED,
+     0x00AA, 0x10AC, 0x20A6, 0x30A0, 0x40B2, 0x50B4, 0x60BE, 0x70B8,
+     0x809A, 0x909C, 0xA096, 0xB090, 0xC082, 0xD084, 0xE08E, 0xF088,
+     0x819B, 0x919D, 0xA197, 0xB191, 0xC183, 0xD185, 0xE18F, 0xF189,
+     0x01AB, 0x11AD, 0x21A7, 0x31A1, 0x41B3, 0x51B5, 0x61BF, 0x71B9,
+     0x01FE, 0x11F8, 0x21F2, 0x31F4, 0x41E6, 0x51E0, 0x61EA, 0x71EC,
+     0x81CE, 0x91C8, 0xA1C2, 0xB1C4, 0xC1D6, 0xD1D0, 0xE1DA, 0xF1DC,
+     0x0154, 0x1152, 0x2158, 0x315E, 0x414C, 0x514A, 0x6140, 0x7146,
+     0x8164, 0x9162, 0xA168, 0xB16E, 0xC17C, 0xD17A, 0xE170, 0xF176,
+     0x8131, 0x9137, 0xA13D, 0xB13B, 0xC129, 0xD12F, 0xE125, 0xF123,
+     0x0101, 0x1107, 0x210D, 0x310B, 0x4119, 0x511F, 0x6115, 0x7113,
+     0x8333, 0x9335, 0xA33F, 0xB339, 0xC32B, 0xD32D, 0xE327, 0xF321,
+     0x0303, 0x1305, 0x230F, 0x3309, 0x431B, 0x531D, 0x6317, 0x7311,
+     0x0356, 0x1350, 0x235A, 0x335C, 0x434E, 0x5348, 0x6342, 0x7344,
+     0x8366, 0x9360, 0xA36A, 0xB36C, 0xC37E, 0xD378, 0xE372, 0xF374,
+     0x03FC, 0x13FA, 0x23F0, 0x33F6, 0x43E4, 0x53E2, 0x63E8, 0x73EE,
+     0x83CC, 0x93CA, 0xA3C0, 0xB3C6, 0xC3D4, 0xD3D2, 0xE3D8, 0xF3DE,
+     0x8399, 0x939F, 0xA395, 0xB393, 0xC381, 0xD387, 0xE38D, 0xF38B,
+     0x03A9, 0x13AF, 0x23A5, 0x33A3, 0x43B1, 0x53B7, 0x63BD, 0x73BB,
+     0x02A8, 0x12AE, 0x22A4, 0x32A2, 0x42B0, 0x52B6, 0x62BC, 0x72BA,
+     0x8298, 0x929E, 0xA294, 0xB292, 0xC280, 0xD286, 0xE28C, 0xF28A,
+     0x82CD, 0x92CB, 0xA2C1, 0xB2C7, 0xC2D5, 0xD2D3, 0xE2D9, 0xF2DF,
+     0x02FD, 0x12FB, 0x22F1, 0x32F7, 0x42E5, 0x52E3, 0x62E9, 0x72EF,
+     0x8267, 0x9261, 0xA26B, 0xB26D, 0xC27F, 0xD279, 0xE273, 0xF275,
+     0x0257, 0x1251, 0x225B, 0x325D, 0x424F, 0x5249, 0x6243, 0x7245,
+     0x0202, 0x1204, 0x220E, 0x3208, 0x421A, 0x521C, 0x6216, 0x7210,
+     0x8232, 0x9234, 0xA23E, 0xB238, 0xC22A, 0xD22C, 0xE226, 0xF220}};
+
+void
+flac_crc8_span(const uint8_t *bytes, unsigned count, void *checksum)
+{
+    uint32_t crc = *((uint32_t*)checksum) & 0xFF;
+
+    for (; count >= 8; count -= 8) {
+        crc = (crc8_slices[7][bytes[0] ^ crc] ^
+               crc8_slices[6][bytes[1]] ^
+               crc8_slices[5][bytes[2]] ^
+               crc8_slices[4][bytes[3]] ^
+               crc8_slices[3][bytes[4]] ^
+               crc8_slices[2][bytes[5]] ^
+               crc8_slices[1][bytes[6]] ^
+               crc8_slices[0][bytes[7]]);
+        bytes += 8;
+    }
+
+    for (; count > 0; count--)
+        crc = crc8_slices[0][crc ^ *bytes++];
+
+    *((uint32_t*)checksum) = crc;
+}
+
+void
+flac_crc16_span(const uint8_t *bytes, unsigned count, void *checksum)
+{
+    uint32_t crc = *((uint32_t*)checksum) & 0xFFFF;
+
+    for (; count >= 8; count -= 8) {
+        crc = (crc16_slices[7][bytes[0] ^ (crc >> 8)] ^
+               crc16_slices[6][bytes[1] ^ (crc & 0xFF)] ^
+               crc16_slices[5][bytes[2]] ^
+               crc16_slices[4][bytes[3]] ^
+               crc16_slices[3][bytes[4]] ^
+               crc16_slices[2][bytes[5]] ^
+               crc16_slices[1][bytes[6]] ^
+               crc16_slices[0][bytes[7]]);
+        bytes += 8;
+    }
+
+    for (; count > 0; count--)
+        crc = (crc16_slices[0][(crc >> 8) ^ *bytes++] ^ (crc << 8)) & 0xFFFF;
+
+    *((uint32_t*)checksum) = crc;
+}
@@ -8,3 +8,15 @@ flac_crc8(uint8_t byte, void *checksum);
 
 void
 flac_crc16(uint8_t byte, void *checksum);
+
+/*given a span of bytes and the previous checksum value,
+  assigns a new checksum to that value
+
+  these compute the same checksums as the byte-at-a-time
+  functions above, but 8 bytes at a time*/
+
+void
+flac_crc8_span(const uint8_t *bytes, unsigned count, void *checksum);
+
+void
+flac_crc16_span(const uint8_t *bytes, unsigned count, void *checksum);
@@ -5,3 +5,11 @@
 
 void
 ogg_crc(uint8_t byte, void *checksum);
+
+/*given a span of bytes and the previous checksum value,
+  assigns a new checksum to that value
+
+  this computes the same checksum as ogg_crc, but 8 bytes at a time*/
+
+void
+ogg_crc_span(const uint8_t *bytes, unsigned count, void *checksum);
@@ -1,5 +1,6 @@
 #include "flac.h"
 #include "../pcmconv.h"
+#include <pthread.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -26,6 +27,7 @@ FlacDecoder_init(decoders_FlacDecoder *self,
 {
     char* filename;
     int stream_offset = 0;
+    int threads = 1;
 
     self->filename = NULL;
     self->file = NULL;
@@ -36,11 +38,21 @@ FlacDecoder_init(decoders_FlacDecoder *self,
     self->framelist_data = array_i_new();
     self->audiotools_pcm = NULL;
     self->remaining_samples = 0;
-
-    if (!PyArg_ParseTuple(args, "si|i",
+    self->seektable.total_points = 0;
+    self->seektable.seekpoints = NULL;
+    self->skip_samples = 0;
+    self->seeked = 0;
+    self->skip_md5 = 0;
+    self->ranges = NULL;
+    self->range_count = 0;
+    self->current_range = 0;
+    self->current_frame = 0;
+
+    if (!PyArg_ParseTuple(args, "si|ii",
                           &filename,
                           &(self->channel_mask),
-                          &stream_offset))
+                          &stream_offset,
+                          &threads))
         return -1;
 
     if (self->channel_mask < 0) {
@@ -51,6 +63,11 @@ FlacDecoder_init(decoders_FlacDecoder *self,
         PyErr_SetString(PyExc_ValueError, "stream offset must be >= 0");
         return -1;
     }
+    if (threads < 1) {
+        PyErr_SetString(PyExc_ValueError, "threads must be >= 1");
+        return -1;
+    }
+    self->threads = (unsigned)threads;
 
     /*open the flac file*/
     self->file = fopen(filename, "rb");
@@ -68,19 +85,28 @@ FlacDecoder_init(decoders_FlacDecoder *self,
     self->filename = strdup(filename);
 
     /*read the STREAMINFO block and setup the total number of samples to read*/
-    if (flacdec_read_metadata(self->bitstream, &(self->streaminfo))) {
+    if (flacdec_read_metadata(self->bitstream,
+                              &(self->streaminfo),
+                              &(self->seektable))) {
         self->streaminfo.channels = 0;
         return -1;
     }
 
+    /*seekpoint offsets are relative to the first frame*/
+    self->stream_start = br_ftell(self->bitstream);
+
     self->remaining_samples = self->streaminfo.total_samples;
 
     /*initialize the output MD5 sum*/
     audiotools__MD5Init(&(self->md5));
     self->stream_finalized = 0;
 
-    /*add callback for CRC16 calculation*/
-    br_add_callback(self->bitstream, flac_crc16, &(self->crc16));
+    /*add checksum for CRC16 calculation*/
+    br_add_checksum(self->bitstream, flac_crc16_span, &(self->crc16));
+
+    /*give each additional thread its own view of the stream*/
+    if ((self->threads > 1) && flacdec_open_ranges(self))
+        return -1;
 
     /*setup a framelist generator function*/
     if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
@@ -89,6 +115,14 @@ FlacDecoder_init(decoders_FlacDecoder *self,
     return 0;
 }
 
+static PyObject*
+FlacDecoder_skip_md5(decoders_FlacDecoder* self, PyObject *args)
+{
+    self->skip_md5 = 1;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 PyObject*
 FlacDecoder_close(decoders_FlacDecoder* self,
                   PyObject *args)
@@ -107,6 +141,12 @@ FlacDecoder_dealloc(decoders_FlacDecoder *self)
     self->framelist_data->del(self->framelist_data);
     Py_XDECREF(self->audiotools_pcm);
 
+    if (self->seektable.seekpoints != NULL)
+        free(self->seektable.seekpoints);
+
+    if (self->ranges != NULL)
+        flacdec_close_ranges(self);
+
     if (self->filename != NULL)
         free(self->filename);
 
@@ -129,11 +169,13 @@ FlacDecoder_new(PyTypeObject *type,
 
 int
 flacdec_read_metadata(BitstreamReader *bitstream,
-                      struct flac_STREAMINFO *streaminfo)
+                      struct flac_STREAMINFO *streaminfo,
+                      struct flac_SEEKTABLE *seektable)
 {
     unsigned int last_block;
     unsigned int block_type;
     unsigned int block_length;
+    unsigned int i;
 
     if (!setjmp(*br_try(bitstream))) {
         if (bitstream->read(bitstream, 32) != 0x664C6143u) {
@@ -166,6 +208,20 @@ flacdec_read_metadata(BitstreamReader *bitstream,
                     bitstream->read_64(bitstream, 36);
 
                 bitstream->read_bytes(bitstream, streaminfo->md5sum, 16);
+            } else if ((block_type == 3) && (seektable->seekpoints == NULL)) {
+                seektable->total_points = block_length / 18;
+                seektable->seekpoints =
+                    malloc(sizeof(struct flac_SEEKPOINT) *
+                           MAX(seektable->total_points, 1));
+                for (i = 0; i < seektable->total_points; i++) {
+                    seektable->seekpoints[i].sample_number =
+                        bitstream->read_64(bitstream, 64);
+                    seektable->seekpoints[i].byte_offset =
+                        bitstream->read_64(bitstream, 64);
+                    seektable->seekpoints[i].samples =
+                        bitstream->read(bitstream, 16);
+                }
+                bitstream->skip(bitstream, (block_length % 18) * 8);
             } else {
                 bitstream->skip(bitstream, block_length * 8);
             }
@@ -237,6 +293,9 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
         }
     }
 
+    if (self->threads > 1)
+        return flacdec_read_threaded(self);
+
     thread_state = PyEval_SaveThread();
     self->crc16 = 0;
 
@@ -275,17 +334,28 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
         /*check CRC-16*/
         self->bitstream->byte_align(self->bitstream);
         self->bitstream->read(self->bitstream, 16);
+        br_update_checksums(self->bitstream);
         if (self->crc16 != 0) {
             PyEval_RestoreThread(thread_state);
             PyErr_SetString(PyExc_ValueError, "invalid checksum in frame");
             goto error;
         }
 
+        /*drop any PCM frames before a seek point in the middle of the frame*/
+        if (self->skip_samples > 0) {
+            self->framelist_data->de_head(self->framelist_data,
+                                          self->skip_samples *
+                                          frame_header.channel_count,
+                                          self->framelist_data);
+            self->skip_samples = 0;
+        }
+
         /*decrement remaining samples*/
         self->remaining_samples -= frame_header.block_size;
     } else {
         /*handle I/O error during read*/
         PyEval_RestoreThread(thread_state);
+        flacdec_pop_frame_checksums(self);
         PyErr_SetString(PyExc_IOError, "EOF reading frame");
         goto error;
     }
@@ -378,6 +448,7 @@ FlacDecoder_offsets(decoders_FlacDecoder* self, PyObject *args)
         } else {
             /*handle I/O error during read*/
             PyEval_RestoreThread(thread_state);
+            flacdec_pop_frame_checksums(self);
             PyErr_SetString(PyExc_IOError, "EOF reading frame");
             goto error;
         }
@@ -395,6 +466,563 @@ FlacDecoder_offsets(decoders_FlacDecoder* self, PyObject *args)
     return NULL;
 }
 
+static PyObject*
+FlacDecoder_seek(decoders_FlacDecoder* self, PyObject *args)
+{
+    long long seekpoint;
+    uint64_t pcm_frame;
+    uint64_t frame_start;
+    flac_status status = OK;
+    PyThreadState *thread_state;
+
+    if (!PyArg_ParseTuple(args, "L", &seekpoint))
+        return NULL;
+
+    if (seekpoint < 0) {
+        PyErr_SetString(PyExc_ValueError, "seekpoint must be >= 0");
+        return NULL;
+    }
+
+    pcm_frame = MIN((uint64_t)seekpoint, self->streaminfo.total_samples);
+
+    thread_state = PyEval_SaveThread();
+
+    /*the CRC-16 isn't needed while searching for frames*/
+    br_pop_checksum(self->bitstream, NULL);
+
+    if (pcm_frame < self->streaminfo.total_samples)
+        frame_start = flacdec_seek_frame(self, pcm_frame, &status);
+    else
+        frame_start = pcm_frame;
+
+    br_add_checksum(self->bitstream, flac_crc16_span, &(self->crc16));
+
+    PyEval_RestoreThread(thread_state);
+
+    switch (status) {
+    case OK:
+        break;
+    case ERROR:
+        PyErr_SetString(PyExc_IOError, "EOF while seeking frame");
+        return NULL;
+    default:
+        PyErr_SetString(PyExc_ValueError, FlacDecoder_strerror(status));
+        return NULL;
+    }
+
+    self->remaining_samples = (self->streaminfo.total_samples - frame_start);
+    self->skip_samples = (uint32_t)(pcm_frame - frame_start);
+    self->stream_finalized = 0;
+
+    /*any frames decoded ahead by threads are no longer needed*/
+    self->range_count = 0;
+
+    /*the MD5 sum can only be verified when decoding the whole stream*/
+    audiotools__MD5Init(&(self->md5));
+    self->seeked = (pcm_frame != 0);
+
+    return Py_BuildValue("K", (unsigned PY_LONG_LONG)pcm_frame);
+}
+
+int
+flacdec_sync_frame(decoders_FlacDecoder* self,
+                   long offset,
+                   long limit,
+                   long* frame_offset,
+                   uint64_t* frame_sample)
+{
+    BitstreamReader* bitstream = self->bitstream;
+    long candidate;
+
+    bitstream->byte_align(bitstream);
+    fseek(self->file, offset, SEEK_SET);
+
+    if (!setjmp(*br_try(bitstream))) {
+        while ((candidate = br_ftell(bitstream)) < limit) {
+            /*look for the 0xFFF8 or 0xFFF9 sync code*/
+            if (bitstream->read(bitstream, 8) != 0xFF)
+                continue;
+            if ((bitstream->read(bitstream, 8) & 0xFE) != 0xF8) {
+                fseek(self->file, candidate + 1, SEEK_SET);
+                continue;
+            }
+
+            /*and ensure it begins a whole valid frame,
+              since a sync code and header CRC-8 can turn up by chance
+              in another frame's data*/
+            if (flacdec_verify_frame(self, candidate, frame_sample)) {
+                br_etry(bitstream);
+                fseek(self->file, candidate, SEEK_SET);
+                *frame_offset = candidate;
+                return 1;
+            } else {
+                /*otherwise, resume searching just past the false match*/
+                fseek(self->file, candidate + 1, SEEK_SET);
+            }
+        }
+
+        br_etry(bitstream);
+        return 0;
+    } else {
+        /*EOF before finding a frame header,
+          so remove any CRC-8 checksum left by the interrupted header*/
+        br_etry(bitstream);
+        while (bitstream->checksums != NULL)
+            br_pop_checksum(bitstream, NULL);
+        bitstream->byte_align(bitstream);
+        return 0;
+    }
+}
+
+int
+flacdec_verify_frame(decoders_FlacDecoder* self,
+                     long offset,
+                     uint64_t* frame_sample)
+{
+    BitstreamReader* bitstream = self->bitstream;
+    struct flac_frame_header frame_header;
+    uint32_t crc16 = 0;
+    int valid = 0;
+    int channel;
+
+    bitstream->byte_align(bitstream);
+    fseek(self->file, offset, SEEK_SET);
+    br_add_checksum(bitstream, flac_crc16_span, &crc16);
+
+    if (!setjmp(*br_try(bitstream))) {
+        if (flacdec_read_frame_header(bitstream,
+                                      &(self->streaminfo),
+                                      &frame_header) == OK) {
+            if (frame_header.blocking_strategy == 0)
+                *frame_sample = (frame_header.frame_number *
+                                 self->streaminfo.maximum_block_size);
+            else
+                *frame_sample = frame_header.frame_number;
+
+            valid = (*frame_sample < self->streaminfo.total_samples);
+        }
+
+        self->subframe_data->reset(self->subframe_data);
+        for (channel = 0;
+             valid && (channel < frame_header.channel_count);
+             channel++)
+            valid = (flacdec_read_subframe(
+                         bitstream,
+                         self->qlp_coeffs,
+                         self->residuals,
+                         (unsigned int)MIN(frame_header.block_size,
+                                           self->streaminfo.total_samples -
+                                           *frame_sample),
+                         flacdec_subframe_bits_per_sample(&frame_header,
+                                                          channel),
+                         self->subframe_data->append(self->subframe_data)) ==
+                     OK);
+
+        if (valid) {
+            bitstream->byte_align(bitstream);
+            bitstream->read(bitstream, 16);
+            br_update_checksums(bitstream);
+            valid = (crc16 == 0);
+        }
+
+        br_etry(bitstream);
+    } else {
+        /*a false match may claim a frame running past EOF*/
+        br_etry(bitstream);
+        valid = 0;
+    }
+
+    /*remove the CRC-16 along with any CRC-8 left above it*/
+    while (bitstream->checksums->data != &crc16)
+        br_pop_checksum(bitstream, NULL);
+    br_pop_checksum(bitstream, NULL);
+    bitstream->byte_align(bitstream);
+
+    return valid;
+}
+
+uint64_t
+flacdec_seek_frame(decoders_FlacDecoder* self,
+                   uint64_t pcm_frame,
+                   flac_status* status)
+{
+    BitstreamReader* bitstream = self->bitstream;
+    struct flac_frame_header frame_header;
+    struct flac_SEEKPOINT* seekpoint;
+    long low = self->stream_start;
+    uint64_t low_sample = 0;
+    long high;
+    long middle;
+    long frame_offset = 0;
+    uint64_t frame_sample;
+    unsigned i;
+    int channel;
+
+    fseek(self->file, 0, SEEK_END);
+    high = ftell(self->file);
+
+    /*narrow the search to the seekpoints on either side of "pcm_frame"*/
+    for (i = 0; i < self->seektable.total_points; i++) {
+        seekpoint = &(self->seektable.seekpoints[i]);
+        if (seekpoint->sample_number == 0xFFFFFFFFFFFFFFFFull) {
+            /*placeholder points carry no position*/
+            continue;
+        } else if (seekpoint->sample_number <= pcm_frame) {
+            if (seekpoint->sample_number >= low_sample) {
+                low = self->stream_start + (long)seekpoint->byte_offset;
+                low_sample = seekpoint->sample_number;
+            }
+        } else if ((self->stream_start +
+                    (long)seekpoint->byte_offset) < high) {
+            high = self->stream_start + (long)seekpoint->byte_offset;
+        }
+    }
+
+    /*then bisect the remaining range by frame headers
+      until it's small enough to decode through*/
+    while ((high - low) > (long)MAX(self->streaminfo.maximum_frame_size * 2,
+                                    FLAC_SEEK_DECODE_BYTES)) {
+        middle = low + ((high - low) / 2);
+        if (flacdec_sync_frame(self, middle, high,
+                               &frame_offset, &frame_sample) &&
+            (frame_sample <= pcm_frame)) {
+            low = frame_offset;
+            low_sample = frame_sample;
+        } else {
+            high = middle;
+        }
+    }
+
+    /*finally, walk forward frame-by-frame to the one containing "pcm_frame"*/
+    bitstream->byte_align(bitstream);
+    fseek(self->file, low, SEEK_SET);
+
+    if (!setjmp(*br_try(bitstream))) {
+        for (frame_offset = low; ; frame_offset = br_ftell(bitstream)) {
+            if ((*status = flacdec_read_frame_header(bitstream,
+                                                     &(self->streaminfo),
+                                                     &frame_header)) != OK) {
+                br_etry(bitstream);
+                return 0;
+            }
+
+            if ((low_sample + frame_header.block_size) > pcm_frame)
+                break;
+
+            self->subframe_data->reset(self->subframe_data);
+            for (channel = 0; channel < frame_header.channel_count; channel++)
+                if ((*status =
+                     flacdec_read_subframe(
+                         bitstream,
+                         self->qlp_coeffs,
+                         self->residuals,
+                         (unsigned int)MIN(frame_header.block_size,
+                                           self->streaminfo.total_samples -
+                                           low_sample),
+                         flacdec_subframe_bits_per_sample(&frame_header,
+                                                          channel),
+                         self->subframe_data->append(self->subframe_data))) !=
+                    OK) {
+                    br_etry(bitstream);
+                    return 0;
+                }
+
+            /*skip CRC-16*/
+            bitstream->byte_align(bitstream);
+            bitstream->read(bitstream, 16);
+
+            low_sample += frame_header.block_size;
+        }
+
+        br_etry(bitstream);
+
+        /*rewind to the start of the frame for read() to decode*/
+        bitstream->byte_align(bitstream);
+        fseek(self->file, frame_offset, SEEK_SET);
+        return low_sample;
+    } else {
+        br_etry(bitstream);
+        while (bitstream->checksums != NULL)
+            br_pop_checksum(bitstream, NULL);
+        *status = ERROR;
+        return 0;
+    }
+}
+
+void
+flacdec_pop_frame_checksums(decoders_FlacDecoder* self)
+{
+    BitstreamReader* bitstream = self->bitstream;
+
+    while ((bitstream->checksums != NULL) &&
+           (bitstream->checksums->data != &(self->crc16)))
+        br_pop_checksum(bitstream, NULL);
+}
+
+int
+flacdec_open_ranges(decoders_FlacDecoder* self)
+{
+    unsigned i;
+
+    self->ranges = calloc(self->threads, sizeof(struct flac_range));
+
+    for (i = 0; i < self->threads; i++) {
+        struct flac_range* range = &(self->ranges[i]);
+
+        if ((range->file = fopen(self->filename, "rb")) == NULL) {
+            PyErr_SetFromErrnoWithFilename(PyExc_IOError, self->filename);
+            return 1;
+        }
+        range->streaminfo = &(self->streaminfo);
+        range->bitstream = br_open(range->file, BS_BIG_ENDIAN);
+        br_add_checksum(range->bitstream, flac_crc16_span, &(range->crc16));
+        range->subframe_data = array_ia_new();
+        range->residuals = array_i_new();
+        range->qlp_coeffs = array_i_new();
+        range->framelist_data = array_i_new();
+        range->frames = array_ia_new();
+    }
+
+    return 0;
+}
+
+void
+flacdec_close_ranges(decoders_FlacDecoder* self)
+{
+    unsigned i;
+
+    for (i = 0; i < self->threads; i++) {
+        struct flac_range* range = &(self->ranges[i]);
+
+        if (range->file == NULL)
+            continue;
+        range->bitstream->close(range->bitstream);
+        range->subframe_data->del(range->subframe_data);
+        range->residuals->del(range->residuals);
+        range->qlp_coeffs->del(range->qlp_coeffs);
+        range->framelist_data->del(range->framelist_data);
+        range->frames->del(range->frames);
+    }
+
+    free(self->ranges);
+    self->ranges = NULL;
+}
+
+void
+flacdec_decode_batch(decoders_FlacDecoder* self)
+{
+    BitstreamReader* bitstream = self->bitstream;
+    struct flac_range* ranges = self->ranges;
+    pthread_t thread_ids[self->threads];
+    int started[self->threads];
+    long start;
+    long frame_offset;
+    uint64_t frame_sample;
+    unsigned count;
+    unsigned i;
+
+    bitstream->byte_align(bitstream);
+    start = br_ftell(bitstream);
+    ranges[0].start = start;
+    ranges[0].start_sample = (self->streaminfo.total_samples -
+                              self->remaining_samples);
+
+    /*the CRC-16 isn't needed while searching for frames*/
+    br_pop_checksum(bitstream, NULL);
+
+    /*split the stream at frame headers about FLAC_THREAD_BYTES apart*/
+    for (count = 1; count < self->threads; count++) {
+        if (!flacdec_sync_frame(self,
+                                MAX(start + (long)count * FLAC_THREAD_BYTES,
+                                    ranges[count - 1].start + 1),
+                                start + (long)(count + 1) * FLAC_THREAD_BYTES,
+                                &frame_offset,
+                                &frame_sample))
+            break;
+
+        ranges[count - 1].end = frame_offset;
+        ranges[count].start = frame_offset;
+        ranges[count].start_sample = frame_sample;
+    }
+    ranges[count - 1].end = ranges[count - 1].start + FLAC_THREAD_BYTES;
+
+    br_add_checksum(bitstream, flac_crc16_span, &(self->crc16));
+
+    /*decode the first range on this thread and the rest on their own*/
+    for (i = 1; i < count; i++)
+        started[i] = (pthread_create(&(thread_ids[i]),
+                                     NULL,
+                                     flacdec_decode_range,
+                                     &(ranges[i])) == 0);
+
+    flacdec_decode_range(&(ranges[0]));
+
+    for (i = 1; i < count; i++)
+        if (started[i])
+            pthread_join(thread_ids[i], NULL);
+        else
+            flacdec_decode_range(&(ranges[i]));
+
+    /*a header found by searching may be a false match in another frame,
+      so keep only ranges which pick up exactly where the last one stopped*/
+    for (i = 1; i < count; i++)
+        if ((ranges[i - 1].status != OK) ||
+            (ranges[i - 1].stop != ranges[i].start) ||
+            (ranges[i - 1].stop_sample != ranges[i].start_sample))
+            break;
+
+    /*a range with neither frames nor an error has hit the end of the file
+      before the end of the stream*/
+    if ((ranges[0].frames->len == 0) && (ranges[0].status == OK))
+        ranges[0].status = ERROR;
+
+    self->range_count = i;
+    self->current_range = 0;
+    self->current_frame = 0;
+
+    fseek(self->file, ranges[i - 1].stop, SEEK_SET);
+}
+
+void*
+flacdec_decode_range(void* range_)
+{
+    struct flac_range* range = range_;
+    BitstreamReader* bitstream = range->bitstream;
+    const uint64_t total_samples = range->streaminfo->total_samples;
+    struct flac_frame_header frame_header;
+    int channel;
+
+    range->frames->reset(range->frames);
+    range->stop = range->start;
+    range->stop_sample = range->start_sample;
+    range->status = OK;
+
+    bitstream->byte_align(bitstream);
+    fseek(range->file, range->start, SEEK_SET);
+
+    if (!setjmp(*br_try(bitstream))) {
+        while ((range->stop < range->end) &&
+               (range->stop_sample < total_samples)) {
+            range->crc16 = 0;
+
+            if ((range->status =
+                 flacdec_read_frame_header(bitstream,
+                                           range->streaminfo,
+                                           &frame_header)) != OK)
+                break;
+
+            range->subframe_data->reset(range->subframe_data);
+            for (channel = 0; channel < frame_header.channel_count; channel++)
+                if ((range->status =
+                     flacdec_read_subframe(
+                         bitstream,
+                         range->qlp_coeffs,
+                         range->residuals,
+                         (unsigned int)MIN(frame_header.block_size,
+                                           total_samples -
+                                           range->stop_sample),
+                         flacdec_subframe_bits_per_sample(&frame_header,
+                                                          channel),
+                         range->subframe_data->append(
+                             range->subframe_data))) != OK)
+                    break;
+            if (range->status != OK)
+                break;
+
+            flacdec_decorrelate_channels(frame_header.channel_assignment,
+                                         range->subframe_data,
+                                         range->framelist_data);
+
+            /*check CRC-16*/
+            bitstream->byte_align(bitstream);
+            bitstream->read(bitstream, 16);
+            br_update_checksums(bitstream);
+            if (range->crc16 != 0) {
+                range->status = ERR_INVALID_FRAME_CHECKSUM;
+                break;
+            }
+
+            range->framelist_data->swap(range->framelist_data,
+                                        range->frames->append(range->frames));
+            range->stop = br_ftell(bitstream);
+            range->stop_sample += frame_header.block_size;
+        }
+
+        br_etry(bitstream);
+    } else {
+        /*handle I/O error during read*/
+        br_etry(bitstream);
+        while ((bitstream->checksums != NULL) &&
+               (bitstream->checksums->data != &(range->crc16)))
+            br_pop_checksum(bitstream, NULL);
+        range->status = ERROR;
+    }
+
+    return NULL;
+}
+
+PyObject*
+flacdec_read_threaded(decoders_FlacDecoder* self)
+{
+    struct flac_range* range;
+    array_i* frame;
+    PyObject* framelist;
+    PyThreadState *thread_state;
+
+    /*find the next decoded frame, decoding a new batch as needed*/
+    for (;;) {
+        if (self->current_range >= self->range_count) {
+            thread_state = PyEval_SaveThread();
+            flacdec_decode_batch(self);
+            PyEval_RestoreThread(thread_state);
+        }
+
+        range = &(self->ranges[self->current_range]);
+        if (self->current_frame < range->frames->len) {
+            break;
+        } else if (range->status == OK) {
+            self->current_range++;
+            self->current_frame = 0;
+        } else {
+            /*an error follows the range's successfully decoded frames*/
+            self->range_count = 0;
+            if (range->status == ERROR)
+                PyErr_SetString(PyExc_IOError, "EOF reading frame");
+            else
+                PyErr_SetString(PyExc_ValueError,
+                                FlacDecoder_strerror(range->status));
+            return NULL;
+        }
+    }
+
+    frame = range->frames->_[self->current_frame++];
+    self->remaining_samples -= (frame->len / self->streaminfo.channels);
+
+    /*drop any PCM frames before a seek point in the middle of the frame*/
+    if (self->skip_samples > 0) {
+        frame->de_head(frame,
+                       self->skip_samples * self->streaminfo.channels,
+                       frame);
+        self->skip_samples = 0;
+    }
+
+    framelist = array_i_to_FrameList(self->audiotools_pcm,
+                                     frame,
+                                     self->streaminfo.channels,
+                                     self->streaminfo.bits_per_sample);
+    if (framelist != NULL) {
+        /*update MD5 sum in stream order*/
+        if (FlacDecoder_update_md5sum(self, framelist) == OK)
+            return framelist;
+        else {
+            Py_DECREF(framelist);
+            return NULL;
+        }
+    } else {
+        return NULL;
+    }
+}
+
 flac_status
 flacdec_read_frame_header(BitstreamReader *bitstream,
                           struct flac_STREAMINFO *streaminfo,
@@ -404,15 +1032,17 @@ flacdec_read_frame_header(BitstreamReader *bitstream,
     uint32_t sample_rate_bits;
     uint32_t crc8 = 0;
 
-    br_add_callback(bitstream, flac_crc8, &crc8);
+    br_add_checksum(bitstream, flac_crc8_span, &crc8);
 
     /*read and verify sync code*/
     if (bitstream->read(bitstream, 14) != 0x3FFE) {
+        br_pop_checksum(bitstream, NULL);
         return ERR_INVALID_SYNC_CODE;
     }
 
     /*read and verify reserved bit*/
     if (bitstream->read(bitstream, 1) != 0) {
+        br_pop_checksum(bitstream, NULL);
         return ERR_INVALID_RESERVED_BIT;
     }
 
@@ -446,6 +1076,7 @@ flacdec_read_frame_header(BitstreamReader *bitstream,
     case 6:
         header->bits_per_sample = 24; break;
     default:
+        br_pop_checksum(bitstream, NULL);
         return ERR_INVALID_BITS_PER_SAMPLE;
     }
     bitstream->read(bitstream, 1); /*padding*/
@@ -488,12 +1119,13 @@ flacdec_read_frame_header(BitstreamReader *bitstream,
     case 0xD: header->sample_rate = bitstream->read(bitstream, 16); break;
     case 0xE: header->sample_rate = bitstream->read(bitstream, 16) * 10; break;
     case 0xF:
+        br_pop_checksum(bitstream, NULL);
         return ERR_INVALID_SAMPLE_RATE;
     }
 
     /*check for valid CRC-8 value*/
     bitstream->read(bitstream, 8);
-    br_pop_callback(bitstream, NULL);
+    br_pop_checksum(bitstream, NULL);
     if (crc8 != 0)
         return ERR_INVALID_FRAME_CRC;
 
@@ -939,13 +1571,16 @@ flac_status
 FlacDecoder_update_md5sum(decoders_FlacDecoder *self,
                           PyObject *framelist)
 {
-    PyObject *string = PyObject_CallMethod(framelist,
-                                           "to_bytes","ii",
-                                           0,
-                                           1);
+    PyObject *string;
     char *string_buffer;
     Py_ssize_t length;
 
+    /*a partial stream can't be verified, so don't bother summing it*/
+    if (self->seeked || self->skip_md5)
+        return OK;
+
+    string = PyObject_CallMethod(framelist, "to_bytes", "ii", 0, 1);
+
     if (string != NULL) {
         if (PyString_AsStringAndSize(string, &string_buffer, &length) == 0) {
             audiotools__MD5Update(&(self->md5),
@@ -971,7 +1606,9 @@ FlacDecoder_verify_okay(decoders_FlacDecoder *self)
 
     audiotools__MD5Final(stream_md5sum, &(self->md5));
 
-    return ((memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
+    return (self->seeked ||
+            self->skip_md5 ||
+            (memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
             (memcmp(stream_md5sum, self->streaminfo.md5sum, 16) == 0));
 }
 
@@ -1008,6 +1645,8 @@ FlacDecoder_strerror(flac_status error)
         return "invalid FIXED subframe order";
     case ERR_INVALID_SUBFRAME_TYPE:
         return "invalid subframe type";
+    case ERR_INVALID_FRAME_CHECKSUM:
+        return "invalid checksum in frame";
     default:
         return "Unknown Error";
     }
@@ -36,6 +36,21 @@ struct flac_STREAMINFO {
     unsigned char md5sum[16];     /*128 bits*/
 };
 
+/*seek() stops bisecting the stream for frame headers
+  and starts decoding forward once the range is this many bytes or smaller*/
+#define FLAC_SEEK_DECODE_BYTES 65536
+
+struct flac_SEEKPOINT {
+    uint64_t sample_number;       /*64 bits*/
+    uint64_t byte_offset;         /*64 bits*/
+    uint16_t samples;             /*16 bits*/
+};
+
+struct flac_SEEKTABLE {
+    unsigned total_points;
+    struct flac_SEEKPOINT* seekpoints;
+};
+
 struct flac_frame_header {
     uint8_t blocking_strategy;
     uint32_t block_size;
@@ -70,9 +85,44 @@ typedef enum {OK,
               ERR_MAXIMUM_BLOCK_SIZE_EXCEEDED,
               ERR_INVALID_CODING_METHOD,
               ERR_INVALID_FIXED_ORDER,
-              ERR_INVALID_SUBFRAME_TYPE} flac_status;
+              ERR_INVALID_SUBFRAME_TYPE,
+              ERR_INVALID_FRAME_CHECKSUM} flac_status;
 
 #ifndef OGG_FLAC
+/*when decoding with more than one thread,
+  each thread decodes about this many bytes of FLAC frames per batch*/
+#define FLAC_THREAD_BYTES 262144
+
+/*a run of FLAC frames decoded by one thread*/
+struct flac_range {
+    struct flac_STREAMINFO* streaminfo;
+
+    /*the thread's own stream and temporary buffers*/
+    FILE* file;
+    BitstreamReader* bitstream;
+    uint32_t crc16;
+    array_ia* subframe_data;
+    array_i* residuals;
+    array_i* qlp_coeffs;
+    array_i* framelist_data;
+
+    /*frames beginning at "start" and starting before "end" are decoded,
+      the first of which starts at PCM frame "start_sample"*/
+    long start;
+    long end;
+    uint64_t start_sample;
+
+    /*the decorrelated samples of each decoded frame*/
+    array_ia* frames;
+
+    /*the stream position and PCM frame just after the last decoded frame*/
+    long stop;
+    uint64_t stop_sample;
+
+    /*OK, or the error which stopped decoding*/
+    flac_status status;
+};
+
 typedef struct {
     PyObject_HEAD
 
@@ -82,8 +132,35 @@ typedef struct {
     int channel_mask;
 
     struct flac_STREAMINFO streaminfo;
+    struct flac_SEEKTABLE seektable;
     uint64_t remaining_samples;
 
+    /*the stream position of the first FLAC frame*/
+    long stream_start;
+
+    /*the number of PCM frames to drop from the start of the next frame,
+      set by seek() when landing in the middle of a FLAC frame*/
+    uint32_t skip_samples;
+
+    /*set by seek() when the stream no longer starts at the first frame,
+      since the MD5 sum can no longer be verified*/
+    int seeked;
+
+    /*set by skip_md5() when the caller doesn't need the MD5 sum verified*/
+    int skip_md5;
+
+    /*the number of threads read() decodes frames with*/
+    unsigned threads;
+
+    /*one range of frames per thread when "threads" is more than 1,
+      of which the first "range_count" hold the current batch*/
+    struct flac_range* ranges;
+    unsigned range_count;
+
+    /*the range and frame within it that read() returns next*/
+    unsigned current_range;
+    unsigned current_frame;
+
     uint32_t crc16;
     audiotools__MD5Context md5;
     int stream_finalized;
@@ -121,6 +198,14 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args);
 static PyObject*
 FlacDecoder_offsets(decoders_FlacDecoder* self, PyObject *args);
 
+/*the FlacDecoder.seek() method*/
+static PyObject*
+FlacDecoder_seek(decoders_FlacDecoder* self, PyObject *args);
+
+/*the FlacDecoder.skip_md5() method*/
+static PyObject*
+FlacDecoder_skip_md5(decoders_FlacDecoder* self, PyObject *args);
+
 /*the FlacDecoder.close() method*/
 static PyObject*
 FlacDecoder_close(decoders_FlacDecoder* self, PyObject *args);
@@ -148,6 +233,11 @@ PyMethodDef FlacDecoder_methods[] = {
      "Reads the given number of bytes from the FLAC file, if possible"},
     {"offsets", (PyCFunction)FlacDecoder_offsets,
      METH_NOARGS, "Returns a list of (offset, PCM frame count) values"},
+    {"seek", (PyCFunction)FlacDecoder_seek,
+     METH_VARARGS,
+     "Seeks to the given PCM frame and returns the frame actually reached"},
+    {"skip_md5", (PyCFunction)FlacDecoder_skip_md5,
+     METH_NOARGS, "Stops calculating and verifying the stream's MD5 sum"},
     {"close", (PyCFunction)FlacDecoder_close,
      METH_NOARGS, "Closes the FLAC decoder stream"},
     {NULL}
@@ -160,13 +250,84 @@ static PyObject*
 FlacDecoder_new(PyTypeObject *type,
                 PyObject *args, PyObject *kwds);
 
-/*reads the STREAMINFO block and skips any other metadata blocks,
+/*reads the STREAMINFO and SEEKTABLE blocks
+  and skips any other metadata blocks,
   placing our internal stream at the first FLAC frame
 
+  seektable->seekpoints is allocated if the stream has a SEEKTABLE
+  and must be freed by the caller
+
   returns 0 on success, 1 on failure with PyErr set*/
 int
 flacdec_read_metadata(BitstreamReader *bitstream,
-                      struct flac_STREAMINFO *streaminfo);
+                      struct flac_STREAMINFO *streaminfo,
+                      struct flac_SEEKTABLE *seektable);
+
+/*searches forward from "offset" for the next valid FLAC frame header
+  which starts before "limit"
+
+  returns 1 and sets "frame_offset" and "frame_sample" if one is found,
+  or returns 0 if the search reaches "limit" or EOF*/
+int
+flacdec_sync_frame(decoders_FlacDecoder* self,
+                   long offset,
+                   long limit,
+                   long* frame_offset,
+                   uint64_t* frame_sample);
+
+/*decodes the FLAC frame at "offset" without keeping its samples
+
+  returns 1 and sets "frame_sample" if its header and subframes parse
+  and its CRC-16 matches, or 0 if not,
+  leaving the stream at some position after "offset"*/
+int
+flacdec_verify_frame(decoders_FlacDecoder* self,
+                     long offset,
+                     uint64_t* frame_sample);
+
+/*positions the stream at the start of the FLAC frame
+  containing "pcm_frame", if necessary decoding forward from
+  the nearest seekpoint or frame header found before it
+
+  returns the first PCM frame of the frame reached,
+  or sets "status" to an error value*/
+uint64_t
+flacdec_seek_frame(decoders_FlacDecoder* self,
+                   uint64_t pcm_frame,
+                   flac_status* status);
+
+/*removes any CRC-8 checksum left on the stream by a frame header
+  interrupted by a read error, leaving only the stream's CRC-16*/
+void
+flacdec_pop_frame_checksums(decoders_FlacDecoder* self);
+
+/*allocates one range per thread, each with its own handle to the file
+  returns 0 on success, 1 on failure with PyErr set*/
+int
+flacdec_open_ranges(decoders_FlacDecoder* self);
+
+/*deallocates the ranges allocated by flacdec_open_ranges*/
+void
+flacdec_close_ranges(decoders_FlacDecoder* self);
+
+/*splits the stream from its current position into ranges
+  starting at frame headers, decodes each range in its own thread
+  and keeps those which continue exactly where the previous range stopped,
+  leaving the stream at the first frame not yet decoded
+
+  this is called without the GIL held*/
+void
+flacdec_decode_batch(decoders_FlacDecoder* self);
+
+/*decodes the frames of a struct flac_range
+  and returns NULL, for use as a thread's start routine*/
+void*
+flacdec_decode_range(void* range);
+
+/*returns the next frame decoded by flacdec_decode_batch
+  as a FrameList, decoding a new batch when the current one is used up*/
+PyObject*
+flacdec_read_threaded(decoders_FlacDecoder* self);
 #endif
 
 /*reads a FLAC frame header from the sync code to the CRC-8
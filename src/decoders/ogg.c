@@ -29,7 +29,7 @@ oggreader_open(FILE *stream) {
     reader->current_header.type = 0;
     reader->current_header.checksum = 0;
     reader->checksum = 0;
-    br_add_callback(reader->ogg_stream, ogg_crc, &(reader->checksum));
+    br_add_checksum(reader->ogg_stream, ogg_crc_span, &(reader->checksum));
     return reader;
 }
 
@@ -43,7 +43,7 @@ ogg_status
 oggreader_read_page_header(BitstreamReader *ogg_stream,
                            struct ogg_page_header *header) {
     int i;
-    struct bs_callback callback;
+    struct br_checksum checksum;
 
     if (!setjmp(*br_try(ogg_stream))) {
         if ((header->magic_number =
@@ -64,9 +64,9 @@ oggreader_read_page_header(BitstreamReader *ogg_stream,
 
         /*the checksum field is *not* checksummed itself, naturally
           those 4 bytes are treated as 0*/
-        br_pop_callback(ogg_stream, &callback);
+        br_pop_checksum(ogg_stream, &checksum);
         header->checksum = ogg_stream->read(ogg_stream, 32);
-        br_push_callback(ogg_stream, &callback);
+        br_push_checksum(ogg_stream, &checksum);
         br_call_callbacks(ogg_stream, 0);
         br_call_callbacks(ogg_stream, 0);
         br_call_callbacks(ogg_stream, 0);
@@ -111,12 +111,9 @@ oggreader_next_segment(OggReader *reader,
         /*the current page is finished*/
 
         /*validate page checksum*/
-        if (reader->current_header.checksum != reader->checksum) {
-            fprintf(stderr, "0x%4.4X 0x%4.4X\n",
-                    reader->current_header.checksum,
-                    reader->checksum);
+        br_update_checksums(reader->ogg_stream);
+        if (reader->current_header.checksum != reader->checksum)
             return OGG_CHECKSUM_MISMATCH;
-        }
 
         /*if the current page isn't the final page,
           read the next page from the stream*/
@@ -100,9 +100,7 @@ OggFlacDecoder_init(decoders_OggFlacDecoder *self,
 
     /*initialize the output MD5 sum*/
     audiotools__MD5Init(&(self->md5));
-
-    /*add callback for CRC16 calculation*/
-    br_add_callback(self->packet, flac_crc16, &(self->crc16));
+    self->skip_md5 = 0;
 
     /*setup a framelist generator function*/
     if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
@@ -150,7 +148,11 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
         /*decode the next FrameList from the stream*/
 
         thread_state = PyEval_SaveThread();
+
+        /*each FLAC frame fills a whole packet, CRC-16 included,
+          so checksum the buffered packet in a single span*/
         self->crc16 = 0;
+        br_substream_checksum(self->packet, flac_crc16_span, &(self->crc16));
 
         if (!setjmp(*br_try(self->packet))) {
             /*read frame header*/
@@ -219,10 +221,13 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
                 return NULL;
             }
         } else {
-            /*read error decoding FLAC frame*/
+            /*read error decoding FLAC frame,
+              so remove any CRC-8 checksum left by an interrupted header*/
             PyEval_RestoreThread(thread_state);
             PyErr_SetString(PyExc_IOError, "I/O error decoding FLAC frame");
             br_etry(self->packet);
+            while (self->packet->checksums != NULL)
+                br_pop_checksum(self->packet, NULL);
             return NULL;
         }
     } else if (ogg_status == OGG_STREAM_FINISHED) {
@@ -246,6 +251,14 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
     }
 }
 
+static PyObject*
+OggFlacDecoder_skip_md5(decoders_OggFlacDecoder *self, PyObject *args) {
+    self->skip_md5 = 1;
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject*
 OggFlacDecoder_close(decoders_OggFlacDecoder *self, PyObject *args) {
     /*FIXME*/
@@ -316,13 +329,15 @@ oggflac_read_streaminfo(BitstreamReader *packet,
 int
 OggFlacDecoder_update_md5sum(decoders_OggFlacDecoder *self,
                              PyObject *framelist) {
-    PyObject *string = PyObject_CallMethod(framelist,
-                                           "to_bytes","ii",
-                                           0,
-                                           1);
+    PyObject *string;
     char *string_buffer;
     Py_ssize_t length;
 
+    if (self->skip_md5)
+        return 1;
+
+    string = PyObject_CallMethod(framelist, "to_bytes", "ii", 0, 1);
+
     if (string != NULL) {
         if (PyString_AsStringAndSize(string, &string_buffer, &length) == 0) {
             audiotools__MD5Update(&(self->md5),
@@ -347,6 +362,7 @@ OggFlacDecoder_verify_okay(decoders_OggFlacDecoder *self) {
 
     audiotools__MD5Final(stream_md5sum, &(self->md5));
 
-    return ((memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
+    return (self->skip_md5 ||
+            (memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
             (memcmp(stream_md5sum, self->streaminfo.md5sum, 16) == 0));
 }
@@ -37,6 +37,7 @@ typedef struct {
 
     uint32_t crc16;
     audiotools__MD5Context md5;
+    int skip_md5;
 
     /*temporary buffers we don't want to reallocate each time*/
     array_ia* subframe_data;
@@ -63,6 +64,9 @@ OggFlacDecoder_channel_mask(decoders_OggFlacDecoder *self, void *closure);
 static PyObject*
 OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args);
 
+static PyObject*
+OggFlacDecoder_skip_md5(decoders_OggFlacDecoder *self, PyObject *args);
+
 static PyObject*
 OggFlacDecoder_close(decoders_OggFlacDecoder *self, PyObject *args);
 
@@ -86,6 +90,7 @@ PyGetSetDef OggFlacDecoder_getseters[] = {
 
 PyMethodDef OggFlacDecoder_methods[] = {
     {"read", (PyCFunction)OggFlacDecoder_read, METH_VARARGS, ""},
+    {"skip_md5", (PyCFunction)OggFlacDecoder_skip_md5, METH_NOARGS, ""},
     {"close", (PyCFunction)OggFlacDecoder_close, METH_NOARGS, ""},
     {NULL}
   };
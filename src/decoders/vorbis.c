@@ -1,4 +1,73 @@
 #include "vorbis.h"
+#include "../pcmconv.h"
+#include <math.h>
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2012  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+#ifndef MIN
+#define MIN(x, y) ((x) < (y) ? (x) : (y))
+#endif
+
+/*the granule position of a page on which no packet finishes*/
+#define NO_GRANULE_POSITION ((uint64_t)-1)
+
+/*for each channel in ChannelMask order,
+  the Vorbis channel it's taken from*/
+static const unsigned vorbis_channel_order[9][8] = {
+    {0},
+    {0},
+    {0, 1},
+    {0, 2, 1},                  /*FL, FR, FC*/
+    {0, 1, 2, 3},               /*FL, FR, BL, BR*/
+    {0, 2, 1, 3, 4},            /*FL, FR, FC, BL, BR*/
+    {0, 2, 1, 5, 3, 4},         /*FL, FR, FC, LFE, BL, BR*/
+    {0, 2, 1, 6, 5, 3, 4},      /*FL, FR, FC, LFE, BC, SL, SR*/
+    {0, 2, 1, 7, 5, 6, 3, 4}    /*FL, FR, FC, LFE, BL, BR, SL, SR*/
+};
+
+static const int vorbis_channel_masks[9] = {
+    0x0, 0x4, 0x3, 0x7, 0x33, 0x37, 0x3F, 0x70F, 0x63F};
+
+/*floor 1 Y values to linear amplitudes*/
+static float floor1_inverse_db[256];
+
+static float**
+vorbis_channel_buffers(unsigned channels, unsigned size) {
+    float** buffers = malloc(sizeof(float*) * channels);
+    unsigned i;
+
+    for (i = 0; i < channels; i++)
+        buffers[i] = calloc(size, sizeof(float));
+    return buffers;
+}
+
+static void
+vorbis_free_channel_buffers(float** buffers, unsigned channels) {
+    unsigned i;
+
+    if (buffers == NULL)
+        return;
+    for (i = 0; i < channels; i++)
+        free(buffers[i]);
+    free(buffers);
+}
 
 PyObject*
 VorbisDecoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
@@ -11,9 +80,31 @@ VorbisDecoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
 
 void
 VorbisDecoder_dealloc(decoders_VorbisDecoder *self) {
-    self->packet->close(self->packet);
+    const unsigned channels = self->identification.channel_count;
+
+    if (self->packet != NULL)
+        self->packet->close(self->packet);
     if (self->ogg_stream != NULL)
         oggreader_close(self->ogg_stream);
+    else if (self->ogg_file != NULL)
+        fclose(self->ogg_file);
+
+    vorbis_free_setup(&(self->setup));
+    vorbis_free_mdct(&(self->mdct[0]));
+    vorbis_free_mdct(&(self->mdct[1]));
+    free(self->slope[0]);
+    free(self->slope[1]);
+    vorbis_free_channel_buffers(self->residue, channels);
+    vorbis_free_channel_buffers(self->block, channels);
+    vorbis_free_channel_buffers(self->overlap, channels);
+    free(self->floor_unused);
+    free(self->no_residue);
+    free(self->interleaved);
+    free(self->classifications);
+
+    if (self->framelist_data != NULL)
+        self->framelist_data->del(self->framelist_data);
+    Py_XDECREF(self->audiotools_pcm);
 
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -23,10 +114,17 @@ VorbisDecoder_init(decoders_VorbisDecoder *self, PyObject *args, PyObject *kwds)
     char* filename;
     ogg_status ogg_result;
     vorbis_status vorbis_result;
+    unsigned channels;
+    unsigned blocksize;
+    unsigned classifications = 0;
+    unsigned i;
+    unsigned j;
 
     self->ogg_stream = NULL;
     self->ogg_file = NULL;
     self->packet = br_substream_new(BS_LITTLE_ENDIAN);
+    self->framelist_data = array_i_new();
+    self->audiotools_pcm = NULL;
 
     if (!PyArg_ParseTuple(args, "s", &filename))
         goto error;
@@ -47,6 +145,8 @@ VorbisDecoder_init(decoders_VorbisDecoder *self, PyObject *args, PyObject *kwds)
             VORBIS_OK) {
             PyErr_SetString(vorbis_exception(vorbis_result),
                             vorbis_strerror(vorbis_result));
+            /*no channel buffers have been allocated*/
+            self->identification.channel_count = 0;
             goto error;
         }
     } else {
@@ -70,8 +170,10 @@ VorbisDecoder_init(decoders_VorbisDecoder *self, PyObject *args, PyObject *kwds)
     /*read setup header*/
     if ((ogg_result = oggreader_next_packet(self->ogg_stream,
                                         self->packet)) == OGG_OK) {
-        if ((vorbis_result = vorbis_read_setup_packet(self->packet)) !=
-            VORBIS_OK) {
+        if ((vorbis_result =
+             vorbis_read_setup_packet(self->packet,
+                                      &(self->identification),
+                                      &(self->setup))) != VORBIS_OK) {
             PyErr_SetString(vorbis_exception(vorbis_result),
                             vorbis_strerror(vorbis_result));
             goto error;
@@ -81,6 +183,66 @@ VorbisDecoder_init(decoders_VorbisDecoder *self, PyObject *args, PyObject *kwds)
         goto error;
     }
 
+    /*audio packets always begin on a fresh page*/
+    self->audio_start = br_ftell(self->ogg_stream->ogg_stream);
+
+    /*the floor 1 table is shared by every decoder*/
+    if (floor1_inverse_db[255] == 0.0) {
+        for (i = 0; i < 256; i++)
+            floor1_inverse_db[i] = (float)pow(1.0649863e-07,
+                                              (255 - i) / 255.0);
+    }
+
+    /*allocate transforms, windows and working space*/
+    channels = self->identification.channel_count;
+    for (i = 0; i < 2; i++) {
+        blocksize = (i == 0 ?
+                     self->identification.blocksize_0 :
+                     self->identification.blocksize_1);
+        vorbis_init_mdct(&(self->mdct[i]), blocksize);
+        self->slope[i] = malloc(sizeof(float) * (blocksize / 2));
+        for (j = 0; j < blocksize / 2; j++) {
+            const double x = sin(((j + 0.5) / (blocksize / 2)) * M_PI / 2);
+            self->slope[i][j] = (float)sin(M_PI / 2 * x * x);
+        }
+    }
+
+    blocksize = self->identification.blocksize_1;
+    self->residue = vorbis_channel_buffers(channels, blocksize / 2);
+    self->block = vorbis_channel_buffers(channels, blocksize);
+    self->overlap = vorbis_channel_buffers(channels, blocksize / 2);
+    self->floor_unused = malloc(sizeof(int) * channels);
+    self->no_residue = malloc(sizeof(int) * channels);
+    self->interleaved = malloc(sizeof(float) * channels * (blocksize / 2));
+
+    for (i = 0; i < self->setup.residue_count; i++) {
+        const struct vorbis_residue* residue = &(self->setup.residues[i]);
+        const unsigned classwords =
+            self->setup.codebooks[residue->classbook].dimensions;
+        unsigned needed;
+
+        if (residue->type == 2)
+            needed = ((channels * (blocksize / 2)) / residue->partition_size +
+                      classwords);
+        else
+            needed = channels * ((blocksize / 2) / residue->partition_size +
+                                 classwords);
+        if (needed > classifications)
+            classifications = needed;
+    }
+    self->classifications = malloc(sizeof(unsigned) * (classifications + 1));
+
+    self->previous_blocksize = 0;
+    self->position = 0;
+    self->position_known = 1;
+    self->granule_seen = 0;
+    self->seek_target = 0;
+    self->stream_finished = 0;
+
+    /*setup a framelist generator function*/
+    if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
+        goto error;
+
     return 0;
 
  error:
@@ -104,24 +266,253 @@ VorbisDecoder_channels(decoders_VorbisDecoder *self, void *closure) {
 
 static PyObject*
 VorbisDecoder_channel_mask(decoders_VorbisDecoder *self, void *closure) {
-    Py_INCREF(Py_None);
-    return Py_None;
+    const unsigned channels = self->identification.channel_count;
+
+    return Py_BuildValue("i",
+                         channels <= 8 ? vorbis_channel_masks[channels] : 0);
+}
+
+/*given the PCM frames just decoded into self->framelist_data,
+  uses the granule position of the page it finishes, if any,
+  to place them in the stream
+  then removes any that fall before the start of the stream,
+  after the end of the stream or before a seek target*/
+static void
+vorbis_place_pcm_frames(decoders_VorbisDecoder *self) {
+    const OggReader* reader = self->ogg_stream;
+    const unsigned channels = self->identification.channel_count;
+    array_i* framelist_data = self->framelist_data;
+    uint64_t pcm_frames = framelist_data->len / channels;
+    uint64_t start;
+
+    if ((reader->current_segment ==
+         reader->current_header.page_segment_count) &&
+        (reader->current_header.granule_position != NO_GRANULE_POSITION)) {
+        const uint64_t granule = reader->current_header.granule_position;
+
+        if (self->position_known &&
+            (self->position + pcm_frames > granule)) {
+            const uint64_t excess = MIN(self->position + pcm_frames - granule,
+                                        pcm_frames);
+
+            if (reader->current_header.type & 0x4) {
+                /*the final page ends before the final packet does*/
+                framelist_data->de_tail(framelist_data,
+                                        (unsigned)excess * channels,
+                                        framelist_data);
+                pcm_frames -= excess;
+            } else if (!self->granule_seen) {
+                /*the first page begins after the first packet does*/
+                framelist_data->de_head(framelist_data,
+                                        (unsigned)excess * channels,
+                                        framelist_data);
+                pcm_frames -= excess;
+            }
+        }
+
+        start = (granule >= pcm_frames) ? (granule - pcm_frames) : 0;
+        self->position_known = 1;
+        self->granule_seen = 1;
+    } else if (self->position_known) {
+        start = self->position;
+    } else {
+        /*frames can't be placed until a page is finished,
+          but a seek never starts less than a page before its target*/
+        framelist_data->reset(framelist_data);
+        return;
+    }
+
+    self->position = start + pcm_frames;
+
+    if (start < self->seek_target) {
+        const uint64_t skip = MIN(self->seek_target - start, pcm_frames);
+        framelist_data->de_head(framelist_data,
+                                (unsigned)skip * channels,
+                                framelist_data);
+    }
 }
 
 static PyObject*
 VorbisDecoder_read(decoders_VorbisDecoder *self, PyObject *args) {
-    Py_INCREF(Py_None);
-    return Py_None;
+    const unsigned channels = self->identification.channel_count;
+    ogg_status ogg_result = OGG_OK;
+    vorbis_status vorbis_result = VORBIS_OK;
+    unsigned pcm_frames;
+    PyThreadState *thread_state;
+
+    self->framelist_data->reset(self->framelist_data);
+
+    if (self->stream_finished) {
+        return empty_FrameList(self->audiotools_pcm, channels, 16);
+    }
+
+    thread_state = PyEval_SaveThread();
+
+    /*keep decoding packets until some PCM frames are ready*/
+    do {
+        ogg_result = oggreader_next_packet(self->ogg_stream, self->packet);
+        if (ogg_result != OGG_OK)
+            break;
+        if ((vorbis_result =
+             vorbis_decode_audio_packet(self, &pcm_frames)) != VORBIS_OK)
+            break;
+        vorbis_place_pcm_frames(self);
+    } while (self->framelist_data->len == 0);
+
+    PyEval_RestoreThread(thread_state);
+
+    if (ogg_result == OGG_STREAM_FINISHED) {
+        self->stream_finished = 1;
+        return empty_FrameList(self->audiotools_pcm, channels, 16);
+    } else if (ogg_result != OGG_OK) {
+        PyErr_SetString(ogg_exception(ogg_result), ogg_strerror(ogg_result));
+        return NULL;
+    } else if (vorbis_result != VORBIS_OK) {
+        PyErr_SetString(vorbis_exception(vorbis_result),
+                        vorbis_strerror(vorbis_result));
+        return NULL;
+    } else {
+        return array_i_to_FrameList(self->audiotools_pcm,
+                                    self->framelist_data,
+                                    channels,
+                                    16);
+    }
+}
+
+ogg_status
+vorbis_seek_page(decoders_VorbisDecoder *self, long offset) {
+    OggReader* reader = self->ogg_stream;
+    ogg_status status;
+
+    reader->ogg_stream->byte_align(reader->ogg_stream);
+    fseek(self->ogg_file, offset, SEEK_SET);
+
+    /*flush bytes from the old position out of the page checksum*/
+    br_update_checksums(reader->ogg_stream);
+    reader->checksum = 0;
+
+    status = oggreader_read_page_header(reader->ogg_stream,
+                                        &(reader->current_header));
+    reader->current_segment = 0;
+    return status;
+}
+
+/*positions the stream so that the next PCM frame returned
+  is "pcm_frame", or the end of the stream if that comes first,
+  and returns that frame's number in "reached"*/
+static ogg_status
+vorbis_seek(decoders_VorbisDecoder *self,
+            uint64_t pcm_frame,
+            uint64_t *reached) {
+    OggReader* reader = self->ogg_stream;
+    struct ogg_page_header header;
+    long offset = self->audio_start;
+    /*the ends of the two most recent pages with granule positions
+      no greater than "pcm_frame"*/
+    long page_ends[2] = {-1, -1};
+    long restart = -1;
+    uint64_t last_granule = 0;
+    int at_end = 0;
+    ogg_status status;
+
+    /*walk page headers to find the last pages finishing before the target*/
+    reader->ogg_stream->byte_align(reader->ogg_stream);
+    for (;;) {
+        long page_end;
+
+        fseek(self->ogg_file, offset, SEEK_SET);
+        if (oggreader_read_page_header(reader->ogg_stream,
+                                       &header) != OGG_OK)
+            break;
+        page_end = br_ftell(reader->ogg_stream) + header.segment_length_total;
+
+        if (header.granule_position != NO_GRANULE_POSITION) {
+            if (header.granule_position > pcm_frame)
+                break;
+
+            /*decoding begins after the second most recent such page
+              so that a page with a granule position
+              is always finished before the target*/
+            if (page_ends[0] >= 0)
+                restart = page_ends[0];
+            page_ends[0] = page_ends[1];
+            page_ends[1] = page_end;
+            last_granule = header.granule_position;
+
+            if (header.type & 0x4) {
+                at_end = 1;
+                break;
+            }
+        }
+
+        offset = page_end;
+    }
+
+    self->previous_blocksize = 0;
+    self->stream_finished = 0;
+
+    if (at_end) {
+        /*the target is at or beyond the end of the stream*/
+        self->stream_finished = 1;
+        self->position = last_granule;
+        *reached = last_granule;
+        return OGG_OK;
+    } else if (restart >= 0) {
+        if ((status = vorbis_seek_page(self, restart)) != OGG_OK)
+            return status;
+
+        /*drop the tail of any packet begun on the previous page*/
+        if ((reader->current_header.type & 0x1) &&
+            ((status = oggreader_next_packet(reader,
+                                             self->packet)) != OGG_OK))
+            return status;
+
+        self->position_known = 0;
+        self->granule_seen = 1;
+    } else {
+        if ((status = vorbis_seek_page(self, self->audio_start)) != OGG_OK)
+            return status;
+
+        self->position = 0;
+        self->position_known = 1;
+        self->granule_seen = 0;
+    }
+
+    self->seek_target = pcm_frame;
+    *reached = pcm_frame;
+    return OGG_OK;
 }
 
 static PyObject*
-VorbisDecoder_analyze_frame(decoders_VorbisDecoder *self, PyObject *args) {
-    Py_INCREF(Py_None);
-    return Py_None;
+VorbisDecoder_seek(decoders_VorbisDecoder *self, PyObject *args) {
+    long long seekpoint;
+    uint64_t reached;
+    ogg_status status;
+    PyThreadState *thread_state;
+
+    if (!PyArg_ParseTuple(args, "L", &seekpoint))
+        return NULL;
+
+    if (seekpoint < 0) {
+        PyErr_SetString(PyExc_ValueError, "seekpoint must be >= 0");
+        return NULL;
+    }
+
+    thread_state = PyEval_SaveThread();
+    status = vorbis_seek(self, (uint64_t)seekpoint, &reached);
+    PyEval_RestoreThread(thread_state);
+
+    if (status != OGG_OK) {
+        PyErr_SetString(ogg_exception(status), ogg_strerror(status));
+        return NULL;
+    }
+
+    return Py_BuildValue("K", (unsigned PY_LONG_LONG)reached);
 }
 
 static PyObject*
 VorbisDecoder_close(decoders_VorbisDecoder *self, PyObject *args) {
+    self->stream_finished = 1;
     Py_INCREF(Py_None);
     return Py_None;
 }
@@ -153,10 +544,20 @@ vorbis_strerror(vorbis_status error) {
         return "invalid codebook sync";
     case VORBIS_UNSUPPORTED_CODEBOOK_LOOKUP_TYPE:
         return "unsupported codebook lookup type";
+    case VORBIS_INVALID_CODEBOOK_LENGTHS:
+        return "invalid codebook codeword lengths";
     case VORBIS_INVALID_TIME_COUNT_VALUE:
         return "invalid time count value";
-    case VORBIS_NOT_IMPLEMENTED:
-        return "not yet implemented";
+    case VORBIS_UNSUPPORTED_FLOOR_TYPE:
+        return "unsupported floor type";
+    case VORBIS_UNSUPPORTED_RESIDUE_TYPE:
+        return "unsupported residue type";
+    case VORBIS_UNSUPPORTED_MAPPING_TYPE:
+        return "unsupported mapping type";
+    case VORBIS_INVALID_SETUP_VALUE:
+        return "invalid value in setup header";
+    case VORBIS_INVALID_AUDIO_PACKET:
+        return "invalid audio packet";
     }
 
     return "unknown error"; /*shouldn't get here*/
@@ -177,10 +578,14 @@ vorbis_exception(vorbis_status error) {
     case VORBIS_INVALID_FRAMING_BIT:
     case VORBIS_INVALID_CODEBOOK_SYNC:
     case VORBIS_UNSUPPORTED_CODEBOOK_LOOKUP_TYPE:
+    case VORBIS_INVALID_CODEBOOK_LENGTHS:
     case VORBIS_INVALID_TIME_COUNT_VALUE:
+    case VORBIS_UNSUPPORTED_FLOOR_TYPE:
+    case VORBIS_UNSUPPORTED_RESIDUE_TYPE:
+    case VORBIS_UNSUPPORTED_MAPPING_TYPE:
+    case VORBIS_INVALID_SETUP_VALUE:
+    case VORBIS_INVALID_AUDIO_PACKET:
         return PyExc_ValueError;
-    case VORBIS_NOT_IMPLEMENTED:
-        return PyExc_NotImplementedError;
     case VORBIS_PREMATURE_EOF:
         return PyExc_IOError;
     }
@@ -200,17 +605,23 @@ float32_unpack(BitstreamReader *bs) {
 
 static int
 lookup1_values(int codebook_entries, int codebook_dimensions) {
-    int value = 0;
-    int i;
-    int j;
+    /*the greatest value whose "codebook_dimensions" power
+      doesn't exceed "codebook_entries",
+      calculated in floating point to avoid overflowing an int*/
+    int value;
 
-    do {
+    if ((codebook_entries < 1) || (codebook_dimensions < 1))
+        return 0;
+
+    value = (int)floor(exp(log((double)codebook_entries) /
+                           codebook_dimensions));
+    if (floor(pow((double)value + 1, codebook_dimensions)) <=
+        codebook_entries)
         value++;
-        for (i = 0, j = value; i < codebook_dimensions - 1; i++)
-            j *= value;
-    } while (j <= codebook_entries);
+    if (pow((double)value, codebook_dimensions) > codebook_entries)
+        value--;
 
-    return value - 1;
+    return value;
 }
 
 static int
@@ -315,7 +726,9 @@ vorbis_read_identification_packet(
 }
 
 vorbis_status
-vorbis_read_setup_packet(BitstreamReader *packet) {
+vorbis_read_setup_packet(BitstreamReader *packet,
+                         const struct vorbis_identification_header *id,
+                         struct vorbis_setup_header *setup) {
     vorbis_status result;
 
     if (!setjmp(*br_try(packet))) {
@@ -325,7 +738,7 @@ vorbis_read_setup_packet(BitstreamReader *packet) {
         }
 
         /*read codebooks*/
-        if ((result = vorbis_read_codebooks(packet)) != VORBIS_OK) {
+        if ((result = vorbis_read_codebooks(packet, setup)) != VORBIS_OK) {
             br_etry(packet);
             return result;
         }
@@ -336,21 +749,30 @@ vorbis_read_setup_packet(BitstreamReader *packet) {
             br_etry(packet);
             return result;
         }
+
         /*read floors*/
-        /*FIXME*/
+        if ((result = vorbis_read_floors(packet, id, setup)) != VORBIS_OK) {
+            br_etry(packet);
+            return result;
+        }
 
         /*read residues*/
-        /*FIXME*/
+        if ((result = vorbis_read_residues(packet, setup)) != VORBIS_OK) {
+            br_etry(packet);
+            return result;
+        }
 
         /*read mappings*/
-        /*FIXME*/
-
-        /*read modes*/
-        /*FIXME*/
-
-        /*read framing bit*/
-        /*FIXME*/
+        if ((result = vorbis_read_mappings(packet, id, setup)) != VORBIS_OK) {
+            br_etry(packet);
+            return result;
+        }
 
+        /*read modes, which are followed by the framing bit*/
+        if ((result = vorbis_read_modes(packet, setup)) != VORBIS_OK) {
+            br_etry(packet);
+            return result;
+        }
     } else {
         br_etry(packet);
         return VORBIS_PREMATURE_EOF;
@@ -360,91 +782,190 @@ vorbis_read_setup_packet(BitstreamReader *packet) {
     return VORBIS_OK;
 }
 
-vorbis_status
-vorbis_read_codebooks(BitstreamReader *packet) {
-    int codebook_count = packet->read(packet, 8) + 1;
-    int codebook;
-    uint32_t codebook_dimensions;
-    uint32_t codebook_entries;
-    uint32_t codebook_entry;
-    uint32_t entry_count;
-    int entry_length;
-    int codebook_lookup_type;
-    int codebook_value_bits;
-    int codebook_lookup_values;
-    int codebook_lookup_value;
-
-    for (codebook = 0; codebook < codebook_count; codebook++) {
-        if (packet->read(packet, 24) != 0x564342)
-            return VORBIS_INVALID_CODEBOOK_SYNC;
-        codebook_dimensions = packet->read(packet, 16);
-        codebook_entries = packet->read(packet, 24);
+void
+vorbis_free_setup(struct vorbis_setup_header *setup) {
+    unsigned i;
+
+    for (i = 0; i < setup->codebook_count; i++) {
+        free(setup->codebooks[i].tree);
+        free(setup->codebooks[i].vectors);
+    }
+    free(setup->codebooks);
+    for (i = 0; i < setup->floor_count; i++)
+        if (setup->floors[i].type == 0) {
+            free(setup->floors[i]._.floor0.map[0]);
+            free(setup->floors[i]._.floor0.map[1]);
+        }
+    free(setup->floors);
+    free(setup->residues);
+    free(setup->mappings);
+    free(setup->modes);
+
+    setup->codebook_count = 0;
+    setup->codebooks = NULL;
+    setup->floor_count = 0;
+    setup->floors = NULL;
+    setup->residue_count = 0;
+    setup->residues = NULL;
+    setup->mapping_count = 0;
+    setup->mappings = NULL;
+    setup->mode_count = 0;
+    setup->modes = NULL;
+}
+
+/*reads a single codebook's lengths and lookup table*/
+static vorbis_status
+vorbis_read_codebook(BitstreamReader *packet,
+                     struct vorbis_codebook *codebook) {
+    unsigned* lengths;
+    unsigned* multiplicands;
+    unsigned entry;
+    unsigned lookup_type;
+    float minimum_value = 0.0;
+    float delta_value = 0.0;
+    unsigned value_bits = 0;
+    unsigned sequence_p = 0;
+    unsigned lookup_values;
+    unsigned i;
 
+    if (packet->read(packet, 24) != 0x564342)
+        return VORBIS_INVALID_CODEBOOK_SYNC;
+    codebook->dimensions = packet->read(packet, 16);
+    codebook->entries = packet->read(packet, 24);
+
+    lengths = malloc(sizeof(unsigned) * (codebook->entries + 1));
+
+    if (!setjmp(*br_try(packet))) {
         /*first, read all the codebook entry lengths*/
         if (packet->read(packet, 1)) {
             /*ordered flag set*/
-            codebook_entry = 0;
-            entry_length = packet->read(packet, 5) + 1;
-            do {
-                for (entry_count = packet->read(packet,
-                                                ilog(codebook_entries -
-                                                     codebook_entry));
-                     entry_count > 0;
-                     entry_count--,codebook_entry++) {
-                    /*FIXME - assign entry_length to codebook_entry*/
-                }
-            } while (codebook_entry < codebook_entries);
-        } else {
-            /*ordered flag not set*/
-            if (packet->read(packet, 1)) {
-                /*sparse flag set*/
-                for (codebook_entry = 0;
-                     codebook_entry < codebook_entries;
-                     codebook_entry++) {
-                    if (packet->read(packet, 1)) {
-                        /*read entry from stream*/
-                        entry_length = packet->read(packet, 5) + 1;
-                        /*FIXME - assign entry_length to codebook_entry*/
-                    }
-                    /*otherwise, skip entry*/
-                    /*FIXME - mark entry as skipped*/
-                }
-            } else {
-                /*parse flag not set*/
-                for (codebook_entry = 0;
-                     codebook_entry < codebook_entries;
-                     codebook_entry++) {
-                    entry_length = packet->read(packet, 5) + 1;
-                    /*FIXME - assign entry_length to codebook_entry*/
+            unsigned length = packet->read(packet, 5) + 1;
+
+            entry = 0;
+            while (entry < codebook->entries) {
+                unsigned count = packet->read(packet,
+                                              ilog(codebook->entries - entry));
+                if ((count > (codebook->entries - entry)) || (length > 32)) {
+                    br_etry(packet);
+                    free(lengths);
+                    return VORBIS_INVALID_CODEBOOK_LENGTHS;
                 }
+                for (; count > 0; count--)
+                    lengths[entry++] = length;
+                length++;
+            }
+        } else if (packet->read(packet, 1)) {
+            /*sparse flag set*/
+            for (entry = 0; entry < codebook->entries; entry++) {
+                if (packet->read(packet, 1))
+                    lengths[entry] = packet->read(packet, 5) + 1;
+                else
+                    lengths[entry] = 0;
             }
+        } else {
+            /*sparse flag not set*/
+            for (entry = 0; entry < codebook->entries; entry++)
+                lengths[entry] = packet->read(packet, 5) + 1;
+        }
+
+        /*then, read the vector lookup table's parameters*/
+        lookup_type = packet->read(packet, 4);
+        if ((lookup_type == 1) || (lookup_type == 2)) {
+            minimum_value = float32_unpack(packet);
+            delta_value = float32_unpack(packet);
+            value_bits = packet->read(packet, 4) + 1;
+            sequence_p = packet->read(packet, 1);
         }
+        br_etry(packet);
+    } else {
+        br_etry(packet);
+        free(lengths);
+        return VORBIS_PREMATURE_EOF;
+    }
+
+    if (vorbis_build_codebook_tree(codebook, lengths)) {
+        free(lengths);
+        return VORBIS_INVALID_CODEBOOK_LENGTHS;
+    }
+    free(lengths);
 
-        /*then, read the vector lookup table*/
-        codebook_lookup_type = packet->read(packet, 4);
-        if ((codebook_lookup_type == 1) ||
-            (codebook_lookup_type == 2)) {
-            float32_unpack(packet);  /*codebook minimum value*/
-            float32_unpack(packet);  /*codebook delta value*/
-            codebook_value_bits = packet->read(packet, 4) + 1;
-            packet->read(packet, 1); /*codebook sequence p*/
-            if (codebook_lookup_type == 1) {
-                codebook_lookup_values = lookup1_values(codebook_entries,
-                                                        codebook_dimensions);
+    switch (lookup_type) {
+    case 0:
+        codebook->vectors = NULL;
+        return VORBIS_OK;
+    case 1:
+        lookup_values = lookup1_values(codebook->entries,
+                                       codebook->dimensions);
+        break;
+    case 2:
+        lookup_values = codebook->entries * codebook->dimensions;
+        break;
+    default:
+        return VORBIS_UNSUPPORTED_CODEBOOK_LOOKUP_TYPE;
+    }
+
+    /*refuse lookup tables too large to be sensible*/
+    if ((codebook->dimensions == 0) ||
+        ((uint64_t)codebook->entries * codebook->dimensions > (1 << 24)))
+        return VORBIS_INVALID_SETUP_VALUE;
+
+    multiplicands = malloc(sizeof(unsigned) * (lookup_values + 1));
+    if (!setjmp(*br_try(packet))) {
+        for (i = 0; i < lookup_values; i++)
+            multiplicands[i] = packet->read(packet, value_bits);
+        br_etry(packet);
+    } else {
+        br_etry(packet);
+        free(multiplicands);
+        return VORBIS_PREMATURE_EOF;
+    }
+
+    /*expand the lookup table into a vector for every entry*/
+    codebook->vectors = malloc(sizeof(float) *
+                               codebook->entries * codebook->dimensions);
+    for (entry = 0; entry < codebook->entries; entry++) {
+        float* vector = codebook->vectors + (entry * codebook->dimensions);
+        float last = 0.0;
+        unsigned index_divisor = 1;
+
+        for (i = 0; i < codebook->dimensions; i++) {
+            unsigned offset;
+
+            if (lookup_type == 1) {
+                offset = (lookup_values ?
+                          (entry / index_divisor) % lookup_values : 0);
+                index_divisor *= lookup_values;
             } else {
-                codebook_lookup_values = (codebook_entries *
-                                          codebook_dimensions);
-            }
-            for (codebook_lookup_value = 0;
-                 codebook_lookup_value < codebook_lookup_values;
-                 codebook_lookup_value++) {
-                packet->read(packet, codebook_value_bits);
-                /*FIXME - store this somewhere*/
+                offset = (entry * codebook->dimensions) + i;
             }
-        } else if (codebook_lookup_type > 2)
-            return VORBIS_UNSUPPORTED_CODEBOOK_LOOKUP_TYPE;
+
+            vector[i] = ((lookup_values ? multiplicands[offset] : 0) *
+                         delta_value + minimum_value + last);
+            if (sequence_p)
+                last = vector[i];
+        }
     }
 
+    free(multiplicands);
+    return VORBIS_OK;
+}
+
+vorbis_status
+vorbis_read_codebooks(BitstreamReader *packet,
+                      struct vorbis_setup_header *setup) {
+    unsigned i;
+    vorbis_status result;
+
+    setup->codebook_count = packet->read(packet, 8) + 1;
+    setup->codebooks = calloc(setup->codebook_count,
+                              sizeof(struct vorbis_codebook));
+
+    for (i = 0; i < setup->codebook_count; i++)
+        if ((result = vorbis_read_codebook(packet,
+                                           &(setup->codebooks[i]))) !=
+            VORBIS_OK)
+            return result;
+
     return VORBIS_OK;
 }
 
@@ -461,3 +982,1032 @@ vorbis_read_time_domain_transforms(BitstreamReader *packet) {
 
     return VORBIS_OK;
 }
+
+static double
+bark(double x) {
+    return (13.1 * atan(0.00074 * x) +
+            2.24 * atan(0.0000000185 * x * x) +
+            0.0001 * x);
+}
+
+static vorbis_status
+vorbis_read_floor0(BitstreamReader *packet,
+                   const struct vorbis_identification_header *id,
+                   const struct vorbis_setup_header *setup,
+                   struct vorbis_floor0 *floor0) {
+    unsigned i;
+    unsigned j;
+
+    floor0->order = packet->read(packet, 8);
+    floor0->rate = packet->read(packet, 16);
+    floor0->bark_map_size = packet->read(packet, 16);
+    floor0->amplitude_bits = packet->read(packet, 6);
+    floor0->amplitude_offset = packet->read(packet, 8);
+    floor0->book_count = packet->read(packet, 4) + 1;
+    for (i = 0; i < floor0->book_count; i++) {
+        floor0->books[i] = packet->read(packet, 8);
+        if ((floor0->books[i] >= setup->codebook_count) ||
+            (setup->codebooks[floor0->books[i]].vectors == NULL))
+            return VORBIS_INVALID_SETUP_VALUE;
+    }
+    if ((floor0->order == 0) ||
+        (floor0->rate == 0) ||
+        (floor0->bark_map_size == 0))
+        return VORBIS_INVALID_SETUP_VALUE;
+
+    /*build the bark scale map for both blocksizes*/
+    for (i = 0; i < 2; i++) {
+        const unsigned n = (i == 0 ? id->blocksize_0 : id->blocksize_1) / 2;
+        int* map = malloc(sizeof(int) * (n + 1));
+
+        for (j = 0; j < n; j++) {
+            const int value =
+                (int)floor(bark((double)floor0->rate * j / (2 * n)) *
+                           floor0->bark_map_size /
+                           bark(0.5 * floor0->rate));
+            map[j] = MIN(value, (int)floor0->bark_map_size - 1);
+        }
+        map[n] = -1;
+        floor0->map[i] = map;
+    }
+
+    return VORBIS_OK;
+}
+
+static vorbis_status
+vorbis_read_floor1(BitstreamReader *packet,
+                   const struct vorbis_setup_header *setup,
+                   struct vorbis_floor1 *floor1) {
+    int maximum_class = -1;
+    unsigned rangebits;
+    unsigned i;
+    unsigned j;
+
+    floor1->partitions = packet->read(packet, 5);
+    for (i = 0; i < floor1->partitions; i++) {
+        floor1->partition_class[i] = packet->read(packet, 4);
+        if ((int)floor1->partition_class[i] > maximum_class)
+            maximum_class = floor1->partition_class[i];
+    }
+
+    for (i = 0; (int)i <= maximum_class; i++) {
+        floor1->class_dimensions[i] = packet->read(packet, 3) + 1;
+        floor1->class_subclasses[i] = packet->read(packet, 2);
+        if (floor1->class_subclasses[i]) {
+            floor1->class_masterbook[i] = packet->read(packet, 8);
+            if (floor1->class_masterbook[i] >= setup->codebook_count)
+                return VORBIS_INVALID_SETUP_VALUE;
+        }
+        for (j = 0; j < (1 << floor1->class_subclasses[i]); j++) {
+            floor1->subclass_books[i][j] = (int)packet->read(packet, 8) - 1;
+            if (floor1->subclass_books[i][j] >= (int)setup->codebook_count)
+                return VORBIS_INVALID_SETUP_VALUE;
+        }
+    }
+
+    floor1->multiplier = packet->read(packet, 2) + 1;
+    rangebits = packet->read(packet, 4);
+    floor1->X[0] = 0;
+    floor1->X[1] = 1 << rangebits;
+    floor1->values = 2;
+    for (i = 0; i < floor1->partitions; i++) {
+        const unsigned class = floor1->partition_class[i];
+
+        for (j = 0; j < floor1->class_dimensions[class]; j++) {
+            if (floor1->values == VORBIS_FLOOR1_MAX_VALUES)
+                return VORBIS_INVALID_SETUP_VALUE;
+            floor1->X[floor1->values++] = packet->read(packet, rangebits);
+        }
+    }
+
+    /*sort X values, keeping the first of any duplicates in front*/
+    for (i = 0; i < floor1->values; i++) {
+        floor1->sorted[i] = i;
+        for (j = i; (j > 0) &&
+                 (floor1->X[floor1->sorted[j - 1]] > floor1->X[i]); j--) {
+            floor1->sorted[j] = floor1->sorted[j - 1];
+            floor1->sorted[j - 1] = i;
+        }
+    }
+
+    /*find the neighbors of each X value among those before it*/
+    for (i = 2; i < floor1->values; i++) {
+        unsigned low = 0;
+        unsigned high = 1;
+
+        for (j = 0; j < i; j++) {
+            if ((floor1->X[j] < floor1->X[i]) &&
+                (floor1->X[j] > floor1->X[low]))
+                low = j;
+            if ((floor1->X[j] > floor1->X[i]) &&
+                (floor1->X[j] < floor1->X[high]))
+                high = j;
+        }
+        floor1->low_neighbor[i] = low;
+        floor1->high_neighbor[i] = high;
+    }
+
+    return VORBIS_OK;
+}
+
+vorbis_status
+vorbis_read_floors(BitstreamReader *packet,
+                   const struct vorbis_identification_header *id,
+                   struct vorbis_setup_header *setup) {
+    unsigned i;
+    vorbis_status result;
+
+    setup->floor_count = packet->read(packet, 6) + 1;
+    setup->floors = calloc(setup->floor_count, sizeof(struct vorbis_floor));
+
+    for (i = 0; i < setup->floor_count; i++) {
+        struct vorbis_floor* floor = &(setup->floors[i]);
+
+        /*mark the floor as type 1 until its maps are allocated*/
+        floor->type = 1;
+        switch (packet->read(packet, 16)) {
+        case 0:
+            floor->type = 0;
+            result = vorbis_read_floor0(packet, id, setup, &(floor->_.floor0));
+            break;
+        case 1:
+            result = vorbis_read_floor1(packet, setup, &(floor->_.floor1));
+            break;
+        default:
+            result = VORBIS_UNSUPPORTED_FLOOR_TYPE;
+            break;
+        }
+        if (result != VORBIS_OK)
+            return result;
+    }
+
+    return VORBIS_OK;
+}
+
+vorbis_status
+vorbis_read_residues(BitstreamReader *packet,
+                     struct vorbis_setup_header *setup) {
+    unsigned i;
+    unsigned j;
+    unsigned k;
+
+    setup->residue_count = packet->read(packet, 6) + 1;
+    setup->residues = calloc(setup->residue_count,
+                             sizeof(struct vorbis_residue));
+
+    for (i = 0; i < setup->residue_count; i++) {
+        struct vorbis_residue* residue = &(setup->residues[i]);
+        unsigned cascade[64];
+
+        if ((residue->type = packet->read(packet, 16)) > 2)
+            return VORBIS_UNSUPPORTED_RESIDUE_TYPE;
+        residue->begin = packet->read(packet, 24);
+        residue->end = packet->read(packet, 24);
+        residue->partition_size = packet->read(packet, 24) + 1;
+        residue->classifications = packet->read(packet, 6) + 1;
+        residue->classbook = packet->read(packet, 8);
+        if ((residue->classbook >= setup->codebook_count) ||
+            (setup->codebooks[residue->classbook].dimensions == 0))
+            return VORBIS_INVALID_SETUP_VALUE;
+
+        for (j = 0; j < residue->classifications; j++) {
+            const unsigned low_bits = packet->read(packet, 3);
+            const unsigned high_bits = (packet->read(packet, 1) ?
+                                        packet->read(packet, 5) : 0);
+            cascade[j] = (high_bits << 3) | low_bits;
+        }
+
+        for (j = 0; j < residue->classifications; j++)
+            for (k = 0; k < 8; k++)
+                if (cascade[j] & (1 << k)) {
+                    residue->books[j][k] = packet->read(packet, 8);
+                    if ((residue->books[j][k] >=
+                         (int)setup->codebook_count) ||
+                        (setup->codebooks[residue->books[j][k]].vectors ==
+                         NULL))
+                        return VORBIS_INVALID_SETUP_VALUE;
+                } else {
+                    residue->books[j][k] = -1;
+                }
+    }
+
+    return VORBIS_OK;
+}
+
+vorbis_status
+vorbis_read_mappings(BitstreamReader *packet,
+                     const struct vorbis_identification_header *id,
+                     struct vorbis_setup_header *setup) {
+    const unsigned channels = id->channel_count;
+    unsigned i;
+    unsigned j;
+
+    setup->mapping_count = packet->read(packet, 6) + 1;
+    setup->mappings = calloc(setup->mapping_count,
+                             sizeof(struct vorbis_mapping));
+
+    for (i = 0; i < setup->mapping_count; i++) {
+        struct vorbis_mapping* mapping = &(setup->mappings[i]);
+
+        if (packet->read(packet, 16) != 0)
+            return VORBIS_UNSUPPORTED_MAPPING_TYPE;
+
+        mapping->submaps = packet->read(packet, 1) ?
+            packet->read(packet, 4) + 1 : 1;
+
+        if (packet->read(packet, 1)) {
+            mapping->coupling_steps = packet->read(packet, 8) + 1;
+            for (j = 0; j < mapping->coupling_steps; j++) {
+                mapping->magnitude[j] = packet->read(packet,
+                                                     ilog(channels - 1));
+                mapping->angle[j] = packet->read(packet, ilog(channels - 1));
+                if ((mapping->magnitude[j] == mapping->angle[j]) ||
+                    (mapping->magnitude[j] >= channels) ||
+                    (mapping->angle[j] >= channels))
+                    return VORBIS_INVALID_SETUP_VALUE;
+            }
+        } else {
+            mapping->coupling_steps = 0;
+        }
+
+        if (packet->read(packet, 2) != 0)
+            return VORBIS_INVALID_SETUP_VALUE;
+
+        for (j = 0; j < channels; j++)
+            if (mapping->submaps > 1) {
+                mapping->mux[j] = packet->read(packet, 4);
+                if (mapping->mux[j] >= mapping->submaps)
+                    return VORBIS_INVALID_SETUP_VALUE;
+            } else {
+                mapping->mux[j] = 0;
+            }
+
+        for (j = 0; j < mapping->submaps; j++) {
+            packet->read(packet, 8); /*unused time configuration*/
+            mapping->submap_floor[j] = packet->read(packet, 8);
+            mapping->submap_residue[j] = packet->read(packet, 8);
+            if ((mapping->submap_floor[j] >= setup->floor_count) ||
+                (mapping->submap_residue[j] >= setup->residue_count))
+                return VORBIS_INVALID_SETUP_VALUE;
+        }
+    }
+
+    return VORBIS_OK;
+}
+
+vorbis_status
+vorbis_read_modes(BitstreamReader *packet,
+                  struct vorbis_setup_header *setup) {
+    unsigned i;
+
+    setup->mode_count = packet->read(packet, 6) + 1;
+    setup->modes = calloc(setup->mode_count, sizeof(struct vorbis_mode));
+
+    for (i = 0; i < setup->mode_count; i++) {
+        struct vorbis_mode* mode = &(setup->modes[i]);
+
+        mode->blockflag = packet->read(packet, 1);
+        if (packet->read(packet, 16) != 0) /*window type*/
+            return VORBIS_INVALID_SETUP_VALUE;
+        if (packet->read(packet, 16) != 0) /*transform type*/
+            return VORBIS_INVALID_SETUP_VALUE;
+        mode->mapping = packet->read(packet, 8);
+        if (mode->mapping >= setup->mapping_count)
+            return VORBIS_INVALID_SETUP_VALUE;
+    }
+
+    if (packet->read(packet, 1) != 1)
+        return VORBIS_INVALID_FRAMING_BIT;
+
+    return VORBIS_OK;
+}
+
+static unsigned
+vorbis_read_codeword(BitstreamReader *packet,
+                     const struct vorbis_codebook *codebook) {
+    int node = 0;
+
+    for (;;) {
+        const int child = codebook->tree[node][packet->read(packet, 1)];
+
+        if (child < 0)
+            return (unsigned)(-(child + 1));
+        else if (child > 0)
+            node = child;
+        else
+            /*a codeword not in the codebook
+              is treated like the end of the packet*/
+            br_abort(packet);
+    }
+}
+
+static int
+vorbis_decode_floor0(decoders_VorbisDecoder *self,
+                     const struct vorbis_floor0 *floor0,
+                     unsigned blockflag,
+                     unsigned n,
+                     float *output) {
+    BitstreamReader* packet = self->packet;
+    const int* map = floor0->map[blockflag];
+    const struct vorbis_codebook* codebook;
+    double cos_coefficients[256];
+    unsigned amplitude;
+    unsigned book_number;
+    unsigned i;
+    unsigned j;
+    float last = 0.0;
+
+    amplitude = packet->read(packet, floor0->amplitude_bits);
+    if (amplitude == 0)
+        return 1;
+
+    book_number = packet->read(packet, ilog(floor0->book_count));
+    if (book_number >= floor0->book_count)
+        br_abort(packet);
+    codebook = &(self->setup.codebooks[floor0->books[book_number]]);
+
+    /*each vector continues from the last value of the previous one*/
+    for (i = 0; i < floor0->order;) {
+        const float* vector = codebook->vectors +
+            (vorbis_read_codeword(packet, codebook) * codebook->dimensions);
+
+        for (j = 0; (j < codebook->dimensions) && (i < floor0->order); j++)
+            cos_coefficients[i++] = cos(vector[j] + last);
+        last += vector[codebook->dimensions - 1];
+    }
+
+    for (i = 0; i < n;) {
+        const int map_value = map[i];
+        const double cos_omega = cos(M_PI * map_value /
+                                     floor0->bark_map_size);
+        double p;
+        double q;
+        float linear_floor_value;
+
+        if (floor0->order % 2) {
+            p = 1.0 - cos_omega * cos_omega;
+            q = 0.25;
+        } else {
+            p = (1.0 - cos_omega) / 2;
+            q = (1.0 + cos_omega) / 2;
+        }
+        for (j = 0; j < floor0->order; j++) {
+            const double term = 4 * (cos_coefficients[j] - cos_omega) *
+                (cos_coefficients[j] - cos_omega);
+            if (j % 2)
+                p *= term;
+            else
+                q *= term;
+        }
+
+        linear_floor_value = (float)exp(
+            0.11512925 * ((amplitude * floor0->amplitude_offset) /
+                          (((1 << floor0->amplitude_bits) - 1) *
+                           sqrt(p + q)) -
+                          floor0->amplitude_offset));
+
+        do {
+            output[i++] = linear_floor_value;
+        } while ((i < n) && (map[i] == map_value));
+    }
+
+    return 0;
+}
+
+static int
+floor1_render_point(int x0, int y0, int x1, int y1, int X) {
+    const int dy = y1 - y0;
+    const int adx = x1 - x0;
+    const int ady = abs(dy);
+    const int offset = (ady * (X - x0)) / adx;
+
+    return (dy < 0) ? (y0 - offset) : (y0 + offset);
+}
+
+static void
+floor1_render_line(int x0, int y0, int x1, int y1,
+                   unsigned n, float *output) {
+    const int dy = y1 - y0;
+    const int adx = x1 - x0;
+    const int base = dy / adx;
+    const int sy = (dy < 0) ? (base - 1) : (base + 1);
+    const int ady = abs(dy) - abs(base) * adx;
+    int x = x0;
+    int y = y0;
+    int err = 0;
+
+    if (x < (int)n)
+        output[x] = floor1_inverse_db[y & 0xFF];
+    for (x = x0 + 1; (x < x1) && (x < (int)n); x++) {
+        err += ady;
+        if (err >= adx) {
+            err -= adx;
+            y += sy;
+        } else {
+            y += base;
+        }
+        output[x] = floor1_inverse_db[y & 0xFF];
+    }
+}
+
+static int
+vorbis_decode_floor1(decoders_VorbisDecoder *self,
+                     const struct vorbis_floor1 *floor1,
+                     unsigned n,
+                     float *output) {
+    static const int ranges[] = {256, 128, 86, 64};
+    BitstreamReader* packet = self->packet;
+    const struct vorbis_codebook* codebooks = self->setup.codebooks;
+    const int range = ranges[floor1->multiplier - 1];
+    const unsigned range_bits = ilog(range - 1);
+    int Y[VORBIS_FLOOR1_MAX_VALUES];
+    int final_Y[VORBIS_FLOOR1_MAX_VALUES];
+    int step2[VORBIS_FLOOR1_MAX_VALUES];
+    unsigned offset;
+    unsigned i;
+    unsigned j;
+    int lx;
+    int ly;
+    int hx;
+    int hy;
+
+    if (!packet->read(packet, 1))
+        return 1;
+
+    Y[0] = packet->read(packet, range_bits);
+    Y[1] = packet->read(packet, range_bits);
+    for (offset = 2, i = 0; i < floor1->partitions; i++) {
+        const unsigned class = floor1->partition_class[i];
+        const unsigned dimensions = floor1->class_dimensions[class];
+        const unsigned bits = floor1->class_subclasses[class];
+        const unsigned subclass_mask = (1 << bits) - 1;
+        unsigned value = 0;
+
+        if (bits)
+            value = vorbis_read_codeword(
+                packet, &(codebooks[floor1->class_masterbook[class]]));
+        for (j = 0; j < dimensions; j++) {
+            const int book = floor1->subclass_books[class][value &
+                                                           subclass_mask];
+            value >>= bits;
+            Y[offset + j] = (book >= 0) ?
+                (int)vorbis_read_codeword(packet, &(codebooks[book])) : 0;
+        }
+        offset += dimensions;
+    }
+
+    /*amplitude value synthesis*/
+    final_Y[0] = Y[0];
+    final_Y[1] = Y[1];
+    step2[0] = step2[1] = 1;
+    for (i = 2; i < floor1->values; i++) {
+        const unsigned low = floor1->low_neighbor[i];
+        const unsigned high = floor1->high_neighbor[i];
+        const int predicted = floor1_render_point(floor1->X[low],
+                                                  final_Y[low],
+                                                  floor1->X[high],
+                                                  final_Y[high],
+                                                  floor1->X[i]);
+        const int value = Y[i];
+        const int high_room = range - predicted;
+        const int low_room = predicted;
+        const int room = ((high_room < low_room) ? high_room : low_room) * 2;
+
+        if (value) {
+            step2[low] = step2[high] = step2[i] = 1;
+            if (value >= room) {
+                if (high_room > low_room)
+                    final_Y[i] = value - low_room + predicted;
+                else
+                    final_Y[i] = predicted - value + high_room - 1;
+            } else if (value % 2) {
+                final_Y[i] = predicted - ((value + 1) / 2);
+            } else {
+                final_Y[i] = predicted + (value / 2);
+            }
+        } else {
+            step2[i] = 0;
+            final_Y[i] = predicted;
+        }
+    }
+
+    /*curve synthesis*/
+    lx = 0;
+    ly = final_Y[floor1->sorted[0]] * floor1->multiplier;
+    hx = 0;
+    hy = 0;
+    for (i = 1; i < floor1->values; i++) {
+        const unsigned index = floor1->sorted[i];
+
+        if (step2[index]) {
+            hx = floor1->X[index];
+            hy = final_Y[index] * floor1->multiplier;
+            if (hx > lx)
+                floor1_render_line(lx, ly, hx, hy, n, output);
+            lx = hx;
+            ly = hy;
+        }
+    }
+    if (hx < (int)n)
+        floor1_render_line(hx, hy, n, hy, n, output);
+
+    return 0;
+}
+
+int
+vorbis_decode_floor(decoders_VorbisDecoder *self,
+                    const struct vorbis_floor *floor,
+                    unsigned blockflag,
+                    unsigned n,
+                    float *output) {
+    if (floor->type == 0)
+        return vorbis_decode_floor0(self, &(floor->_.floor0),
+                                    blockflag, n, output);
+    else
+        return vorbis_decode_floor1(self, &(floor->_.floor1), n, output);
+}
+
+/*decodes the residue partitions of "ch" vectors of "n" values each
+  using residue format 0 or 1*/
+static void
+vorbis_decode_partitions(decoders_VorbisDecoder *self,
+                         const struct vorbis_residue *residue,
+                         unsigned format,
+                         unsigned ch,
+                         unsigned n,
+                         const int *do_not_decode,
+                         float **output) {
+    BitstreamReader* packet = self->packet;
+    const struct vorbis_codebook* codebooks = self->setup.codebooks;
+    const struct vorbis_codebook* classbook =
+        &(codebooks[residue->classbook]);
+    const unsigned classwords = classbook->dimensions;
+    const unsigned begin = MIN(residue->begin, n);
+    const unsigned end = MIN(residue->end, n);
+    const unsigned partition_size = residue->partition_size;
+    const unsigned partitions = (end > begin) ?
+        (end - begin) / partition_size : 0;
+    const unsigned stride = partitions + classwords;
+    unsigned* classifications = self->classifications;
+    unsigned pass;
+
+    if (partitions == 0)
+        return;
+
+    /*an end of packet during residue decode isn't an error
+      and leaves any remaining values as 0*/
+    if (!setjmp(*br_try(packet))) {
+        for (pass = 0; pass < 8; pass++) {
+            unsigned partition = 0;
+
+            while (partition < partitions) {
+                unsigned i;
+                unsigned j;
+
+                if (pass == 0) {
+                    for (j = 0; j < ch; j++) {
+                        unsigned value;
+
+                        if (do_not_decode[j])
+                            continue;
+                        value = vorbis_read_codeword(packet, classbook);
+                        for (i = classwords; i > 0; i--) {
+                            classifications[j * stride + partition + i - 1] =
+                                value % residue->classifications;
+                            value /= residue->classifications;
+                        }
+                    }
+                }
+
+                for (i = 0; (i < classwords) && (partition < partitions);
+                     i++, partition++) {
+                    for (j = 0; j < ch; j++) {
+                        const struct vorbis_codebook* codebook;
+                        unsigned dimensions;
+                        int book;
+                        float* v;
+                        unsigned k;
+                        unsigned l;
+
+                        /*channels which aren't decoded
+                          have no classifications to look up*/
+                        if (do_not_decode[j])
+                            continue;
+
+                        book = residue->books[
+                            classifications[j * stride + partition]][pass];
+                        if (book < 0)
+                            continue;
+
+                        codebook = &(codebooks[book]);
+                        dimensions = codebook->dimensions;
+                        v = output[j] + begin + (partition * partition_size);
+                        if (format == 0) {
+                            const unsigned step = partition_size / dimensions;
+
+                            for (k = 0; k < step; k++) {
+                                const float* vector = codebook->vectors +
+                                    (vorbis_read_codeword(packet, codebook) *
+                                     dimensions);
+                                for (l = 0; l < dimensions; l++)
+                                    v[k + l * step] += vector[l];
+                            }
+                        } else {
+                            for (k = 0; k < partition_size;) {
+                                const float* vector = codebook->vectors +
+                                    (vorbis_read_codeword(packet, codebook) *
+                                     dimensions);
+                                for (l = 0;
+                                     (l < dimensions) && (k < partition_size);
+                                     l++)
+                                    v[k++] += vector[l];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    br_etry(packet);
+}
+
+void
+vorbis_decode_residue(decoders_VorbisDecoder *self,
+                      const struct vorbis_residue *residue,
+                      unsigned ch,
+                      unsigned n,
+                      const int *do_not_decode,
+                      float **output) {
+    unsigned i;
+    unsigned j;
+
+    for (i = 0; i < ch; i++)
+        memset(output[i], 0, sizeof(float) * n);
+
+    if (residue->type == 2) {
+        /*format 2 decodes every channel interleaved in a single vector
+          so long as any of them is to be decoded*/
+        const int decode = 0;
+        float* interleaved = self->interleaved;
+
+        for (i = 0; (i < ch) && do_not_decode[i]; i++)
+            /*do nothing*/;
+        if (i == ch)
+            return;
+
+        memset(interleaved, 0, sizeof(float) * n * ch);
+        vorbis_decode_partitions(self, residue, 1, 1, n * ch,
+                                 &decode, &interleaved);
+        for (i = 0; i < n; i++)
+            for (j = 0; j < ch; j++)
+                output[j][i] = interleaved[i * ch + j];
+    } else {
+        vorbis_decode_partitions(self, residue, residue->type,
+                                 ch, n, do_not_decode, output);
+    }
+}
+
+vorbis_status
+vorbis_decode_audio_packet(decoders_VorbisDecoder *self,
+                           unsigned *pcm_frames) {
+    BitstreamReader* packet = self->packet;
+    const struct vorbis_identification_header* id = &(self->identification);
+    const struct vorbis_setup_header* setup = &(self->setup);
+    const unsigned channels = id->channel_count;
+    const struct vorbis_mode* mode;
+    const struct vorbis_mapping* mapping;
+    const float* left_slope;
+    const float* right_slope;
+    int do_not_decode[256];
+    float* vectors[256];
+    unsigned mode_number;
+    unsigned blockflag;
+    unsigned previous_window = 0;
+    unsigned next_window = 0;
+    unsigned n;
+    unsigned left_n;
+    unsigned left_start;
+    unsigned right_n;
+    unsigned right_start;
+    unsigned previous_n;
+    unsigned i;
+    unsigned j;
+    unsigned ch;
+    array_i* framelist_data = self->framelist_data;
+
+    framelist_data->reset(framelist_data);
+    *pcm_frames = 0;
+
+    if (!setjmp(*br_try(packet))) {
+        if (packet->read(packet, 1) != 0) {
+            /*not an audio packet, so ignore it*/
+            br_etry(packet);
+            return VORBIS_OK;
+        }
+        mode_number = packet->read(packet, ilog(setup->mode_count - 1));
+        if (mode_number >= setup->mode_count) {
+            br_etry(packet);
+            return VORBIS_INVALID_AUDIO_PACKET;
+        }
+        mode = &(setup->modes[mode_number]);
+        blockflag = mode->blockflag;
+        if (blockflag) {
+            previous_window = packet->read(packet, 1);
+            next_window = packet->read(packet, 1);
+        }
+        br_etry(packet);
+    } else {
+        /*a packet truncated this early produces no audio*/
+        br_etry(packet);
+        return VORBIS_OK;
+    }
+
+    mapping = &(setup->mappings[mode->mapping]);
+    n = blockflag ? id->blocksize_1 : id->blocksize_0;
+
+    /*decode each channel's floor into the first half of its block*/
+    if (!setjmp(*br_try(packet))) {
+        for (ch = 0; ch < channels; ch++) {
+            const unsigned submap = mapping->mux[ch];
+            self->floor_unused[ch] = vorbis_decode_floor(
+                self,
+                &(setup->floors[mapping->submap_floor[submap]]),
+                blockflag,
+                n / 2,
+                self->block[ch]);
+        }
+    } else {
+        /*an end of packet during floor decode zeroes every channel*/
+        for (ch = 0; ch < channels; ch++)
+            self->floor_unused[ch] = 1;
+    }
+    br_etry(packet);
+
+    /*coupled channels are decoded if either one has a floor*/
+    for (ch = 0; ch < channels; ch++)
+        self->no_residue[ch] = self->floor_unused[ch];
+    for (i = 0; i < mapping->coupling_steps; i++)
+        if (!self->no_residue[mapping->magnitude[i]] ||
+            !self->no_residue[mapping->angle[i]]) {
+            self->no_residue[mapping->magnitude[i]] = 0;
+            self->no_residue[mapping->angle[i]] = 0;
+        }
+
+    /*decode residues for each submap's bundle of channels*/
+    for (i = 0; i < mapping->submaps; i++) {
+        unsigned bundle = 0;
+
+        for (ch = 0; ch < channels; ch++)
+            if (mapping->mux[ch] == i) {
+                do_not_decode[bundle] = self->no_residue[ch];
+                vectors[bundle] = self->residue[ch];
+                bundle++;
+            }
+        vorbis_decode_residue(self,
+                              &(setup->residues[mapping->submap_residue[i]]),
+                              bundle,
+                              n / 2,
+                              do_not_decode,
+                              vectors);
+    }
+
+    /*inverse coupling*/
+    for (i = mapping->coupling_steps; i > 0; i--) {
+        float* magnitude = self->residue[mapping->magnitude[i - 1]];
+        float* angle = self->residue[mapping->angle[i - 1]];
+
+        for (j = 0; j < n / 2; j++) {
+            const float M = magnitude[j];
+            const float A = angle[j];
+
+            if (M > 0) {
+                if (A > 0) {
+                    angle[j] = M - A;
+                } else {
+                    angle[j] = M;
+                    magnitude[j] = M + A;
+                }
+            } else {
+                if (A > 0) {
+                    angle[j] = M + A;
+                } else {
+                    angle[j] = M;
+                    magnitude[j] = M - A;
+                }
+            }
+        }
+    }
+
+    /*determine the window's slopes from the neighboring block sizes*/
+    if (blockflag && previous_window) {
+        left_n = id->blocksize_1 / 2;
+        left_slope = self->slope[1];
+    } else {
+        left_n = id->blocksize_0 / 2;
+        left_slope = self->slope[0];
+    }
+    if (blockflag && next_window) {
+        right_n = id->blocksize_1 / 2;
+        right_slope = self->slope[1];
+    } else {
+        right_n = id->blocksize_0 / 2;
+        right_slope = self->slope[0];
+    }
+    left_start = n / 4 - left_n / 2;
+    right_start = (n * 3) / 4 - right_n / 2;
+
+    /*apply the floor to the residue,
+      perform the inverse MDCT and apply the window*/
+    for (ch = 0; ch < channels; ch++) {
+        float* residue = self->residue[ch];
+        float* block = self->block[ch];
+
+        if (self->floor_unused[ch]) {
+            memset(block, 0, sizeof(float) * n);
+            continue;
+        }
+
+        for (i = 0; i < n / 2; i++)
+            residue[i] *= block[i];
+        vorbis_inverse_mdct(&(self->mdct[blockflag]), residue, block);
+
+        for (i = 0; i < left_start; i++)
+            block[i] = 0.0;
+        for (i = 0; i < left_n; i++)
+            block[left_start + i] *= left_slope[i];
+        for (i = 0; i < right_n; i++)
+            block[right_start + i] *= right_slope[right_n - 1 - i];
+        for (i = right_start + right_n; i < n; i++)
+            block[i] = 0.0;
+    }
+
+    /*overlap the first half of this block
+      with the second half of the previous block,
+      lined up at the centers of their windows*/
+    previous_n = self->previous_blocksize;
+    if (previous_n) {
+        const unsigned frames = previous_n / 4 + n / 4;
+        const unsigned* order = (channels <= 8) ?
+            vorbis_channel_order[channels] : NULL;
+        int* samples;
+
+        framelist_data->resize(framelist_data, frames * channels);
+        samples = framelist_data->_;
+        framelist_data->len = frames * channels;
+
+        for (ch = 0; ch < channels; ch++) {
+            const unsigned source = order ? order[ch] : ch;
+            const float* overlap = self->overlap[source];
+            const float* block = self->block[source];
+
+            for (i = 0; i < frames; i++) {
+                const int offset = (int)i + (int)(n / 4) -
+                    (int)(previous_n / 4);
+                float value = 0.0;
+                long sample;
+
+                if (i < previous_n / 2)
+                    value += overlap[i];
+                if ((offset >= 0) && (offset < (int)n))
+                    value += block[offset];
+
+                sample = lrintf(value * 32768.0f);
+                if (sample > 32767)
+                    sample = 32767;
+                else if (sample < -32768)
+                    sample = -32768;
+                samples[i * channels + ch] = (int)sample;
+            }
+        }
+
+        *pcm_frames = frames;
+    }
+
+    /*hold on to the second half of this block for the next one*/
+    for (ch = 0; ch < channels; ch++)
+        memcpy(self->overlap[ch], self->block[ch] + n / 2,
+               sizeof(float) * (n / 2));
+    self->previous_blocksize = n;
+
+    return VORBIS_OK;
+}
+
+void
+vorbis_init_mdct(struct vorbis_mdct *mdct, unsigned n) {
+    const unsigned half = n / 2;
+    const unsigned size = n / 4;
+    unsigned bits = 0;
+    unsigned i;
+
+    while ((1u << bits) < size)
+        bits++;
+
+    mdct->n = n;
+    mdct->pre_real = malloc(sizeof(float) * size);
+    mdct->pre_imag = malloc(sizeof(float) * size);
+    mdct->post_real = malloc(sizeof(float) * size);
+    mdct->post_imag = malloc(sizeof(float) * size);
+    mdct->fft_real = malloc(sizeof(float) * size);
+    mdct->fft_imag = malloc(sizeof(float) * size);
+    mdct->bit_reverse = malloc(sizeof(unsigned) * size);
+    mdct->work_real = malloc(sizeof(float) * size);
+    mdct->work_imag = malloc(sizeof(float) * size);
+    mdct->dct = malloc(sizeof(float) * half);
+
+    for (i = 0; i < size; i++) {
+        unsigned reversed = 0;
+        unsigned b;
+
+        mdct->pre_real[i] = (float)cos(-M_PI * (i + 0.25) / half);
+        mdct->pre_imag[i] = (float)sin(-M_PI * (i + 0.25) / half);
+        mdct->post_real[i] = (float)cos(-M_PI * i / half);
+        mdct->post_imag[i] = (float)sin(-M_PI * i / half);
+        mdct->fft_real[i] = (float)cos(-2 * M_PI * i / size);
+        mdct->fft_imag[i] = (float)sin(-2 * M_PI * i / size);
+
+        for (b = 0; b < bits; b++)
+            if (i & (1 << b))
+                reversed |= 1 << (bits - 1 - b);
+        mdct->bit_reverse[i] = reversed;
+    }
+}
+
+void
+vorbis_free_mdct(struct vorbis_mdct *mdct) {
+    free(mdct->pre_real);
+    free(mdct->pre_imag);
+    free(mdct->post_real);
+    free(mdct->post_imag);
+    free(mdct->fft_real);
+    free(mdct->fft_imag);
+    free(mdct->bit_reverse);
+    free(mdct->work_real);
+    free(mdct->work_imag);
+    free(mdct->dct);
+}
+
+void
+vorbis_inverse_mdct(struct vorbis_mdct *mdct,
+                    const float *input,
+                    float *output) {
+    const unsigned half = mdct->n / 2;
+    const unsigned quarter = mdct->n / 4;
+    const unsigned size = mdct->n / 4;
+    float* real = mdct->work_real;
+    float* imag = mdct->work_imag;
+    float* dct = mdct->dct;
+    unsigned length;
+    unsigned i;
+    unsigned j;
+
+    /*the inverse MDCT is a DCT-IV of half its output size
+      which is calculated with a complex FFT of a quarter its output size
+
+      first, pair up even inputs with reversed odd inputs,
+      twiddle them and place them in bit-reversed order*/
+    for (i = 0; i < size; i++) {
+        const float x_real = input[2 * i];
+        const float x_imag = input[half - 1 - 2 * i];
+        const unsigned k = mdct->bit_reverse[i];
+
+        real[k] = x_real * mdct->pre_real[i] - x_imag * mdct->pre_imag[i];
+        imag[k] = x_real * mdct->pre_imag[i] + x_imag * mdct->pre_real[i];
+    }
+
+    /*then perform an in-place radix-2 FFT*/
+    for (length = 2; length <= size; length *= 2) {
+        const unsigned span = length / 2;
+        const unsigned step = size / length;
+
+        for (i = 0; i < size; i += length)
+            for (j = 0; j < span; j++) {
+                const float w_real = mdct->fft_real[j * step];
+                const float w_imag = mdct->fft_imag[j * step];
+                const unsigned a = i + j;
+                const unsigned b = a + span;
+                const float t_real = real[b] * w_real - imag[b] * w_imag;
+                const float t_imag = real[b] * w_imag + imag[b] * w_real;
+
+                real[b] = real[a] - t_real;
+                imag[b] = imag[a] - t_imag;
+                real[a] += t_real;
+                imag[a] += t_imag;
+            }
+    }
+
+    /*twiddle the results back into DCT-IV order*/
+    for (i = 0; i < size; i++) {
+        dct[2 * i] = real[i] * mdct->post_real[i] -
+            imag[i] * mdct->post_imag[i];
+        dct[half - 1 - 2 * i] = -(real[i] * mdct->post_imag[i] +
+                                  imag[i] * mdct->post_real[i]);
+    }
+
+    /*finally, unfold the DCT-IV into the full MDCT output*/
+    for (i = 0; i < quarter; i++)
+        output[i] = dct[quarter + i];
+    for (i = quarter; i < half + quarter; i++)
+        output[i] = -dct[half + quarter - 1 - i];
+    for (i = half + quarter; i < mdct->n; i++)
+        output[i] = -dct[i - half - quarter];
+}
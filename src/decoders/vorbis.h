@@ -1,7 +1,7 @@
 #include <Python.h>
 #include <stdint.h>
 #include "ogg.h"
-#include "../huffman.h"
+#include "../array.h"
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -22,6 +22,11 @@
  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 *******************************************************/
 
+/*the most floor 1 X values a setup header can define:
+  2 implicit values + 31 partitions of up to 8 dimensions,
+  though the spec limits the total to 65*/
+#define VORBIS_FLOOR1_MAX_VALUES 65
+
 struct vorbis_identification_header {
     uint32_t vorbis_version;
     uint8_t channel_count;
@@ -33,13 +38,125 @@ struct vorbis_identification_header {
     uint16_t blocksize_1;
 };
 
-struct vorbis_codeword {
-    int is_leaf;
-    int value;
-    unsigned int bits;
-    unsigned int length;
-    struct vorbis_codeword* bit_0;
-    struct vorbis_codeword* bit_1;
+struct vorbis_codebook {
+    unsigned dimensions;
+    unsigned entries;
+
+    /*the codebook's Huffman tree as pairs of child nodes
+      where a positive child is the index of another node,
+      a negative child is a leaf for entry -(child + 1)
+      and 0 is a codeword no entry was assigned to
+
+      node 0 is the root*/
+    int (*tree)[2];
+    unsigned tree_size;
+
+    /*"entries" vectors of "dimensions" values each,
+      or NULL if the codebook has no lookup table*/
+    float* vectors;
+};
+
+struct vorbis_floor0 {
+    unsigned order;
+    unsigned rate;
+    unsigned bark_map_size;
+    unsigned amplitude_bits;
+    unsigned amplitude_offset;
+    unsigned book_count;
+    unsigned books[16];
+
+    /*the bark scale map for each blocksize*/
+    int* map[2];
+};
+
+struct vorbis_floor1 {
+    unsigned partitions;
+    unsigned partition_class[32];
+    unsigned class_dimensions[16];
+    unsigned class_subclasses[16];
+    unsigned class_masterbook[16];
+    int subclass_books[16][8];
+    unsigned multiplier;
+    unsigned values;
+    unsigned X[VORBIS_FLOOR1_MAX_VALUES];
+
+    /*indexes of X values in ascending order*/
+    unsigned sorted[VORBIS_FLOOR1_MAX_VALUES];
+
+    /*the low and high neighbor of each X value*/
+    unsigned low_neighbor[VORBIS_FLOOR1_MAX_VALUES];
+    unsigned high_neighbor[VORBIS_FLOOR1_MAX_VALUES];
+};
+
+struct vorbis_floor {
+    unsigned type;
+    union {
+        struct vorbis_floor0 floor0;
+        struct vorbis_floor1 floor1;
+    } _;
+};
+
+struct vorbis_residue {
+    unsigned type;
+    unsigned begin;
+    unsigned end;
+    unsigned partition_size;
+    unsigned classifications;
+    unsigned classbook;
+
+    /*the codebook for each classification and pass, or -1 if unused*/
+    int books[64][8];
+};
+
+struct vorbis_mapping {
+    unsigned submaps;
+    unsigned coupling_steps;
+    unsigned magnitude[256];
+    unsigned angle[256];
+    unsigned mux[256];
+    unsigned submap_floor[16];
+    unsigned submap_residue[16];
+};
+
+struct vorbis_mode {
+    unsigned blockflag;
+    unsigned mapping;
+};
+
+struct vorbis_setup_header {
+    unsigned codebook_count;
+    struct vorbis_codebook* codebooks;
+    unsigned floor_count;
+    struct vorbis_floor* floors;
+    unsigned residue_count;
+    struct vorbis_residue* residues;
+    unsigned mapping_count;
+    struct vorbis_mapping* mappings;
+    unsigned mode_count;
+    struct vorbis_mode* modes;
+};
+
+/*precalculated values for an inverse MDCT of a single blocksize*/
+struct vorbis_mdct {
+    unsigned n;
+
+    /*twiddle factors before and after the FFT, n / 4 values each*/
+    float* pre_real;
+    float* pre_imag;
+    float* post_real;
+    float* post_imag;
+
+    /*FFT twiddle factors and bit-reversed indexes, n / 4 values each*/
+    float* fft_real;
+    float* fft_imag;
+    unsigned* bit_reverse;
+
+    /*complex working space, n / 4 values each*/
+    float* work_real;
+    float* work_imag;
+
+    /*DCT-IV output, n / 2 values*/
+    float* dct;
 };
 
 typedef struct {
@@ -50,6 +167,50 @@ typedef struct {
     BitstreamReader* packet;
 
     struct vorbis_identification_header identification;
+    struct vorbis_setup_header setup;
+
+    struct vorbis_mdct mdct[2];
+
+    /*the rising half of the window for each blocksize,
+      blocksize / 2 values each*/
+    float* slope[2];
+
+    /*per-channel working space*/
+    float** residue;  /*blocksize_1 / 2 values per channel*/
+    float** block;    /*blocksize_1 values per channel*/
+    float** overlap;  /*blocksize_1 / 2 values per channel*/
+    int* floor_unused;
+    int* no_residue;
+
+    /*working space for residue decoding*/
+    float* interleaved;
+    unsigned* classifications;
+
+    /*the blocksize of the previous audio packet
+      or 0 if no packet has been decoded yet*/
+    unsigned previous_blocksize;
+
+    /*the file offset of the first audio page*/
+    long audio_start;
+
+    /*the PCM frame after the last one returned from the stream*/
+    uint64_t position;
+
+    /*set once the stream's position is known
+      from the granule position of a completed page*/
+    int position_known;
+
+    /*set once a granule position has been seen,
+      which means leading samples are never trimmed*/
+    int granule_seen;
+
+    /*PCM frames before this one are decoded but not returned*/
+    uint64_t seek_target;
+
+    int stream_finished;
+
+    array_i* framelist_data;
+    PyObject* audiotools_pcm;
 } decoders_VorbisDecoder;
 
 typedef enum {VORBIS_OK,
@@ -64,8 +225,13 @@ typedef enum {VORBIS_OK,
               VORBIS_INVALID_FRAMING_BIT,
               VORBIS_INVALID_CODEBOOK_SYNC,
               VORBIS_UNSUPPORTED_CODEBOOK_LOOKUP_TYPE,
+              VORBIS_INVALID_CODEBOOK_LENGTHS,
               VORBIS_INVALID_TIME_COUNT_VALUE,
-              VORBIS_NOT_IMPLEMENTED /*FIXME - take this out at some point*/
+              VORBIS_UNSUPPORTED_FLOOR_TYPE,
+              VORBIS_UNSUPPORTED_RESIDUE_TYPE,
+              VORBIS_UNSUPPORTED_MAPPING_TYPE,
+              VORBIS_INVALID_SETUP_VALUE,
+              VORBIS_INVALID_AUDIO_PACKET
 } vorbis_status;
 
 static PyObject*
@@ -80,12 +246,15 @@ VorbisDecoder_channels(decoders_VorbisDecoder *self, void *closure);
 static PyObject*
 VorbisDecoder_channel_mask(decoders_VorbisDecoder *self, void *closure);
 
+/*the VorbisDecoder.read() method*/
 static PyObject*
 VorbisDecoder_read(decoders_VorbisDecoder *self, PyObject *args);
 
+/*the VorbisDecoder.seek() method*/
 static PyObject*
-VorbisDecoder_analyze_frame(decoders_VorbisDecoder *self, PyObject *args);
+VorbisDecoder_seek(decoders_VorbisDecoder *self, PyObject *args);
 
+/*the VorbisDecoder.close() method*/
 static PyObject*
 VorbisDecoder_close(decoders_VorbisDecoder *self, PyObject *args);
 
@@ -107,9 +276,14 @@ PyGetSetDef VorbisDecoder_getseters[] = {
 };
 
 PyMethodDef VorbisDecoder_methods[] = {
-    {"read", (PyCFunction)VorbisDecoder_read, METH_VARARGS, ""},
-    {"analyze_frame", (PyCFunction)VorbisDecoder_analyze_frame, METH_NOARGS, ""},
-    {"close", (PyCFunction)VorbisDecoder_close, METH_NOARGS, ""},
+    {"read", (PyCFunction)VorbisDecoder_read, METH_VARARGS,
+     "read(bytes) -> FrameList\n"
+     "returns the PCM frames of the next audio packet"},
+    {"seek", (PyCFunction)VorbisDecoder_seek, METH_VARARGS,
+     "seek(pcm_frame) -> pcm_frame\n"
+     "positions the stream so the next read() begins at the given frame"},
+    {"close", (PyCFunction)VorbisDecoder_close, METH_NOARGS,
+     "close() -> None"},
     {NULL}
 };
 
@@ -184,20 +358,93 @@ vorbis_read_identification_packet(
                         BitstreamReader *packet,
                         struct vorbis_identification_header *identification);
 
-/*reads setup information (including the common header)
-  performs EOF checking in case the packet is too small*/
-/*FIXME - place the setup info somewhere*/
+/*reads setup information (including the common header) into "setup"
+  performs EOF checking in case the packet is too small
+
+  "setup" should be freed with vorbis_free_setup
+  whether or not the read is successful*/
 vorbis_status
-vorbis_read_setup_packet(BitstreamReader *packet);
+vorbis_read_setup_packet(BitstreamReader *packet,
+                         const struct vorbis_identification_header *id,
+                         struct vorbis_setup_header *setup);
 
-/*reads codebook information*/
-/*FIXME - place the codebook info somewhere*/
+void
+vorbis_free_setup(struct vorbis_setup_header *setup);
+
+/*reads codebook information into "setup"*/
 vorbis_status
-vorbis_read_codebooks(BitstreamReader *packet);
+vorbis_read_codebooks(BitstreamReader *packet,
+                      struct vorbis_setup_header *setup);
 
 #include "vorbis_codewords.h"
 
-/*read time domain transforms information*/
-/*FIXME - place the results from this somewhere (if necessary)*/
+/*read time domain transforms information,
+  which is only a placeholder in Vorbis I*/
 vorbis_status
 vorbis_read_time_domain_transforms(BitstreamReader *packet);
+
+vorbis_status
+vorbis_read_floors(BitstreamReader *packet,
+                   const struct vorbis_identification_header *id,
+                   struct vorbis_setup_header *setup);
+
+vorbis_status
+vorbis_read_residues(BitstreamReader *packet,
+                     struct vorbis_setup_header *setup);
+
+vorbis_status
+vorbis_read_mappings(BitstreamReader *packet,
+                     const struct vorbis_identification_header *id,
+                     struct vorbis_setup_header *setup);
+
+vorbis_status
+vorbis_read_modes(BitstreamReader *packet,
+                  struct vorbis_setup_header *setup);
+
+/*returns the codebook entry of the next codeword in "packet"*/
+static unsigned
+vorbis_read_codeword(BitstreamReader *packet,
+                     const struct vorbis_codebook *codebook);
+
+/*decodes the floor for a channel into "output" of n values
+  returns 1 if the floor is unused for this packet, 0 if used*/
+int
+vorbis_decode_floor(decoders_VorbisDecoder *self,
+                    const struct vorbis_floor *floor,
+                    unsigned blockflag,
+                    unsigned n,
+                    float *output);
+
+/*decodes residue vectors of n values for "ch" channels into "output"*/
+void
+vorbis_decode_residue(decoders_VorbisDecoder *self,
+                      const struct vorbis_residue *residue,
+                      unsigned ch,
+                      unsigned n,
+                      const int *do_not_decode,
+                      float **output);
+
+/*decodes the audio packet currently in self->packet
+  and places any finished PCM frames in self->framelist_data
+  in ChannelMask order*/
+vorbis_status
+vorbis_decode_audio_packet(decoders_VorbisDecoder *self,
+                           unsigned *pcm_frames);
+
+/*sets up the inverse MDCT tables for blocksize n*/
+void
+vorbis_init_mdct(struct vorbis_mdct *mdct, unsigned n);
+
+void
+vorbis_free_mdct(struct vorbis_mdct *mdct);
+
+/*transforms n / 2 frequency values in "input"
+  to n time domain values in "output"*/
+void
+vorbis_inverse_mdct(struct vorbis_mdct *mdct,
+                    const float *input,
+                    float *output);
+
+/*positions the Ogg stream at the start of the page at "offset"*/
+ogg_status
+vorbis_seek_page(decoders_VorbisDecoder *self, long offset);
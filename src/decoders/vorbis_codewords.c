@@ -18,142 +18,106 @@
 *******************************************************/
 
 /*codeword helper functions for transforming
-  the list of frequencies into a proper Huffman lookup table*/
-static struct vorbis_codeword*
-codeword_new_leaf(int value, unsigned int length, unsigned int bits) {
-    struct vorbis_codeword* leaf = malloc(sizeof(struct vorbis_codeword));
-    leaf->is_leaf = 1;
-    leaf->value = value;
-    leaf->bits = bits;
-    leaf->length = length;
-    return leaf;
-}
+  the list of codeword lengths into a Huffman tree*/
+static int
+vorbis_build_codebook_tree(struct vorbis_codebook *codebook,
+                           const unsigned *lengths) {
+    /*the next available codeword of each length, or 0 if none*/
+    uint32_t available[33];
+    unsigned entry;
+    unsigned used = 0;
+    unsigned last_used = 0;
+    unsigned i;
+    int first = 1;
 
-static struct vorbis_codeword*
-codeword_new_tree(void) {
-    struct vorbis_codeword* tree = malloc(sizeof(struct vorbis_codeword));
-    tree->is_leaf = 0;
-    tree->bit_0 = NULL;
-    tree->bit_1 = NULL;
-    return tree;
-}
+    codebook->tree = NULL;
+    codebook->tree_size = 0;
+    codeword_new_node(codebook);
 
-static void
-codeword_free_tree(struct vorbis_codeword* tree) {
-    if (tree == NULL) {
-        return;
-    } else if (tree->is_leaf) {
-        free(tree);
-    } else {
-        codeword_free_tree(tree->bit_0);
-        codeword_free_tree(tree->bit_1);
-        free(tree);
-    }
-}
+    for (entry = 0; entry < codebook->entries; entry++)
+        if (lengths[entry] > 0) {
+            used++;
+            last_used = entry;
+        }
 
-static unsigned int
-codeword_total_leaf_nodes(struct vorbis_codeword* tree) {
-    if (tree == NULL) {
+    if (used == 1) {
+        /*a codebook with a single entry returns that entry
+          for either value of its lone bit*/
+        codebook->tree[0][0] = codebook->tree[0][1] = -(int)(last_used + 1);
         return 0;
-    } else if (tree->is_leaf) {
-        return 1;
-    } else {
-        return (codeword_total_leaf_nodes(tree->bit_0) +
-                codeword_total_leaf_nodes(tree->bit_1));
     }
-}
 
-static struct vorbis_codeword*
-codeword_add_length(struct vorbis_codeword* tree,
-                    unsigned int current_depth,
-                    unsigned int length,
-                    unsigned int bits,
-                    int value) {
-    struct vorbis_codeword* new_leaf;
-
-    if (current_depth == length) {
-        if (tree != NULL)
-            /*node already present, so return failure*/
-            return NULL;
-        else
-            /*node not yet present, so add new node*/
-            return codeword_new_leaf(value, length, bits);
-    } else if (current_depth < length) {
-        if (tree != NULL) {
-            if (tree->is_leaf) {
-                /*can't add leaf nodes to other leaves*/
-                return NULL;
-            } else {
-                /*try bit 0 first*/
-                new_leaf = codeword_add_length(tree->bit_0,
-                                               current_depth + 1,
-                                               length,
-                                               bits << 1,
-                                               value);
-                if (new_leaf != NULL) {
-                    tree->bit_0 = new_leaf;
-                    return tree;
-                }
-
-                /*then try the 1 bit*/
-                new_leaf = codeword_add_length(tree->bit_1,
-                                               current_depth + 1,
-                                               length,
-                                               (bits << 1) | 1,
-                                               value);
-                if (new_leaf != NULL) {
-                    tree->bit_1 = new_leaf;
-                    return tree;
-                }
-
-                /*if neither works, return failure*/
-                return NULL;
-            }
-        } else {
-            /*tree not yet large enough, so add new non-leaf node*/
-            tree = codeword_new_tree();
-            tree->bit_0 = codeword_add_length(tree->bit_0,
-                                              current_depth + 1,
-                                              length,
-                                              bits << 1,
-                                              value);
-            return tree;
+    for (i = 0; i <= 32; i++)
+        available[i] = 0;
+
+    for (entry = 0; entry < codebook->entries; entry++) {
+        const unsigned length = lengths[entry];
+        uint32_t codeword;
+        unsigned z;
+
+        if (length == 0)
+            continue;
+
+        if (first) {
+            /*the first entry gets the codeword of all 0 bits*/
+            codeword_add_entry(codebook, 0, length, entry);
+            for (i = 1; i <= length; i++)
+                available[i] = (uint32_t)1 << (32 - i);
+            first = 0;
+            continue;
         }
-    } else {
-        /*walked too far within tree, so return failure*/
-        return NULL;
+
+        /*find the longest available codeword no longer than "length"*/
+        for (z = length; (z > 0) && (available[z] == 0); z--)
+            /*do nothing*/;
+        if (z == 0)
+            return 1;
+
+        codeword = available[z];
+        available[z] = 0;
+        codeword_add_entry(codebook, codeword, length, entry);
+
+        /*and make the branches it leaves behind available*/
+        for (i = length; i > z; i--)
+            available[i] = codeword + ((uint32_t)1 << (32 - i));
     }
+
+    return 0;
+}
+
+static int
+codeword_new_node(struct vorbis_codebook *codebook) {
+    const unsigned index = codebook->tree_size;
+
+    /*grow the tree each time its size reaches a power of 2*/
+    if ((index & (index - 1)) == 0)
+        codebook->tree = realloc(codebook->tree,
+                                 sizeof(int[2]) * (index ? index * 2 : 1));
+
+    codebook->tree[index][0] = 0;
+    codebook->tree[index][1] = 0;
+    codebook->tree_size++;
+    return (int)index;
 }
 
-/* static struct huffman_frequency* */
-/* codeword_tree_to_frequencies(struct vorbis_codeword* tree) { */
-/*     struct huffman_frequency* frequencies = */
-/*         malloc(sizeof(struct huffman_frequency) * */
-/*                (codeword_total_leaf_nodes(tree) + 1)); */
-/*     int index = 0; */
-
-/*     codeword_tree_to_frequencies_(tree, frequencies, &index); */
-/*     frequencies[index].length = 0; */
-/*     return frequencies; */
-/* } */
-
-/* static void */
-/* codeword_tree_to_frequencies_(struct vorbis_codeword* tree, */
-/*                               struct huffman_frequency* frequencies, */
-/*                               int* index) { */
-/*     if (tree == NULL) { */
-/*         return; */
-/*     } else if (tree->is_leaf) { */
-/*         frequencies[*index].value = tree->value; */
-/*         frequencies[*index].bits = tree->bits; */
-/*         frequencies[*index].length = tree->length; */
-/*         *index += 1; */
-/*     } else { */
-/*         codeword_tree_to_frequencies_(tree->bit_0, */
-/*                                       frequencies, */
-/*                                       index); */
-/*         codeword_tree_to_frequencies_(tree->bit_1, */
-/*                                       frequencies, */
-/*                                       index); */
-/*     } */
-/* } */
+static void
+codeword_add_entry(struct vorbis_codebook *codebook,
+                   uint32_t codeword,
+                   unsigned length,
+                   unsigned entry) {
+    int node = 0;
+    unsigned depth;
+
+    for (depth = 0; depth < (length - 1); depth++) {
+        const unsigned bit = (codeword >> (31 - depth)) & 1;
+        int child = codebook->tree[node][bit];
+
+        if (child <= 0) {
+            child = codeword_new_node(codebook);
+            codebook->tree[node][bit] = child;
+        }
+        node = child;
+    }
+
+    codebook->tree[node][(codeword >> (32 - length)) & 1] = -(int)(entry + 1);
+}
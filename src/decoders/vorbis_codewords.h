@@ -17,29 +17,25 @@
  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 *******************************************************/
 
-static struct vorbis_codeword*
-codeword_new_leaf(int value, unsigned int length, unsigned int bits);
-
-static struct vorbis_codeword*
-codeword_new_tree(void);
-
-static struct vorbis_codeword*
-codeword_add_length(struct vorbis_codeword* tree,
-                    unsigned int current_depth,
-                    unsigned int length,
-                    unsigned int bits,
-                    int value);
-
+/*given a codeword length for each of the codebook's entries,
+  where a length of 0 indicates an unused entry,
+  assigns codewords to entries in the order the Vorbis spec requires
+  and builds "codebook"'s Huffman tree from them
+
+  returns 0 on success,
+  or 1 if the lengths describe more codewords than a tree can hold*/
+static int
+vorbis_build_codebook_tree(struct vorbis_codebook *codebook,
+                           const unsigned *lengths);
+
+/*adds a node to "codebook"'s tree and returns its index*/
+static int
+codeword_new_node(struct vorbis_codebook *codebook);
+
+/*adds "entry" to "codebook"'s tree at the given codeword,
+  which is "length" bits long and aligned to the top of a 32 bit value*/
 static void
-codeword_free_tree(struct vorbis_codeword* tree);
-
-static unsigned int
-codeword_total_leaf_nodes(struct vorbis_codeword* tree);
-
-/* static struct huffman_frequency* */
-/* codeword_tree_to_frequencies(struct vorbis_codeword* tree); */
-
-/* static void */
-/* codeword_tree_to_frequencies_(struct vorbis_codeword* tree, */
-/*                               struct huffman_frequency* frequencies, */
-/*                               int* index); */
+codeword_add_entry(struct vorbis_codebook *codebook,
+                   uint32_t codeword,
+                   unsigned length,
+                   unsigned entry);
@@ -33,6 +33,7 @@ WavPackDecoder_init(decoders_WavPackDecoder *self,
 
     audiotools__MD5Init(&(self->md5));
     self->md5sum_checked = 0;
+    self->skip_md5 = 0;
 
     self->channels_data = array_ia_new();
     self->decorrelation_terms = array_i_new();
@@ -204,6 +205,14 @@ WavPackDecoder_channel_mask(decoders_WavPackDecoder *self, void *closure) {
     return Py_BuildValue("i", self->channel_mask);
 }
 
+static PyObject*
+WavPackDecoder_skip_md5(decoders_WavPackDecoder* self, PyObject *args) {
+    self->skip_md5 = 1;
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject*
 WavPackDecoder_close(decoders_WavPackDecoder* self, PyObject *args) {
     Py_INCREF(Py_None);
@@ -280,7 +289,7 @@ WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args) {
             return NULL;
         }
     } else {
-        if (!self->md5sum_checked) {
+        if (!(self->md5sum_checked || self->skip_md5)) {
             struct sub_block md5_sub_block;
             unsigned char sub_block_md5sum[16];
             unsigned char stream_md5sum[16];
@@ -1721,6 +1730,9 @@ WavPackDecoder_update_md5sum(decoders_WavPackDecoder *self,
     Py_ssize_t length;
     int sign = self->bits_per_sample >= 16;
 
+    if (self->skip_md5)
+        return 0;
+
     if ((string_obj =
          PyObject_CallMethod(framelist, "to_bytes","ii", 0, sign)) != NULL) {
         if (PyString_AsStringAndSize(string_obj,
@@ -62,6 +62,7 @@ typedef struct {
 
     audiotools__MD5Context md5;
     int md5sum_checked;
+    int skip_md5;
 
     int sample_rate;
     int bits_per_sample;
@@ -115,6 +116,10 @@ PyGetSetDef WavPackDecoder_getseters[] = {
     {NULL}
 };
 
+/*the WavPackDecoder.skip_md5() method*/
+static PyObject*
+WavPackDecoder_skip_md5(decoders_WavPackDecoder* self, PyObject *args);
+
 /*the WavPackDecoder.close() method*/
 static PyObject*
 WavPackDecoder_close(decoders_WavPackDecoder* self, PyObject *args);
@@ -126,6 +131,8 @@ WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args);
 PyMethodDef WavPackDecoder_methods[] = {
     {"read", (PyCFunction)WavPackDecoder_read,
      METH_VARARGS, "Returns a decoded frame"},
+    {"skip_md5", (PyCFunction)WavPackDecoder_skip_md5,
+     METH_NOARGS, "Stops calculating and verifying the stream's MD5 sum"},
     {"close", (PyCFunction)WavPackDecoder_close,
      METH_NOARGS, "Closes the stream"},
     {NULL}
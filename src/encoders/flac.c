@@ -6,6 +6,7 @@
 #include <float.h>
 #include <math.h>
 #include <assert.h>
+#include <pthread.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -64,13 +65,23 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
                              "disable_constant_subframes",
                              "disable_fixed_subframes",
                              "disable_lpc_subframes",
+                             "threads",
                              NULL};
     audiotools__MD5Context md5sum;
 
-    array_ia* samples;
+    int threads = 1;
+    unsigned batch_size;
+    struct flac_context** encoders;
+    struct flac_frame_job* jobs;
+    array_ia** samples;
+    BitstreamWriter** frames;
+    unsigned frame_count;
+    unsigned frame_number = 0;
+    unsigned i;
 
     PyObject *frame_offsets = NULL;
     PyObject *offset = NULL;
+    long batch_offset;
 
     unsigned block_size = 0;
 
@@ -86,7 +97,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
     /*extract a filename, PCMReader-compatible object and encoding options:
       blocksize int*/
     if (!PyArg_ParseTupleAndKeywords(
-            args, keywds, "sOIIII|iiiiiii",
+            args, keywds, "sOIIII|iiiiiiii",
             kwlist,
             &filename,
             &pcmreader_obj,
@@ -101,7 +112,8 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
             &(encoder.options.no_verbatim_subframes),
             &(encoder.options.no_constant_subframes),
             &(encoder.options.no_fixed_subframes),
-            &(encoder.options.no_lpc_subframes)))
+            &(encoder.options.no_lpc_subframes),
+            &threads))
         return NULL;
 
     block_size = encoder.options.block_size;
@@ -139,7 +151,15 @@ encoders_encode_flac(char *filename,
     pcmreader* pcmreader;
     char version_string[0xFF];
     audiotools__MD5Context md5sum;
-    array_ia* samples;
+    int threads = 1;
+    unsigned batch_size;
+    struct flac_context** encoders;
+    struct flac_frame_job* jobs;
+    array_ia** samples;
+    BitstreamWriter** frames;
+    unsigned frame_count;
+    unsigned frame_number = 0;
+    unsigned i;
 
     /*set user-defined encoding options*/
     encoder.options.block_size = block_size;
@@ -241,45 +261,85 @@ encoders_encode_flac(char *filename,
 
     /*build frames until reader is empty,
       which updates STREAMINFO in the process*/
-    samples = array_ia_new();
+    if (threads < 1)
+        threads = 1;
+    batch_size = (threads == 1) ? 1 : threads * FRAMES_PER_THREAD;
+
+    /*each thread gets its own encoder buffers,
+      with the first thread's being the main encoder*/
+    encoders = malloc(sizeof(struct flac_context*) * threads);
+    jobs = malloc(sizeof(struct flac_frame_job) * threads);
+    encoders[0] = &encoder;
+    for (i = 1; i < threads; i++) {
+        encoders[i] = malloc(sizeof(struct flac_context));
+        encoders[i]->options = encoder.options;
+        encoders[i]->streaminfo = encoder.streaminfo;
+        flacenc_init_encoder(encoders[i]);
+    }
+
+    samples = malloc(sizeof(array_ia*) * batch_size);
+    frames = malloc(sizeof(BitstreamWriter*) * batch_size);
+    for (i = 0; i < batch_size; i++) {
+        samples[i] = array_ia_new();
+        frames[i] = bw_open_recorder(BS_BIG_ENDIAN);
+    }
 
-    if (pcmreader->read(pcmreader, block_size, samples))
-        goto error;
+    do {
+        /*read up to a batch's worth of PCM blocks*/
+        for (frame_count = 0; frame_count < batch_size; frame_count++) {
+            if (pcmreader->read(pcmreader, block_size, samples[frame_count]))
+                goto error;
+            if (samples[frame_count]->_[0]->len == 0)
+                break;
+        }
 
-    while (samples->_[0]->len > 0) {
 #ifndef STANDALONE
-        offset = Py_BuildValue("(i, i)",
-                               bw_ftell(output_stream),
-                               samples->_[0]->len);
-        PyList_Append(frame_offsets, offset);
-        Py_DECREF(offset);
+        batch_offset = bw_ftell(output_stream);
 
         Py_BEGIN_ALLOW_THREADS
 #endif
-        bw_reset_recorder(encoder.frame);
-        flacenc_write_frame(encoder.frame, &encoder, samples);
-        encoder.streaminfo.total_samples += samples->_[0]->len;
-        encoder.streaminfo.minimum_frame_size =
-            MIN(encoder.streaminfo.minimum_frame_size,
-                encoder.frame->bits_written(encoder.frame) / 8);
-        encoder.streaminfo.maximum_frame_size =
-            MAX(encoder.streaminfo.maximum_frame_size,
-                encoder.frame->bits_written(encoder.frame) / 8);
-        bw_rec_copy(output_stream, encoder.frame);
+        /*encode the whole batch, then write its frames in order*/
+        flacenc_encode_batch(threads,
+                             encoders,
+                             jobs,
+                             frame_count,
+                             frame_number,
+                             samples,
+                             frames);
+        frame_number += frame_count;
+
+        for (i = 0; i < frame_count; i++) {
+            encoder.streaminfo.total_samples += samples[i]->_[0]->len;
+            encoder.streaminfo.minimum_frame_size =
+                MIN(encoder.streaminfo.minimum_frame_size,
+                    frames[i]->bits_written(frames[i]) / 8);
+            encoder.streaminfo.maximum_frame_size =
+                MAX(encoder.streaminfo.maximum_frame_size,
+                    frames[i]->bits_written(frames[i]) / 8);
+            bw_rec_copy(output_stream, frames[i]);
+        }
 #ifndef STANDALONE
         Py_END_ALLOW_THREADS
-#endif
 
-        if (pcmreader->read(pcmreader, block_size, samples))
-            goto error;
-    }
+        /*frames are byte-aligned, so each one's offset
+          follows from the sizes of those before it*/
+        for (i = 0; i < frame_count; i++) {
+            offset = Py_BuildValue("(l, i)",
+                                   batch_offset,
+                                   samples[i]->_[0]->len);
+            PyList_Append(frame_offsets, offset);
+            Py_DECREF(offset);
+            batch_offset += frames[i]->bits_written(frames[i]) / 8;
+        }
+#endif
+    } while (frame_count == batch_size);
 
     /*go back and re-write STREAMINFO with complete values*/
     audiotools__MD5Final(encoder.streaminfo.md5sum, &md5sum);
     fseek(output_stream->output.file, 4 + 4, SEEK_SET);
     flacenc_write_streaminfo(output_stream, &encoder.streaminfo);
 
-    samples->del(samples); /*deallocate the temporary samples block*/
+    flacenc_free_batch(threads, encoders, jobs, batch_size, samples, frames);
     pcmreader->close(pcmreader);
     pcmreader->del(pcmreader);
     flacenc_free_encoder(&encoder);
@@ -290,7 +350,7 @@ encoders_encode_flac(char *filename,
     /*an error result does everything a regular result does
       but returns NULL instead of Py_None*/
     Py_XDECREF(frame_offsets);
-    samples->del(samples);
+    flacenc_free_batch(threads, encoders, jobs, batch_size, samples, frames);
     pcmreader->del(pcmreader);
     flacenc_free_encoder(&encoder);
     output_stream->close(output_stream); /*close the output file*/
@@ -299,7 +359,7 @@ encoders_encode_flac(char *filename,
 #else
     return 1;
  error:
-    samples->del(samples);
+    flacenc_free_batch(threads, encoders, jobs, batch_size, samples, frames);
     pcmreader->del(pcmreader);
     flacenc_free_encoder(&encoder);
     output_stream->close(output_stream); /*close the output file*/
@@ -307,6 +367,90 @@ encoders_encode_flac(char *filename,
 }
 #endif
 
+void*
+flacenc_encode_frames(void* job)
+{
+    struct flac_frame_job* frame_job = job;
+    unsigned i;
+
+    for (i = frame_job->first; i < frame_job->count; i += frame_job->step) {
+        frame_job->encoder->total_flac_frames = frame_job->frame_number + i;
+        bw_reset_recorder(frame_job->frames[i]);
+        flacenc_write_frame(frame_job->frames[i],
+                            frame_job->encoder,
+                            frame_job->samples[i]);
+    }
+
+    return NULL;
+}
+
+void
+flacenc_encode_batch(unsigned threads,
+                     struct flac_context** encoders,
+                     struct flac_frame_job* jobs,
+                     unsigned count,
+                     unsigned frame_number,
+                     array_ia** samples,
+                     BitstreamWriter** frames)
+{
+    pthread_t thread_ids[threads];
+    int started[threads];
+    unsigned i;
+
+    for (i = 0; i < threads; i++) {
+        jobs[i].encoder = encoders[i];
+        jobs[i].first = i;
+        jobs[i].step = threads;
+        jobs[i].count = count;
+        jobs[i].frame_number = frame_number;
+        jobs[i].samples = samples;
+        jobs[i].frames = frames;
+    }
+
+    /*start a thread for every job but the first*/
+    for (i = 1; i < threads; i++)
+        started[i] = (i < count) &&
+            (pthread_create(&(thread_ids[i]),
+                            NULL,
+                            flacenc_encode_frames,
+                            &(jobs[i])) == 0);
+
+    flacenc_encode_frames(&(jobs[0]));
+
+    /*wait for the started threads
+      and run any job whose thread couldn't be started*/
+    for (i = 1; i < threads; i++)
+        if (started[i])
+            pthread_join(thread_ids[i], NULL);
+        else
+            flacenc_encode_frames(&(jobs[i]));
+}
+
+void
+flacenc_free_batch(unsigned threads,
+                   struct flac_context** encoders,
+                   struct flac_frame_job* jobs,
+                   unsigned batch_size,
+                   array_ia** samples,
+                   BitstreamWriter** frames)
+{
+    unsigned i;
+
+    for (i = 1; i < threads; i++) {
+        flacenc_free_encoder(encoders[i]);
+        free(encoders[i]);
+    }
+    free(encoders);
+    free(jobs);
+
+    for (i = 0; i < batch_size; i++) {
+        samples[i]->del(samples[i]);
+        frames[i]->close(frames[i]);
+    }
+    free(samples);
+    free(frames);
+}
+
 
 void
 flacenc_init_encoder(struct flac_context* encoder)
@@ -94,6 +94,22 @@ struct flac_context {
     array_li* remaining_residuals;
 };
 
+/*the number of frames each thread encodes per batch
+  when encoding with more than one thread*/
+#define FRAMES_PER_THREAD 4
+
+/*a batch of frames for one encoding thread,
+  which encodes every "step"th frame starting at "first"*/
+struct flac_frame_job {
+    struct flac_context* encoder;  /*the thread's own buffers*/
+    unsigned first;
+    unsigned step;
+    unsigned count;                /*total frames in the batch*/
+    unsigned frame_number;         /*FLAC frame number of frame 0*/
+    array_ia** samples;            /*PCM blocks, one per frame*/
+    BitstreamWriter** frames;      /*frame recorders, one per frame*/
+};
+
 struct flac_frame_header {
     uint8_t blocking_strategy;
     uint32_t block_size;
@@ -127,6 +143,35 @@ flacenc_init_encoder(struct flac_context* encoder);
 void
 flacenc_free_encoder(struct flac_context* encoder);
 
+/*encodes the job's frames to their recorders
+  and returns NULL, for use as a thread's start routine*/
+void*
+flacenc_encode_frames(void* job);
+
+/*encodes "count" PCM blocks to "frames" using "threads" number of
+  encoders and jobs, with frame numbers starting at "frame_number"
+
+  encoders[0] is used by the calling thread
+  while any others are run in threads of their own*/
+void
+flacenc_encode_batch(unsigned threads,
+                     struct flac_context** encoders,
+                     struct flac_frame_job* jobs,
+                     unsigned count,
+                     unsigned frame_number,
+                     array_ia** samples,
+                     BitstreamWriter** frames);
+
+/*deallocates the extra encoders, jobs, PCM blocks and frame recorders
+  allocated for batch encoding*/
+void
+flacenc_free_batch(unsigned threads,
+                   struct flac_context** encoders,
+                   struct flac_frame_job* jobs,
+                   unsigned batch_size,
+                   array_ia** samples,
+                   BitstreamWriter** frames);
+
 /*writes a STREAMINFO metadata block to the BitstreamWriter*/
 void
 flacenc_write_streaminfo(BitstreamWriter* bs,
@@ -144,6 +144,11 @@ encoders_encode_wavpack(char *filename,
     while (pcm_frames->_[0]->len > 0) {
         unsigned pcm_frame_count = pcm_frames->_[0]->len;
 
+#ifndef STANDALONE
+        /*the block set is encoded and written without touching
+          any Python objects, so other threads may run meanwhile*/
+        Py_BEGIN_ALLOW_THREADS
+#endif
         /*split PCM frames into 1-2 channel blocks*/
         for (block = 0; block < context.blocks_per_set; block++) {
             /*add a fresh block offset based on current file position*/
@@ -163,6 +168,9 @@ encoders_encode_wavpack(char *filename,
                          block == 0,
                          block == (context.blocks_per_set - 1));
         }
+#ifndef STANDALONE
+        Py_END_ALLOW_THREADS
+#endif
 
         block_index += pcm_frame_count;
         if (pcmreader->read(pcmreader, block_size, pcm_frames))
@@ -2,6 +2,8 @@
 #include <Python.h>
 #endif
 #include <stdlib.h>
+#include <math.h>
+#include <time.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -43,6 +45,9 @@ PyMethodDef module_methods[] = {
     {"from_channels", (PyCFunction)FrameList_from_channels,
      METH_VARARGS,
      "from_channels(framelist_list) -> FrameList"},
+    {"from_buffer", (PyCFunction)FrameList_from_buffer,
+     METH_VARARGS,
+     "from_buffer(buffer, channels, bits_per_sample) -> FrameList"},
     {"from_float_frames", (PyCFunction)FloatFrameList_from_frames,
      METH_VARARGS,
      "from_float_frames(floatframelist_list) -> FloatFrameList"},
@@ -90,6 +95,14 @@ PyMethodDef FrameList_methods[] = {
      "F.frame_count(bytes) -> int -- "
      "given a number of bytes, returns the maximum number of frames "
      "that would fit or a minimum of 1"},
+    {"apply_gain", (PyCFunction)FrameList_apply_gain,
+     METH_VARARGS,
+     "F.apply_gain(multiplier[, dither]) -> FrameList -- "
+     "scales samples by multiplier, clipping to bits_per_sample"},
+    {"requantize", (PyCFunction)FrameList_requantize,
+     METH_VARARGS,
+     "F.requantize(bits_per_sample[, dither]) -> FrameList -- "
+     "converts samples to a new bits_per_sample"},
     {NULL}
 };
 
@@ -106,6 +119,15 @@ static PySequenceMethods pcm_FrameListType_as_sequence = {
     (ssizeargfunc)NULL,             /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FrameListType_as_buffer = {
+    (readbufferproc)FrameList_getreadbuffer, /* bf_getreadbuffer */
+    (writebufferproc)NULL,                   /* bf_getwritebuffer */
+    (segcountproc)FrameList_getsegcount,     /* bf_getsegcount */
+    (charbufferproc)NULL,                    /* bf_getcharbuffer */
+    (getbufferproc)FrameList_getbuffer,      /* bf_getbuffer */
+    (releasebufferproc)NULL,                 /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FrameListType = {
     PyObject_HEAD_INIT(NULL)
     0,                         /*ob_size*/
@@ -126,8 +148,9 @@ PyTypeObject pcm_FrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FrameList(string, channels, bits_per_sample, is_big_endian, is_signed)",
     /* tp_doc */
     0,                         /* tp_traverse */
@@ -153,7 +176,12 @@ PyTypeObject pcm_FrameListType = {
 void
 FrameList_dealloc(pcm_FrameList* self)
 {
-    free(self->samples);
+    if (self->adopted != NULL) {
+        PyBuffer_Release(self->adopted);
+        free(self->adopted);
+    } else {
+        free(self->samples);
+    }
     self->ob_type->tp_free((PyObject*)self);
 }
 
@@ -179,6 +207,13 @@ FrameList_init(pcm_FrameList *self, PyObject *args, PyObject *kwds)
     int is_big_endian;
     int is_signed;
     FrameList_char_to_int_converter converter;
+    unsigned i;
+
+    if (self->adopted != NULL) {
+        PyErr_SetString(PyExc_ValueError,
+                        "FrameList already initialized");
+        return -1;
+    }
 
     if (!PyArg_ParseTuple(args, "s#IIii",
                           &data, &data_size,
@@ -204,23 +239,25 @@ FrameList_init(pcm_FrameList *self, PyObject *args, PyObject *kwds)
                         "bits-per-sample and number of channels");
         return -1;
     } else {
-        self->samples_length = data_size / (self->bits_per_sample / 8);
-        self->frames = self->samples_length / self->channels;
-        self->samples = malloc(sizeof(int) * self->samples_length);
         converter = FrameList_get_char_to_int_converter(self->bits_per_sample,
                                                         is_big_endian,
                                                         is_signed);
-        if (converter) {
-            FrameList_char_to_samples(self->samples,
-                                      data,
-                                      converter,
-                                      self->samples_length,
-                                      self->bits_per_sample);
-        } else {
+        if (!converter) {
             PyErr_SetString(PyExc_ValueError,
                             "unsupported number of bits per sample");
             return -1;
         }
+        if (FrameList_resize(self,
+                             (unsigned)(data_size /
+                                        (self->bits_per_sample / 8) /
+                                        self->channels),
+                             self->channels,
+                             self->bits_per_sample))
+            return -1;
+        for (i = 0; i < self->samples_length;
+             i++, data += (self->bits_per_sample / 8)) {
+            FrameList_set_sample(self, i, converter(data));
+        }
     }
 
     return 0;
@@ -230,17 +267,26 @@ PyObject*
 FrameList_blank(PyObject *dummy, PyObject *args)
 {
     pcm_FrameList *framelist = FrameList_create();
-    framelist->frames = framelist->channels = 0;
-    framelist->bits_per_sample = 8;
-    framelist->samples_length = 0;
-    framelist->samples = malloc(0);
+    if ((framelist != NULL) && FrameList_resize(framelist, 0, 0, 8)) {
+        Py_DECREF(framelist);
+        return NULL;
+    }
     return (PyObject*)framelist;
 }
 
 pcm_FrameList*
 FrameList_create(void)
 {
-    return (pcm_FrameList*)_PyObject_New(&pcm_FrameListType);
+    pcm_FrameList *framelist =
+        (pcm_FrameList*)_PyObject_New(&pcm_FrameListType);
+    if (framelist != NULL) {
+        framelist->frames = framelist->channels = 0;
+        framelist->bits_per_sample = 0;
+        framelist->samples = NULL;
+        framelist->samples_length = 0;
+        framelist->adopted = NULL;
+    }
+    return framelist;
 }
 
 int
@@ -304,20 +350,14 @@ PyObject
 int
 FrameList_equals(pcm_FrameList *a, pcm_FrameList *b)
 {
-    unsigned i;
-
-    if ((a->frames == b->frames) &&
-        (a->channels == b->channels) &&
-        (a->bits_per_sample == b->bits_per_sample) &&
-        (a->samples_length == b->samples_length)) {
-        for (i = 0; i < a->samples_length; i++) {
-            if (a->samples[i] != b->samples[i])
-                return 0;
-        }
-        return 1;
-    } else {
-        return 0;
-    }
+    /*FrameLists with the same bits-per-sample share a storage type*/
+    return ((a->frames == b->frames) &&
+            (a->channels == b->channels) &&
+            (a->bits_per_sample == b->bits_per_sample) &&
+            (a->samples_length == b->samples_length) &&
+            (memcmp(a->samples, b->samples,
+                    a->samples_length *
+                    FRAMELIST_SAMPLE_SIZE(a->bits_per_sample)) == 0));
 }
 
 PyObject*
@@ -327,7 +367,7 @@ FrameList_GetItem(pcm_FrameList *o, Py_ssize_t i)
         PyErr_SetString(PyExc_IndexError, "index out of range");
         return NULL;
     } else {
-        return Py_BuildValue("i", o->samples[i]);
+        return Py_BuildValue("i", FrameList_get_sample(o, (unsigned)i));
     }
 }
 
@@ -336,6 +376,7 @@ FrameList_frame(pcm_FrameList *self, PyObject *args)
 {
     int frame_number;
     pcm_FrameList *frame;
+    size_t sample_size;
 
     if (!PyArg_ParseTuple(args, "i", &frame_number))
         return NULL;
@@ -345,14 +386,15 @@ FrameList_frame(pcm_FrameList *self, PyObject *args)
     }
 
     frame = FrameList_create();
-    frame->frames = 1;
-    frame->channels = self->channels;
-    frame->bits_per_sample = self->bits_per_sample;
-    frame->samples = malloc(sizeof(int) * self->channels);
-    frame->samples_length = self->channels;
+    if (FrameList_resize(frame, 1, self->channels, self->bits_per_sample)) {
+        Py_DECREF(frame);
+        return NULL;
+    }
+    sample_size = FRAMELIST_SAMPLE_SIZE(self->bits_per_sample);
     memcpy(frame->samples,
-           self->samples + (frame_number * self->channels),
-           sizeof(int) * self->channels);
+           (uint8_t*)self->samples +
+           (frame_number * self->channels * sample_size),
+           self->channels * sample_size);
     return (PyObject*)frame;
 }
 
@@ -373,18 +415,17 @@ FrameList_channel(pcm_FrameList *self, PyObject *args)
     }
 
     channel = FrameList_create();
-    channel->frames = self->frames;
-    channel->channels = 1;
-    channel->bits_per_sample = self->bits_per_sample;
-    channel->samples = malloc(sizeof(int) * self->frames);
-    channel->samples_length = self->frames;
+    if (FrameList_resize(channel, self->frames, 1, self->bits_per_sample)) {
+        Py_DECREF(channel);
+        return NULL;
+    }
 
     samples_length = self->samples_length;
     total_channels = self->channels;
     for (j=0, i = channel_number;
          i < samples_length;
          j++, i += total_channels) {
-        channel->samples[j] = self->samples[i];
+        FrameList_set_sample(channel, j, FrameList_get_sample(self, i));
     }
 
     return (PyObject*)channel;
@@ -398,21 +439,24 @@ FrameList_to_bytes(pcm_FrameList *self, PyObject *args)
     unsigned char *bytes;
     Py_ssize_t bytes_size;
     PyObject *bytes_obj;
+    FrameList_int_to_char_converter converter;
+    int bytes_per_sample = self->bits_per_sample / 8;
+    unsigned i;
 
     if (!PyArg_ParseTuple(args, "ii", &is_big_endian, &is_signed))
         return NULL;
 
-    bytes_size = (self->bits_per_sample / 8) * self->samples_length;
+    bytes_size = bytes_per_sample * self->samples_length;
     bytes = malloc(bytes_size);
 
     if (bytes_size > 0) {
-        FrameList_samples_to_char(
-             bytes, self->samples,
-             FrameList_get_int_to_char_converter(self->bits_per_sample,
-                                                 is_big_endian,
-                                                 is_signed),
-             self->samples_length,
-             self->bits_per_sample);
+        converter =
+            FrameList_get_int_to_char_converter(self->bits_per_sample,
+                                                is_big_endian,
+                                                is_signed);
+        for (i = 0; i < self->samples_length; i++)
+            converter(FrameList_get_sample(self, i),
+                      bytes + (i * bytes_per_sample));
     }
 
     bytes_obj = PyString_FromStringAndSize((char*)bytes, bytes_size);
@@ -427,6 +471,7 @@ FrameList_split(pcm_FrameList *self, PyObject *args)
     pcm_FrameList *tail = NULL;
     PyObject* tuple;
     int split_point;
+    size_t sample_size;
 
     if (!PyArg_ParseTuple(args, "i", &split_point))
         goto error;
@@ -438,39 +483,32 @@ FrameList_split(pcm_FrameList *self, PyObject *args)
         head = self;
         Py_INCREF(head);
         tail = FrameList_create();
-        tail->frames = 0;
-        tail->channels = self->channels;
-        tail->bits_per_sample = self->bits_per_sample;
-        tail->samples_length = 0;
-        tail->samples = malloc(0);
+        if (FrameList_resize(tail, 0, self->channels, self->bits_per_sample))
+            goto error;
     } else if (split_point == 0) {
         head = FrameList_create();
-        head->frames = 0;
-        head->channels = self->channels;
-        head->bits_per_sample = self->bits_per_sample;
-        head->samples_length = 0;
-        head->samples = malloc(0);
+        if (FrameList_resize(head, 0, self->channels, self->bits_per_sample))
+            goto error;
         tail = self;
         Py_INCREF(tail);
     } else {
+        sample_size = FRAMELIST_SAMPLE_SIZE(self->bits_per_sample);
+
         head = FrameList_create();
-        head->frames = split_point;
-        head->samples_length = (head->frames * self->channels);
-        head->samples = malloc(head->samples_length * sizeof(int));
+        if (FrameList_resize(head, split_point,
+                             self->channels, self->bits_per_sample))
+            goto error;
         memcpy(head->samples,
                self->samples,
-               head->samples_length * sizeof(int));
+               head->samples_length * sample_size);
 
         tail = FrameList_create();
-        tail->frames = (self->frames - split_point);
-        tail->samples_length = (tail->frames * self->channels);
-        tail->samples = malloc(tail->samples_length * sizeof(int));
+        if (FrameList_resize(tail, self->frames - split_point,
+                             self->channels, self->bits_per_sample))
+            goto error;
         memcpy(tail->samples,
-               self->samples + head->samples_length,
-               tail->samples_length * sizeof(int));
-
-        head->channels = tail->channels = self->channels;
-        head->bits_per_sample = tail->bits_per_sample = self->bits_per_sample;
+               (uint8_t*)self->samples + (head->samples_length * sample_size),
+               tail->samples_length * sample_size);
     }
 
     tuple = Py_BuildValue("(O,O)", head, tail);
@@ -488,6 +526,7 @@ FrameList_concat(pcm_FrameList *a, PyObject *bb)
 {
     pcm_FrameList *concat = NULL;
     pcm_FrameList *b;
+    size_t sample_size;
 
     if (!FrameList_CheckExact(bb)) {
         PyErr_SetString(PyExc_TypeError,
@@ -512,15 +551,14 @@ FrameList_concat(pcm_FrameList *a, PyObject *bb)
     }
 
     concat = FrameList_create();
-    concat->frames = a->frames + b->frames;
-    concat->channels = a->channels;
-    concat->bits_per_sample = a->bits_per_sample;
-    concat->samples_length = a->samples_length + b->samples_length;
-    concat->samples = malloc(concat->samples_length * sizeof(int));
-    memcpy(concat->samples, a->samples, a->samples_length * sizeof(int));
-    memcpy(concat->samples + a->samples_length,
+    if (FrameList_resize(concat, a->frames + b->frames,
+                         a->channels, a->bits_per_sample))
+        goto error;
+    sample_size = FRAMELIST_SAMPLE_SIZE(a->bits_per_sample);
+    memcpy(concat->samples, a->samples, a->samples_length * sample_size);
+    memcpy((uint8_t*)concat->samples + (a->samples_length * sample_size),
            b->samples,
-           b->samples_length * sizeof(int));
+           b->samples_length * sample_size);
 
     return (PyObject*)concat;
  error:
@@ -537,11 +575,12 @@ FrameList_to_float(pcm_FrameList *self, PyObject *args)
     framelist->frames = self->frames;
     framelist->channels = self->channels;
     framelist->samples_length = self->samples_length;
-    framelist->samples = malloc(sizeof(double) * framelist->samples_length);
+    framelist->samples = malloc(sizeof(float) * framelist->samples_length);
 
     adjustment = 1 << (self->bits_per_sample - 1);
     for (i = 0; i < self->samples_length; i++) {
-        framelist->samples[i] = ((double)self->samples[i]) / adjustment;
+        framelist->samples[i] =
+            (float)(((double)FrameList_get_sample(self, i)) / adjustment);
     }
 
     return (PyObject*)framelist;
@@ -562,6 +601,100 @@ FrameList_frame_count(pcm_FrameList *self, PyObject *args)
     }
 }
 
+PyObject*
+FrameList_apply_gain(pcm_FrameList *self, PyObject *args)
+{
+    double multiplier;
+    int dither = DITHER_NONE;
+    int sample_min;
+    int sample_max;
+    unsigned i;
+    pcm_FrameList *framelist;
+
+    if (!PyArg_ParseTuple(args, "d|i", &multiplier, &dither))
+        return NULL;
+    if (!pcm_valid_dither(dither))
+        return NULL;
+
+    framelist = FrameList_create();
+    if (FrameList_resize(framelist, self->frames,
+                         self->channels, self->bits_per_sample)) {
+        Py_DECREF(framelist);
+        return NULL;
+    }
+
+    sample_max = (1 << (self->bits_per_sample - 1)) - 1;
+    sample_min = -(1 << (self->bits_per_sample - 1));
+    for (i = 0; i < self->samples_length; i++) {
+        FrameList_set_sample(
+            framelist, i,
+            pcm_quantize((FrameList_get_sample(self, i) * multiplier) +
+                         pcm_dither_noise(dither),
+                         sample_min,
+                         sample_max));
+    }
+
+    return (PyObject*)framelist;
+}
+
+PyObject*
+FrameList_requantize(pcm_FrameList *self, PyObject *args)
+{
+    unsigned int bits_per_sample;
+    int dither = DITHER_NONE;
+    int sample_min;
+    int sample_max;
+    int multiplier;
+    double divisor;
+    unsigned i;
+    pcm_FrameList *framelist;
+
+    if (!PyArg_ParseTuple(args, "I|i", &bits_per_sample, &dither))
+        return NULL;
+    if (!pcm_valid_dither(dither))
+        return NULL;
+
+    switch (bits_per_sample) {
+    case 8:
+    case 16:
+    case 24:
+        break;
+    default:
+        PyErr_SetString(PyExc_ValueError,
+                        "bits_per_sample must be 8, 16 or 24");
+        return NULL;
+    }
+
+    framelist = FrameList_create();
+    if (FrameList_resize(framelist, self->frames,
+                         self->channels, bits_per_sample)) {
+        Py_DECREF(framelist);
+        return NULL;
+    }
+
+    if (bits_per_sample >= self->bits_per_sample) {
+        /*adding bits is exact, so no dither is needed*/
+        multiplier = 1 << (bits_per_sample - self->bits_per_sample);
+        for (i = 0; i < self->samples_length; i++)
+            FrameList_set_sample(framelist, i,
+                                 FrameList_get_sample(self, i) * multiplier);
+    } else {
+        /*removing bits rounds to the new LSB after adding any dither*/
+        divisor = (double)(1 << (self->bits_per_sample - bits_per_sample));
+        sample_max = (1 << (bits_per_sample - 1)) - 1;
+        sample_min = -(1 << (bits_per_sample - 1));
+        for (i = 0; i < self->samples_length; i++)
+            FrameList_set_sample(
+                framelist, i,
+                pcm_quantize((FrameList_get_sample(self, i) / divisor) +
+                             pcm_dither_noise(dither),
+                             sample_min,
+                             sample_max));
+    }
+
+    return (PyObject*)framelist;
+}
+
 #endif
 
 void
@@ -589,6 +722,8 @@ FrameList_from_list(PyObject *dummy, PyObject *args)
     Py_ssize_t list_len, i;
     long integer_val;
     int adjustment;
+    long sample_min;
+    long sample_max;
     unsigned int channels;
     unsigned int bits_per_sample;
     int is_signed;
@@ -626,21 +761,35 @@ FrameList_from_list(PyObject *dummy, PyObject *args)
         adjustment = (1 << (bits_per_sample - 1));
     }
 
+    /*values must fit the storage type chosen for bits_per_sample*/
+    if (bits_per_sample <= 16) {
+        sample_min = INT16_MIN;
+        sample_max = INT16_MAX;
+    } else {
+        sample_min = INT32_MIN;
+        sample_max = INT32_MAX;
+    }
+
     framelist = FrameList_create();
-    framelist->channels = channels;
-    framelist->bits_per_sample = bits_per_sample;
-    framelist->samples = malloc(sizeof(int) * list_len);
-    framelist->samples_length = (unsigned int)list_len;
-    framelist->frames = (unsigned int)list_len / framelist->channels;
+    if (FrameList_resize(framelist, (unsigned int)list_len / channels,
+                         channels, bits_per_sample))
+        goto error;
     for (i = 0; i < list_len; i++) {
         if ((integer = PySequence_GetItem(list, i)) == NULL)
             goto error;
         if (((integer_val = PyInt_AsLong(integer)) == -1) &&
             PyErr_Occurred())
             goto error;
-        else {
-            framelist->samples[i] = (int)(integer_val - adjustment);
+        integer_val -= adjustment;
+        if ((integer_val < sample_min) || (integer_val > sample_max)) {
+            PyErr_SetString(PyExc_ValueError,
+                            "sample value out of range "
+                            "for bits per sample");
+            goto error;
+        } else {
+            FrameList_set_sample(framelist, (unsigned)i, (int)integer_val);
             Py_DECREF(integer);
+            integer = NULL;
         }
     }
 
@@ -660,6 +809,7 @@ FrameList_from_frames(PyObject *dummy, PyObject *args)
     PyObject *list_item = NULL;
     Py_ssize_t list_len, i;
     pcm_FrameList *frame;
+    size_t sample_size;
 
     if (!PyArg_ParseTuple(args, "O", &list))
         goto error;
@@ -684,14 +834,13 @@ FrameList_from_frames(PyObject *dummy, PyObject *args)
     }
 
     framelist = FrameList_create();
-    framelist->frames = (unsigned int)list_len;
-    framelist->channels = frame->channels;
-    framelist->bits_per_sample = frame->bits_per_sample;
-    framelist->samples_length = (unsigned int)list_len * frame->channels;
-    framelist->samples = malloc(sizeof(int) * framelist->samples_length);
+    if (FrameList_resize(framelist, (unsigned int)list_len,
+                         frame->channels, frame->bits_per_sample))
+        goto error;
+    sample_size = FRAMELIST_SAMPLE_SIZE(framelist->bits_per_sample);
 
     memcpy(framelist->samples, frame->samples,
-           sizeof(int) * frame->samples_length);
+           sample_size * frame->samples_length);
 
     for (i = 1; i < list_len; i++) {
         if ((list_item = PySequence_GetItem(list, i)) == NULL)
@@ -721,9 +870,10 @@ FrameList_from_frames(PyObject *dummy, PyObject *args)
             goto error;
         }
 
-        memcpy(framelist->samples + (i * framelist->channels),
+        memcpy((uint8_t*)framelist->samples +
+               (i * framelist->channels * sample_size),
                frame->samples,
-               sizeof(int) * frame->samples_length);
+               sample_size * frame->samples_length);
         Py_DECREF(list_item);
     }
 
@@ -770,14 +920,13 @@ FrameList_from_channels(PyObject *dummy, PyObject *args)
     }
 
     framelist = FrameList_create();
-    framelist->frames = channel->frames;
-    framelist->channels = (unsigned int)list_len;
-    framelist->bits_per_sample = channel->bits_per_sample;
-    framelist->samples_length = framelist->frames * (unsigned int)list_len;
-    framelist->samples = malloc(sizeof(int) * framelist->samples_length);
+    if (FrameList_resize(framelist, channel->frames,
+                         (unsigned int)list_len, channel->bits_per_sample))
+        goto error;
 
     for (j = 0; j < channel->samples_length; j++) {
-        framelist->samples[j * list_len] = channel->samples[j];
+        FrameList_set_sample(framelist, j * list_len,
+                             FrameList_get_sample(channel, j));
     }
 
     for (i = 1; i < list_len; i++) {
@@ -809,7 +958,8 @@ FrameList_from_channels(PyObject *dummy, PyObject *args)
         }
 
         for (j = 0; j < channel->samples_length; j++) {
-            framelist->samples[(j * list_len) + i] = channel->samples[j];
+            FrameList_set_sample(framelist, (j * list_len) + i,
+                                 FrameList_get_sample(channel, j));
         }
         Py_DECREF(list_item);
     }
@@ -826,6 +976,113 @@ FrameList_from_channels(PyObject *dummy, PyObject *args)
 
 
 
+PyObject*
+FrameList_from_buffer(PyObject *dummy, PyObject *args)
+{
+    PyObject *buffer_obj;
+    unsigned int channels;
+    unsigned int bits_per_sample;
+    Py_buffer *view;
+    pcm_FrameList *framelist;
+
+    if (!PyArg_ParseTuple(args, "OII", &buffer_obj,
+                          &channels, &bits_per_sample))
+        return NULL;
+
+    if (channels < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "number of channels must be > 0");
+        return NULL;
+    }
+
+    switch (bits_per_sample) {
+    case 8:
+    case 16:
+    case 24:
+        break;
+    default:
+        PyErr_SetString(PyExc_ValueError,
+                        "unsupported number of bits per sample");
+        return NULL;
+    }
+
+    view = malloc(sizeof(Py_buffer));
+    if (PyObject_GetBuffer(buffer_obj, view,
+                           PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == -1) {
+        free(view);
+        return NULL;
+    }
+
+    /*the buffer's items must match the storage type
+      chosen for bits_per_sample*/
+    if ((view->itemsize != FRAMELIST_SAMPLE_SIZE(bits_per_sample)) ||
+        !pcm_native_int_format(view->format, view->itemsize)) {
+        PyErr_SetString(PyExc_TypeError,
+                        (bits_per_sample <= 16) ?
+                        "buffer must contain native signed shorts" :
+                        "buffer must contain native signed 32-bit ints");
+        goto error;
+    }
+
+    if ((view->len / view->itemsize) % channels) {
+        PyErr_SetString(PyExc_ValueError,
+                        "number of samples must be divisible by "
+                        "number of channels");
+        goto error;
+    }
+
+    /*the new FrameList holds on to the buffer until it is deallocated
+      rather than copying the samples*/
+    framelist = FrameList_create();
+    framelist->channels = channels;
+    framelist->bits_per_sample = bits_per_sample;
+    framelist->samples = view->buf;
+    framelist->samples_length = (unsigned int)(view->len / view->itemsize);
+    framelist->frames = framelist->samples_length / channels;
+    framelist->adopted = view;
+
+    return (PyObject*)framelist;
+ error:
+    PyBuffer_Release(view);
+    free(view);
+    return NULL;
+}
+
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags)
+{
+    if (self->bits_per_sample <= 16)
+        return pcm_fill_buffer(view, (PyObject*)self, self->samples,
+                               self->samples_length, sizeof(int16_t),
+                               "h", flags);
+    else
+        return pcm_fill_buffer(view, (PyObject*)self, self->samples,
+                               self->samples_length, sizeof(int32_t),
+                               "i", flags);
+}
+
+Py_ssize_t
+FrameList_getreadbuffer(pcm_FrameList *self, Py_ssize_t segment, void **ptr)
+{
+    if (segment != 0) {
+        PyErr_SetString(PyExc_SystemError,
+                        "accessing non-existent FrameList segment");
+        return -1;
+    }
+    *ptr = self->samples;
+    return self->samples_length * FRAMELIST_SAMPLE_SIZE(self->bits_per_sample);
+}
+
+Py_ssize_t
+FrameList_getsegcount(pcm_FrameList *self, Py_ssize_t *lenp)
+{
+    if (lenp != NULL)
+        *lenp = (self->samples_length *
+                 FRAMELIST_SAMPLE_SIZE(self->bits_per_sample));
+    return 1;
+}
+
+
 /***********************
   FloatFrameList Object
 ************************/
@@ -849,7 +1106,7 @@ PyMethodDef FloatFrameList_methods[] = {
      "splits the FloatFrameList at the given index"},
     {"to_int", (PyCFunction)FloatFrameList_to_int,
      METH_VARARGS,
-     "FF.to_int(bits_per_sample) -> FrameList"},
+     "FF.to_int(bits_per_sample[, dither]) -> FrameList"},
     {NULL}
 };
 
@@ -866,6 +1123,15 @@ static PySequenceMethods pcm_FloatFrameListType_as_sequence = {
     (ssizeargfunc)NULL,                   /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FloatFrameListType_as_buffer = {
+    (readbufferproc)FloatFrameList_getreadbuffer, /* bf_getreadbuffer */
+    (writebufferproc)NULL,                        /* bf_getwritebuffer */
+    (segcountproc)FloatFrameList_getsegcount,     /* bf_getsegcount */
+    (charbufferproc)NULL,                         /* bf_getcharbuffer */
+    (getbufferproc)FloatFrameList_getbuffer,      /* bf_getbuffer */
+    (releasebufferproc)NULL,                      /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FloatFrameListType = {
     PyObject_HEAD_INIT(NULL)
     0,                         /*ob_size*/
@@ -886,8 +1152,9 @@ PyTypeObject pcm_FloatFrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FloatFrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FloatFrameList(float_list, channels)",  /* tp_doc */
     0,                         /* tp_traverse */
     0,                         /* tp_clear */
@@ -932,6 +1199,7 @@ FloatFrameList_init(pcm_FloatFrameList *self, PyObject *args, PyObject *kwds)
     PyObject *data_item;
     Py_ssize_t data_size;
     Py_ssize_t i;
+    double value;
 
     if (!PyArg_ParseTuple(args, "OI",
                           &data,
@@ -952,7 +1220,7 @@ FloatFrameList_init(pcm_FloatFrameList *self, PyObject *args, PyObject *kwds)
     } else {
         self->samples_length = (unsigned int)data_size;
         self->frames = (self->samples_length / self->channels);
-        self->samples = malloc(sizeof(double) * self->samples_length);
+        self->samples = malloc(sizeof(float) * self->samples_length);
     }
 
     for (i = 0; i < data_size; i++) {
@@ -960,11 +1228,12 @@ FloatFrameList_init(pcm_FloatFrameList *self, PyObject *args, PyObject *kwds)
             /*this shouldn't happen unless "data" changes mid-function*/
             return -1;
 
-        if (((self->samples[i] = PyFloat_AsDouble(data_item)) == -1) &&
+        if (((value = PyFloat_AsDouble(data_item)) == -1) &&
             PyErr_Occurred()) {
             Py_DECREF(data_item);
             return -1;
         }
+        self->samples[i] = (float)value;
         Py_DECREF(data_item);
     }
 
@@ -1018,7 +1287,7 @@ FloatFrameList_GetItem(pcm_FloatFrameList *o, Py_ssize_t i)
         PyErr_SetString(PyExc_IndexError, "index out of range");
         return NULL;
     } else {
-        return Py_BuildValue("d", o->samples[i]);
+        return Py_BuildValue("d", (double)o->samples[i]);
     }
 }
 
@@ -1038,11 +1307,11 @@ FloatFrameList_frame(pcm_FloatFrameList *self, PyObject *args)
     frame = FloatFrameList_create();
     frame->frames = 1;
     frame->channels = self->channels;
-    frame->samples = malloc(sizeof(double) * self->channels);
+    frame->samples = malloc(sizeof(float) * self->channels);
     frame->samples_length = self->channels;
     memcpy(frame->samples,
            self->samples + (frame_number * self->channels),
-           sizeof(double) * self->channels);
+           sizeof(float) * self->channels);
     return (PyObject*)frame;
 }
 
@@ -1065,7 +1334,7 @@ FloatFrameList_channel(pcm_FloatFrameList *self, PyObject *args)
     channel = FloatFrameList_create();
     channel->frames = self->frames;
     channel->channels = 1;
-    channel->samples = malloc(sizeof(double) * self->frames);
+    channel->samples = malloc(sizeof(float) * self->frames);
     channel->samples_length = self->frames;
 
     samples_length = self->samples_length;
@@ -1088,25 +1357,39 @@ FloatFrameList_to_int(pcm_FloatFrameList *self, PyObject *args)
     int sample_max;
     pcm_FrameList *framelist;
     int bits_per_sample;
+    int dither = DITHER_NONE;
 
-    if (!PyArg_ParseTuple(args, "i", &bits_per_sample))
+    if (!PyArg_ParseTuple(args, "i|i", &bits_per_sample, &dither))
+        return NULL;
+    if (!pcm_valid_dither(dither))
         return NULL;
 
     framelist = FrameList_create();
-    framelist->frames = self->frames;
-    framelist->channels = self->channels;
-    framelist->bits_per_sample = bits_per_sample;
-    framelist->samples_length = self->samples_length;
-    framelist->samples = malloc(sizeof(int) * framelist->samples_length);
+    if (FrameList_resize(framelist, self->frames,
+                         self->channels, bits_per_sample)) {
+        Py_DECREF(framelist);
+        return NULL;
+    }
 
     adjustment = 1 << (bits_per_sample - 1);
     sample_min = -adjustment;
     sample_max = adjustment - 1;
-    for (i = 0; i < self->samples_length; i++) {
-        framelist->samples[i] =  MAX(MIN((int)(
-                                         self->samples[i] * adjustment),
+    if (dither == DITHER_NONE) {
+        for (i = 0; i < self->samples_length; i++) {
+            FrameList_set_sample(framelist, i,
+                                 MAX(MIN((int)(self->samples[i] * adjustment),
                                          sample_max),
-                                     sample_min);
+                                     sample_min));
+        }
+    } else {
+        for (i = 0; i < self->samples_length; i++) {
+            FrameList_set_sample(
+                framelist, i,
+                pcm_quantize(((double)self->samples[i] * adjustment) +
+                             pcm_dither_noise(dither),
+                             sample_min,
+                             sample_max));
+        }
     }
 
     return (PyObject*)framelist;
@@ -1146,18 +1429,18 @@ FloatFrameList_split(pcm_FloatFrameList *self, PyObject *args)
         head = FloatFrameList_create();
         head->frames = split_point;
         head->samples_length = (head->frames * self->channels);
-        head->samples = malloc(head->samples_length * sizeof(double));
+        head->samples = malloc(head->samples_length * sizeof(float));
         memcpy(head->samples,
                self->samples,
-               head->samples_length * sizeof(double));
+               head->samples_length * sizeof(float));
 
         tail = FloatFrameList_create();
         tail->frames = (self->frames - split_point);
         tail->samples_length = (tail->frames * self->channels);
-        tail->samples = malloc(tail->samples_length * sizeof(double));
+        tail->samples = malloc(tail->samples_length * sizeof(float));
         memcpy(tail->samples,
                self->samples + head->samples_length,
-               tail->samples_length * sizeof(double));
+               tail->samples_length * sizeof(float));
 
         head->channels = tail->channels = self->channels;
     }
@@ -1198,11 +1481,11 @@ FloatFrameList_concat(pcm_FloatFrameList *a, PyObject *bb)
     concat->frames = a->frames + b->frames;
     concat->channels = a->channels;
     concat->samples_length = a->samples_length + b->samples_length;
-    concat->samples = malloc(concat->samples_length * sizeof(double));
-    memcpy(concat->samples, a->samples, a->samples_length * sizeof(double));
+    concat->samples = malloc(concat->samples_length * sizeof(float));
+    memcpy(concat->samples, a->samples, a->samples_length * sizeof(float));
     memcpy(concat->samples + a->samples_length,
            b->samples,
-           b->samples_length * sizeof(double));
+           b->samples_length * sizeof(float));
 
     return (PyObject*)concat;
  error:
@@ -1246,10 +1529,10 @@ FloatFrameList_from_frames(PyObject *dummy, PyObject *args)
     framelist->frames = (unsigned int)list_len;
     framelist->channels = frame->channels;
     framelist->samples_length = (unsigned int)list_len * frame->channels;
-    framelist->samples = malloc(sizeof(double) * framelist->samples_length);
+    framelist->samples = malloc(sizeof(float) * framelist->samples_length);
 
     memcpy(framelist->samples, frame->samples,
-           sizeof(double) * frame->samples_length);
+           sizeof(float) * frame->samples_length);
 
     for (i = 1; i < list_len; i++) {
         if ((list_item = PySequence_GetItem(list, i)) == NULL)
@@ -1275,7 +1558,7 @@ FloatFrameList_from_frames(PyObject *dummy, PyObject *args)
 
         memcpy(framelist->samples + (i * framelist->channels),
                frame->samples,
-               sizeof(double) * frame->samples_length);
+               sizeof(float) * frame->samples_length);
         Py_DECREF(list_item);
     }
 
@@ -1325,7 +1608,7 @@ FloatFrameList_from_channels(PyObject *dummy, PyObject *args)
     framelist->frames = channel->frames;
     framelist->channels = (unsigned int)list_len;
     framelist->samples_length = framelist->frames * (unsigned int)list_len;
-    framelist->samples = malloc(sizeof(double) * framelist->samples_length);
+    framelist->samples = malloc(sizeof(float) * framelist->samples_length);
 
     for (j = 0; j < channel->samples_length; j++) {
         framelist->samples[j * list_len] = channel->samples[j];
@@ -1369,6 +1652,433 @@ FloatFrameList_from_channels(PyObject *dummy, PyObject *args)
     return NULL;
 }
 
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self, Py_buffer *view, int flags)
+{
+    return pcm_fill_buffer(view, (PyObject*)self, self->samples,
+                           self->samples_length, sizeof(float), "f", flags);
+}
+
+Py_ssize_t
+FloatFrameList_getreadbuffer(pcm_FloatFrameList *self,
+                             Py_ssize_t segment, void **ptr)
+{
+    if (segment != 0) {
+        PyErr_SetString(PyExc_SystemError,
+                        "accessing non-existent FloatFrameList segment");
+        return -1;
+    }
+    *ptr = self->samples;
+    return self->samples_length * sizeof(float);
+}
+
+Py_ssize_t
+FloatFrameList_getsegcount(pcm_FloatFrameList *self, Py_ssize_t *lenp)
+{
+    if (lenp != NULL)
+        *lenp = self->samples_length * sizeof(float);
+    return 1;
+}
+
+/*******************
+  FrameBuffer Object
+********************/
+
+PyGetSetDef FrameBuffer_getseters[] = {
+    {"frames", (getter)FrameBuffer_frames, 0, "buffered frame count", NULL},
+    {"channels", (getter)FrameBuffer_channels, 0, "channel count", NULL},
+    {"bits_per_sample", (getter)FrameBuffer_bits_per_sample,
+     0, "bits per sample", NULL},
+    {NULL}  /* Sentinel */
+};
+
+PyMethodDef FrameBuffer_methods[] = {
+    {"push", (PyCFunction)FrameBuffer_push,
+     METH_VARARGS,
+     "B.push(framelist) -- appends the FrameList's frames to the buffer"},
+    {"pop", (PyCFunction)FrameBuffer_pop,
+     METH_VARARGS,
+     "B.pop(pcm_frames) -> FrameList -- "
+     "removes and returns up to pcm_frames of the oldest frames"},
+    {NULL}
+};
+
+static PySequenceMethods pcm_FrameBufferType_as_sequence = {
+    (lenfunc)FrameBuffer_len,        /* sq_length */
+    (binaryfunc)NULL,                /* sq_concat */
+    (ssizeargfunc)NULL,              /* sq_repeat */
+    (ssizeargfunc)NULL,              /* sq_item */
+    (ssizessizeargfunc)NULL,         /* sq_slice */
+    (ssizeobjargproc)NULL,           /* sq_ass_item */
+    (ssizessizeobjargproc)NULL,      /* sq_ass_slice */
+    (objobjproc)NULL,                /* sq_contains */
+    (binaryfunc)NULL,                /* sq_inplace_concat */
+    (ssizeargfunc)NULL,              /* sq_inplace_repeat */
+};
+
+PyTypeObject pcm_FrameBufferType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                         /*ob_size*/
+    "pcm.FrameBuffer",         /*tp_name*/
+    sizeof(pcm_FrameBuffer),   /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    (destructor)FrameBuffer_dealloc, /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    0,                         /*tp_as_number*/
+    &pcm_FrameBufferType_as_sequence, /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    "FrameBuffer(channels, bits_per_sample)", /* tp_doc */
+    0,                         /* tp_traverse */
+    0,                         /* tp_clear */
+    0,                         /* tp_richcompare */
+    0,                         /* tp_weaklistoffset */
+    0,                         /* tp_iter */
+    0,                         /* tp_iternext */
+    FrameBuffer_methods,       /* tp_methods */
+    0,                         /* tp_members */
+    FrameBuffer_getseters,     /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)FrameBuffer_init, /* tp_init */
+    0,                         /* tp_alloc */
+    FrameBuffer_new,           /* tp_new */
+};
+
+void
+FrameBuffer_dealloc(pcm_FrameBuffer* self)
+{
+    free(self->samples);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+PyObject*
+FrameBuffer_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    pcm_FrameBuffer *self;
+
+    self = (pcm_FrameBuffer *)type->tp_alloc(type, 0);
+    if (self != NULL) {
+        /*an uninitialized buffer has no channels,
+          which push() and pop() check for*/
+        self->channels = 0;
+        self->bits_per_sample = 0;
+        self->samples = NULL;
+        self->total_frames = 0;
+        self->head = 0;
+        self->frames = 0;
+    }
+
+    return (PyObject *)self;
+}
+
+int
+FrameBuffer_init(pcm_FrameBuffer *self, PyObject *args, PyObject *kwds)
+{
+    if (!PyArg_ParseTuple(args, "II",
+                          &(self->channels),
+                          &(self->bits_per_sample)))
+        return -1;
+
+    if (self->channels < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "number of channels must be > 0");
+        return -1;
+    } else if ((self->bits_per_sample != 16) &&
+               (self->bits_per_sample != 24) &&
+               (self->bits_per_sample != 8)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "bits_per_sample must be 8, 16 or 24");
+        return -1;
+    }
+
+    free(self->samples);
+    self->samples = NULL;
+    self->total_frames = 0;
+    self->head = 0;
+    self->frames = 0;
+    return 0;
+}
+
+PyObject*
+FrameBuffer_frames(pcm_FrameBuffer *self, void* closure)
+{
+    return Py_BuildValue("I", self->frames);
+}
+
+PyObject*
+FrameBuffer_channels(pcm_FrameBuffer *self, void* closure)
+{
+    return Py_BuildValue("I", self->channels);
+}
+
+PyObject*
+FrameBuffer_bits_per_sample(pcm_FrameBuffer *self, void* closure)
+{
+    return Py_BuildValue("I", self->bits_per_sample);
+}
+
+Py_ssize_t
+FrameBuffer_len(pcm_FrameBuffer *o)
+{
+    return (Py_ssize_t)o->frames * o->channels;
+}
+
+int
+FrameBuffer_reserve(pcm_FrameBuffer *self, unsigned frames)
+{
+    unsigned total_frames;
+    unsigned head_frames;
+    uint8_t* samples;
+    const size_t frame_size =
+        FRAMELIST_SAMPLE_SIZE(self->bits_per_sample) * self->channels;
+
+    if (frames <= self->total_frames)
+        return 0;
+
+    /*grow geometrically so that a steady stream of pushes
+      only rarely needs to reallocate*/
+    total_frames = MAX(frames, self->total_frames * 2);
+    if ((total_frames > (UINT_MAX / frame_size)) ||
+        ((samples = malloc(frame_size * total_frames)) == NULL)) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    /*copy the buffered frames to the start of the new ring,
+      unwrapping them if they straddle the end of the old one*/
+    head_frames = MIN(self->frames, self->total_frames - self->head);
+    memcpy(samples,
+           (uint8_t*)self->samples + (self->head * frame_size),
+           head_frames * frame_size);
+    memcpy(samples + (head_frames * frame_size),
+           self->samples,
+           (self->frames - head_frames) * frame_size);
+
+    free(self->samples);
+    self->samples = samples;
+    self->total_frames = total_frames;
+    self->head = 0;
+    return 0;
+}
+
+PyObject*
+FrameBuffer_push(pcm_FrameBuffer *self, PyObject *args)
+{
+    pcm_FrameList *framelist;
+    unsigned tail;
+    unsigned tail_frames;
+    size_t frame_size;
+
+    if (!PyArg_ParseTuple(args, "O!", &pcm_FrameListType, &framelist))
+        return NULL;
+
+    if (self->channels == 0) {
+        PyErr_SetString(PyExc_ValueError, "FrameBuffer not initialized");
+        return NULL;
+    } else if (framelist->channels != self->channels) {
+        PyErr_SetString(PyExc_ValueError,
+                        "FrameList must have the same number of channels");
+        return NULL;
+    } else if (framelist->bits_per_sample != self->bits_per_sample) {
+        PyErr_SetString(PyExc_ValueError,
+                        "FrameList must have the same bits_per_sample");
+        return NULL;
+    } else if (framelist->frames > (UINT_MAX - self->frames)) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    if (FrameBuffer_reserve(self, self->frames + framelist->frames))
+        return NULL;
+
+    /*the new frames go after the last buffered frame,
+      wrapping around to the start of the ring as needed*/
+    tail = (self->head + self->frames) % MAX(self->total_frames, 1);
+    tail_frames = MIN(framelist->frames, self->total_frames - tail);
+    frame_size = FRAMELIST_SAMPLE_SIZE(self->bits_per_sample) * self->channels;
+    memcpy((uint8_t*)self->samples + (tail * frame_size),
+           framelist->samples,
+           tail_frames * frame_size);
+    memcpy(self->samples,
+           (uint8_t*)framelist->samples + (tail_frames * frame_size),
+           (framelist->frames - tail_frames) * frame_size);
+    self->frames += framelist->frames;
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+PyObject*
+FrameBuffer_pop(pcm_FrameBuffer *self, PyObject *args)
+{
+    int pcm_frames;
+    unsigned head_frames;
+    pcm_FrameList *framelist;
+    size_t frame_size;
+
+    if (!PyArg_ParseTuple(args, "i", &pcm_frames))
+        return NULL;
+
+    if (self->channels == 0) {
+        PyErr_SetString(PyExc_ValueError, "FrameBuffer not initialized");
+        return NULL;
+    } else if (pcm_frames < 0) {
+        PyErr_SetString(PyExc_ValueError, "pcm_frames must be >= 0");
+        return NULL;
+    }
+
+    framelist = FrameList_create();
+    if (FrameList_resize(framelist, MIN((unsigned)pcm_frames, self->frames),
+                         self->channels, self->bits_per_sample)) {
+        Py_DECREF(framelist);
+        return NULL;
+    }
+
+    /*the popped frames may wrap around the end of the ring,
+      in which case they're copied out in two pieces*/
+    frame_size = FRAMELIST_SAMPLE_SIZE(self->bits_per_sample) * self->channels;
+    head_frames = MIN(framelist->frames, self->total_frames - self->head);
+    memcpy(framelist->samples,
+           (uint8_t*)self->samples + (self->head * frame_size),
+           head_frames * frame_size);
+    memcpy((uint8_t*)framelist->samples + (head_frames * frame_size),
+           self->samples,
+           (framelist->frames - head_frames) * frame_size);
+
+    self->frames -= framelist->frames;
+    if (self->frames > 0)
+        self->head = (self->head + framelist->frames) % self->total_frames;
+    else
+        self->head = 0;
+
+    return (PyObject*)framelist;
+}
+
+static uint64_t pcm_dither_state = PCM_XORSHIFT_SEED;
+
+void
+pcm_seed_dither(uint64_t seed)
+{
+    /*xorshift's state must never be 0*/
+    pcm_dither_state = seed ? seed : PCM_XORSHIFT_SEED;
+}
+
+double
+pcm_uniform(void)
+{
+    return pcm_xorshift_uniform(&pcm_dither_state);
+}
+
+double
+pcm_dither_noise(pcm_dither dither)
+{
+    return pcm_xorshift_dither_noise(dither, &pcm_dither_state);
+}
+
+int
+pcm_valid_dither(int dither)
+{
+    switch (dither) {
+    case DITHER_NONE:
+    case DITHER_RECTANGULAR:
+    case DITHER_TRIANGULAR:
+        return 1;
+    default:
+        PyErr_SetString(PyExc_ValueError, "unknown dither type");
+        return 0;
+    }
+}
+
+int
+pcm_quantize(double value, int sample_min, int sample_max)
+{
+    if (value >= sample_max)
+        return sample_max;
+    else if (value <= sample_min)
+        return sample_min;
+    else
+        return (int)lround(value);
+}
+
+int
+pcm_fill_buffer(Py_buffer *view, PyObject *obj, void *buf,
+                Py_ssize_t length, Py_ssize_t itemsize, char *format,
+                int flags)
+{
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "FrameLists are read-only");
+        return -1;
+    }
+
+    view->buf = buf;
+    view->obj = obj;
+    Py_INCREF(obj);
+    view->len = length * itemsize;
+    view->itemsize = itemsize;
+    view->readonly = 1;
+    view->ndim = 1;
+    view->format = ((flags & PyBUF_FORMAT) == PyBUF_FORMAT) ? format : NULL;
+    view->smalltable[0] = length;
+    view->shape = ((flags & PyBUF_ND) == PyBUF_ND) ? view->smalltable : NULL;
+    view->strides = (((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ?
+                     &(view->itemsize) : NULL);
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    return 0;
+}
+
+int
+pcm_native_int_format(const char *format, Py_ssize_t itemsize)
+{
+    const int one = 1;
+    const int little_endian = *((char*)&one);
+
+    if ((format == NULL) ||
+        ((itemsize != sizeof(int16_t)) && (itemsize != sizeof(int32_t))))
+        return 0;
+
+    switch (format[0]) {
+    case '@':
+    case '=':
+        format++;
+        break;
+    case '<':
+        if (!little_endian)
+            return 0;
+        format++;
+        break;
+    case '>':
+    case '!':
+        if (little_endian)
+            return 0;
+        format++;
+        break;
+    default:
+        break;
+    }
+
+    if (format[1] != '\0')
+        return 0;
+    else if (itemsize == sizeof(int16_t))
+        return (format[0] == 'h');
+    else
+        return ((format[0] == 'i') || (format[0] == 'l'));
+}
+
 
 PyMODINIT_FUNC
 initpcm(void)
@@ -1383,6 +2093,9 @@ initpcm(void)
     if (PyType_Ready(&pcm_FloatFrameListType) < 0)
         return;
 
+    if (PyType_Ready(&pcm_FrameBufferType) < 0)
+        return;
+
     m = Py_InitModule3("pcm", module_methods,
                        "A PCM FrameList handling module.");
 
@@ -1392,6 +2105,15 @@ initpcm(void)
     Py_INCREF(&pcm_FloatFrameListType);
     PyModule_AddObject(m, "FloatFrameList",
                        (PyObject *)&pcm_FloatFrameListType);
+    Py_INCREF(&pcm_FrameBufferType);
+    PyModule_AddObject(m, "FrameBuffer",
+                       (PyObject *)&pcm_FrameBufferType);
+
+    PyModule_AddIntConstant(m, "DITHER_NONE", DITHER_NONE);
+    PyModule_AddIntConstant(m, "DITHER_RECTANGULAR", DITHER_RECTANGULAR);
+    PyModule_AddIntConstant(m, "DITHER_TRIANGULAR", DITHER_TRIANGULAR);
+
+    pcm_seed_dither(((uint64_t)time(NULL) << 32) ^ (uint64_t)getpid());
 }
 
 #endif
@@ -33,6 +33,50 @@ typedef int Py_ssize_t;
 #endif
 
 #include <stdint.h>
+#include <limits.h>
+
+/*the kinds of dither FrameList and FloatFrameList methods can apply
+  when quantizing samples, exported as pcm.DITHER_* constants*/
+typedef enum {DITHER_NONE,
+              DITHER_RECTANGULAR,
+              DITHER_TRIANGULAR} pcm_dither;
+
+/*a nonzero starting state for pcm_xorshift_uniform*/
+#define PCM_XORSHIFT_SEED 0x9E3779B97F4A7C15ull
+
+/*returns a random value in the interval [0, 1)
+  from the xorshift64* generator whose state is at "state",
+  which must never be 0
+
+  this is shared by the pcm module's own generator
+  and those kept by each pcmconverter.Converter*/
+static inline double
+pcm_xorshift_uniform(uint64_t *state)
+{
+    uint64_t x = *state;
+    x ^= x >> 12;
+    x ^= x << 25;
+    x ^= x >> 27;
+    *state = x;
+
+    /*the top 53 bits of xorshift64* output fill a double's mantissa*/
+    return (double)((x * 0x2545F4914F6CDD1Dull) >> 11) / 9007199254740992.0;
+}
+
+/*returns a noise value for the given dither, in LSBs,
+  from the xorshift64* generator whose state is at "state"*/
+static inline double
+pcm_xorshift_dither_noise(pcm_dither dither, uint64_t *state)
+{
+    switch (dither) {
+    case DITHER_RECTANGULAR:
+        return pcm_xorshift_uniform(state) - 0.5;
+    case DITHER_TRIANGULAR:
+        return pcm_xorshift_uniform(state) - pcm_xorshift_uniform(state);
+    default:
+        return 0.0;
+    }
+}
 
 /******************
   FrameList Object
@@ -48,13 +92,79 @@ typedef struct {
                              aka the total number of columns in "samples*/
     unsigned int bits_per_sample; /*the maximum size of each sample, in bits*/
 
-    int* samples;            /*the actual sample data itself,
-                               stored raw as 32-bit signed integers*/
+    void* samples;           /*the actual sample data itself,
+                               stored raw as 16-bit signed integers
+                               if bits_per_sample is 16 or less
+                               and as 32-bit signed integers otherwise*/
     unsigned samples_length; /*the total number of samples
                                which must be evenly distributable
                                between channels and bits-per-sample*/
+
+    Py_buffer* adopted;      /*if not NULL, "samples" points into
+                               this buffer from another object
+                               rather than memory of our own,
+                               and the buffer is released on dealloc*/
 } pcm_FrameList;
 
+/*the size of each sample in a FrameList's "samples" array, in bytes*/
+#define FRAMELIST_SAMPLE_SIZE(bits_per_sample) \
+    ((bits_per_sample) <= 16 ? sizeof(int16_t) : sizeof(int32_t))
+
+/*returns the sample at the given index of "samples"*/
+static inline int
+FrameList_get_sample(const pcm_FrameList *self, unsigned i)
+{
+    if (self->bits_per_sample <= 16)
+        return ((int16_t*)self->samples)[i];
+    else
+        return ((int32_t*)self->samples)[i];
+}
+
+/*sets the sample at the given index of "samples"
+  which must fit in the FrameList's bits_per_sample*/
+static inline void
+FrameList_set_sample(pcm_FrameList *self, unsigned i, int value)
+{
+    if (self->bits_per_sample <= 16)
+        ((int16_t*)self->samples)[i] = (int16_t)value;
+    else
+        ((int32_t*)self->samples)[i] = (int32_t)value;
+}
+
+/*sets the FrameList's frames, channels and bits_per_sample
+  and resizes "samples" to match, which must not be adopted
+  returns 0 on success, -1 with MemoryError set on failure*/
+static inline int
+FrameList_resize(pcm_FrameList *self,
+                 unsigned frames,
+                 unsigned channels,
+                 unsigned bits_per_sample)
+{
+    void *samples;
+
+    if ((channels > 0) &&
+        (frames > (UINT_MAX / FRAMELIST_SAMPLE_SIZE(bits_per_sample) /
+                   channels))) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    /*realloc() may free "samples" when asked for 0 bytes,
+      so at least 1 byte is always kept*/
+    samples = realloc(self->samples,
+                      (frames * channels *
+                       FRAMELIST_SAMPLE_SIZE(bits_per_sample)) + 1);
+    if (samples == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->samples = samples;
+    self->frames = frames;
+    self->channels = channels;
+    self->bits_per_sample = bits_per_sample;
+    self->samples_length = frames * channels;
+    return 0;
+}
+
 void
 FrameList_dealloc(pcm_FrameList* self);
 
@@ -116,6 +226,12 @@ FrameList_split(pcm_FrameList *self, PyObject *args);
 PyObject*
 FrameList_concat(pcm_FrameList *a, PyObject *bb);
 
+PyObject*
+FrameList_apply_gain(pcm_FrameList *self, PyObject *args);
+
+PyObject*
+FrameList_requantize(pcm_FrameList *self, PyObject *args);
+
 PyObject*
 FrameList_from_list(PyObject *dummy, PyObject *args);
 
@@ -125,6 +241,21 @@ FrameList_from_frames(PyObject *dummy, PyObject *args);
 PyObject*
 FrameList_from_channels(PyObject *dummy, PyObject *args);
 
+PyObject*
+FrameList_from_buffer(PyObject *dummy, PyObject *args);
+
+/*the FrameList buffer protocol functions,
+  which export "samples" as read-only native shorts or ints
+  without copying*/
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags);
+
+Py_ssize_t
+FrameList_getreadbuffer(pcm_FrameList *self, Py_ssize_t segment, void **ptr);
+
+Py_ssize_t
+FrameList_getsegcount(pcm_FrameList *self, Py_ssize_t *lenp);
+
 
 /***********************
   FloatFrameList Object
@@ -138,8 +269,8 @@ typedef struct {
     unsigned int channels; /*the total number of channels in this FrameList
                              aka the total number of columns in "samples*/
 
-    double *samples;          /*the actual sample data itself,
-                                stored raw as doubles*/
+    float *samples;           /*the actual sample data itself,
+                                stored raw as single-precision floats*/
     unsigned samples_length;  /*the total number of samples
                                 which must be evenly distributable
                                 between channels*/
@@ -196,6 +327,113 @@ FloatFrameList_from_frames(PyObject *dummy, PyObject *args);
 PyObject*
 FloatFrameList_from_channels(PyObject *dummy, PyObject *args);
 
+/*the FloatFrameList buffer protocol functions,
+  which export "samples" as read-only native floats without copying*/
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self,
+                         Py_buffer *view, int flags);
+
+Py_ssize_t
+FloatFrameList_getreadbuffer(pcm_FloatFrameList *self,
+                             Py_ssize_t segment, void **ptr);
+
+Py_ssize_t
+FloatFrameList_getsegcount(pcm_FloatFrameList *self, Py_ssize_t *lenp);
+
+/*******************
+  FrameBuffer Object
+********************/
+
+typedef struct {
+    PyObject_HEAD;
+
+    unsigned int channels;        /*the number of channels in each frame*/
+    unsigned int bits_per_sample; /*the bits-per-sample of each frame*/
+
+    void* samples;         /*a ring of "total_frames" PCM frames
+                             whose first valid frame is at "head",
+                             stored like FrameList samples*/
+    unsigned total_frames; /*the capacity of "samples", in PCM frames*/
+    unsigned head;         /*the index of the oldest buffered frame*/
+    unsigned frames;       /*the number of buffered frames,
+                             which may wrap around the end of "samples"*/
+} pcm_FrameBuffer;
+
+void
+FrameBuffer_dealloc(pcm_FrameBuffer* self);
+
+PyObject*
+FrameBuffer_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
+
+int
+FrameBuffer_init(pcm_FrameBuffer *self, PyObject *args, PyObject *kwds);
+
+PyObject*
+FrameBuffer_frames(pcm_FrameBuffer *self, void* closure);
+
+PyObject*
+FrameBuffer_channels(pcm_FrameBuffer *self, void* closure);
+
+PyObject*
+FrameBuffer_bits_per_sample(pcm_FrameBuffer *self, void* closure);
+
+Py_ssize_t
+FrameBuffer_len(pcm_FrameBuffer *o);
+
+/*appends a copy of the given FrameList's samples to the buffer,
+  growing the ring if necessary*/
+PyObject*
+FrameBuffer_push(pcm_FrameBuffer *self, PyObject *args);
+
+/*removes up to the given number of PCM frames from the buffer
+  and returns them as a new FrameList*/
+PyObject*
+FrameBuffer_pop(pcm_FrameBuffer *self, PyObject *args);
+
+/*ensures the ring has room for at least "frames" PCM frames,
+  moving any buffered frames to the start of the new ring
+  returns 0 on success, -1 with MemoryError set on failure*/
+int
+FrameBuffer_reserve(pcm_FrameBuffer *self, unsigned frames);
+
+/*seeds the generator used for dither noise*/
+void
+pcm_seed_dither(uint64_t seed);
+
+/*returns a random value in the interval [0, 1)
+  from a fast xorshift generator,
+  which needn't be cryptographically strong like os.urandom*/
+double
+pcm_uniform(void);
+
+/*returns a noise value for the given dither, in LSBs
+  DITHER_RECTANGULAR is uniform over [-0.5, 0.5)
+  DITHER_TRIANGULAR is triangular over (-1, 1)
+  DITHER_NONE is always 0*/
+double
+pcm_dither_noise(pcm_dither dither);
+
+/*returns 1 if "dither" is a known pcm_dither value,
+  or 0 with PyErr set*/
+int
+pcm_valid_dither(int dither);
+
+/*rounds "value" to the nearest integer, clipped to the given range*/
+int
+pcm_quantize(double value, int sample_min, int sample_max);
+
+/*fills in "view" for a read-only, one-dimensional buffer
+  of "length" items, each "itemsize" bytes in the given struct "format"*/
+int
+pcm_fill_buffer(Py_buffer *view, PyObject *obj, void *buf,
+                Py_ssize_t length, Py_ssize_t itemsize, char *format,
+                int flags);
+
+/*returns 1 if the struct module "format" string
+  describes a single native-order signed integer of "itemsize" bytes*/
+int
+pcm_native_int_format(const char *format, Py_ssize_t itemsize);
+
 #endif
 
 typedef int (*FrameList_char_to_int_converter)(unsigned char *s);
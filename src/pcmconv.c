@@ -35,22 +35,36 @@ array_i_to_FrameList(PyObject* audiotools_pcm,
                      unsigned int bits_per_sample)
 {
     pcm_FrameList *framelist;
+    unsigned i;
 
     framelist = (pcm_FrameList*)PyObject_CallMethod(audiotools_pcm,
                                                     "__blank__", NULL);
 
     if (framelist != NULL) {
         if ((samples->len % channels) == 0) {
-            framelist->frames = samples->len / channels;
-            framelist->channels = channels;
-            framelist->bits_per_sample = bits_per_sample;
-            framelist->samples_length = framelist->frames * framelist->channels;
-            framelist->samples = realloc(framelist->samples,
-                                         framelist->samples_length *
-                                         sizeof(int));
+            if (FrameList_resize(framelist, samples->len / channels,
+                                 channels, bits_per_sample)) {
+                Py_DECREF((PyObject*)framelist);
+                return NULL;
+            }
 
-            memcpy(framelist->samples, samples->_,
-                   framelist->samples_length * sizeof(int));
+            if (FRAMELIST_SAMPLE_SIZE(bits_per_sample) == sizeof(int)) {
+                memcpy(framelist->samples, samples->_,
+                       framelist->samples_length * sizeof(int));
+            } else {
+                /*values must fit the int16_t storage*/
+                for (i = 0; i < framelist->samples_length; i++) {
+                    if ((samples->_[i] < INT16_MIN) ||
+                        (samples->_[i] > INT16_MAX)) {
+                        Py_DECREF((PyObject*)framelist);
+                        PyErr_SetString(PyExc_ValueError,
+                                        "sample value out of range "
+                                        "for bits per sample");
+                        return NULL;
+                    }
+                    FrameList_set_sample(framelist, i, samples->_[i]);
+                }
+            }
 
             return (PyObject*)framelist;
         } else {
@@ -78,21 +92,30 @@ array_ia_to_FrameList(PyObject* audiotools_pcm,
                                                     "__blank__", NULL);
     if (framelist != NULL) {
         if (channels->len > 0) {
-            framelist->frames = channels->_[0]->len;
-            framelist->channels = channels->len;
-            framelist->bits_per_sample = bits_per_sample;
-            framelist->samples_length = (framelist->frames *
-                                         framelist->channels);
-            framelist->samples = realloc(framelist->samples,
-                                         framelist->samples_length *
-                                         sizeof(int));
+            if (FrameList_resize(framelist, channels->_[0]->len,
+                                 channels->len, bits_per_sample)) {
+                Py_DECREF((PyObject*)framelist);
+                return NULL;
+            }
 
             for (c = 0; c < channels->len; c++) {
                 channel = channels->_[c];
                 if (channel->len == framelist->frames) {
                     for (i = 0; i < framelist->frames; i++) {
-                        framelist->samples[(i * channels->len) + c] =
-                            channel->_[i];
+                        /*values must fit the FrameList's storage*/
+                        if ((FRAMELIST_SAMPLE_SIZE(bits_per_sample) ==
+                             sizeof(int16_t)) &&
+                            ((channel->_[i] < INT16_MIN) ||
+                             (channel->_[i] > INT16_MAX))) {
+                            Py_DECREF((PyObject*)framelist);
+                            PyErr_SetString(PyExc_ValueError,
+                                            "sample value out of range "
+                                            "for bits per sample");
+                            return NULL;
+                        }
+                        FrameList_set_sample(framelist,
+                                             (i * channels->len) + c,
+                                             channel->_[i]);
                     }
                 } else {
                     /*return an error if there's a channel length mismatch*/
@@ -121,8 +144,10 @@ empty_FrameList(PyObject* audiotools_pcm,
                                                     "__blank__", NULL);
 
     if (framelist != NULL) {
-        framelist->channels = channels;
-        framelist->bits_per_sample = bits_per_sample;
+        if (FrameList_resize(framelist, 0, channels, bits_per_sample)) {
+            Py_DECREF((PyObject*)framelist);
+            return NULL;
+        }
 
         return (PyObject*)framelist;
     } else {
@@ -252,8 +277,9 @@ int pcmreader_read(struct pcmreader_s* reader,
         for (frame = 0; frame < framelist->frames; frame++) {
             channel_a->resize(channel_a, framelist->frames);
             a_append(channel_a,
-                     framelist->samples[(frame * framelist->channels) +
-                                        channel]);
+                     FrameList_get_sample(framelist,
+                                          (frame * framelist->channels) +
+                                          channel));
         }
     }
 
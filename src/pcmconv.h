@@ -39,7 +39,8 @@ open_audiotools_pcm(void);
   returns a new FrameList object containing that data
   with the given number of channels and bits per sample
   which Python will presumably DECREF once no longer needed
-  or returns NULL with an exception set on error*/
+  or returns NULL with an exception set on error,
+  such as a ValueError if a sample doesn't fit the FrameList*/
 PyObject*
 array_i_to_FrameList(PyObject* audiotools_pcm,
                      array_i* samples,
@@ -0,0 +1,507 @@
+#include "pcmconverter.h"
+#include <math.h>
+#include "samplerate/samplerate.c"
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2012  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+/*the smallest src_process output buffer, in PCM frames*/
+#define MINIMUM_RESAMPLED_FRAMES 4096
+
+#ifdef IS_PY3K
+
+static PyModuleDef pcmconvertermodule = {
+    PyModuleDef_HEAD_INIT,
+    "pcmconverter",
+    "A PCM stream conversion module.",
+    -1,
+    NULL,
+    NULL, NULL, NULL, NULL
+};
+
+PyMODINIT_FUNC
+PyInit_pcmconverter(void)
+{
+    PyObject* m;
+
+    if (PyType_Ready(&pcmconverter_ConverterType) < 0)
+        return NULL;
+
+    m = PyModule_Create(&pcmconvertermodule);
+    if (m == NULL)
+        return NULL;
+
+    Py_INCREF(&pcmconverter_ConverterType);
+    PyModule_AddObject(m, "Converter",
+                       (PyObject *)&pcmconverter_ConverterType);
+    return m;
+}
+
+#else
+
+PyMODINIT_FUNC
+initpcmconverter(void)
+{
+    PyObject* m;
+
+    if (PyType_Ready(&pcmconverter_ConverterType) < 0)
+        return;
+
+    m = Py_InitModule3("pcmconverter", module_methods,
+                       "A PCM stream conversion module.");
+
+    Py_INCREF(&pcmconverter_ConverterType);
+    PyModule_AddObject(m, "Converter",
+                       (PyObject *)&pcmconverter_ConverterType);
+}
+
+#endif
+
+void
+Converter_dealloc(pcmconverter_Converter* self)
+{
+    if (self->reader != NULL)
+        self->reader->del(self->reader);
+    Py_XDECREF(self->pcm_module);
+    free(self->matrix);
+    if (self->src_state != NULL)
+        src_delete(self->src_state);
+    free(self->unresampled);
+    free(self->resampled);
+    if (self->input != NULL)
+        self->input->del(self->input);
+    if (self->output != NULL)
+        self->output->del(self->output);
+#ifdef IS_PY3K
+    Py_TYPE(self)->tp_free((PyObject*)self);
+#else
+    self->ob_type->tp_free((PyObject*)self);
+#endif
+}
+
+PyObject*
+Converter_new(PyTypeObject *type,
+              PyObject *args, PyObject *kwds)
+{
+    pcmconverter_Converter *self;
+
+    self = (pcmconverter_Converter *)type->tp_alloc(type, 0);
+    self->reader = NULL;
+    self->pcm_module = NULL;
+    self->matrix = NULL;
+    self->dither = DITHER_NONE;
+    self->dither_state = PCM_XORSHIFT_SEED;
+    self->src_state = NULL;
+    self->unresampled = NULL;
+    self->unresampled_frames = 0;
+    self->unresampled_size = 0;
+    self->resampled = NULL;
+    self->resampled_size = 0;
+    self->finished = 0;
+    self->input = array_ia_new();
+    self->output = array_i_new();
+
+    return (PyObject *)self;
+}
+
+static int
+valid_bits_per_sample(unsigned bits_per_sample)
+{
+    switch (bits_per_sample) {
+    case 8:
+    case 16:
+    case 24:
+        return 1;
+    default:
+        PyErr_SetString(PyExc_ValueError,
+                        "bits_per_sample must be 8, 16 or 24");
+        return 0;
+    }
+}
+
+/*populates self->matrix from a sequence of output channel rows,
+  each of which is a sequence of gains per input channel
+
+  returns 0 on success, or -1 with an exception set*/
+static int
+parse_matrix(pcmconverter_Converter *self, PyObject *matrix_obj)
+{
+    PyObject *rows = NULL;
+    PyObject *row = NULL;
+    Py_ssize_t o;
+    Py_ssize_t i;
+    double gain;
+
+    if ((rows = PySequence_Fast(matrix_obj,
+                                "matrix must be a sequence")) == NULL)
+        return -1;
+
+    if (PySequence_Fast_GET_SIZE(rows) < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "matrix must have at least 1 output channel");
+        goto error;
+    }
+    self->output_channels = (unsigned)PySequence_Fast_GET_SIZE(rows);
+    self->matrix = malloc(sizeof(double) *
+                          self->output_channels * self->input_channels);
+
+    for (o = 0; o < self->output_channels; o++) {
+        if ((row = PySequence_Fast(PySequence_Fast_GET_ITEM(rows, o),
+                                   "matrix rows must be sequences")) == NULL)
+            goto error;
+        if (PySequence_Fast_GET_SIZE(row) != self->input_channels) {
+            PyErr_SetString(PyExc_ValueError,
+                            "matrix rows must have a gain "
+                            "for each input channel");
+            goto error;
+        }
+        for (i = 0; i < self->input_channels; i++) {
+            gain = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(row, i));
+            if ((gain == -1.0) && PyErr_Occurred())
+                goto error;
+            self->matrix[(o * self->input_channels) + i] = gain;
+        }
+        Py_DECREF(row);
+        row = NULL;
+    }
+
+    Py_DECREF(rows);
+    return 0;
+
+ error:
+    Py_XDECREF(row);
+    Py_DECREF(rows);
+    return -1;
+}
+
+int
+Converter_init(pcmconverter_Converter *self,
+               PyObject *args, PyObject *kwds)
+{
+    PyObject *pcmreader_obj;
+    int sample_rate;
+    int bits_per_sample;
+    PyObject *matrix_obj;
+    int dither = DITHER_NONE;
+    int error;
+
+    if (!PyArg_ParseTuple(args, "OiiO|i", &pcmreader_obj, &sample_rate,
+                          &bits_per_sample, &matrix_obj, &dither))
+        return -1;
+
+    /*__init__ may be called again on the same Converter,
+      so anything from an earlier call is released first*/
+    if (self->reader != NULL) {
+        self->reader->del(self->reader);
+        self->reader = NULL;
+    }
+    Py_CLEAR(self->pcm_module);
+    free(self->matrix);
+    self->matrix = NULL;
+    if (self->src_state != NULL) {
+        src_delete(self->src_state);
+        self->src_state = NULL;
+    }
+    free(self->unresampled);
+    self->unresampled = NULL;
+    self->unresampled_frames = 0;
+    self->unresampled_size = 0;
+    free(self->resampled);
+    self->resampled = NULL;
+    self->resampled_size = 0;
+    self->finished = 0;
+
+    if ((self->pcm_module = open_audiotools_pcm()) == NULL)
+        return -1;
+
+    if ((self->reader = open_pcmreader(pcmreader_obj)) == NULL)
+        return -1;
+
+    if (sample_rate < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "sample rate must be greater than 0");
+        return -1;
+    }
+    if ((self->reader->sample_rate < 1) || (self->reader->channels < 1)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "invalid PCMReader sample rate or channel count");
+        return -1;
+    }
+    if (!valid_bits_per_sample(self->reader->bits_per_sample) ||
+        !valid_bits_per_sample((unsigned)bits_per_sample))
+        return -1;
+    switch (dither) {
+    case DITHER_NONE:
+    case DITHER_RECTANGULAR:
+    case DITHER_TRIANGULAR:
+        self->dither = dither;
+        break;
+    default:
+        PyErr_SetString(PyExc_ValueError, "unknown dither type");
+        return -1;
+    }
+
+    self->input_channels = self->reader->channels;
+    self->input_bits_per_sample = self->reader->bits_per_sample;
+    self->output_bits_per_sample = (unsigned)bits_per_sample;
+
+    if (parse_matrix(self, matrix_obj) != 0)
+        return -1;
+
+    if ((unsigned)sample_rate != self->reader->sample_rate) {
+        self->ratio = ((double)sample_rate /
+                       (double)self->reader->sample_rate);
+        if ((self->src_state = src_new(0, self->output_channels,
+                                       &error)) == NULL) {
+            PyErr_SetString(PyExc_ValueError, src_strerror(error));
+            return -1;
+        }
+    }
+
+    return 0;
+}
+
+/***************************/
+/*Converter implementation*/
+/***************************/
+
+/*each Converter keeps its own generator state
+  so that several may dither at once without the GIL*/
+static inline double
+converter_dither_noise(pcmconverter_Converter *self)
+{
+    return pcm_xorshift_dither_noise(self->dither, &(self->dither_state));
+}
+
+static inline int
+converter_quantize(double value, int sample_min, int sample_max)
+{
+    if (value >= sample_max)
+        return sample_max;
+    else if (value <= sample_min)
+        return sample_min;
+    else
+        return (int)lround(value);
+}
+
+/*mixes frame "f" of self->input into output channel "o"*/
+static inline double
+converter_mix(const pcmconverter_Converter *self, unsigned o, unsigned f)
+{
+    const double *gains = self->matrix + (o * self->input_channels);
+    double total = 0.0;
+    unsigned i;
+
+    for (i = 0; i < self->input_channels; i++)
+        if (gains[i] != 0.0)
+            total += gains[i] * self->input->_[i]->_[f];
+
+    return total;
+}
+
+/*appends "frames" of self->input to self->output
+  mixing, requantizing and dithering them in one pass*/
+static void
+converter_mix_to_output(pcmconverter_Converter *self, unsigned frames)
+{
+    const int sample_max = (1 << (self->output_bits_per_sample - 1)) - 1;
+    const int sample_min = -(1 << (self->output_bits_per_sample - 1));
+    const double scale = ldexp(1.0, (int)self->output_bits_per_sample -
+                                    (int)self->input_bits_per_sample);
+    array_i *output = self->output;
+    unsigned f;
+    unsigned o;
+
+    output->resize(output, frames * self->output_channels);
+    for (f = 0; f < frames; f++)
+        for (o = 0; o < self->output_channels; o++)
+            a_append(output,
+                     converter_quantize(
+                         (converter_mix(self, o, f) * scale) +
+                         converter_dither_noise(self),
+                         sample_min,
+                         sample_max));
+}
+
+/*appends "frames" of self->input to self->unresampled
+  as mixed floating point samples between -1.0 and 1.0*/
+static void
+converter_mix_to_unresampled(pcmconverter_Converter *self, unsigned frames)
+{
+    const double scale = ldexp(1.0, 1 - (int)self->input_bits_per_sample);
+    float *unresampled;
+    unsigned f;
+    unsigned o;
+
+    unresampled = self->unresampled +
+        (self->unresampled_frames * self->output_channels);
+    for (f = 0; f < frames; f++)
+        for (o = 0; o < self->output_channels; o++)
+            *unresampled++ = (float)(converter_mix(self, o, f) * scale);
+    self->unresampled_frames += frames;
+}
+
+/*appends "frames" of self->resampled to self->output,
+  quantized and dithered to the output bits-per-sample*/
+static void
+converter_resampled_to_output(pcmconverter_Converter *self, unsigned frames)
+{
+    const int sample_max = (1 << (self->output_bits_per_sample - 1)) - 1;
+    const int sample_min = -(1 << (self->output_bits_per_sample - 1));
+    const double scale = ldexp(1.0, self->output_bits_per_sample - 1);
+    const unsigned samples = frames * self->output_channels;
+    array_i *output = self->output;
+    unsigned i;
+
+    output->resize(output, samples);
+    for (i = 0; i < samples; i++)
+        a_append(output,
+                 converter_quantize((self->resampled[i] * scale) +
+                                    converter_dither_noise(self),
+                                    sample_min,
+                                    sample_max));
+}
+
+/*grows a buffer of floats to hold at least "minimum" samples
+
+  returns 0 on success, or -1 with an exception set*/
+static int
+converter_reserve(float **buffer, unsigned *size, unsigned minimum)
+{
+    float *resized;
+
+    if (minimum > *size) {
+        if ((resized = realloc(*buffer, minimum * sizeof(float))) == NULL) {
+            PyErr_SetString(PyExc_MemoryError, "out of memory");
+            return -1;
+        }
+        *buffer = resized;
+        *size = minimum;
+    }
+    return 0;
+}
+
+PyObject*
+Converter_read(pcmconverter_Converter* self, PyObject *args)
+{
+    int bytes;
+    unsigned pcm_frames;
+    unsigned input_frames;
+    unsigned resampled_frames;
+    SRC_DATA src_data;
+    int processing_error;
+
+    if (!PyArg_ParseTuple(args, "i", &bytes))
+        return NULL;
+
+    pcm_frames = (unsigned)MAX(bytes, 0) /
+        (self->input_channels * (self->input_bits_per_sample / 8));
+    if (pcm_frames == 0)
+        pcm_frames = 1;
+
+    self->output->reset(self->output);
+
+    do {
+        if (self->finished)
+            break;
+
+        if (self->reader->read(self->reader, pcm_frames, self->input))
+            return NULL;
+
+        if ((self->input->len > 0) && (self->input->_[0]->len > 0)) {
+            input_frames = self->input->_[0]->len;
+            if (self->input->len != self->input_channels) {
+                PyErr_SetString(PyExc_ValueError,
+                                "FrameList's channel count differs "
+                                "from PCMReader's");
+                return NULL;
+            }
+        } else {
+            input_frames = 0;
+        }
+
+        if (self->src_state == NULL) {
+            /*without resampling, a single read is enough*/
+            Py_BEGIN_ALLOW_THREADS
+            converter_mix_to_output(self, input_frames);
+            Py_END_ALLOW_THREADS
+            break;
+        }
+
+        if (converter_reserve(&(self->unresampled),
+                              &(self->unresampled_size),
+                              (self->unresampled_frames + input_frames) *
+                              self->output_channels) ||
+            converter_reserve(&(self->resampled),
+                              &(self->resampled_size),
+                              MAX((unsigned)ceil(
+                                      (self->unresampled_frames +
+                                       input_frames) * self->ratio),
+                                  MINIMUM_RESAMPLED_FRAMES) *
+                              self->output_channels))
+            return NULL;
+
+        Py_BEGIN_ALLOW_THREADS
+        converter_mix_to_unresampled(self, input_frames);
+
+        src_data.data_in = self->unresampled;
+        src_data.input_frames = self->unresampled_frames;
+        src_data.data_out = self->resampled;
+        src_data.output_frames = (self->resampled_size /
+                                  self->output_channels);
+        src_data.end_of_input = (input_frames == 0);
+        src_data.src_ratio = self->ratio;
+
+        processing_error = src_process(self->src_state, &src_data);
+
+        if (processing_error == 0) {
+            /*keep any unconsumed input for the next call*/
+            self->unresampled_frames -= (unsigned)src_data.input_frames_used;
+            memmove(self->unresampled,
+                    self->unresampled + (src_data.input_frames_used *
+                                         self->output_channels),
+                    (self->unresampled_frames * self->output_channels *
+                     sizeof(float)));
+
+            resampled_frames = (unsigned)src_data.output_frames_gen;
+            converter_resampled_to_output(self, resampled_frames);
+        }
+        Py_END_ALLOW_THREADS
+
+        if (processing_error != 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            src_strerror(processing_error));
+            return NULL;
+        }
+
+        /*once the input is exhausted and the resampler has been drained
+          every subsequent read returns an empty FrameList*/
+        if ((input_frames == 0) && (resampled_frames == 0))
+            self->finished = 1;
+
+        /*the resampler may hold on to a small read entirely,
+          so keep reading until it generates something
+          rather than returning an empty FrameList mid-stream*/
+    } while (resampled_frames == 0);
+
+    return array_i_to_FrameList(self->pcm_module,
+                                self->output,
+                                self->output_channels,
+                                self->output_bits_per_sample);
+}
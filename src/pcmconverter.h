@@ -0,0 +1,177 @@
+#include <Python.h>
+#include <stdint.h>
+#include "samplerate/samplerate.h"
+#include "pcmconv.h"
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2012  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+#if PY_MAJOR_VERSION >= 3
+#define IS_PY3K
+#endif
+
+PyMethodDef module_methods[] = {
+    {NULL}
+};
+
+/***********************/
+/*Converter definitions*/
+/***********************/
+
+typedef struct {
+    PyObject_HEAD
+
+    /*the wrapped PCMReader and the module used to build FrameLists*/
+    struct pcmreader_s* reader;
+    PyObject* pcm_module;
+
+    /*the conversion plan*/
+    unsigned input_channels;
+    unsigned input_bits_per_sample;
+    unsigned output_channels;
+    unsigned output_bits_per_sample;
+    double* matrix;           /*output_channels rows of input_channels gains*/
+    pcm_dither dither;
+    uint64_t dither_state;
+
+    /*resampling state, where src_state is NULL
+      if the sample rate is unchanged*/
+    SRC_STATE* src_state;
+    double ratio;
+    float* unresampled;       /*mixed input not yet consumed by src_process*/
+    unsigned unresampled_frames;
+    unsigned unresampled_size;
+    float* resampled;         /*src_process output*/
+    unsigned resampled_size;
+    int finished;
+
+    /*buffers reused from one read to the next*/
+    array_ia* input;
+    array_i* output;
+} pcmconverter_Converter;
+
+void
+Converter_dealloc(pcmconverter_Converter* self);
+
+PyObject*
+Converter_new(PyTypeObject *type,
+              PyObject *args, PyObject *kwds);
+
+int
+Converter_init(pcmconverter_Converter *self,
+               PyObject *args, PyObject *kwds);
+
+PyObject*
+Converter_read(pcmconverter_Converter* self, PyObject *args);
+
+PyMethodDef Converter_methods[] = {
+    {"read", (PyCFunction)Converter_read,
+     METH_VARARGS, "Reads a converted FrameList from the wrapped PCMReader"},
+    {NULL}
+};
+
+#ifdef IS_PY3K
+
+static PyTypeObject pcmconverter_ConverterType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "pcmconverter.Converter",  /* tp_name */
+    sizeof(pcmconverter_Converter), /* tp_basicsize */
+    0,                         /* tp_itemsize */
+    (destructor)Converter_dealloc, /* tp_dealloc */
+    0,                         /* tp_print */
+    0,                         /* tp_getattr */
+    0,                         /* tp_setattr */
+    0,                         /* tp_reserved */
+    0,                         /* tp_repr */
+    0,                         /* tp_as_number */
+    0,                         /* tp_as_sequence */
+    0,                         /* tp_as_mapping */
+    0,                         /* tp_hash  */
+    0,                         /* tp_call */
+    0,                         /* tp_str */
+    0,                         /* tp_getattro */
+    0,                         /* tp_setattro */
+    0,                         /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_BASETYPE,   /* tp_flags */
+    "Converter objects",       /* tp_doc */
+    0,		               /* tp_traverse */
+    0,		               /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    0,		               /* tp_iter */
+    0,		               /* tp_iternext */
+    Converter_methods,         /* tp_methods */
+    0,                         /* tp_members */
+    0,                         /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)Converter_init,  /* tp_init */
+    0,                         /* tp_alloc */
+    Converter_new,             /* tp_new */
+};
+
+#else
+
+PyTypeObject pcmconverter_ConverterType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                         /*ob_size*/
+    "pcmconverter.Converter",  /*tp_name*/
+    sizeof(pcmconverter_Converter), /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    (destructor)Converter_dealloc, /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    0,                         /*tp_as_number*/
+    0,                         /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    "Converter objects",       /* tp_doc */
+    0,		               /* tp_traverse */
+    0,		               /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    0,		               /* tp_iter */
+    0,		               /* tp_iternext */
+    Converter_methods,         /* tp_methods */
+    0,                         /* tp_members */
+    0,                         /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)Converter_init,  /* tp_init */
+    0,                         /* tp_alloc */
+    Converter_new,             /* tp_new */
+};
+
+#endif
@@ -48,6 +48,10 @@ PyMethodDef ReplayGain_methods[] = {
      METH_NOARGS,"Returns a (title gain,title peak) tuple and resets"},
     {"album_gain",(PyCFunction)ReplayGain_album_gain,
      METH_NOARGS,"Returns an (album gain,album peak) tuple"},
+    {"album_state",(PyCFunction)ReplayGain_album_state,
+     METH_NOARGS,"Returns an (album histogram,album peak) tuple"},
+    {"merge_album_state",(PyCFunction)ReplayGain_merge_album_state,
+     METH_VARARGS,"Adds an (album histogram,album peak) pair to the album"},
     {NULL}
 };
 
@@ -196,6 +200,7 @@ ReplayGain_update(replaygain_ReplayGain *self, PyObject *args)
     unsigned sample;
     double peak;
     int32_t peak_shift;
+    int analysis_result;
 
     /*receive a (presumably) FrameList from our arguments*/
     if (!PyArg_ParseTuple(args,"O",&framelist_obj))
@@ -246,6 +251,16 @@ ReplayGain_update(replaygain_ReplayGain *self, PyObject *args)
     channel_l = (pcm_FrameList*)channel_l_obj;
     channel_r = (pcm_FrameList*)channel_r_obj;
 
+    switch (channel_l->bits_per_sample) {
+    case 8:
+    case 16:
+    case 24:
+        break;
+    default:
+        PyErr_SetString(PyExc_ValueError,"unsupported bits per sample");
+        goto error;
+    }
+
     /*convert channel_l and channel_r to doubles,
       but *not* doubles between -1.0 and 1.0*/
     channel_l_buffer = malloc(channel_l->frames * sizeof(double));
@@ -253,51 +268,56 @@ ReplayGain_update(replaygain_ReplayGain *self, PyObject *args)
 
     peak_shift = 1 << (channel_l->bits_per_sample - 1);
 
+    /*the channel FrameLists are held until we're done with them,
+      so their samples may be analyzed without the GIL*/
+    Py_BEGIN_ALLOW_THREADS
+
     switch (channel_l->bits_per_sample) {
     case 8:
         for (sample = 0; sample < channel_l->frames; sample++) {
-            channel_l_buffer[sample] = (double)(channel_l->samples[sample] << 8);
-            channel_r_buffer[sample] = (double)(channel_r->samples[sample] << 8);
+            channel_l_buffer[sample] = (double)(FrameList_get_sample(channel_l, sample) << 8);
+            channel_r_buffer[sample] = (double)(FrameList_get_sample(channel_r, sample) << 8);
 
-            peak = (double)(MAX(abs(channel_l->samples[sample]),
-                                abs(channel_r->samples[sample]))) / peak_shift;
+            peak = (double)(MAX(abs(FrameList_get_sample(channel_l, sample)),
+                                abs(FrameList_get_sample(channel_r, sample)))) / peak_shift;
             self->title_peak = MAX(self->title_peak,peak);
             self->album_peak = MAX(self->album_peak,peak);
         }
         break;
     case 16:
         for (sample = 0; sample < channel_l->frames; sample++) {
-            channel_l_buffer[sample] = (double)(channel_l->samples[sample]);
-            channel_r_buffer[sample] = (double)(channel_r->samples[sample]);
+            channel_l_buffer[sample] = (double)(FrameList_get_sample(channel_l, sample));
+            channel_r_buffer[sample] = (double)(FrameList_get_sample(channel_r, sample));
 
-            peak = (double)(MAX(abs(channel_l->samples[sample]),
-                                abs(channel_r->samples[sample]))) / peak_shift;
+            peak = (double)(MAX(abs(FrameList_get_sample(channel_l, sample)),
+                                abs(FrameList_get_sample(channel_r, sample)))) / peak_shift;
             self->title_peak = MAX(self->title_peak,peak);
             self->album_peak = MAX(self->album_peak,peak);
         }
         break;
     case 24:
         for (sample = 0; sample < channel_l->frames; sample++) {
-            channel_l_buffer[sample] = (double)(channel_l->samples[sample] >> 8);
-            channel_r_buffer[sample] = (double)(channel_r->samples[sample] >> 8);
+            channel_l_buffer[sample] = (double)(FrameList_get_sample(channel_l, sample) >> 8);
+            channel_r_buffer[sample] = (double)(FrameList_get_sample(channel_r, sample) >> 8);
 
-            peak = (double)(MAX(abs(channel_l->samples[sample]),
-                                abs(channel_r->samples[sample]))) / peak_shift;
+            peak = (double)(MAX(abs(FrameList_get_sample(channel_l, sample)),
+                                abs(FrameList_get_sample(channel_r, sample)))) / peak_shift;
             self->title_peak = MAX(self->title_peak,peak);
             self->album_peak = MAX(self->album_peak,peak);
         }
         break;
-    default:
-        PyErr_SetString(PyExc_ValueError,"unsupported bits per sample");
-        goto error;
     }
 
     /*perform actual gain analysis on channels*/
-    if (ReplayGain_analyze_samples(self,
-                                   channel_l_buffer,
-                                   channel_r_buffer,
-                                   channel_l->frames,
-                                   2) == GAIN_ANALYSIS_ERROR) {
+    analysis_result = ReplayGain_analyze_samples(self,
+                                                 channel_l_buffer,
+                                                 channel_r_buffer,
+                                                 channel_l->frames,
+                                                 2);
+
+    Py_END_ALLOW_THREADS
+
+    if (analysis_result == GAIN_ANALYSIS_ERROR) {
         PyErr_SetString(PyExc_ValueError,"ReplayGain calculation error");
         goto error;
     }
@@ -353,6 +373,70 @@ ReplayGain_album_gain(replaygain_ReplayGain *self)
     }
 }
 
+PyObject*
+ReplayGain_album_state(replaygain_ReplayGain *self)
+{
+    PyObject *histogram;
+    PyObject *value;
+    Py_ssize_t i;
+
+    if ((histogram = PyList_New(STEPS_per_dB_times_MAX_dB)) == NULL)
+        return NULL;
+
+    for (i = 0; i < STEPS_per_dB_times_MAX_dB; i++) {
+        if ((value = PyLong_FromUnsignedLong(self->B[i])) == NULL) {
+            Py_DECREF(histogram);
+            return NULL;
+        }
+        PyList_SET_ITEM(histogram, i, value);
+    }
+
+    return Py_BuildValue("(N,d)", histogram, self->album_peak);
+}
+
+PyObject*
+ReplayGain_merge_album_state(replaygain_ReplayGain *self, PyObject *args)
+{
+    PyObject *histogram_obj;
+    PyObject *histogram;
+    double peak;
+    uint32_t counts[STEPS_per_dB_times_MAX_dB];
+    unsigned long count;
+    Py_ssize_t i;
+
+    if (!PyArg_ParseTuple(args, "Od", &histogram_obj, &peak))
+        return NULL;
+
+    if ((histogram = PySequence_Fast(histogram_obj,
+                                     "histogram must be a sequence")) == NULL)
+        return NULL;
+
+    if (PySequence_Fast_GET_SIZE(histogram) != STEPS_per_dB_times_MAX_dB) {
+        PyErr_SetString(PyExc_ValueError, "invalid histogram length");
+        Py_DECREF(histogram);
+        return NULL;
+    }
+
+    /*validate the whole histogram before altering any of our state*/
+    for (i = 0; i < STEPS_per_dB_times_MAX_dB; i++) {
+        count = PyInt_AsUnsignedLongMask(
+            PySequence_Fast_GET_ITEM(histogram, i));
+        if ((count == (unsigned long)-1) && PyErr_Occurred()) {
+            Py_DECREF(histogram);
+            return NULL;
+        }
+        counts[i] = (uint32_t)count;
+    }
+    Py_DECREF(histogram);
+
+    for (i = 0; i < STEPS_per_dB_times_MAX_dB; i++)
+        self->B[i] += counts[i];
+    self->album_peak = MAX(self->album_peak, peak);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 
 PyGetSetDef ReplayGainReader_getseters[] = {
     {"sample_rate",
@@ -839,7 +923,6 @@ int
 ReplayGainReader_init(replaygain_ReplayGainReader *self,
                       PyObject *args, PyObject *kwds) {
     self->pcm_module = NULL;
-    self->os_module = NULL;
     self->pcmreader = NULL;
     double replaygain;
     double peak;
@@ -856,10 +939,6 @@ ReplayGainReader_init(replaygain_ReplayGainReader *self,
         return -1;
     }
 
-    if ((self->os_module = PyImport_ImportModule("os")) == NULL) {
-        return -1;
-    }
-
     self->multiplier = powl(10.0l, replaygain / 20.0l);
     if (self->multiplier > 1.0l)
         self->multiplier = 1.0l / peak;
@@ -871,7 +950,6 @@ void
 ReplayGainReader_dealloc(replaygain_ReplayGainReader* self) {
     Py_XDECREF(self->pcmreader);
     Py_XDECREF(self->pcm_module);
-    Py_XDECREF(self->os_module);
     self->ob_type->tp_free((PyObject*)self);
 }
 
@@ -905,19 +983,8 @@ ReplayGainReader_read(replaygain_ReplayGainReader* self, PyObject *args) {
 
     PyObject* framelist_obj;
     PyObject* framelist_type_obj;
-    pcm_FrameList *framelist;
-
     PyObject* output_obj;
-    pcm_FrameList *output_framelist;
-
-    PyObject* dither_obj;
-    uint8_t* dither;
-    Py_ssize_t dither_length;
-
-    int max_value;
-    int min_value;
-    unsigned i;
-    double multiplier = self->multiplier;
+    int dither;
 
     if (!PyArg_ParseTuple(args, "O", &bytes))
         return NULL;
@@ -935,77 +1002,26 @@ ReplayGainReader_read(replaygain_ReplayGainReader* self, PyObject *args) {
     }
 
     if (framelist_obj->ob_type == (PyTypeObject*)framelist_type_obj) {
-        framelist = (pcm_FrameList*)framelist_obj;
-
-        /*grab some white noise from os.urandom for dithering*/
-        if ((dither_obj = PyObject_CallMethod(
-                              self->os_module,
-                              "urandom",
-                              "i",
-                              (framelist->samples_length / 8) + 1)) == NULL) {
-            Py_DECREF(framelist_obj);
-            return NULL;
-        }
-
-        /*convert white noise to a buffer of bytes*/
-        if (PyString_AsStringAndSize(dither_obj,
-                                     (char **)&dither,
-                                     &dither_length) == -1) {
-            Py_DECREF(dither_obj);
-            Py_DECREF(framelist_obj);
-            return NULL;
-        }
-
-        /*ensure buffer is big enough to apply to our samples*/
-        if ((dither_length * 8) < framelist->samples_length) {
-            PyErr_SetString(PyExc_ValueError,
-                            "string returned by os.urandom is too short");
-            Py_DECREF(dither_obj);
-            Py_DECREF(framelist_obj);
-            return NULL;
-        }
-
-        /*build an output FrameList*/
-        if ((output_obj = PyObject_CallMethod(self->pcm_module,
-                                              "__blank__",
-                                              NULL)) == NULL) {
-            Py_DECREF(dither_obj);
-            Py_DECREF(framelist_obj);
-            return NULL;
-        }
-
-        /*update output FrameList to match input FrameList*/
-        output_framelist = (pcm_FrameList*)output_obj;
-        output_framelist->frames = framelist->frames;
-        output_framelist->channels = framelist->channels;
-        output_framelist->bits_per_sample = framelist->bits_per_sample;
-        output_framelist->samples_length = framelist->samples_length;
-        output_framelist->samples = realloc(output_framelist->samples,
-                                            sizeof(int) *
-                                            framelist->samples_length);
+        Py_DECREF(framelist_type_obj);
 
         /*apply our multiplier to framelist's integer samples
-          and apply dithering*/
-        max_value = (1 << (framelist->bits_per_sample - 1)) - 1;
-        min_value = -(1 << (framelist->bits_per_sample - 1));
-
-        for (i = 0; i < framelist->samples_length; i++) {
-            output_framelist->samples[i] =
-                MIN(MAX((int)lround(framelist->samples[i] *
-                                          multiplier) ^
-                        (dither[i / 8] & (1 << (i % 8))) >> (i % 8),
-                        min_value),
-                    max_value);
-        }
-
-        /*decref input FrameList and dither string*/
-        Py_DECREF(dither_obj);
+          along with triangular dither, if not 8 bits-per-sample*/
+        if (((pcm_FrameList*)framelist_obj)->bits_per_sample >= 16)
+            dither = DITHER_TRIANGULAR;
+        else
+            dither = DITHER_NONE;
+
+        output_obj = PyObject_CallMethod(framelist_obj,
+                                         "apply_gain",
+                                         "di",
+                                         self->multiplier,
+                                         dither);
         Py_DECREF(framelist_obj);
-
         return output_obj;
     } else {
         PyErr_SetString(PyExc_TypeError,
                         "results from pcmreader.read() must be FrameLists");
+        Py_DECREF(framelist_type_obj);
         Py_DECREF(framelist_obj);
         return NULL;
     }
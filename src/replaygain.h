@@ -96,6 +96,12 @@ ReplayGain_title_gain(replaygain_ReplayGain *self);
 PyObject*
 ReplayGain_album_gain(replaygain_ReplayGain *self);
 
+PyObject*
+ReplayGain_album_state(replaygain_ReplayGain *self);
+
+PyObject*
+ReplayGain_merge_album_state(replaygain_ReplayGain *self, PyObject *args);
+
 gain_calc_status
 ReplayGain_analyze_samples(replaygain_ReplayGain* self,
                            const double* left_samples,
@@ -114,7 +120,6 @@ typedef struct {
     PyObject_HEAD;
 
     PyObject* pcm_module;
-    PyObject* os_module;
     PyObject* pcmreader;
     double multiplier;
 } replaygain_ReplayGainReader;
@@ -24,6 +24,8 @@
 #include "pcm.h"
 #include "samplerate/samplerate.c"
 
+#define OUTPUT_SAMPLES_LENGTH 0x100000
+
 #ifdef IS_PY3K
 
 static PyModuleDef resamplemodule = {
@@ -81,6 +83,7 @@ void
 Resampler_dealloc(resample_Resampler* self)
 {
     src_delete(self->src_state);
+    free(self->data_out);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -90,6 +93,7 @@ void
 Resampler_dealloc(resample_Resampler* self)
 {
     src_delete(self->src_state);
+    free(self->data_out);
     Py_XDECREF(self->pcm_module);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -103,6 +107,8 @@ Resampler_new(PyTypeObject *type,
     resample_Resampler *self;
 
     self = (resample_Resampler *)type->tp_alloc(type, 0);
+    self->src_state = NULL;
+    self->data_out = NULL;
     self->pcm_module = NULL;
 
     return (PyObject *)self;
@@ -138,6 +144,15 @@ Resampler_init(resample_Resampler *self,
     self->channels = channels;
     self->ratio = ratio;
 
+    /*each Resampler has its own output buffer
+      so that several may process samples at once*/
+    if ((self->data_out == NULL) &&
+        ((self->data_out = malloc(OUTPUT_SAMPLES_LENGTH *
+                                  sizeof(float))) == NULL)) {
+        PyErr_SetString(PyExc_MemoryError, "out of memory");
+        return -1;
+    }
+
     return 0;
 }
 
@@ -145,8 +160,6 @@ Resampler_init(resample_Resampler *self,
 /*Resampler implementation*/
 /**************************/
 
-#define OUTPUT_SAMPLES_LENGTH 0x100000
-
 PyObject*
 Resampler_process(resample_Resampler* self, PyObject *args)
 {
@@ -156,18 +169,12 @@ Resampler_process(resample_Resampler* self, PyObject *args)
     SRC_DATA src_data;
     int processing_error;
 
-    static float data_out[OUTPUT_SAMPLES_LENGTH];
-
-    Py_ssize_t i, j;
-
     PyObject *framelist_type_obj = NULL;
     pcm_FloatFrameList *framelist;
     pcm_FloatFrameList *processed_samples = NULL;
     pcm_FloatFrameList *unprocessed_samples = NULL;
     PyObject *toreturn;
 
-    src_data.data_in = NULL;
-
     /*grab (framelist,last) passed in from the method call*/
     if (!PyArg_ParseTuple(args, "Oi", &framelist_obj, &last))
         goto error;
@@ -191,25 +198,26 @@ Resampler_process(resample_Resampler* self, PyObject *args)
         goto error;
     }
 
-    /*build SRC_DATA from our inputs*/
-    if ((src_data.data_in = malloc(framelist->samples_length *
-                                   sizeof(float))) == NULL) {
-        PyErr_SetString(PyExc_MemoryError, "out of memory");
-        goto error;
-    }
-
-    src_data.data_out = data_out;
+    /*build SRC_DATA from our inputs,
+      which src_process() may read directly
+      since FloatFrameLists hold single-precision floats*/
+    src_data.data_in = framelist->samples;
+    src_data.data_out = self->data_out;
     src_data.input_frames = framelist->frames;
     src_data.output_frames = OUTPUT_SAMPLES_LENGTH / self->channels;
     src_data.end_of_input = last;
     src_data.src_ratio = self->ratio;
 
-    for (i = 0; i < framelist->samples_length; i++) {
-        src_data.data_in[i] = (float)framelist->samples[i];
-    }
+    /*the input FrameList is held by our arguments
+      so its samples may be resampled without the GIL*/
+    Py_BEGIN_ALLOW_THREADS
 
     /*run src_process() on our self->SRC_STATE and SRC_DATA*/
-    if ((processing_error = src_process(self->src_state, &src_data)) != 0) {
+    processing_error = src_process(self->src_state, &src_data);
+
+    Py_END_ALLOW_THREADS
+
+    if (processing_error != 0) {
         /*some sort of processing error raises ValueError*/
         PyErr_SetString(PyExc_ValueError,
                         src_strerror(processing_error));
@@ -229,7 +237,7 @@ Resampler_process(resample_Resampler* self, PyObject *args)
         (unsigned int)processed_samples->frames * processed_samples->channels;
     processed_samples->samples =
         realloc(processed_samples->samples,
-                sizeof(double) * processed_samples->samples_length);
+                sizeof(float) * processed_samples->samples_length);
 
     if ((unprocessed_samples = (pcm_FloatFrameList*)PyObject_CallMethod(
                     self->pcm_module, "__blank_float__", NULL)) == NULL)
@@ -242,27 +250,24 @@ Resampler_process(resample_Resampler* self, PyObject *args)
         unprocessed_samples->frames * unprocessed_samples->channels;
     unprocessed_samples->samples =
         realloc(unprocessed_samples->samples,
-                sizeof(double) * unprocessed_samples->samples_length);
+                sizeof(float) * unprocessed_samples->samples_length);
 
 
     /*successfully processed samples*/
-    for (i = 0; i < src_data.output_frames_gen * self->channels; i++) {
-        processed_samples->samples[i] = src_data.data_out[i];
-    }
+    memcpy(processed_samples->samples,
+           src_data.data_out,
+           sizeof(float) * processed_samples->samples_length);
 
     /*not-yet-successfully processed samples*/
-    for (i = src_data.input_frames_used * self->channels, j=0;
-         i < (src_data.input_frames * self->channels);
-         i++, j++) {
-        unprocessed_samples->samples[j] = src_data.data_in[i];
-    }
+    memcpy(unprocessed_samples->samples,
+           src_data.data_in + (src_data.input_frames_used * self->channels),
+           sizeof(float) * unprocessed_samples->samples_length);
 
 
     /*return those two arrays as a tuple*/
     toreturn = Py_BuildValue("(O,O)", processed_samples, unprocessed_samples);
 
     /*cleanup anything allocated*/
-    free(src_data.data_in);
     Py_DECREF(framelist_type_obj);
     Py_DECREF(processed_samples);
     Py_DECREF(unprocessed_samples);
@@ -270,8 +275,6 @@ Resampler_process(resample_Resampler* self, PyObject *args)
     return toreturn;
 
  error:
-    if (src_data.data_in != NULL)
-        free(src_data.data_in);
     Py_XDECREF(framelist_type_obj);
     Py_XDECREF(processed_samples);
     Py_XDECREF(unprocessed_samples);
@@ -40,6 +40,7 @@ typedef struct {
     SRC_STATE *src_state;
     int channels;
     double ratio;
+    float *data_out;
     PyObject *pcm_module;
 } resample_Resampler;
 
@@ -28,7 +28,6 @@ verifymodule_ogg(PyObject *dummy, PyObject *args) {
     struct ogg_header header;
     uint8_t *data_buffer = NULL;
     int data_buffer_size = 0;
-    int i;
     uint32_t checksum;
 
     /*fixes a "may be used unitialized" warning*/
@@ -44,7 +43,7 @@ verifymodule_ogg(PyObject *dummy, PyObject *args) {
         return NULL;
     } else {
         bitstream = br_open(PyFile_AsFile(file_obj), BS_LITTLE_ENDIAN);
-        br_add_callback(bitstream, ogg_crc, &checksum);
+        br_add_checksum(bitstream, ogg_crc_span, &checksum);
     }
 
     if (!setjmp(*br_try(bitstream))) {
@@ -65,8 +64,10 @@ verifymodule_ogg(PyObject *dummy, PyObject *args) {
                     goto error;
                 }
 
-                for (i = 0; i < header.segment_length_total; i++)
-                    ogg_crc(data_buffer[i], &checksum);
+                br_update_checksums(bitstream);
+                ogg_crc_span(data_buffer,
+                             header.segment_length_total,
+                             &checksum);
                 if (header.checksum != checksum) {
                     PyErr_SetString(PyExc_ValueError,
                                     "checksum mismatch in stream");
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""times "import audiotools" in fresh interpreters
+
+each source tree given on the command line is placed first
+on the interpreter's PYTHONPATH, so that an older checkout
+can be compared against the current one"""
+
+import os
+import os.path
+import sys
+import subprocess
+import time
+import optparse
+
+
+def import_times(tree, statement, runs):
+    """returns a sorted list of seconds each run of statement took
+    in a new interpreter with the given tree first on its path
+
+    the interpreter is started from within the tree,
+    since "python -c" also searches its working directory"""
+
+    environment = os.environ.copy()
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [os.path.abspath(tree)] +
+        [p for p in [environment.get("PYTHONPATH", "")] if (len(p) > 0)])
+    devnull = open(os.devnull, "wb")
+    times = []
+    try:
+        for i in xrange(runs):
+            start = time.time()
+            sub = subprocess.Popen([sys.executable, "-c", statement],
+                                   env=environment,
+                                   cwd=tree,
+                                   stdout=devnull)
+            if (sub.wait() != 0):
+                raise ValueError("\"%s\" failed in %s" % (statement, tree))
+            times.append(time.time() - start)
+    finally:
+        devnull.close()
+    return sorted(times)
+
+
+if (__name__ == '__main__'):
+    parser = optparse.OptionParser(
+        usage="%prog [options] [source tree] ...")
+    parser.add_option("-n", "--runs", dest="runs", type="int", default=50,
+                      help="number of interpreters to start per tree")
+    parser.add_option("-s", "--statement", dest="statement",
+                      default="import audiotools",
+                      help="statement each interpreter runs")
+    (options, args) = parser.parse_args()
+    if (len(args) == 0):
+        args = [os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir)]
+
+    #an interpreter which imports nothing at all,
+    #to subtract from the others
+    baseline = import_times(os.curdir, "pass", options.runs)
+    print "%-40s %10s %10s" % ("tree", "median ms", "minimum ms")
+    print "%-40s %10.1f %10.1f" % ("(python -c pass)",
+                                  baseline[len(baseline) / 2] * 1000,
+                                  baseline[0] * 1000)
+    for tree in args:
+        times = import_times(tree, options.statement, options.runs)
+        print "%-40s %10.1f %10.1f" % (os.path.abspath(tree)[-40:],
+                                      times[len(times) / 2] * 1000,
+                                      times[0] * 1000)
@@ -479,6 +479,137 @@ class PCMConverter(unittest.TestCase):
                 (decimal.Decimal(wave.cd_frames()) / 75).to_integral(),
                 5)
 
+    def __convert__(self, samples, channels, channel_mask, bits_per_sample,
+                    new_channels, new_channel_mask, new_bits_per_sample):
+        converter = audiotools.PCMConverter(
+            test_streams.FrameListReader(samples, 44100, channels,
+                                         bits_per_sample, channel_mask),
+            sample_rate=44100,
+            channels=new_channels,
+            channel_mask=new_channel_mask,
+            bits_per_sample=new_bits_per_sample)
+        framelist = converter.read(4096)
+        self.assertEqual(framelist.channels, new_channels)
+        self.assertEqual(framelist.bits_per_sample, new_bits_per_sample)
+        self.assertEqual(len(converter.read(4096)), 0)
+        converter.close()
+        return list(framelist)
+
+    @LIB_CORE
+    def test_mixing(self):
+        #stereo to mono averages both channels
+        self.assertEqual(self.__convert__([100, 200, -3, -4], 2, 0x3, 16,
+                                          1, 0x4, 16),
+                         [150, -4])
+
+        #mono to stereo places the center channel in both
+        self.assertEqual(self.__convert__([1000], 1, 0x4, 16,
+                                          2, 0x3, 16),
+                         [700, 700])
+
+        #5.1 to stereo mixes in center and rear, but not LFE
+        self.assertEqual(self.__convert__([1000, 2000, 100, 5000, 300, 500],
+                                          6, 0x3F, 16, 2, 0x3, 16),
+                         [1406, 1734])
+
+        #removing channels keeps those in the new mask
+        self.assertEqual(self.__convert__([1, 2, 3, 4, 5, 6],
+                                          6, 0x3F, 16, 4, 0x33, 16),
+                         [1, 2, 5, 6])
+
+        #adding channels duplicates the first one
+        self.assertEqual(self.__convert__([5, 6], 2, 0x3, 16,
+                                          4, 0x33, 16),
+                         [5, 6, 5, 5])
+
+        #adding bits is exact
+        self.assertEqual(self.__convert__([1, -1, 32767, -32768],
+                                          2, 0x3, 16, 2, 0x3, 24),
+                         [256, -256, 32767 * 256, -32768 * 256])
+
+        #mixing and adding bits happen in one pass
+        self.assertEqual(self.__convert__([1, 2], 2, 0x3, 16,
+                                          1, 0x4, 24),
+                         [384])
+
+        #mixed samples are clipped to the output's range
+        self.assertEqual(self.__convert__([32767, 32767, 32767, 0, 0, 0],
+                                          6, 0x3F, 16, 2, 0x3, 16),
+                         [32767, 32767])
+
+    @LIB_CORE
+    def test_resampling(self):
+        converter = audiotools.PCMConverter(
+            test_streams.Sine16_Stereo(4410, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            sample_rate=48000,
+            channels=2,
+            channel_mask=0x3,
+            bits_per_sample=24)
+
+        #small reads never return an empty FrameList
+        #until the end of the stream
+        frames = 0
+        framelist = converter.read(4)
+        while (len(framelist) > 0):
+            self.assertEqual(framelist.channels, 2)
+            self.assertEqual(framelist.bits_per_sample, 24)
+            frames += framelist.frames
+            framelist = converter.read(4)
+        #the resampler's final flush may round up by a frame
+        self.assert_(4800 <= frames <= 4801)
+        self.assertEqual(len(converter.read(4)), 0)
+        converter.close()
+
+    @LIB_CORE
+    def test_errors(self):
+        from audiotools.pcmconverter import Converter
+
+        #errors from the wrapped reader are passed through
+        converter = audiotools.PCMConverter(
+            __counting_reader__(BLANK_PCM_Reader(1), ValueError("error")),
+            sample_rate=44100,
+            channels=1,
+            channel_mask=0x4,
+            bits_per_sample=16)
+        self.assertRaises(ValueError, converter.read, 4096)
+
+        reader = BLANK_PCM_Reader(1)
+        self.assertRaises(TypeError, Converter)
+        self.assertRaises(ValueError, Converter, reader, 0, 16,
+                          [[1.0, 0.0]])
+        self.assertRaises(ValueError, Converter, reader, 44100, 12,
+                          [[1.0, 0.0]])
+        self.assertRaises(ValueError, Converter, reader, 44100, 16,
+                          [])
+        self.assertRaises(ValueError, Converter, reader, 44100, 16,
+                          [[1.0]])
+        self.assertRaises(TypeError, Converter, reader, 44100, 16,
+                          [["foo", 0.0]])
+        self.assertRaises(ValueError, Converter, reader, 44100, 16,
+                          [[1.0, 0.0]], -1)
+
+    @LIB_CORE
+    def test_reinit(self):
+        from audiotools.pcmconverter import Converter
+
+        #calling __init__ again replaces the earlier conversion
+        #including its resampler
+        converter = Converter(
+            test_streams.Sine16_Stereo(4410, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            48000, 24, [[1.0, 0.0], [0.0, 1.0]])
+        self.assertEqual(converter.read(4096).bits_per_sample, 24)
+        converter.__init__(
+            test_streams.FrameListReader([100, 200, -3, -4], 44100, 2,
+                                         16, 0x3),
+            44100, 16, [[0.5, 0.5]])
+        framelist = converter.read(4096)
+        self.assertEqual(framelist.channels, 1)
+        self.assertEqual(framelist.bits_per_sample, 16)
+        self.assertEqual(list(framelist), [150, -4])
+        self.assertEqual(len(converter.read(4096)), 0)
+
 
 class LimitedPCMReader(unittest.TestCase):
     @LIB_CORE
@@ -493,6 +624,17 @@ class LimitedPCMReader(unittest.TestCase):
         self.assertEqual(counter1.value, 4100 * 4)
         self.assertEqual(counter2.value, 40000 * 4)
 
+    @LIB_CORE
+    def test_read_unbuffered(self):
+        #PCMReaders without read_frames() are read with read()
+        reader = audiotools.PCMReader(cStringIO.StringIO(chr(0) * 44100 * 4),
+                                      44100, 2, 0x3, 16)
+        self.assert_(not hasattr(reader, "read_frames"))
+        counter = FrameCounter(2, 16, 44100)
+        audiotools.transfer_framelist_data(
+            audiotools.LimitedPCMReader(reader, 4100), counter.update)
+        self.assertEqual(counter.value, 4100 * 4)
+
 
 class PCMCat(unittest.TestCase):
     @LIB_CORE
@@ -510,6 +652,176 @@ class PCMCat(unittest.TestCase):
         self.assertEqual(int(counter), 6)
 
 
+class PCMReaderTee(unittest.TestCase):
+    @LIB_CORE
+    def test_read(self):
+        import threading
+
+        tee = audiotools.PCMReaderTee(
+            test_streams.Sine16_Stereo(441000, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            3, 2)
+        self.assertEqual(len(tee.readers), 3)
+        for reader in tee.readers:
+            self.assertEqual(reader.sample_rate, 44100)
+            self.assertEqual(reader.bits_per_sample, 16)
+            self.assertEqual(reader.channels, 2)
+            self.assertEqual(reader.channel_mask, 0x3)
+
+        #each reader gets the whole stream
+        #even while one of them is closed early
+        sums = [md5(), md5()]
+        threads = [threading.Thread(
+                target=audiotools.transfer_framelist_data,
+                args=(reader, sum.update))
+                   for (reader, sum) in zip(tee.readers, sums)]
+        for thread in threads:
+            thread.start()
+        tee.readers[2].close()
+        tee.run()
+        for thread in threads:
+            thread.join()
+
+        sum = md5()
+        audiotools.transfer_framelist_data(
+            test_streams.Sine16_Stereo(441000, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            sum.update)
+        self.assertEqual(sums[0].hexdigest(), sum.hexdigest())
+        self.assertEqual(sums[1].hexdigest(), sum.hexdigest())
+
+    @LIB_CORE
+    def test_from_pcm_many(self):
+        temp1 = tempfile.NamedTemporaryFile(suffix=".wav")
+        temp2 = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            (wav, flac) = audiotools.from_pcm_many(
+                test_streams.Sine16_Stereo(441000, 44100,
+                                           441.0, 0.50, 4410.0, 0.49, 1.0),
+                [(temp1.name, audiotools.WaveAudio, None),
+                 (temp2.name, audiotools.FlacAudio, "1")])
+            self.assert_(isinstance(wav, audiotools.WaveAudio))
+            self.assert_(isinstance(flac, audiotools.FlacAudio))
+            self.assertEqual(wav.total_frames(), 441000)
+            self.assertEqual(flac.total_frames(), 441000)
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(wav.to_pcm(), flac.to_pcm()), None)
+
+        finally:
+            temp1.close()
+            temp2.close()
+
+        #errors from the original stream
+        #are raised as an EncodingError
+        temp_dir = tempfile.mkdtemp()
+        try:
+            self.assertRaises(
+                audiotools.EncodingError,
+                audiotools.from_pcm_many,
+                audiotools.PCMReaderError(u"error", 44100, 2, 0x3, 16),
+                [(os.path.join(temp_dir, "error.wav"),
+                  audiotools.WaveAudio, None),
+                 (os.path.join(temp_dir, "error.flac"),
+                  audiotools.FlacAudio, None)])
+        finally:
+            for f in os.listdir(temp_dir):
+                os.unlink(os.path.join(temp_dir, f))
+            os.rmdir(temp_dir)
+
+
+class __counting_reader__:
+    def __init__(self, pcmreader, error=None):
+        self.pcmreader = pcmreader
+        self.sample_rate = pcmreader.sample_rate
+        self.channels = pcmreader.channels
+        self.channel_mask = pcmreader.channel_mask
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.error = error
+        self.reads = 0
+
+    def read(self, bytes):
+        self.reads += 1
+        if (self.error is not None):
+            raise self.error
+        else:
+            return self.pcmreader.read(bytes)
+
+    def close(self):
+        self.pcmreader.close()
+
+
+class ThreadedPCMReader(unittest.TestCase):
+    @LIB_CORE
+    def test_read(self):
+        reader = audiotools.ThreadedPCMReader(
+            test_streams.Sine16_Stereo(441000, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            2)
+        self.assertEqual(reader.sample_rate, 44100)
+        self.assertEqual(reader.bits_per_sample, 16)
+        self.assertEqual(reader.channels, 2)
+        self.assertEqual(reader.channel_mask, 0x3)
+
+        sum1 = md5()
+        audiotools.transfer_framelist_data(reader, sum1.update)
+        reader.close()
+        self.assert_(not reader.thread.isAlive())
+
+        sum2 = md5()
+        audiotools.transfer_framelist_data(
+            test_streams.Sine16_Stereo(441000, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0),
+            sum2.update)
+        self.assertEqual(sum1.hexdigest(), sum2.hexdigest())
+
+        #closing early stops the thread
+        #without reading the rest of the stream
+        source = __counting_reader__(
+            test_streams.Sine16_Stereo(441000, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0))
+        reader = audiotools.ThreadedPCMReader(source, 2)
+        self.assert_(len(reader.read(4096)) > 0)
+        reader.close()
+        self.assert_(not reader.thread.isAlive())
+        self.assert_(source.reads < 10)
+
+    @LIB_CORE
+    def test_errors(self):
+        #errors from reading are raised by read()
+        reader = audiotools.ThreadedPCMReader(
+            __counting_reader__(BLANK_PCM_Reader(1), IOError("error")))
+        self.assertRaises(IOError, reader.read, 4096)
+        self.assertRaises(IOError, reader.read, 4096)
+        reader.close()
+        self.assert_(not reader.thread.isAlive())
+
+        #errors from closing are raised by close()
+        reader = audiotools.ThreadedPCMReader(
+            audiotools.PCMReaderError(u"error", 44100, 2, 0x3, 16))
+        self.assertEqual(len(reader.read(4096)), 0)
+        self.assertRaises(audiotools.DecodingError, reader.close)
+        self.assert_(not reader.thread.isAlive())
+
+        #and are raised as EncodingError during conversion
+        temp_dir = tempfile.mkdtemp()
+        try:
+            track = audiotools.WaveAudio.from_pcm(
+                os.path.join(temp_dir, "track.wav"),
+                BLANK_PCM_Reader(1))
+            f = open(track.filename, "r+b")
+            f.seek(-100, 2)
+            f.truncate()
+            f.close()
+            self.assertRaises(audiotools.EncodingError,
+                              track.convert,
+                              os.path.join(temp_dir, "track.aiff"),
+                              audiotools.AiffAudio)
+        finally:
+            for f in os.listdir(temp_dir):
+                os.unlink(os.path.join(temp_dir, f))
+            os.rmdir(temp_dir)
+
+
 class PCMReaderWindow(unittest.TestCase):
     @LIB_CORE
     def setUp(self):
@@ -594,6 +906,57 @@ class Test_ReplayGain(unittest.TestCase):
                             audiotools.ReplayGain(0.5, 1.0, 0.5, 0.5))
 
 
+def __square_job__(value, progress):
+    progress(0, 2)
+    progress(1, 2)
+    return value * value
+
+
+def __failing_job__(value, progress):
+    raise ValueError(value)
+
+
+def __pool_worker_job__(progress):
+    return audiotools.__POOL_WORKER__
+
+
+class Test_ExecProgressQueue(unittest.TestCase):
+    @LIB_CORE
+    def test_results(self):
+        for max_processes in [1, 2, 4, 16]:
+            queue = audiotools.ExecProgressQueue(
+                audiotools.ProgressDisplay(
+                    audiotools.SilentMessenger("test")))
+            for i in xrange(10):
+                queue.execute(__square_job__, None, None, value=i)
+            queue.run(max_processes)
+            self.assertEqual(queue.results,
+                             dict([(i, i * i) for i in xrange(10)]))
+
+    @LIB_CORE
+    def test_exception(self):
+        queue = audiotools.ExecProgressQueue(
+            audiotools.ProgressDisplay(
+                audiotools.SilentMessenger("test")))
+        queue.execute(__square_job__, None, None, value=1)
+        queue.execute(__failing_job__, None, None, value=2)
+        queue.execute(__square_job__, None, None, value=3)
+        self.assertRaises(ValueError, queue.run, 2)
+
+    @LIB_CORE
+    def test_pool_worker(self):
+        #jobs know they're running in a worker
+        #so that they don't fork pools of their own
+        self.assertEqual(audiotools.__POOL_WORKER__, False)
+        queue = audiotools.ExecProgressQueue(
+            audiotools.ProgressDisplay(
+                audiotools.SilentMessenger("test")))
+        queue.execute(__pool_worker_job__, None, None)
+        queue.run(1)
+        self.assertEqual(queue.results, {0: True})
+        self.assertEqual(audiotools.__POOL_WORKER__, False)
+
+
 class Test_filename_to_type(unittest.TestCase):
     @LIB_CORE
     def test_filename_to_type(self):
@@ -742,6 +1105,127 @@ class Test_open(unittest.TestCase):
                           audiotools.open,
                           self.dummy3.name)
 
+    @LIB_CORE
+    def test_magic(self):
+        audio_types = tuple(audiotools.TYPE_MAP.values())
+        for audio_class in audio_types:
+            temp = tempfile.NamedTemporaryFile(
+                suffix="." + audio_class.SUFFIX)
+            try:
+                try:
+                    audio_class.from_pcm(temp.name, BLANK_PCM_Reader(1))
+                except audiotools.EncodingError:
+                    continue
+
+                #every format's files match its own MAGIC signatures
+                header = open(temp.name, "rb").read(
+                    audiotools.MAGIC_READ_SIZE)
+                (matched,
+                 unmarked) = audiotools.__magic_candidates__(header,
+                                                             audio_types)
+                self.assert_(audio_class in matched)
+                self.assertEqual(audiotools.open(temp.name).__class__,
+                                 audio_class)
+
+                #and are still found behind an ID3v2 tag,
+                #though only formats which allow one will accept it
+                data = open(temp.name, "rb").read()
+                f = open(temp.name, "wb")
+                f.write("ID3\x03\x00\x00\x00\x00\x00\x10" +
+                        chr(0) * 0x10 + data)
+                f.close()
+                try:
+                    self.assertEqual(audiotools.open(temp.name).__class__,
+                                     audio_class)
+                except audiotools.UnsupportedFile:
+                    self.assert_(audio_class not in (audiotools.FlacAudio,
+                                                     audiotools.MP3Audio,
+                                                     audiotools.MP2Audio))
+            finally:
+                temp.close()
+
+        #neither signatures nor is_type() match arbitrary data
+        self.assertEqual(audiotools.__magic_candidates__(
+                open(self.dummy1.name, "rb").read(), audio_types)[0], [])
+
+
+class Test_lazy_types(unittest.TestCase):
+    def __loaded_modules__(self, statement):
+        #runs statement after importing audiotools in a new interpreter
+        #and returns the format modules it has imported by then
+        import subprocess
+        import sys
+
+        environment = os.environ.copy()
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(
+                        os.path.abspath(audiotools.__file__)))] +
+            [p for p in [environment.get("PYTHONPATH", "")] if (len(p) > 0)])
+        sub = subprocess.Popen(
+            [sys.executable, "-c",
+             "import sys, audiotools\n%s\n" % (statement) +
+             "print ' '.join([m for m in audiotools.__LAZY_MODULES__ " +
+             "if (sys.modules.get('audiotools.' + m) is not None)])"],
+            env=environment,
+            stdout=subprocess.PIPE)
+        output = sub.stdout.read()
+        self.assertEqual(sub.wait(), 0)
+        return set(output.split())
+
+    @LIB_CORE
+    def test_registry(self):
+        #each registered format matches its class
+        #and they're in AVAILABLE_TYPES order
+        self.assertEqual(len(audiotools.__FORMATS__),
+                         len(audiotools.AVAILABLE_TYPES))
+        for ((name, suffix, module_name, class_name),
+             audio_class) in zip(audiotools.__FORMATS__,
+                                 audiotools.AVAILABLE_TYPES):
+            self.assertEqual(audio_class.NAME, name)
+            self.assertEqual(audio_class.SUFFIX, suffix)
+            self.assertEqual(audio_class.__module__,
+                             "audiotools." + module_name)
+            self.assert_(module_name in audiotools.__LAZY_MODULES__)
+            self.assert_(getattr(audiotools, class_name) is audio_class)
+
+        #and binary lookups are remembered
+        self.assertEqual(audiotools.BIN.can_execute(audiotools.BIN["flac"]),
+                         audiotools.BIN.__executable__[
+                audiotools.BIN["flac"]])
+
+    @LIB_CORE
+    def test_lazy_import(self):
+        #no format modules are imported with audiotools itself
+        self.assertEqual(self.__loaded_modules__(""), set([]))
+
+        #using a format class imports its own module
+        loaded = self.__loaded_modules__("audiotools.WaveAudio")
+        self.assert_("__wav__" in loaded)
+        self.assert_("__flac__" not in loaded)
+
+        #as does opening a file with that format's suffix
+        loaded = self.__loaded_modules__(
+            "assert(isinstance(audiotools.open('flac-allframes.flac'), " +
+            "audiotools.FlacAudio))")
+        self.assert_("__flac__" in loaded)
+        self.assert_("__m4a__" not in loaded)
+
+        #while a file with some other suffix tries every format
+        temp = tempfile.NamedTemporaryFile(suffix=".bin")
+        try:
+            temp.write(open("flac-allframes.flac", "rb").read())
+            temp.flush()
+            loaded = self.__loaded_modules__(
+                ("assert(isinstance(audiotools.open('%s'), " +
+                 "audiotools.FlacAudio))") % (temp.name))
+            self.assert_("__m4a__" in loaded)
+        finally:
+            temp.close()
+
+        #and any other name from a format module is found
+        loaded = self.__loaded_modules__("audiotools.XMCD")
+        self.assert_("__freedb__" in loaded)
+
 
 class Test_open_directory(unittest.TestCase):
     @LIB_CORE
@@ -795,6 +1279,13 @@ class Test_open_directory(unittest.TestCase):
                            track3_1, track3_2, track3_3,
                            track2_1, track2_2, track2_3]])
 
+        #files opened on several threads arrive in the same order
+        for threads in [2, 4, 16]:
+            self.assertEqual(
+                [t.filename for t in
+                 audiotools.open_directory(self.dir, threads=threads)],
+                [t.filename for t in tracks])
+
 
 class Test_open_files(unittest.TestCase):
     @LIB_CORE
@@ -832,6 +1323,186 @@ class Test_open_files(unittest.TestCase):
         self.assertEqual([t.filename for t in tracks],
                          [t.filename for t in [track1, track2, track3]])
 
+        #files opened on several threads arrive in the same order
+        filenames = [track3.filename, dummy1_name,
+                     track2.filename, track1.filename]
+        for threads in [2, 4, 16]:
+            self.assertEqual(
+                [t.filename for t in
+                 audiotools.open_files(filenames, threads=threads)],
+                [t.filename for t in [track1, track2, track3]])
+            self.assertEqual(
+                [t.filename for t in
+                 audiotools.open_files(filenames, sorted=False,
+                                       threads=threads)],
+                [t.filename for t in [track3, track2, track1]])
+
+        #and errors are sent to the messenger in the same order
+        class ErrorMessenger(audiotools.SilentMessenger):
+            def __init__(self):
+                audiotools.SilentMessenger.__init__(self, "test")
+                self.errors = []
+
+            def warning(self, s):
+                self.errors.append(s)
+
+            def error(self, s):
+                self.errors.append(s)
+
+        filenames = [track1.filename, "/dev/null/foo",
+                     track2.filename, self.dir, track3.filename]
+        messenger = ErrorMessenger()
+        audiotools.open_files(filenames, messenger=messenger)
+        self.assertEqual(len(messenger.errors), 2)
+        for threads in [2, 4, 16]:
+            threaded_messenger = ErrorMessenger()
+            audiotools.open_files(filenames,
+                                  messenger=threaded_messenger,
+                                  threads=threads)
+            self.assertEqual(threaded_messenger.errors, messenger.errors)
+
+class Test_catalog(unittest.TestCase):
+    @LIB_CORE
+    def setUp(self):
+        import audiotools.catalog
+
+        self.output_type = audiotools.FlacAudio
+        self.suffix = "." + self.output_type.SUFFIX
+        self.dir = tempfile.mkdtemp()
+        self.catalog_path = os.path.join(self.dir, "catalog.db")
+        self.catalog = audiotools.catalog.Catalog(self.catalog_path)
+
+    def make_track(self, directory, track_number):
+        track = self.output_type.from_pcm(
+            os.path.join(directory, str(track_number) + self.suffix),
+            test_streams.Sine16_Stereo(44100, 44100,
+                                       441.0, 0.50, 441.0, 0.49, 1.0))
+        track.set_metadata(audiotools.MetaData(track_name=u"Track Name",
+                                               track_number=track_number))
+        return track
+
+    @LIB_CORE
+    def tearDown(self):
+        import shutil
+
+        self.catalog.close()
+        shutil.rmtree(self.dir)
+
+    @LIB_CORE
+    def test_catalog(self):
+        from audiotools.catalog import Catalog, CachedAudioFile
+
+        track1 = self.make_track(self.dir, 1)
+        track2 = self.make_track(self.dir, 2)
+        track3 = self.make_track(self.dir, 3)
+        dummy1_name = os.path.join(self.dir, "4" + self.suffix)
+        dummy1 = open(dummy1_name, "wb")
+        dummy1.write("Hello World")
+        dummy1.close()
+        filenames = [track3.filename, dummy1_name,
+                     track1.filename, track2.filename]
+
+        #files not yet cataloged are opened as usual
+        tracks = audiotools.open_files(filenames, catalog=self.catalog)
+        self.assertEqual([t.filename for t in tracks],
+                         [t.filename for t in [track1, track2, track3]])
+        for track in tracks:
+            self.assert_(not isinstance(track, CachedAudioFile))
+        self.assertRaises(audiotools.UnsupportedFile,
+                          self.catalog.open,
+                          dummy1_name)
+
+        #and are cached from then on, even by a new Catalog
+        self.catalog.close()
+        self.catalog = Catalog(self.catalog_path)
+        tracks = audiotools.open_files(filenames, catalog=self.catalog)
+        self.assertEqual([t.filename for t in tracks],
+                         [t.filename for t in [track1, track2, track3]])
+        threaded_tracks = audiotools.open_files(filenames,
+                                                catalog=self.catalog,
+                                                threads=4)
+        self.assertEqual([t.filename for t in threaded_tracks],
+                         [t.filename for t in [track1, track2, track3]])
+        for track in threaded_tracks:
+            self.assert_(isinstance(track, CachedAudioFile))
+        for (cached, track) in zip(tracks, [track1, track2, track3]):
+            self.assert_(isinstance(cached, CachedAudioFile))
+            self.assert_(isinstance(cached, self.output_type))
+            self.assertEqual(cached.audio_class(), self.output_type)
+            self.assertEqual(cached.__class__,
+                             audiotools.catalog.cached_type(self.output_type))
+            self.assert_(type(cached) is cached.__class__)
+            self.assertEqual(cached.NAME, self.output_type.NAME)
+            self.assertEqual(cached.sample_rate(), track.sample_rate())
+            self.assertEqual(cached.channels(), track.channels())
+            self.assertEqual(int(cached.channel_mask()),
+                             int(track.channel_mask()))
+            self.assertEqual(cached.bits_per_sample(),
+                             track.bits_per_sample())
+            self.assertEqual(cached.total_frames(), track.total_frames())
+            self.assertEqual(cached.seconds_length(), track.seconds_length())
+            self.assertEqual(cached.get_metadata(), track.get_metadata())
+            self.assertEqual(cached.track_number(), track.track_number())
+
+            #none of which required parsing the file
+            self.assertEqual(cached.__catalog_parsed__, False)
+
+            #though its PCM data is still available
+            self.assertEqual(audiotools.pcm_frame_cmp(cached.to_pcm(),
+                                                      track.to_pcm()), None)
+            self.assertEqual(cached.verify(), True)
+        self.assertRaises(audiotools.UnsupportedFile,
+                          self.catalog.open,
+                          dummy1_name)
+
+        #copying a cached track yields a track of its own class
+        copy_name = os.path.join(self.dir, "copy" + self.suffix)
+        copied = tracks[0].convert(copy_name, self.output_type)
+        self.assert_(not isinstance(copied, CachedAudioFile))
+        self.assertEqual(copied.__class__, self.output_type)
+        self.assertEqual(open(copy_name, "rb").read(),
+                         open(tracks[0].filename, "rb").read())
+        os.unlink(copy_name)
+
+        #cached objects may also be built from the file alone
+        cached = audiotools.catalog.cached_type(self.output_type)(
+            track1.filename)
+        self.assertEqual(int(cached.channel_mask()),
+                         int(track1.channel_mask()))
+        self.assertEqual(cached.total_frames(), track1.total_frames())
+
+        #metadata set on a cached track is read back from the file
+        cached = self.catalog.open(track1.filename)
+        metadata = cached.get_metadata()
+        metadata.track_name = u"New Name"
+        cached.update_metadata(metadata)
+        self.assertEqual(cached.get_metadata().track_name, u"New Name")
+        self.assertEqual(audiotools.open(track1.filename).get_metadata(),
+                         cached.get_metadata())
+
+        #and a changed file is parsed again, and then re-cataloged
+        stat = os.stat(track1.filename)
+        os.utime(track1.filename, (stat.st_atime, stat.st_mtime + 1))
+        track = self.catalog.open(track1.filename)
+        self.assert_(not isinstance(track, CachedAudioFile))
+        self.assertEqual(track.get_metadata().track_name, u"New Name")
+        cached = self.catalog.open(track1.filename)
+        self.assert_(isinstance(cached, CachedAudioFile))
+        self.assertEqual(cached.get_metadata().track_name, u"New Name")
+
+        #and a file which becomes supported is opened as such
+        os.unlink(dummy1_name)
+        track3.convert(dummy1_name, self.output_type)
+        self.assertEqual(self.catalog.open(dummy1_name).total_frames(),
+                         track3.total_frames())
+
+        #and removed files are pruned from the catalog
+        os.unlink(track2.filename)
+        self.assertEqual(self.catalog.prune(), 1)
+        self.assertEqual(self.catalog.prune(), 0)
+        self.assertRaises(IOError, self.catalog.open, track2.filename)
+
+
 
 class Test_pcm_frame_cmp(unittest.TestCase):
     @LIB_CORE
@@ -865,6 +1536,67 @@ class Test_pcm_frame_cmp(unittest.TestCase):
                                         RANDOM_PCM_Reader(1)]))), 44100)
 
 
+class Test_ogg_final_granule_position(unittest.TestCase):
+    @LIB_CORE
+    def test_final_granule_position(self):
+        from audiotools.bitstream import BitstreamWriter
+
+        def build_stream(pages, serial_numbers=None):
+            data = cStringIO.StringIO()
+            writer = BitstreamWriter(data, 1)
+            if (serial_numbers is None):
+                serial_numbers = [0x1234] * len(pages)
+            for (i, ((granule_position, segments),
+                     serial_number)) in enumerate(zip(pages,
+                                                      serial_numbers)):
+                ogg = audiotools.OggStreamWriter(writer, serial_number)
+                ogg.write_page(granule_position, segments,
+                               0, i == 0, i == (len(pages) - 1))
+            writer.flush()
+            return data.getvalue()
+
+        #the final page's granule position is found
+        #even if its data contains capture patterns
+        stream = build_stream([(0, ["\x01header"]),
+                               (4096, ["OggS" * 63] * 200),
+                               (8192, ["OggS" * 63] * 255)])
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream)), 8192)
+
+        #pages without completed packets are skipped
+        stream = build_stream([(0, ["\x01header"]),
+                               (4096, ["\x00" * 255, "\x00" * 10]),
+                               (-1, ["\x00" * 255] * 255),
+                               (-1, ["\x00" * 255] * 255)])
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream)), 4096)
+
+        #truncated streams have no final granule position
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream[0:-1])), None)
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO("")), None)
+
+        #pages with bad checksums are not pages
+        stream = build_stream([(0, ["\x01header"]),
+                               (4096, ["\x00" * 100]),
+                               (8192, ["\x00" * 100])])
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream)), 8192)
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream[0:-1] + "\x01")), None)
+
+        #pages from other logical streams are skipped
+        stream = build_stream([(0, ["\x01header"]),
+                               (4096, ["\x00" * 100]),
+                               (8192, ["\x00" * 100])],
+                              [0x1234, 0x1234, 0x5678])
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream)), 4096)
+        self.assertEqual(audiotools.read_ogg_final_granule_position(
+                cStringIO.StringIO(stream), 0x5678), 8192)
+
+
 class Test_pcm_split(unittest.TestCase):
     @LIB_CORE
     def test_pcm_split(self):
@@ -880,6 +1612,97 @@ class Test_pcm_split(unittest.TestCase):
             self.assertEqual(sub_frames, int(counter) * 44100)
 
 
+class Test_UndoDB(unittest.TestCase):
+    @LIB_CORE
+    def test_undo(self):
+        import audiotools.delta
+
+        original = "".join(map(chr, [random.randint(0, 255)
+                                     for i in xrange(100000)]))
+        undo_dir = tempfile.mkdtemp()
+        undo_db = os.path.join(undo_dir, "undo.db")
+        old_file = os.path.join(undo_dir, "old")
+        new_file = os.path.join(undo_dir, "new")
+        try:
+            for modified in [original[0:10] + "foo" + original[13:],
+                             "bar" * 1000 + original,
+                             original[5000:],
+                             "baz" * 100 + original[0:-128] + "kelp" * 32,
+                             original + original,
+                             ""]:
+                f = open(old_file, "wb")
+                f.write(original)
+                f.close()
+                f = open(new_file, "wb")
+                f.write(modified)
+                f.close()
+
+                db = audiotools.delta.open_db(undo_db)
+                try:
+                    db.add(old_file, new_file)
+
+                    #undo restores the original file
+                    self.assertEqual(db.undo(new_file), True)
+                    self.assertEqual(open(new_file, "rb").read(), original)
+
+                    #undo again restores the modified file
+                    self.assertEqual(db.undo(new_file), True)
+                    self.assertEqual(open(new_file, "rb").read(), modified)
+                finally:
+                    db.close()
+                os.unlink(undo_db)
+
+            #only the changed bytes are stored
+            #(with a little compression overhead, since they're random)
+            f = open(new_file, "wb")
+            f.write("foo" + original[3:])
+            f.close()
+            db = audiotools.delta.open_db(undo_db)
+            try:
+                db.add(old_file, new_file)
+                db.cursor.execute(
+                    "SELECT SUM(LENGTH(range_data)) FROM delta_range")
+                self.assert_(db.cursor.fetchone()[0] <=
+                             (2 * (audiotools.delta.UndoDB.CHUNK_SIZE + 64)))
+            finally:
+                db.close()
+            os.unlink(undo_db)
+
+            #and new bytes are stored compressed
+            f = open(new_file, "wb")
+            f.write(("padding" * 10000) + original)
+            f.close()
+            db = audiotools.delta.open_db(undo_db)
+            try:
+                db.add(old_file, new_file)
+                db.cursor.execute(
+                    "SELECT SUM(LENGTH(range_data)) FROM delta_range")
+                self.assert_(db.cursor.fetchone()[0] <
+                             (len("padding") * 10000) / 10)
+                self.assertEqual(db.undo(new_file), True)
+                self.assertEqual(open(new_file, "rb").read(), original)
+                self.assertEqual(db.undo(new_file), True)
+                self.assertEqual(open(new_file, "rb").read(),
+                                 ("padding" * 10000) + original)
+            finally:
+                db.close()
+
+            #and unknown files aren't changed
+            f = open(new_file, "wb")
+            f.write("unknown")
+            f.close()
+            db = audiotools.delta.open_db(undo_db)
+            try:
+                self.assertEqual(db.undo(new_file), False)
+                self.assertEqual(open(new_file, "rb").read(), "unknown")
+            finally:
+                db.close()
+        finally:
+            for f in os.listdir(undo_dir):
+                os.unlink(os.path.join(undo_dir, f))
+            os.rmdir(undo_dir)
+
+
 class Test_str_width(unittest.TestCase):
     @LIB_CORE
     def test_str_width(self):
@@ -1380,6 +2203,138 @@ class TestFrameList(unittest.TestCase):
             finally:
                 temp_track.close()
 
+    @LIB_CORE
+    def test_buffer(self):
+        import audiotools.pcm
+        import struct
+
+        #FrameLists export their samples without copying
+        #as native shorts up to 16 bits-per-sample
+        f = audiotools.pcm.from_list(range(-5, 5), 2, 16, True)
+        view = memoryview(f)
+        self.assertEqual(view.format, "h")
+        self.assertEqual(view.itemsize, struct.calcsize("h"))
+        self.assertEqual(len(view), 10)
+        self.assertEqual(view.readonly, True)
+        self.assertEqual(view.tobytes(), struct.pack("10h", *range(-5, 5)))
+        self.assertEqual(str(buffer(f)), view.tobytes())
+
+        #and as native ints above that
+        view = memoryview(f.requantize(24))
+        self.assertEqual(view.format, "i")
+        self.assertEqual(view.itemsize, 4)
+        self.assertEqual(view.tobytes(),
+                         struct.pack("10i", *[i * 256 for i in range(-5, 5)]))
+
+        #FloatFrameLists export their samples as native floats
+        ff = f.to_float()
+        view = memoryview(ff)
+        self.assertEqual(view.format, "f")
+        self.assertEqual(view.tobytes(), struct.pack("10f", *list(ff)))
+
+        #from_buffer() adopts an existing buffer
+        #which outlives the object it came from
+        g = audiotools.pcm.from_buffer(memoryview(f), 2, 16)
+        self.assertEqual(g, f)
+        self.assertEqual(g.frames, 5)
+        del(f)
+        self.assertEqual(list(g), range(-5, 5))
+        self.assertEqual(g.split(2)[1],
+                         audiotools.pcm.from_list(range(-1, 5), 2, 16, True))
+
+        #but only if it holds native samples of the right size
+        #evenly divisible by channels
+        self.assertRaises(TypeError,
+                          audiotools.pcm.from_buffer,
+                          "abcd", 1, 16)
+        self.assertRaises(TypeError,
+                          audiotools.pcm.from_buffer,
+                          memoryview(g), 2, 24)
+        self.assertRaises(TypeError,
+                          audiotools.pcm.from_buffer,
+                          memoryview(g.requantize(24)), 2, 16)
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          memoryview(g), 3, 16)
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          memoryview(g), 0, 16)
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          memoryview(g), 2, 12)
+
+    @LIB_CORE
+    def test_gain_and_dither(self):
+        import audiotools.pcm
+
+        f = audiotools.pcm.from_list(range(-32768, 32768, 3), 1, 16, True)
+
+        #gain rounds to the nearest sample and clips to bits-per-sample
+        self.assertEqual(list(f.apply_gain(1.0)), list(f))
+        self.assertEqual(list(f.apply_gain(0.5)),
+                         [int(round(i * 0.5)) for i in f])
+        self.assertEqual(list(f.apply_gain(4.0)),
+                         [max(min(i * 4, 32767), -32768) for i in f])
+
+        #adding bits is exact and removing them rounds
+        self.assertEqual(list(f.requantize(24)), [i * 256 for i in f])
+        self.assertEqual(list(f.requantize(24).requantize(16)), list(f))
+        self.assertEqual(f.requantize(8).bits_per_sample, 8)
+        self.assertEqual(list(f.requantize(8)),
+                         [max(min(int(round(i / 256.0)), 127), -128)
+                          for i in f])
+
+        #dither noise stays within an LSB and averages out to nothing
+        for dither in [audiotools.pcm.DITHER_RECTANGULAR,
+                       audiotools.pcm.DITHER_TRIANGULAR]:
+            for dithered in [f.requantize(8, dither),
+                             f.to_float().to_int(8, dither)]:
+                errors = [d - (i / 256.0) for (d, i) in zip(dithered, f)
+                          if (-128 < d < 127)]
+                self.assert_(max(map(abs, errors)) < 1.5)
+                self.assert_(abs(sum(errors) / len(errors)) < 0.05)
+                self.assertNotEqual(list(dithered), list(f.requantize(8)))
+
+    @LIB_CORE
+    def test_storage(self):
+        import audiotools.pcm
+
+        #samples are stored as shorts up to 16 bits-per-sample
+        #and as 32-bit ints above that
+        for (bits_per_sample, sample_size) in [(8, 2), (16, 2), (24, 4)]:
+            f = audiotools.pcm.from_list(range(-4, 4), 2, bits_per_sample,
+                                         True)
+            self.assertEqual(len(buffer(f)), 8 * sample_size)
+            self.assertEqual(len(buffer(f.frame(1))), 2 * sample_size)
+            self.assertEqual(len(buffer(f.channel(1))), 4 * sample_size)
+            self.assertEqual(len(buffer(f.to_float())), 8 * 4)
+            self.assertEqual(list(f + f), range(-4, 4) * 2)
+            (head, tail) = f.split(1)
+            self.assertEqual(list(head), range(-4, -2))
+            self.assertEqual(list(tail), range(-2, 4))
+
+        #requantizing moves samples to the other storage type
+        f = audiotools.pcm.from_list([-32768, -1, 0, 32767], 1, 16, True)
+        self.assertEqual(list(f.requantize(24)),
+                         [-8388608, -256, 0, 8388352])
+        self.assertEqual(f.requantize(24).requantize(16), f)
+
+        #values which don't fit the storage type are rejected
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_list,
+                          [32768], 1, 16, True)
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_list,
+                          [-32769], 1, 8, True)
+
+        #float samples hold 24 bits-per-sample losslessly
+        f = audiotools.pcm.from_list([-8388608, -1, 0, 1, 8388607],
+                                     1, 24, True)
+        self.assertEqual(f.to_float().to_int(24), f)
+
+        self.assertRaises(ValueError, f.apply_gain, 1.0, 10)
+        self.assertRaises(ValueError, f.requantize, 12)
+
     @LIB_CORE
     def test_errors(self):
         #check list that's too large
@@ -1542,6 +2497,85 @@ class TestFloatFrameList(unittest.TestCase):
                               chr(0) * 4, 2, bps, 1, 1)
 
 
+class TestFrameBuffer(unittest.TestCase):
+    @LIB_CORE
+    def test_basics(self):
+        import audiotools.pcm
+
+        self.assertRaises(ValueError, audiotools.pcm.FrameBuffer, 0, 16)
+        self.assertRaises(ValueError, audiotools.pcm.FrameBuffer, 2, 12)
+
+        #a buffer which hasn't been through __init__ can't be used
+        b = audiotools.pcm.FrameBuffer.__new__(audiotools.pcm.FrameBuffer)
+        self.assertEqual(b.frames, 0)
+        self.assertEqual(b.channels, 0)
+        self.assertRaises(ValueError,
+                          b.push,
+                          audiotools.pcm.from_list([1, 2], 2, 16, True))
+        self.assertRaises(ValueError, b.pop, 1)
+
+        b = audiotools.pcm.FrameBuffer(2, 16)
+        self.assertEqual(b.frames, 0)
+        self.assertEqual(b.channels, 2)
+        self.assertEqual(b.bits_per_sample, 16)
+        self.assertEqual(len(b), 0)
+
+        #FrameLists must match the buffer's format
+        self.assertRaises(ValueError,
+                          b.push,
+                          audiotools.pcm.from_list([1, 2, 3], 1, 16, True))
+        self.assertRaises(ValueError,
+                          b.push,
+                          audiotools.pcm.from_list([1, 2], 2, 24, True))
+        self.assertRaises(TypeError, b.push, [1, 2])
+        self.assertRaises(ValueError, b.pop, -1)
+
+        #popping an empty buffer returns an empty FrameList
+        f = b.pop(10)
+        self.assertEqual(f.frames, 0)
+        self.assertEqual(f.channels, 2)
+        self.assertEqual(f.bits_per_sample, 16)
+
+        b.push(audiotools.pcm.from_list(range(10), 2, 16, True))
+        self.assertEqual(b.frames, 5)
+        self.assertEqual(len(b), 10)
+        self.assertEqual(list(b.pop(2)), range(4))
+        self.assertEqual(list(b.pop(10)), range(4, 10))
+        self.assertEqual(b.frames, 0)
+
+    @LIB_CORE
+    def test_ring(self):
+        import audiotools.pcm
+
+        #push and pop randomly-sized FrameLists so that the ring
+        #both grows and wraps around, checking against a plain list
+        for (channels, bits_per_sample) in [(1, 8), (2, 16), (6, 24)]:
+            b = audiotools.pcm.FrameBuffer(channels, bits_per_sample)
+            expected = []
+            sample = 0
+            for i in xrange(500):
+                if (random.choice([True, False])):
+                    samples = range(sample,
+                                    sample + (random.randint(0, 300) *
+                                              channels))
+                    sample += len(samples)
+                    b.push(audiotools.pcm.from_list(
+                            [s % 100 for s in samples],
+                            channels, bits_per_sample, True))
+                    expected.extend([s % 100 for s in samples])
+                else:
+                    pcm_frames = random.randint(0, 400)
+                    f = b.pop(pcm_frames)
+                    self.assertEqual(f.frames,
+                                     min(pcm_frames,
+                                         len(expected) / channels))
+                    self.assertEqual(list(f),
+                                     expected[0:f.frames * channels])
+                    del(expected[0:f.frames * channels])
+                self.assertEqual(b.frames * channels, len(expected))
+            self.assertEqual(list(b.pop(b.frames)), expected)
+
+
 class __SimpleChunkReader__:
     def __init__(self, chunks):
         self.chunks = chunks
@@ -3457,6 +4491,139 @@ class TestReplayGain(unittest.TestCase):
             dummy1.close()
             dummy2.close()
 
+    @LIB_CORE
+    def test_album_state(self):
+        import audiotools.replaygain
+
+        #album results built from merged per-track states
+        #should match those of analyzing every track in sequence
+        tracks = [test_streams.Sine16_Stereo(44100 * (i + 1), 44100,
+                                             441.0 * (i + 1), 0.50,
+                                             882.0, 0.10 * (i + 1), 1.0)
+                  for i in xrange(3)]
+
+        serial = audiotools.replaygain.ReplayGain(44100)
+        merged = audiotools.replaygain.ReplayGain(44100)
+        for track in tracks:
+            single = audiotools.replaygain.ReplayGain(44100)
+            track.reset()
+            audiotools.transfer_data(track.read, serial.update)
+            track.reset()
+            audiotools.transfer_data(track.read, single.update)
+            self.assertEqual(serial.title_gain(), single.title_gain())
+            (histogram, peak) = single.album_state()
+            self.assertEqual(len(histogram), 12000)
+            merged.merge_album_state(histogram, peak)
+
+        self.assertEqual(serial.album_gain(), merged.album_gain())
+        self.assertEqual(serial.album_state(), merged.album_state())
+
+        self.assertRaises(ValueError, merged.merge_album_state, [0] * 10, 0.0)
+        self.assertRaises(TypeError, merged.merge_album_state, None, 0.0)
+
+    @LIB_CORE
+    def test_parallel(self):
+        test_format = audiotools.WaveAudio
+
+        temp_files = [tempfile.NamedTemporaryFile(
+                suffix="." + test_format.SUFFIX)
+                      for i in xrange(4)]
+        try:
+            tracks = [test_format.from_pcm(
+                    temp_file.name,
+                    test_streams.Sine16_Stereo(44100 * (i + 1), 44100,
+                                               441.0 * (i + 1), 0.50,
+                                               882.0, 0.10 * (i + 1), 1.0))
+                      for (i, temp_file) in enumerate(temp_files)]
+
+            serial = list(audiotools.calculate_replay_gain(
+                    tracks, max_processes=1))
+
+            #both match the values of a single ReplayGain object
+            #given every track in sequence
+            from audiotools.replaygain import ReplayGain
+
+            rg = ReplayGain(44100)
+            sequential = []
+            for track in tracks:
+                pcmreader = track.to_pcm()
+                audiotools.transfer_data(pcmreader.read, rg.update)
+                pcmreader.close()
+                sequential.append((track,) + rg.title_gain())
+            sequential = [values + rg.album_gain() for values in sequential]
+            self.assertEqual(serial, sequential)
+
+            for max_processes in [2, 3, 8]:
+                progress_values = []
+                parallel = list(audiotools.calculate_replay_gain(
+                        tracks,
+                        lambda x, y: progress_values.append((x, y)),
+                        max_processes=max_processes))
+                self.assertEqual(serial, parallel)
+                for (current, total) in progress_values:
+                    self.assert_(current <= total)
+        finally:
+            for f in temp_files:
+                f.close()
+
+    @LIB_CORE
+    def test_calculator(self):
+        test_format = audiotools.WaveAudio
+
+        temp_files = [tempfile.NamedTemporaryFile(
+                suffix="." + test_format.SUFFIX)
+                      for i in xrange(3)]
+        try:
+            #values calculated while encoding
+            #should match those calculated from the finished tracks
+            tracks = []
+            results = []
+            for (i, temp_file) in enumerate(temp_files):
+                calculator = audiotools.ReplayGainCalculator(
+                    test_streams.Sine16_Stereo(44100 * (i + 1), 44100,
+                                               441.0 * (i + 1), 0.50,
+                                               882.0, 0.10 * (i + 1), 1.0))
+                self.assertEqual(calculator.sample_rate, 44100)
+                self.assertEqual(calculator.channels, 2)
+                self.assertEqual(calculator.bits_per_sample, 16)
+                tracks.append(test_format.from_pcm(temp_file.name,
+                                                   calculator))
+                results.append(calculator.result())
+
+            gains = audiotools.album_replay_gain(44100, results)
+            self.assertEqual(len(gains), 3)
+            for (gain, (track,
+                        track_gain,
+                        track_peak,
+                        album_gain,
+                        album_peak)) in zip(
+                gains, audiotools.calculate_replay_gain(tracks)):
+                self.assertEqual(gain,
+                                 audiotools.ReplayGain(track_gain,
+                                                       track_peak,
+                                                       album_gain,
+                                                       album_peak))
+
+            #errors are raised by result() rather than read()
+            calculator = audiotools.ReplayGainCalculator(
+                BLANK_PCM_Reader(1, 44100, 6, 16, 0x3F))
+            self.assertEqual(audiotools.pcm_frame_cmp(
+                    calculator, BLANK_PCM_Reader(1, 44100, 6, 16, 0x3F)), None)
+            self.assertRaises(ValueError, calculator.result)
+
+            calculator = audiotools.ReplayGainCalculator(
+                audiotools.PCMReader(cStringIO.StringIO(""),
+                                     44100, 2, 0x3, 16))
+            self.assertEqual(len(calculator.read(4096)), 0)
+            self.assertRaises(ValueError, calculator.result)
+
+            self.assertRaises(ValueError,
+                              audiotools.ReplayGainCalculator,
+                              BLANK_PCM_Reader(1, 200000, 2, 16))
+        finally:
+            for f in temp_files:
+                f.close()
+
     @LIB_CORE
     def test_applicable(self):
         #build a bunch of test tracks
@@ -6239,6 +7406,55 @@ class Test_Player(unittest.TestCase):
         time.sleep(6)
         self.assertEqual(callback.called, True)
 
+    @LIB_PLAYER
+    def test_seek(self):
+        import audiotools.player
+        import time
+
+        wav_file = tempfile.NamedTemporaryFile(suffix=".wav")
+        try:
+            wav_track = audiotools.WaveAudio.from_pcm(wav_file.name,
+                                                      BLANK_PCM_Reader(6))
+
+            #FLAC decoders seek directly, while WAVE falls back
+            #to decoding and discarding the frames before the position
+            for track in [self.temp_track, wav_track]:
+                callback = __callback__()
+                player = audiotools.player.Player(
+                    audiotools.player.NULLAudioOutput(),
+                    next_track_callback=callback.call)
+                player.open(track)
+
+                #seeking a stopped track leaves it paused at that position
+                player.seek(4)
+                time.sleep(.5)
+                self.assertEqual(player.progress(),
+                                 (44100 * 4, track.total_frames()))
+                time.sleep(.5)
+                self.assertEqual(player.progress()[0], 44100 * 4)
+
+                player.play()
+                time.sleep(.5)
+                (current1, total1) = player.progress()
+                self.assert_(current1 > 44100 * 4)
+
+                #seeking backwards mid-playback updates progress at once
+                player.seek(1.5)
+                time.sleep(.25)
+                (current2, total2) = player.progress()
+                self.assert_(current2 >= 44100 * 1.5)
+                self.assert_(current2 < current1)
+                self.assertEqual(total2, total1)
+
+                #and seeking past the end stops playback
+                player.seek(10)
+                time.sleep(.5)
+                self.assertEqual(player.progress(), (0, total1))
+                self.assertEqual(callback.called, False)
+                player.close()
+        finally:
+            wav_file.close()
+
 
 class Test_CDPlayer(unittest.TestCase):
     @LIB_PLAYER
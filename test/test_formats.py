@@ -744,6 +744,35 @@ class AudioFileTest(unittest.TestCase):
                 track_file2.close()
                 track_file3.close()
 
+    @FORMAT_AUDIOFILE
+    def test_set_replay_gain(self):
+        if (self.audio_class.can_set_replay_gain()):
+            self.assert_(self.audio_class.can_add_replay_gain())
+            self.assert_(self.audio_class.lossless_replay_gain())
+
+            temp = tempfile.NamedTemporaryFile(
+                suffix="." + self.audio_class.SUFFIX)
+            try:
+                track = self.audio_class.from_pcm(
+                    temp.name,
+                    BLANK_PCM_Reader(1))
+                self.assert_(track.replay_gain() is None)
+
+                gain = audiotools.ReplayGain(-1.25, 0.5, -2.5, 0.75)
+                track.set_replay_gain(gain)
+                self.assertEqual(track.replay_gain(), gain)
+                self.assertEqual(audiotools.open(temp.name).replay_gain(),
+                                 gain)
+
+                #other metadata is left as-is
+                track.set_metadata(audiotools.MetaData(track_name=u"Foo"))
+                gain = audiotools.ReplayGain(1.5, 0.25, 0.5, 0.5)
+                track.set_replay_gain(gain)
+                self.assertEqual(track.replay_gain(), gain)
+                self.assertEqual(track.get_metadata().track_name, u"Foo")
+            finally:
+                temp.close()
+
     @FORMAT_AUDIOFILE
     def test_invalid_from_pcm(self):
         if (self.audio_class is audiotools.AudioFile):
@@ -1083,6 +1112,49 @@ class LosslessFileTest(AudioFileTest):
         finally:
             temp.close()
 
+    @FORMAT_LOSSLESS
+    def test_convert_copy(self):
+        if (self.audio_class is audiotools.AudioFile):
+            return
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        temp2 = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            track = self.audio_class.from_pcm(
+                temp.name,
+                test_streams.Sine16_Stereo(44100, 44100,
+                                           441.0, 0.50, 4410.0, 0.49, 1.0))
+
+            #converting to the same format with no compression
+            #copies the file as-is
+            log = Log()
+            track2 = track.convert(temp2.name,
+                                   self.audio_class,
+                                   progress=log.update)
+            self.assertEqual(track2.__class__, self.audio_class)
+            self.assertEqual(open(temp.name, "rb").read(),
+                             open(temp2.name, "rb").read())
+            self.assert_(len(log.results) > 0)
+            self.assertEqual(log.results[-1],
+                             (os.path.getsize(temp.name),
+                              os.path.getsize(temp.name)))
+            self.assertRaises(audiotools.EncodingError,
+                              track.convert,
+                              "/dev/null/foo.%s" % (self.suffix),
+                              self.audio_class)
+
+            #while an explicit compression forces a re-encode
+            for compression in self.audio_class.COMPRESSION_MODES:
+                track2 = track.convert(temp2.name,
+                                       self.audio_class,
+                                       compression)
+                self.assert_(
+                    audiotools.pcm_frame_cmp(track.to_pcm(),
+                                             track2.to_pcm()) is None)
+        finally:
+            temp.close()
+            temp2.close()
+
 
 class LossyFileTest(AudioFileTest):
     @FORMAT_LOSSY
@@ -3594,6 +3666,321 @@ class FlacFileTest(TestForeignAiffChunks,
         #verifies without errors
         self.assertEqual(flac.verify(), True)
 
+    @FORMAT_FLAC
+    def test_seek(self):
+        temp = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            flac = audiotools.FlacAudio.from_pcm(
+                temp.name,
+                test_streams.Sine16_Stereo(441000, 44100,
+                                           441.0, 0.50,
+                                           4410.0, 0.49, 1.0),
+                "1")
+            full_data = []
+            audiotools.transfer_framelist_data(flac.to_pcm(),
+                                               full_data.append)
+            full_data = "".join(full_data)
+
+            for has_seektable in [True, False]:
+                if (not has_seektable):
+                    metadata = flac.get_metadata()
+                    metadata.replace_blocks(
+                        audiotools.Flac_SEEKTABLE.BLOCK_ID, [])
+                    flac.update_metadata(metadata)
+                    flac = audiotools.open(temp.name)
+                    self.assertEqual(
+                        len(flac.get_metadata().get_blocks(
+                                audiotools.Flac_SEEKTABLE.BLOCK_ID)), 0)
+
+                for offset in [0, 1, 4095, 4096, 4097, 88200, 220499,
+                               440999, 441000]:
+                    #ensure decoder-level seeking lands on the exact frame
+                    pcmreader = flac.to_pcm()
+                    self.assertEqual(pcmreader.seek(offset), offset)
+                    data = []
+                    audiotools.transfer_framelist_data(pcmreader,
+                                                       data.append)
+                    pcmreader.close()
+                    self.assertEqual("".join(data), full_data[offset * 4:])
+
+                    #and to_pcm_offset() does the same
+                    data = []
+                    audiotools.transfer_framelist_data(
+                        audiotools.to_pcm_offset(flac, offset),
+                        data.append)
+                    self.assertEqual("".join(data), full_data[offset * 4:])
+
+                #seeking past the end clamps to the end of the stream
+                pcmreader = flac.to_pcm()
+                self.assertEqual(pcmreader.seek(500000), 441000)
+                self.assertEqual(pcmreader.read(4096).frames, 0)
+                pcmreader.close()
+
+                #and negative seeks are an error
+                self.assertRaises(ValueError, flac.to_pcm().seek, -1)
+
+            #seeking back to the start restores MD5 verification
+            pcmreader = flac.to_pcm()
+            pcmreader.seek(1000)
+            pcmreader.seek(0)
+            data = []
+            audiotools.transfer_framelist_data(pcmreader, data.append)
+            pcmreader.close()
+            self.assertEqual("".join(data), full_data)
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_seek_false_sync(self):
+        def first_frame(data):
+            #returns the offset of the first frame after the metadata blocks
+            offset = 4
+            while (True):
+                (header, length) = (ord(data[offset]),
+                                    (ord(data[offset + 1]) << 16) |
+                                    (ord(data[offset + 2]) << 8) |
+                                    ord(data[offset + 3]))
+                offset += 4 + length
+                if (header & 0x80):
+                    return offset
+
+        temp = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            #noisy mono audio is stored in verbatim subframes
+            #so its samples appear in the file as-is
+            noise = random.Random(0)
+            pcm_data = "".join([chr(noise.randint(0, 255))
+                                for i in xrange(441000 * 2)])
+            flac = audiotools.FlacAudio.from_pcm(
+                temp.name,
+                audiotools.PCMReader(cStringIO.StringIO(pcm_data),
+                                     44100, 1, 0x4, 16, big_endian=True),
+                "1")
+
+            #grab the first frame's header, through its CRC-8
+            data = open(temp.name, "rb").read()
+            block_size = (ord(data[8 + 2]) << 8) | ord(data[8 + 3])
+            frame = first_frame(data)
+            self.assertEqual(data[frame:frame + 2], "\xff\xf8")
+            header_size = (6 +
+                           {6: 1, 7: 2}.get(ord(data[frame + 2]) >> 4, 0) +
+                           {12: 1, 13: 2, 14: 2}.get(
+                    ord(data[frame + 2]) & 0xF, 0))
+            header = data[frame:frame + header_size]
+
+            #and plant copies of it near the end of every frame's samples
+            #where they pass for frame headers except for the CRC-16
+            for i in xrange(len(pcm_data) / (block_size * 2)):
+                planted = (i * block_size + block_size - 8) * 2
+                pcm_data = (pcm_data[0:planted] + header +
+                            pcm_data[planted + len(header):])
+            flac = audiotools.FlacAudio.from_pcm(
+                temp.name,
+                audiotools.PCMReader(cStringIO.StringIO(pcm_data),
+                                     44100, 1, 0x4, 16, big_endian=True),
+                "1")
+            metadata = flac.get_metadata()
+            metadata.replace_blocks(audiotools.Flac_SEEKTABLE.BLOCK_ID, [])
+            flac.update_metadata(metadata)
+            flac = audiotools.open(temp.name)
+            self.assert_(open(temp.name, "rb").read().count(header) >
+                         (len(pcm_data) / (block_size * 2)))
+
+            full_data = []
+            audiotools.transfer_framelist_data(flac.to_pcm(),
+                                               full_data.append)
+            full_data = "".join(full_data)
+            self.assertEqual(len(full_data), len(pcm_data))
+
+            #seeking skips over the false headers
+            #and still lands on the exact frame
+            for offset in [1, 4097, 100000, 220499, 300000, 440999]:
+                pcmreader = flac.to_pcm()
+                self.assertEqual(pcmreader.seek(offset), offset)
+                data = []
+                audiotools.transfer_framelist_data(pcmreader, data.append)
+                pcmreader.close()
+                self.assertEqual("".join(data), full_data[offset * 2:])
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_out_of_range(self):
+        from audiotools.bitstream import BitstreamWriter
+        from audiotools.decoders import FlacDecoder
+        from audiotools.py_encoders.flac import CRC16, write_frame_header
+
+        temp = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            pcmreader = audiotools.PCMReader(
+                cStringIO.StringIO(chr(0) * 4096 * 4), 44100, 2, 0x3, 16)
+            flac = audiotools.FlacAudio.from_pcm(temp.name, pcmreader, "8")
+            self.assertEqual(flac.total_frames(), 4096)
+
+            #replace the file's only frame with a left-side frame
+            #whose right channel is 32767 - -32768, which is out of range
+            data = open(temp.name, "rb").read()
+            offset = 4
+            while (not (ord(data[offset]) & 0x80)):
+                offset += 4 + ((ord(data[offset + 1]) << 16) |
+                               (ord(data[offset + 2]) << 8) |
+                               ord(data[offset + 3]))
+            offset += 4 + ((ord(data[offset + 1]) << 16) |
+                           (ord(data[offset + 2]) << 8) |
+                           ord(data[offset + 3]))
+            f = open(temp.name, "wb")
+            f.write(data[0:offset])
+            writer = BitstreamWriter(f, 0)
+            crc16 = CRC16()
+            writer.add_callback(crc16.update)
+            write_frame_header(writer,
+                               pcmreader,
+                               0,
+                               audiotools.pcm.from_list([0, 0] * 4096,
+                                                        2, 16, True),
+                               0x8)
+            #CONSTANT subframes of the left and side channels
+            writer.build("1u 6u 1u 16s", (0, 0, 0, 32767))
+            writer.build("1u 6u 1u 17s", (0, 0, 0, -32768))
+            writer.byte_align()
+            writer.pop_callback()
+            writer.write(16, int(crc16))
+            writer.close()
+
+            decoder = FlacDecoder(temp.name, 0x3)
+            self.assertRaises(ValueError, decoder.read, 4096)
+            decoder.close()
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_skip_md5(self):
+        temp = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            flac = audiotools.FlacAudio.from_pcm(
+                temp.name,
+                test_streams.Sine16_Stereo(44100, 44100,
+                                           441.0, 0.50,
+                                           4410.0, 0.49, 1.0))
+            full_data = []
+            audiotools.transfer_framelist_data(flac.to_pcm(),
+                                               full_data.append)
+            full_data = "".join(full_data)
+
+            #give the stream an MD5 sum which doesn't match its data
+            metadata = flac.get_metadata()
+            metadata.get_block(
+                audiotools.Flac_STREAMINFO.BLOCK_ID).md5sum = chr(1) * 16
+            flac.update_metadata(metadata)
+            flac = audiotools.open(temp.name)
+
+            #a full decode catches the mismatch
+            self.assertRaises(ValueError,
+                              audiotools.transfer_framelist_data,
+                              flac.to_pcm(),
+                              lambda s: None)
+
+            #but not if the decoder is told to skip the MD5 sum
+            pcmreader = flac.to_pcm()
+            pcmreader.skip_md5()
+            data = []
+            audiotools.transfer_framelist_data(pcmreader, data.append)
+            self.assertEqual("".join(data), full_data)
+
+            #which to_pcm_offset() does for unverified reads
+            data = []
+            audiotools.transfer_framelist_data(
+                audiotools.to_pcm_offset(flac, 0, verify=False),
+                data.append)
+            self.assertEqual("".join(data), full_data)
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_threads(self):
+        #multithreaded encoding should match single-threaded encoding
+        #byte-for-byte, including the returned frame offsets
+        for opts in self.encode_opts:
+            temp1 = tempfile.NamedTemporaryFile(suffix=".flac")
+            temp2 = tempfile.NamedTemporaryFile(suffix=".flac")
+            try:
+                offsets1 = self.encode(
+                    temp1.name,
+                    audiotools.BufferedPCMReader(
+                        test_streams.Sine16_Stereo(200000 + 17, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0)),
+                    **opts)
+                for threads in [2, 3, 8]:
+                    offsets2 = self.encode(
+                        temp2.name,
+                        audiotools.BufferedPCMReader(
+                            test_streams.Sine16_Stereo(200000 + 17, 44100,
+                                                       441.0, 0.50,
+                                                       4410.0, 0.49, 1.0)),
+                        threads=threads,
+                        **opts)
+                    self.assertEqual(offsets1, offsets2)
+                    self.assertEqual(open(temp1.name, "rb").read(),
+                                     open(temp2.name, "rb").read())
+            finally:
+                temp1.close()
+                temp2.close()
+
+    @FORMAT_FLAC
+    def test_threaded_decode(self):
+        def decode(filename, threads, seek=None):
+            decoder = self.decoder(filename, 0x3, 0, threads)
+            if (seek is not None):
+                decoder.seek(seek)
+            data = []
+            audiotools.transfer_framelist_data(decoder, data.append)
+            return "".join(data)
+
+        temp = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            for total_frames in [4410, 1000000 + 17]:
+                for opts in [self.encode_opts[0], self.encode_opts[-1]]:
+                    self.encode(temp.name,
+                                audiotools.BufferedPCMReader(
+                                    test_streams.Sine16_Stereo(
+                                        total_frames, 44100,
+                                        441.0, 0.50, 4410.0, 0.49, 1.0)),
+                                **opts)
+
+                    #threaded decoding returns the same PCM data
+                    #and verifies the same MD5 sum
+                    data = decode(temp.name, 1)
+                    for threads in [2, 3, 8]:
+                        self.assertEqual(decode(temp.name, threads), data)
+                        for seek in [1, total_frames / 2, total_frames]:
+                            self.assertEqual(decode(temp.name, threads, seek),
+                                             decode(temp.name, 1, seek))
+
+            #errors are raised after the same frames are returned
+            f = open(temp.name, "rb")
+            flac_data = f.read()
+            f.close()
+            bad_data = (flac_data[0:len(flac_data) / 2] +
+                        chr(ord(flac_data[len(flac_data) / 2]) ^ 0x10) +
+                        flac_data[len(flac_data) / 2 + 1:])
+            for data in [bad_data, flac_data[0:len(flac_data) * 2 / 3]]:
+                f = open(temp.name, "wb")
+                f.write(data)
+                f.close()
+                results = []
+                for threads in [1, 4]:
+                    decoder = self.decoder(temp.name, 0x3, 0, threads)
+                    frames = []
+                    self.assertRaises((ValueError, IOError),
+                                      audiotools.transfer_framelist_data,
+                                      decoder,
+                                      frames.append)
+                    results.append(len("".join(frames)))
+                self.assertEqual(results[0], results[1])
+        finally:
+            temp.close()
+
 
 class M4AFileTest(LossyFileTest):
     def setUp(self):
@@ -3990,6 +4377,70 @@ class OggFlacFileTest(OggVerify,
 
         self.assertRaises(ValueError, self.decoder, "/dev/null", -1)
 
+    @FORMAT_OGGFLAC
+    def test_remux(self):
+        flac_file = tempfile.NamedTemporaryFile(suffix=".flac")
+        oggflac_file = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        flac_file2 = tempfile.NamedTemporaryFile(suffix=".flac")
+        try:
+            for (total_frames, block_size) in [(10, "5"),
+                                               (441000 + 17, "0"),
+                                               (441000 + 17, "8")]:
+                flac = audiotools.FlacAudio.from_pcm(
+                    flac_file.name,
+                    test_streams.Sine16_Stereo(total_frames, 44100,
+                                               441.0, 0.50,
+                                               4410.0, 0.49, 1.0),
+                    block_size)
+                flac.set_metadata(audiotools.MetaData(track_name=u"Foo",
+                                                      track_number=1))
+                pcm = flac.to_pcm()
+                flac_md5 = md5()
+                audiotools.transfer_framelist_data(pcm, flac_md5.update)
+                pcm.close()
+
+                #FLAC to Ogg FLAC copies frames and metadata
+                progress = []
+                oggflac = flac.convert(oggflac_file.name,
+                                       self.audio_class,
+                                       None,
+                                       lambda c, t: progress.append((c, t)))
+                self.assertEqual(oggflac.__class__, self.audio_class)
+                self.assertEqual(oggflac.total_frames(), total_frames)
+                self.assertEqual(progress[-1], (total_frames, total_frames))
+                self.assertEqual(oggflac.verify(), True)
+                self.assertEqual(oggflac.get_metadata().track_name, u"Foo")
+                self.assertEqual(
+                    len(oggflac.get_metadata().get_blocks(
+                            audiotools.Flac_SEEKTABLE.BLOCK_ID)), 0)
+                pcm = oggflac.to_pcm()
+                oggflac_md5 = md5()
+                audiotools.transfer_framelist_data(pcm, oggflac_md5.update)
+                pcm.close()
+                self.assertEqual(flac_md5.hexdigest(),
+                                 oggflac_md5.hexdigest())
+
+                #and Ogg FLAC to FLAC copies them back unchanged
+                flac2 = oggflac.convert(flac_file2.name,
+                                        audiotools.FlacAudio)
+                self.assertEqual(flac2.__class__, audiotools.FlacAudio)
+                self.assertEqual(flac2.verify(), True)
+                self.assertEqual(flac2.get_metadata().track_name, u"Foo")
+                self.assertEqual(
+                    flac2.get_metadata().get_block(
+                        audiotools.Flac_SEEKTABLE.BLOCK_ID),
+                    flac.get_metadata().get_block(
+                        audiotools.Flac_SEEKTABLE.BLOCK_ID))
+                self.assertEqual(
+                    open(flac_file.name, "rb").read()[
+                        4 + flac.metadata_length():],
+                    open(flac_file2.name, "rb").read()[
+                        4 + flac2.metadata_length():])
+        finally:
+            flac_file.close()
+            oggflac_file.close()
+            flac_file2.close()
+
 
 class ShortenFileTest(TestForeignWaveChunks,
                       TestForeignAiffChunks,
@@ -4453,6 +4904,77 @@ class VorbisFileTest(OggVerify, LossyFileTest):
         finally:
             track_file.close()
 
+    @FORMAT_VORBIS
+    def test_decoder(self):
+        from audiotools.decoders import VorbisDecoder
+
+        def read_all(pcmreader):
+            data = framelist = pcmreader.read(4096)
+            while (framelist.frames > 0):
+                framelist = pcmreader.read(4096)
+                data += framelist
+            pcmreader.close()
+            return data
+
+        #vorbis-sine.ogg is a 1 second stereo sine sweep
+        #and vorbis-sine.flac is libvorbis' decoding of it,
+        #which output must match to within rounding
+        reference = read_all(audiotools.open("vorbis-sine.flac").to_pcm())
+        decoded = read_all(VorbisDecoder("vorbis-sine.ogg"))
+        self.assertEqual(decoded.channels, reference.channels)
+        self.assertEqual(decoded.frames, reference.frames)
+        for (decoded_sample, reference_sample) in zip(decoded, reference):
+            self.assert_(abs(decoded_sample - reference_sample) <= 1)
+        for offset in [1, 4095, 20000, 44099]:
+            decoder = VorbisDecoder("vorbis-sine.ogg")
+            self.assertEqual(decoder.seek(offset), offset)
+            self.assertEqual(read_all(decoder),
+                             decoded.split(offset)[1])
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            for (channels, mask) in [(1, 0x4), (2, 0x3), (6, 0x3F)]:
+                track = self.audio_class.from_pcm(
+                    temp.name,
+                    BLANK_PCM_Reader(2, channels=channels,
+                                     channel_mask=mask))
+
+                #decoding is in-process and in ChannelMask order
+                decoder = VorbisDecoder(temp.name)
+                self.assertEqual(decoder.channels, channels)
+                self.assertEqual(decoder.channel_mask, mask)
+                self.assertEqual(decoder.sample_rate, 44100)
+                self.assertEqual(decoder.bits_per_sample, 16)
+                full_data = []
+                audiotools.transfer_framelist_data(decoder,
+                                                   full_data.append)
+                decoder.close()
+                full_data = "".join(full_data)
+                self.assertEqual(len(full_data),
+                                 track.total_frames() * channels * 2)
+
+                #seeking lands on the exact frame
+                for offset in [0, 1, 4095, 44100, 88199]:
+                    decoder = VorbisDecoder(temp.name)
+                    self.assertEqual(decoder.seek(offset), offset)
+                    data = []
+                    audiotools.transfer_framelist_data(decoder,
+                                                       data.append)
+                    decoder.close()
+                    self.assertEqual("".join(data),
+                                     full_data[offset * channels * 2:])
+
+                #seeking past the end clamps to the end of the stream
+                decoder = VorbisDecoder(temp.name)
+                self.assertEqual(decoder.seek(100000), 88200)
+                self.assertEqual(decoder.read(4096).frames, 0)
+                decoder.close()
+
+                self.assertRaises(ValueError,
+                                  VorbisDecoder(temp.name).seek, -1)
+        finally:
+            temp.close()
+
     @FORMAT_AUDIOFILE
     def test_replay_gain(self):
         self.assert_(True)
@@ -5232,3 +5754,15 @@ class SineStreamTest(unittest.TestCase):
                           16, -1, 44100, 100, 100)
         self.assertRaises(ValueError, Sine_Simple,
                           16, 4000, -1, 100, 100)
+
+    @FORMAT_SINES
+    def test_out_of_range(self):
+        from audiotools.decoders import Sine_Simple
+
+        #samples which don't fit 16 bits raise ValueError
+        #rather than being truncated
+        self.assertRaises(ValueError,
+                          Sine_Simple(100, 16, 44100, 40000, 100).read,
+                          400)
+        self.assertEqual(
+            max(Sine_Simple(100, 16, 44100, 32767, 100).read(400)), 32767)
@@ -1164,6 +1164,76 @@ class ID3v22MetaData(MetaDataTest):
             finally:
                 temp_file.close()
 
+    @METADATA_ID3V2
+    def test_padding(self):
+        import os
+
+        def mp3_data(filename):
+            f = open(filename, "rb")
+            audiotools.MP3Audio.__find_mp3_start__(f)
+            data_start = f.tell()
+            audiotools.MP3Audio.__find_last_mp3_frame__(f)
+            data_end = f.tell()
+            f.seek(data_start, 0)
+            data = f.read(data_end - data_start)
+            f.close()
+            return (data_start, data)
+
+        temp_file = tempfile.NamedTemporaryFile(suffix=".mp3")
+        try:
+            temp_file.write(open("sine.mp3", "rb").read())
+            temp_file.flush()
+            (data_start, original_data) = mp3_data(temp_file.name)
+            self.assertEqual(data_start, 0)
+            track = audiotools.MP3Audio(temp_file.name)
+
+            #a new tag has padding reserved after it
+            metadata = self.empty_metadata()
+            metadata.track_name = u"Foo"
+            track.update_metadata(metadata)
+            (data_start, data) = mp3_data(temp_file.name)
+            self.assertEqual(data, original_data)
+            self.assertEqual(data_start,
+                             (metadata.size() +
+                              audiotools.MP3Audio.ID3V2_PADDING))
+            self.assertEqual(track.get_metadata().track_name, u"Foo")
+
+            #so a larger tag that fits in that padding
+            #is written without moving the MP3 data
+            file_size = os.path.getsize(temp_file.name)
+            metadata = track.get_metadata()
+            metadata.track_name = u"Bar" * 100
+            track.update_metadata(metadata)
+            self.assertEqual(os.path.getsize(temp_file.name), file_size)
+            self.assertEqual(mp3_data(temp_file.name), (data_start, data))
+            self.assertEqual(track.get_metadata().track_name, u"Bar" * 100)
+
+            #as is a smaller one
+            metadata = track.get_metadata()
+            metadata.track_name = u"Baz"
+            track.update_metadata(metadata)
+            self.assertEqual(os.path.getsize(temp_file.name), file_size)
+            self.assertEqual(mp3_data(temp_file.name), (data_start, data))
+            self.assertEqual(track.get_metadata().track_name, u"Baz")
+
+            #while a tag too large for the padding rewrites the file
+            metadata = track.get_metadata()
+            metadata.track_name = u"Kelp" * 1000
+            track.update_metadata(metadata)
+            (data_start, data) = mp3_data(temp_file.name)
+            self.assertEqual(data, original_data)
+            self.assertEqual(data_start,
+                             (metadata.size() +
+                              audiotools.MP3Audio.ID3V2_PADDING))
+            self.assertEqual(track.get_metadata().track_name, u"Kelp" * 1000)
+
+            #and removing the tag leaves only the MP3 data
+            track.delete_metadata()
+            self.assertEqual(open(temp_file.name, "rb").read(), original_data)
+            self.assertEqual(track.get_metadata(), None)
+        finally:
+            temp_file.close()
+
     @METADATA_ID3V2
     def test_foreign_field(self):
         metadata = audiotools.ID3v22Comment(
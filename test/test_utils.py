@@ -1178,6 +1178,83 @@ class track2track(UtilTest):
         finally:
             unsupported_bps_file.close()
 
+    @UTIL_TRACK2TRACK
+    def test_foreign_chunks(self):
+        #a WAVE with a foreign chunk
+        input_wave = os.path.join(self.input_dir, "01 - chunks.wav")
+        wave = audiotools.WaveAudio.from_pcm(
+            os.path.join(self.input_dir, "00 - plain.wav"),
+            BLANK_PCM_Reader(1))
+        chunks = list(wave.chunks())
+        chunks.insert(1, audiotools.RIFF_Chunk("abcd", 4, "\x01\x02\x03\x04"))
+        audiotools.WaveAudio.wave_from_chunks(input_wave, chunks)
+        self.assert_(audiotools.open(input_wave).has_foreign_riff_chunks())
+
+        #converted to several types at once
+        #keeps its chunks in every type which supports them
+        self.assertEqual(self.__run_app__(["track2track",
+                                           "-t", "wav",
+                                           "-t", "flac",
+                                           "-d", self.output_dir,
+                                           "--format=%(suffix)s.%(suffix)s",
+                                           "-V", "quiet",
+                                           input_wave]), 0)
+        for suffix in ["wav", "flac"]:
+            track = audiotools.open(os.path.join(self.output_dir,
+                                                 "%s.%s" % (suffix, suffix)))
+            self.assert_(track.has_foreign_riff_chunks(),
+                         "%s lost RIFF chunks" % (suffix))
+            output_wave = track.convert(
+                os.path.join(self.cwd_dir, "%s.wav" % (suffix)),
+                audiotools.WaveAudio)
+            self.assertEqual([chunk.data().read()
+                              for chunk in output_wave.chunks()
+                              if (chunk.id == "abcd")],
+                             ["\x01\x02\x03\x04"])
+
+    @UTIL_TRACK2TRACK
+    def test_foreign_chunks_lossy(self):
+        #a WAVE with a foreign chunk
+        input_wave = os.path.join(self.input_dir, "01 - chunks.wav")
+        wave = audiotools.WaveAudio.from_pcm(
+            os.path.join(self.input_dir, "00 - plain.wav"),
+            test_streams.Sine16_Stereo(44100, 44100,
+                                       441.0, 0.50, 4410.0, 0.49, 1.0))
+        chunks = list(wave.chunks())
+        chunks.insert(1, audiotools.RIFF_Chunk("abcd", 4, "\x01\x02\x03\x04"))
+        audiotools.WaveAudio.wave_from_chunks(input_wave, chunks)
+
+        #converted to a lossy type which can't hold its chunks
+        #alongside a lossless type which can
+        self.assertEqual(self.__run_app__(["track2track",
+                                           "-t", "mp3",
+                                           "-t", "flac",
+                                           "-d", self.output_dir,
+                                           "--format=%(suffix)s.%(suffix)s",
+                                           "--replay-gain",
+                                           "-V", "quiet",
+                                           input_wave]), 0)
+        flac = audiotools.open(os.path.join(self.output_dir, "flac.flac"))
+        self.assert_(flac.has_foreign_riff_chunks())
+        self.assert_(isinstance(
+                audiotools.open(os.path.join(self.output_dir, "mp3.mp3")),
+                audiotools.MP3Audio))
+
+        #the FLAC's ReplayGain is calculated from the source's PCM data
+        #rather than from the lossy file's
+        self.assertEqual(self.__run_app__(["track2track",
+                                           "-t", "flac",
+                                           "-d", self.cwd_dir,
+                                           "--format=%(suffix)s.%(suffix)s",
+                                           "--replay-gain",
+                                           "-V", "quiet",
+                                           input_wave]), 0)
+        self.assertEqual(
+            flac.replay_gain(),
+            audiotools.open(os.path.join(self.cwd_dir,
+                                         "flac.flac")).replay_gain())
+        self.assert_(flac.replay_gain() is not None)
+
     @UTIL_TRACK2TRACK
     def test_replay_gain(self):
         temp_files = [os.path.join(